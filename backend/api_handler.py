@@ -10,9 +10,17 @@ from ariadne import (
 )
 
 from dataall.api.Objects import bootstrap as bootstrap_schema, get_executable_schema
+from dataall.api.Objects.Stack.stack_helper import batch_stack_refreshes
 from dataall.aws.handlers.service_handlers import Worker
 from dataall.aws.handlers.sqs import SqsQueue
-from dataall.db import init_permissions, get_engine, api, permissions
+from dataall.db import (
+    init_permissions,
+    get_engine,
+    api,
+    permissions,
+    collect_sql_stats,
+    SQL_STATS_DEBUG,
+)
 from dataall.searchproxy import connect
 
 logger = logging.getLogger()
@@ -147,9 +155,13 @@ def handler(event, context):
         raise Exception(f'Could not initialize user context from event {event}')
 
     query = json.loads(event.get('body'))
-    success, response = graphql_sync(
-        schema=executable_schema, data=query, context_value=app_context
-    )
+    with collect_sql_stats(operation=query.get('operationName')) as sql_stats:
+        with batch_stack_refreshes(ENGINE):
+            success, response = graphql_sync(
+                schema=executable_schema, data=query, context_value=app_context
+            )
+    if SQL_STATS_DEBUG:
+        response['extensions'] = {'sql': sql_stats.to_dict()}
     response = json.dumps(response)
 
     log.info('Lambda Response %s', response)
@@ -1,83 +1,218 @@
+import os
+
 import nanoid
-from pyathena import connect
 
-from ....db import models
+from ....aws.handlers.athena import Athena, AthenaResult, PAGE_SIZE, TERMINAL_QUERY_STATES
+from ....db import exceptions, models
 from ....aws.handlers.sts import SessionHelper
 
+QUERY_TIMEOUT = int(os.getenv('ATHENA_QUERY_TIMEOUT', '600'))
+MAX_PAGE_SIZE = PAGE_SIZE
+
 
 def random_key():
     return nanoid.generate()
 
 
-def run_query(environment: models.Environment, sql=None):
-
+def run_query(environment: models.Environment, sql=None, page_size: int = None):
     boto3_session = SessionHelper.remote_session(accountid=environment.AwsAccountId)
-    creds = boto3_session.get_credentials()
-    connection = connect(
-        aws_access_key_id=creds.access_key,
-        aws_secret_access_key=creds.secret_key,
-        aws_session_token=creds.token,
+    return _run_query(
+        boto3_session.client('athena', region_name=environment.region),
+        sql=sql,
         work_group='primary',
-        s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/preview/',
-        region_name=environment.region,
+        output_location=f's3://{environment.EnvironmentDefaultBucketName}/preview/',
+        page_size=page_size,
+    )
+
+
+def run_query_with_role(
+    environment: models.Environment,
+    environment_group: models.EnvironmentGroup,
+    sql=None,
+    page_size: int = None,
+):
+    return _run_query(
+        get_athena_client_with_role(environment, environment_group),
+        sql=sql,
+        work_group=environment_group.environmentAthenaWorkGroup,
+        output_location=_output_location(environment, environment_group),
+        page_size=page_size,
+    )
+
+
+def start_query_with_role(
+    environment: models.Environment,
+    environment_group: models.EnvironmentGroup,
+    sql=None,
+) -> dict:
+    """Starts the query without waiting for it, returns its execution"""
+    output_location = _output_location(environment, environment_group)
+    query_id = Athena.start_query(
+        get_athena_client_with_role(environment, environment_group),
+        sql,
+        environment_group.environmentAthenaWorkGroup,
+        output_location,
     )
-    cursor = connection.cursor()
-    cursor.execute(sql)
-    columns = []
-    for f in cursor.description:
-        columns.append({'columnName': f[0], 'typeName': 'String'})
-
-    rows = []
-    for row in cursor:
-        record = {'cells': []}
-        for col_position, column in enumerate(columns):
-            cell = {}
-            cell['columnName'] = column['columnName']
-            cell['typeName'] = column['typeName']
-            cell['value'] = str(row[col_position])
-            record['cells'].append(cell)
-        rows.append(record)
     return {
-        'error': None,
-        'AthenaQueryId': cursor.query_id,
-        'ElapsedTime': cursor.total_execution_time_in_millis,
-        'rows': rows,
-        'columns': columns,
+        'AthenaQueryId': query_id,
+        'Status': 'QUEUED',
+        'OutputLocation': output_location,
     }
 
 
-def run_query_with_role(environment: models.Environment, environment_group: models.EnvironmentGroup, sql=None):
+def get_query_execution_with_role(
+    environment: models.Environment,
+    environment_group: models.EnvironmentGroup,
+    query_id: str,
+) -> dict:
+    return Athena.get_query_execution(
+        get_athena_client_with_role(environment, environment_group), query_id
+    )
+
+
+def read_query_result_pages_with_role(
+    environment: models.Environment,
+    environment_group: models.EnvironmentGroup,
+    query_id: str,
+    next_token: str,
+    page_size: int,
+    count: int,
+) -> [tuple]:
+    """
+    Reads up to count consecutive pages of results starting at next_token
+    Returns
+    -------
+    list of (AthenaResult, token of the next page or None)
+    """
+    client = get_athena_client_with_role(environment, environment_group)
+    pages = []
+    while len(pages) < count:
+        result, next_token = Athena.get_query_results_page(
+            client, query_id, next_token, validate_page_size(page_size)
+        )
+        pages.append((result, next_token))
+        if not next_token:
+            break
+    return pages
+
+
+def get_query_results_with_role(
+    environment: models.Environment,
+    environment_group: models.EnvironmentGroup,
+    query_id: str,
+    next_token: str = None,
+    page_size: int = None,
+):
+    """Reads a page of the results of a query, page_size defaults to the maximum page size"""
+    client = get_athena_client_with_role(environment, environment_group)
+    result, next_token = Athena.get_query_results_page(
+        client, query_id, next_token, validate_page_size(page_size or MAX_PAGE_SIZE)
+    )
+    return to_query_result(
+        Athena.get_query_execution(client, query_id), result, next_token
+    )
+
+
+def get_athena_client_with_role(
+    environment: models.Environment, environment_group: models.EnvironmentGroup
+):
     base_session = SessionHelper.remote_session(accountid=environment.AwsAccountId)
-    boto3_session = SessionHelper.get_session(base_session=base_session, role_arn=environment_group.environmentIAMRoleArn)
-    creds = boto3_session.get_credentials()
-    connection = connect(
-        aws_access_key_id=creds.access_key,
-        aws_secret_access_key=creds.secret_key,
-        aws_session_token=creds.token,
-        work_group=environment_group.environmentAthenaWorkGroup,
-        s3_staging_dir=f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{environment_group.environmentAthenaWorkGroup}/',
-        region_name=environment.region,
+    boto3_session = SessionHelper.get_session(
+        base_session=base_session, role_arn=environment_group.environmentIAMRoleArn
     )
-    cursor = connection.cursor()
-    cursor.execute(sql)
-    columns = []
-    for f in cursor.description:
-        columns.append({'columnName': f[0], 'typeName': 'String'})
-
-    rows = []
-    for row in cursor:
-        record = {'cells': []}
-        for col_position, column in enumerate(columns):
-            cell = {}
-            cell['columnName'] = column['columnName']
-            cell['typeName'] = column['typeName']
-            cell['value'] = str(row[col_position])
-            record['cells'].append(cell)
-        rows.append(record)
+    return boto3_session.client('athena', region_name=environment.region)
+
+
+def _output_location(
+    environment: models.Environment, environment_group: models.EnvironmentGroup
+):
+    return f's3://{environment.EnvironmentDefaultBucketName}/athenaqueries/{environment_group.environmentAthenaWorkGroup}/'
+
+
+def _run_query(client, sql, work_group, output_location, page_size=None):
+    """
+    Runs the query and reads its results.
+    Without page_size all the results are read, otherwise only the first page
+    is read and the next pages are fetched with the returned nextToken.
+    """
+    query_id = Athena.start_query(client, sql, work_group, output_location)
+    execution = Athena.wait_for_query(client, query_id, QUERY_TIMEOUT)
+    if execution['Status'] not in TERMINAL_QUERY_STATES:
+        # Still running after the timeout, it would keep scanning and billing
+        Athena.stop_query(client, query_id)
+        execution['Status'] = 'CANCELLED'
+    if execution['Status'] != 'SUCCEEDED':
+        return to_query_result(
+            {
+                **execution,
+                'Error': execution.get('Error')
+                or f'Query did not finish within {QUERY_TIMEOUT} seconds',
+            }
+        )
+    if page_size:
+        result, next_token = Athena.get_query_results_page(
+            client, query_id, page_size=validate_page_size(page_size)
+        )
+    else:
+        result, next_token = Athena.read_query_results(client, query_id), None
+    return to_query_result(execution, result, next_token)
+
+
+def validate_page_size(page_size: int):
+    if page_size < 1 or page_size > MAX_PAGE_SIZE:
+        raise exceptions.InvalidInput('pageSize', page_size, f'between 1 and {MAX_PAGE_SIZE}')
+    return page_size
+
+
+def to_query_result(execution: dict, result: AthenaResult = None, next_token=None):
     return {
-        'error': None,
-        'AthenaQueryId': cursor.query_id,
-        'ElapsedTime': cursor.total_execution_time_in_millis,
-        'rows': rows,
-        'columns': columns,
+        'error': execution.get('Error'),
+        'Error': execution.get('Error'),
+        'Status': execution.get('Status'),
+        'AthenaQueryId': execution.get('AthenaQueryId'),
+        'ElapsedTime': execution.get('ElapsedTimeInMs'),
+        'ElapsedTimeInMs': execution.get('ElapsedTimeInMs'),
+        'DataScannedInBytes': execution.get('DataScannedInBytes'),
+        'OutputLocation': execution.get('OutputLocation'),
+        'columns': [
+            {'columnName': c['name'], 'typeName': c['type']} for c in result.columns
+        ]
+        if result
+        else [],
+        'result': result,
+        'nextToken': next_token,
     }
+
+
+def to_legacy_rows(result: AthenaResult):
+    """Rows with one cell per column repeating the column name and type"""
+    if not result:
+        return []
+    return [
+        {
+            'cells': [
+                {
+                    'columnName': column['name'],
+                    'typeName': column['type'],
+                    'value': _to_string(value),
+                }
+                for column, value in zip(result.columns, row)
+            ]
+        }
+        for row in result.rows()
+    ]
+
+
+def to_vectors(result: AthenaResult):
+    """One vector of values per column, in the order of the columns, typed by their typeName"""
+    if not result:
+        return []
+    return [[_to_string(value) for value in vector] for vector in result.vectors]
+
+
+def _to_string(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
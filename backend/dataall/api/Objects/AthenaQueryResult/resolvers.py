@@ -0,0 +1,15 @@
+from .helpers import to_legacy_rows, to_vectors
+
+
+def resolve_rows(context, source, **kwargs):
+    if not source:
+        return None
+    if source.get('result') is None:
+        return source.get('rows')
+    return to_legacy_rows(source['result'])
+
+
+def resolve_vectors(context, source, **kwargs):
+    if not source:
+        return None
+    return to_vectors(source.get('result'))
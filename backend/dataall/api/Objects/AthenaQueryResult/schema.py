@@ -1,4 +1,5 @@
 from ... import gql
+from .resolvers import *
 
 AthenaResultColumnDescriptor = gql.ObjectType(
     name='AthenaResultColumnDescriptor',
@@ -34,12 +35,25 @@ AthenaQueryResult = gql.ObjectType(
         gql.Field(name='AthenaQueryId', type=gql.String),
         gql.Field(name='AwsAccountId', type=gql.String),
         gql.Field(name='region', type=gql.String),
-        gql.Field(name='ElapsedTimeInMs', type=gql.Integer),
-        gql.Field(name='DataScannedInBytes', type=gql.Integer),
+        # Float, GraphQL Int is 32-bit and Athena statistics are not
+        gql.Field(name='ElapsedTimeInMs', type=gql.Float),
+        gql.Field(name='DataScannedInBytes', type=gql.Float),
         gql.Field(name='Status', type=gql.String),
         gql.Field(
             name='columns', type=gql.ArrayType(gql.Ref('AthenaResultColumnDescriptor'))
         ),
-        gql.Field(name='rows', type=gql.ArrayType(gql.Ref('AthenaResultRecord'))),
+        gql.Field(
+            name='rows',
+            type=gql.ArrayType(gql.Ref('AthenaResultRecord')),
+            resolver=resolve_rows,
+        ),
+        gql.Field(
+            name='vectors',
+            type=gql.ArrayType(gql.ArrayType(gql.String)),
+            resolver=resolve_vectors,
+        ),
+        gql.Field(name='nextToken', type=gql.String),
+        gql.Field(name='page', type=gql.Integer),
+        gql.Field(name='hasNext', type=gql.Boolean),
     ],
 )
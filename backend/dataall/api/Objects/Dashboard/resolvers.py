@@ -27,45 +27,46 @@ def get_quicksight_reader_url(context, source, dashboardUri: str = None):
                 action=permissions.GET_DASHBOARD,
                 message=f'Dashboards feature is disabled for the environment {env.label}',
             )
-        if dash.SamlGroupName in context.groups:
-            url = Quicksight.get_reader_session(
-                AwsAccountId=env.AwsAccountId,
-                region=env.region,
-                UserName=context.username,
-                DashboardId=dash.DashboardId,
-            )
-        else:
-            shared_groups = db.api.Dashboard.query_all_user_groups_shareddashboard(
-                session=session,
-                username=context.username,
-                groups=context.groups,
-                uri=dashboardUri
-            )
-            if not shared_groups:
-                raise db.exceptions.UnauthorizedOperation(
-                    action=permissions.GET_DASHBOARD,
-                    message='Dashboard has not been shared with your Teams',
-                )
-
-            session_type = ParameterStoreManager.get_parameter_value(
-                parameter_path=f"/dataall/{os.getenv('envname', 'local')}/quicksight/sharedDashboardsSessions"
-            )
-
-            if session_type == 'reader':
-                url = Quicksight.get_shared_reader_session(
+        with Quicksight.environment_settings(env):
+            if dash.SamlGroupName in context.groups:
+                url = Quicksight.get_reader_session(
                     AwsAccountId=env.AwsAccountId,
                     region=env.region,
                     UserName=context.username,
-                    GroupName=shared_groups[0],
                     DashboardId=dash.DashboardId,
                 )
             else:
-                url = Quicksight.get_anonymous_session(
-                    AwsAccountId=env.AwsAccountId,
-                    region=env.region,
-                    UserName=context.username,
-                    DashboardId=dash.DashboardId,
+                shared_groups = db.api.Dashboard.query_all_user_groups_shareddashboard(
+                    session=session,
+                    username=context.username,
+                    groups=context.groups,
+                    uri=dashboardUri
                 )
+                if not shared_groups:
+                    raise db.exceptions.UnauthorizedOperation(
+                        action=permissions.GET_DASHBOARD,
+                        message='Dashboard has not been shared with your Teams',
+                    )
+
+                session_type = ParameterStoreManager.get_parameter_value(
+                    parameter_path=f"/dataall/{os.getenv('envname', 'local')}/quicksight/sharedDashboardsSessions"
+                )
+
+                if session_type == 'reader':
+                    url = Quicksight.get_shared_reader_session(
+                        AwsAccountId=env.AwsAccountId,
+                        region=env.region,
+                        UserName=context.username,
+                        GroupName=shared_groups[0],
+                        DashboardId=dash.DashboardId,
+                    )
+                else:
+                    url = Quicksight.get_anonymous_session(
+                        AwsAccountId=env.AwsAccountId,
+                        region=env.region,
+                        UserName=context.username,
+                        DashboardId=dash.DashboardId,
+                    )
     return url
 
 
@@ -87,12 +88,13 @@ def get_quicksight_designer_url(
                 message=f'Dashboards feature is disabled for the environment {env.label}',
             )
 
-        url = Quicksight.get_author_session(
-            AwsAccountId=env.AwsAccountId,
-            region=env.region,
-            UserName=context.username,
-            UserRole='AUTHOR',
-        )
+        with Quicksight.environment_settings(env):
+            url = Quicksight.get_author_session(
+                AwsAccountId=env.AwsAccountId,
+                region=env.region,
+                UserName=context.username,
+                UserRole='AUTHOR',
+            )
 
     return url
 
@@ -116,12 +118,13 @@ def import_dashboard(context: Context, source, input: dict = None):
                 message=f'Dashboards feature is disabled for the environment {env.label}',
             )
 
-        can_import = Quicksight.can_import_dashboard(
-            AwsAccountId=env.AwsAccountId,
-            region=env.region,
-            UserName=context.username,
-            DashboardId=input.get('dashboardId'),
-        )
+        with Quicksight.environment_settings(env):
+            can_import = Quicksight.can_import_dashboard(
+                AwsAccountId=env.AwsAccountId,
+                region=env.region,
+                UserName=context.username,
+                DashboardId=input.get('dashboardId'),
+            )
 
         if not can_import:
             raise db.exceptions.UnauthorizedOperation(
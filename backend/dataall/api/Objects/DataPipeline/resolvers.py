@@ -174,20 +174,17 @@ def cat(context: Context, source, input: dict = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(
-            action='repo.datapipeline.cat',
-            targetUri=input.get('DataPipelineUri'),
-            payload={
-                'absolutePath': input.get('absolutePath'),
-                'branch': input.get('branch', 'master'),
-            },
-        )
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    response = Worker.invoke(
+        engine=context.engine,
+        action='repo.datapipeline.cat',
+        target_uri=input.get('DataPipelineUri'),
+        payload={
+            'absolutePath': input.get('absolutePath'),
+            'branch': input.get('branch', 'master'),
+        },
     )
-    return response[0]['response'].decode('ascii')
+    return response['response'].decode('ascii')
 
 
 def ls(context: Context, source, input: dict = None):
@@ -200,20 +197,17 @@ def ls(context: Context, source, input: dict = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(
-            action='repo.datapipeline.ls',
-            targetUri=input.get('DataPipelineUri'),
-            payload={
-                'folderPath': input.get('folderPath', '/'),
-                'branch': input.get('branch', 'master'),
-            },
-        )
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    response = Worker.invoke(
+        engine=context.engine,
+        action='repo.datapipeline.ls',
+        target_uri=input.get('DataPipelineUri'),
+        payload={
+            'folderPath': input.get('folderPath', '/'),
+            'branch': input.get('branch', 'master'),
+        },
     )
-    return json.dumps(response[0]['response'])
+    return json.dumps(response['response'])
 
 
 def list_branches(context: Context, source, DataPipelineUri: str = None):
@@ -226,13 +220,13 @@ def list_branches(context: Context, source, DataPipelineUri: str = None):
             data=None,
             check_perm=True,
         )
-        task = models.Task(action='repo.datapipeline.branches', targetUri=DataPipelineUri)
-        session.add(task)
 
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
+    response = Worker.invoke(
+        engine=context.engine,
+        action='repo.datapipeline.branches',
+        target_uri=DataPipelineUri,
     )
-    return response[0]['response']
+    return response['response']
 
 
 def get_stack(context, source: models.DataPipeline, **kwargs):
@@ -248,28 +242,20 @@ def get_stack(context, source: models.DataPipeline, **kwargs):
 def get_job_runs(context, source: models.DataPipeline, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        task = models.Task(targetUri=source.DataPipelineUri, action='glue.job.runs')
-        session.add(task)
-
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
+    response = Worker.invoke(
+        engine=context.engine, action='glue.job.runs', target_uri=source.DataPipelineUri
+    )
     return response['response']
 
 
 def get_pipeline_executions(context: Context, source: models.DataPipeline, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        task = models.Task(
-            targetUri=source.DataPipelineUri, action='datapipeline.pipeline.executions'
-        )
-        session.add(task)
-
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
+    response = Worker.invoke(
+        engine=context.engine,
+        action='datapipeline.pipeline.executions',
+        target_uri=source.DataPipelineUri,
+    )
     return response['response']
 
 
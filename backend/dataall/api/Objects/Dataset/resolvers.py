@@ -26,10 +26,11 @@ log = logging.getLogger(__name__)
 
 def check_dataset_account(environment):
     if environment.dashboardsEnabled:
-        quicksight_subscription = Quicksight.check_quicksight_enterprise_subscription(AwsAccountId=environment.AwsAccountId)
-        if quicksight_subscription:
-            group = Quicksight.create_quicksight_group(AwsAccountId=environment.AwsAccountId)
-            return True if group else False
+        with Quicksight.environment_settings(environment):
+            quicksight_subscription = Quicksight.check_quicksight_enterprise_subscription(AwsAccountId=environment.AwsAccountId)
+            if quicksight_subscription:
+                group = Quicksight.create_quicksight_group(AwsAccountId=environment.AwsAccountId)
+                return True if group else False
     return True
 
 
@@ -267,18 +268,10 @@ def update_dataset(context, source, datasetUri: str = None, input: dict = None):
 def get_dataset_statistics(context: Context, source: models.Dataset, **kwargs):
     if not source:
         return None
-    with context.engine.scoped_session() as session:
-        count_tables = db.api.Dataset.count_dataset_tables(session, source.datasetUri)
-        count_locations = db.api.Dataset.count_dataset_locations(
-            session, source.datasetUri
-        )
-        count_upvotes = db.api.Vote.count_upvotes(
-            session, None, None, source.datasetUri, {'targetType': 'dataset'}
-        )
     return {
-        'tables': count_tables or 0,
-        'locations': count_locations or 0,
-        'upvotes': count_upvotes or 0,
+        'tables': source.tablesCount or 0,
+        'locations': source.locationsCount or 0,
+        'upvotes': source.upvotesCount or 0,
     }
 
 
@@ -291,11 +284,9 @@ def get_dataset_etl_credentials(context: Context, source, datasetUri: str = None
             resource_uri=datasetUri,
             permission_name=permissions.CREDENTIALS_DATASET,
         )
-        task = models.Task(targetUri=datasetUri, action='iam.dataset.user.credentials')
-        session.add(task)
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
+    response = Worker.invoke(
+        engine=context.engine, action='iam.dataset.user.credentials', target_uri=datasetUri
+    )
     return json.dumps(response['response'])
 
 
@@ -353,12 +344,11 @@ def sync_tables(context: Context, source, datasetUri: str = None):
         )
         dataset = Dataset.get_dataset_by_uri(session, datasetUri)
 
-        task = models.Task(
-            action='glue.dataset.database.tables',
-            targetUri=dataset.datasetUri,
-        )
-        session.add(task)
-    Worker.process(engine=context.engine, task_ids=[task.taskUri], save_response=False)
+    Worker.invoke(
+        engine=context.engine,
+        action='glue.dataset.database.tables',
+        target_uri=dataset.datasetUri,
+    )
     with context.engine.scoped_session() as session:
         indexers.upsert_dataset_tables(
             session=session, es=context.es, datasetUri=dataset.datasetUri
@@ -657,16 +647,12 @@ def publish_dataset_update(
                 "First enable subscriptions for this dataset's environment then retry."
             )
 
-        task = models.Task(
-            targetUri=datasetUri,
-            action='sns.dataset.publish_update',
-            payload={'s3Prefix': s3Prefix},
-        )
-        session.add(task)
-
-    response = Worker.process(
-        engine=context.engine, task_ids=[task.taskUri], save_response=False
-    )[0]
+    response = Worker.invoke(
+        engine=context.engine,
+        action='sns.dataset.publish_update',
+        target_uri=datasetUri,
+        payload={'s3Prefix': s3Prefix},
+    )
     log.info(f'Dataset update publish response: {response}')
     return True
 
@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 
 from .... import db
 from ....api.context import Context
@@ -7,9 +8,12 @@ from ....aws.handlers.service_handlers import Worker
 from ....aws.handlers.sts import SessionHelper
 from ....db import api, permissions, models
 from ....db.api import ResourcePolicy
+from ....db.api.dataset_profiling_run import TERMINAL_STATES
 
 log = logging.getLogger(__name__)
 
+STATUS_REFRESH_WINDOW = int(os.getenv('PROFILING_STATUS_REFRESH_WINDOW', '60'))
+
 
 def resolve_dataset(context, source: models.DatasetProfilingRun):
     if not source:
@@ -23,13 +27,32 @@ def resolve_dataset(context, source: models.DatasetProfilingRun):
 def resolve_profiling_run_status(context: Context, source: models.DatasetProfilingRun):
     if not source:
         return None
+    return source.status
+
+
+def _refresh_profiling_runs_status(context: Context, tableUri, runs: [models.DatasetProfilingRun]):
+    """
+    Queues one status refresh for the unfinished runs displayed,
+    runs checked less than STATUS_REFRESH_WINDOW seconds ago are skipped
+    """
+    unfinished = [
+        run.profilingRunUri for run in runs if run.status not in TERMINAL_STATES
+    ]
+    if not unfinished:
+        return
     with context.engine.scoped_session() as session:
+        uris = api.DatasetProfilingRun.request_status_refresh(
+            session, unfinished, STATUS_REFRESH_WINDOW
+        )
+        if not uris:
+            return
         task = models.Task(
-            targetUri=source.profilingRunUri, action='glue.job.profiling_run_status'
+            targetUri=tableUri,
+            action='glue.job.profiling_runs_status',
+            payload={'profilingRunUris': uris},
         )
         session.add(task)
     Worker.queue(engine=context.engine, task_ids=[task.taskUri])
-    return source.status
 
 
 def resolve_profiling_results(context: Context, source: models.DatasetProfilingRun):
@@ -62,12 +85,11 @@ def start_profiling_run(context: Context, source, input: dict = None):
             GlueTableName=input.get('GlueTableName'),
         )
 
-        task = models.Task(
-            targetUri=run.profilingRunUri, action='glue.job.start_profiling_run'
-        )
-        session.add(task)
-
-    Worker.process(engine=context.engine, task_ids=[task.taskUri])
+    Worker.invoke(
+        engine=context.engine,
+        action='glue.job.start_profiling_run',
+        target_uri=run.profilingRunUri,
+    )
 
     return run
 
@@ -109,7 +131,9 @@ def get_dataset_table_profiling_run(context: Context, source, tableUri=None):
                 if run_with_results:
                     run = run_with_results
 
-        return run
+    if run:
+        _refresh_profiling_runs_status(context, tableUri, [run])
+    return run
 
 
 def _get_profiling_results_from_s3(environment, dataset, table, run):
@@ -139,9 +163,11 @@ def list_table_profiling_runs(context: Context, source, tableUri=None):
     """
     with context.engine.scoped_session() as session:
         _check_preview_permissions_if_needed(context=context, session=session, tableUri=tableUri)
-        return api.DatasetProfilingRun.list_table_profiling_runs(
+        runs = api.DatasetProfilingRun.list_table_profiling_runs(
             session=session, tableUri=tableUri, filter={}
         )
+    _refresh_profiling_runs_status(context, tableUri, runs['nodes'])
+    return runs
 
 
 def _check_preview_permissions_if_needed(context, session, tableUri):
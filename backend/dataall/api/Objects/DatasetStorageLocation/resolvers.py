@@ -117,14 +117,13 @@ def publish_location_update(context: Context, source, locationUri: str = None):
                 'Subscriptions are disabled. '
                 "First enable subscriptions for this dataset's environment then retry."
             )
-        task = models.Task(
-            targetUri=location.datasetUri,
-            action='sns.dataset.publish_update',
-            payload={'s3Prefix': location.S3Prefix},
-        )
-        session.add(task)
 
-    Worker.process(engine=context.engine, task_ids=[task.taskUri], save_response=False)
+    Worker.invoke(
+        engine=context.engine,
+        action='sns.dataset.publish_update',
+        target_uri=location.datasetUri,
+        payload={'s3Prefix': location.S3Prefix},
+    )
     return True
 
 
@@ -50,3 +50,11 @@ DatasetTableFilter = gql.InputType(
         gql.Argument('pageSize', gql.Integer),
     ],
 )
+
+DatasetTablePreviewFilter = gql.InputType(
+    name='DatasetTablePreviewFilter',
+    arguments=[
+        gql.Argument('limit', gql.Integer),
+        gql.Argument('columns', gql.ArrayType(gql.String)),
+    ],
+)
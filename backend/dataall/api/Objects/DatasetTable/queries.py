@@ -1,5 +1,5 @@
 from ... import gql
-from .input_types import DatasetTableFilter
+from .input_types import DatasetTableFilter, DatasetTablePreviewFilter
 from .resolvers import *
 from .schema import (
     DatasetTable,
@@ -22,17 +22,45 @@ listDatasetTables = gql.QueryField(
 )
 
 
+QueryPreviewColumn = gql.ObjectType(
+    name='QueryPreviewColumn',
+    fields=[
+        gql.Field(name='name', type=gql.String),
+        gql.Field(name='typeName', type=gql.String),
+    ],
+)
+
 QueryPreviewResult = gql.ObjectType(
     name='QueryPreviewResult',
     fields=[
-        gql.Field(name='fields', type=gql.ArrayType(gql.String)),
-        gql.Field(name='rows', type=gql.ArrayType(gql.String)),
+        gql.Field(
+            name='fields',
+            type=gql.ArrayType(gql.String),
+            resolver=resolve_preview_fields,
+        ),
+        gql.Field(
+            name='rows',
+            type=gql.ArrayType(gql.String),
+            resolver=resolve_preview_rows,
+        ),
+        gql.Field(
+            name='columns',
+            type=gql.ArrayType(gql.Ref('QueryPreviewColumn')),
+            resolver=resolve_preview_columns,
+        ),
+        gql.Field(name='data', type=gql.String, resolver=resolve_preview_data),
+        gql.Field(
+            name='rowCount', type=gql.Integer, resolver=resolve_preview_row_count
+        ),
     ],
 )
 
 previewTable2 = gql.QueryField(
     name='previewTable2',
-    args=[gql.Argument(name='tableUri', type=gql.NonNullableType(gql.String))],
+    args=[
+        gql.Argument(name='tableUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='filter', type=DatasetTablePreviewFilter),
+    ],
     resolver=preview,
     type=gql.Ref('QueryPreviewResult'),
 )
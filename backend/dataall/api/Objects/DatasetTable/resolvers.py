@@ -1,12 +1,12 @@
 import json
 import logging
-
-from botocore.exceptions import ClientError
-from pyathena import connect
+import os
+from datetime import datetime
 
 from .... import db
 from ..Dataset.resolvers import get_dataset
 from ....api.context import Context
+from ....aws.handlers.athena import Athena, AthenaResult
 from ....aws.handlers.service_handlers import Worker
 from ....aws.handlers.sts import SessionHelper
 from ....db import permissions, models
@@ -16,6 +16,11 @@ from ....utils import json_utils, sql_utils
 
 log = logging.getLogger(__name__)
 
+PREVIEW_DEFAULT_ROWS = 50
+PREVIEW_MAX_ROWS = int(os.getenv('PREVIEW_MAX_ROWS', '1000'))
+PREVIEW_CACHE_TTL = int(os.getenv('PREVIEW_CACHE_TTL', '3600'))
+PREVIEW_REFRESH_WINDOW = int(os.getenv('PREVIEW_REFRESH_WINDOW', '300'))
+
 
 def create_table(context, source, datasetUri: str = None, input: dict = None):
     with context.engine.scoped_session() as session:
@@ -100,7 +105,9 @@ def delete_table(context, source, tableUri: str = None):
     return True
 
 
-def preview(context, source, tableUri: str = None):
+def preview(context, source, tableUri: str = None, filter: dict = None):
+    if not filter:
+        filter = {}
     with context.engine.scoped_session() as session:
         table: models.DatasetTable = db.api.DatasetTable.get_dataset_table_by_uri(
             session, tableUri
@@ -118,41 +125,87 @@ def preview(context, source, tableUri: str = None):
                 permission_name=permissions.PREVIEW_DATASET_TABLE,
             )
         env = db.api.Environment.get_environment_by_uri(session, dataset.environmentUri)
-        env_workgroup = {}
-        boto3_session = SessionHelper.remote_session(accountid=table.AWSAccountId)
-        creds = boto3_session.get_credentials()
+        columns = db.api.DatasetTable.validate_preview_columns(
+            session, table, filter.get('columns')
+        )
+        query = {
+            'accountid': table.AWSAccountId,
+            'region': table.region,
+            'work_group': env.EnvironmentDefaultAthenaWorkGroup,
+            'work_group_region': env.region,
+            's3_staging_dir': f's3://{env.EnvironmentDefaultBucketName}/preview/{dataset.datasetUri}/{table.tableUri}',
+            'sql': 'select {columns} from {table_identifier} limit {limit}'.format(
+                columns=', '.join(str(sql_utils.Identifier(c)) for c in columns) if columns else '*',
+                table_identifier=sql_utils.Identifier(table.GlueDatabaseName, table.GlueTableName),
+                limit=preview_limit(filter.get('limit')),
+            ),
+        }
+
+        cached_result, refresh_task, version = None, None, None
+        if PREVIEW_CACHE_TTL > 0:
+            version = db.api.DatasetTable.get_preview_version(session, table)
+            cached = db.api.DatasetTable.get_table_preview(session, table.tableUri, query['sql'])
+            if cached and cached.version == version:
+                cached_result = AthenaResult.from_dict(cached.result)
+                age = (datetime.now() - cached.created).total_seconds()
+                if age > PREVIEW_CACHE_TTL and db.api.DatasetTable.request_table_preview_refresh(
+                    session, cached, PREVIEW_REFRESH_WINDOW
+                ):
+                    refresh_task = models.Task(
+                        targetUri=table.tableUri,
+                        action='athena.table.preview.refresh',
+                        payload={'query': query, 'version': version},
+                    )
+                    session.add(refresh_task)
+
+    if cached_result:
+        if refresh_task:
+            log.info(f'Serving stale preview of {tableUri}, refreshing it in the background')
+            Worker.queue(engine=context.engine, task_ids=[refresh_task.taskUri])
+        return cached_result
+
+    # The database session is released before the Athena query starts
+    result = Athena.run_table_preview(query)
+
+    if version:
         try:
-            env_workgroup = boto3_session.client(
-                'athena', region_name=env.region
-            ).get_work_group(WorkGroup=env.EnvironmentDefaultAthenaWorkGroup)
-        except ClientError as e:
-            log.info(
-                f'Workgroup {env.EnvironmentDefaultAthenaWorkGroup} can not be found'
-                f'due to: {e}'
-            )
-
-        connection = connect(
-            aws_access_key_id=creds.access_key,
-            aws_secret_access_key=creds.secret_key,
-            aws_session_token=creds.token,
-            work_group=env_workgroup.get('WorkGroup', {}).get('Name', 'primary'),
-            s3_staging_dir=f's3://{env.EnvironmentDefaultBucketName}/preview/{dataset.datasetUri}/{table.tableUri}',
-            region_name=table.region,
+            with context.engine.scoped_session() as session:
+                db.api.DatasetTable.save_table_preview(
+                    session, tableUri, query['sql'], version, result.to_dict()
+                )
+        except Exception as e:
+            log.error(f'Failed to cache the preview of {tableUri} due to: {e}')
+    return result
+
+
+def preview_limit(limit: int = None):
+    if limit is None:
+        return PREVIEW_DEFAULT_ROWS
+    if limit < 1 or limit > PREVIEW_MAX_ROWS:
+        raise db.exceptions.InvalidInput(
+            'limit', limit, f'must be between 1 and {PREVIEW_MAX_ROWS}'
         )
-        cursor = connection.cursor()
+    return limit
 
-        SQL = 'select * from {table_identifier} limit 50'.format(
-            table_identifier=sql_utils.Identifier(table.GlueDatabaseName, table.GlueTableName)
-        )
-        cursor.execute(SQL)
-        fields = []
-        for f in cursor.description:
-            fields.append(json.dumps({'name': f[0]}))
-        rows = []
-        for row in cursor:
-            rows.append(json.dumps(json_utils.to_json(list(row))))
 
-    return {'rows': rows, 'fields': fields}
+def resolve_preview_fields(context, source: AthenaResult, **kwargs):
+    return [json.dumps({'name': c['name']}) for c in source.columns]
+
+
+def resolve_preview_rows(context, source: AthenaResult, **kwargs):
+    return [json.dumps(json_utils.to_json(row)) for row in source.rows()]
+
+
+def resolve_preview_columns(context, source: AthenaResult, **kwargs):
+    return [{'name': c['name'], 'typeName': c['type']} for c in source.columns]
+
+
+def resolve_preview_data(context, source: AthenaResult, **kwargs):
+    return json.dumps(source.vectors)
+
+
+def resolve_preview_row_count(context, source: AthenaResult, **kwargs):
+    return source.row_count
 
 
 def get_glue_table_properties(context: Context, source: models.DatasetTable, **kwargs):
@@ -206,14 +259,12 @@ def publish_table_update(context: Context, source, tableUri: str = None):
                 "First enable subscriptions for this dataset's environment then retry."
             )
 
-        task = models.Task(
-            targetUri=table.datasetUri,
-            action='sns.dataset.publish_update',
-            payload={'s3Prefix': table.S3Prefix},
-        )
-        session.add(task)
-
-    Worker.process(engine=context.engine, task_ids=[task.taskUri], save_response=False)
+    Worker.invoke(
+        engine=context.engine,
+        action='sns.dataset.publish_update',
+        target_uri=table.datasetUri,
+        payload={'s3Prefix': table.S3Prefix},
+    )
     return True
 
 
@@ -1,9 +1,9 @@
-from sqlalchemy import or_
 
 from .... import db
 from ....api.context import Context
 from ....aws.handlers.service_handlers import Worker
 from ....db import paginate, permissions, models
+from ....db.search import contains_term
 from ....db.api import ResourcePolicy
 
 
@@ -31,9 +31,10 @@ def list_table_columns(
         term = filter.get('term')
         if term:
             q = q.filter(
-                or_(
-                    models.DatasetTableColumn.label.ilike('%' + term + '%'),
-                    models.DatasetTableColumn.description.ilike('%' + term + '%'),
+                contains_term(
+                    term,
+                    models.DatasetTableColumn.label,
+                    models.DatasetTableColumn.description,
                 )
             ).order_by(models.DatasetTableColumn.columnType.asc())
 
@@ -54,9 +55,7 @@ def sync_table_columns(context: Context, source, tableUri: str = None):
             resource_uri=table.datasetUri,
             permission_name=permissions.UPDATE_DATASET_TABLE,
         )
-        task = models.Task(action='glue.table.columns', targetUri=table.tableUri)
-        session.add(task)
-    Worker.process(engine=context.engine, task_ids=[task.taskUri], save_response=False)
+    Worker.invoke(engine=context.engine, action='glue.table.columns', target_uri=table.tableUri)
     return list_table_columns(context, source=table, tableUri=tableUri)
 
 
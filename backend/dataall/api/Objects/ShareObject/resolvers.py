@@ -310,12 +310,24 @@ def resolve_consumption_data(context: Context, source: models.ShareObject, **kwa
 def resolve_share_object_statistics(context: Context, source: models.ShareObject, **kwargs):
     if not source:
         return None
+    if getattr(source, 'statistics', None) is not None:
+        return source.statistics
     with context.engine.scoped_session() as session:
         return db.api.ShareObject.resolve_share_object_statistics(
             session, source.shareUri
         )
 
 
+def attach_share_objects_statistics(session, shares: [models.ShareObject]):
+    """Computes the statistics of a page of shares in one query, they are then returned by the statistics field"""
+    statistics = db.api.ShareObject.resolve_share_objects_statistics(
+        session, [share.shareUri for share in shares]
+    )
+    for share in shares:
+        share.statistics = statistics[share.shareUri]
+    return shares
+
+
 def resolve_existing_shared_items(context: Context, source: models.ShareObject, **kwargs):
     if not source:
         return None
@@ -347,7 +359,7 @@ def list_shares_in_my_inbox(context: Context, source, filter: dict = None):
     if not filter:
         filter = {}
     with context.engine.scoped_session() as session:
-        return db.api.ShareObject.list_user_received_share_requests(
+        shares = db.api.ShareObject.list_user_received_share_requests(
             session=session,
             username=context.username,
             groups=context.groups,
@@ -355,13 +367,15 @@ def list_shares_in_my_inbox(context: Context, source, filter: dict = None):
             data=filter,
             check_perm=None,
         )
+        attach_share_objects_statistics(session, shares['nodes'])
+        return shares
 
 
 def list_shares_in_my_outbox(context: Context, source, filter: dict = None):
     if not filter:
         filter = {}
     with context.engine.scoped_session() as session:
-        return db.api.ShareObject.list_user_sent_share_requests(
+        shares = db.api.ShareObject.list_user_sent_share_requests(
             session=session,
             username=context.username,
             groups=context.groups,
@@ -369,6 +383,8 @@ def list_shares_in_my_outbox(context: Context, source, filter: dict = None):
             data=filter,
             check_perm=None,
         )
+        attach_share_objects_statistics(session, shares['nodes'])
+        return shares
 
 
 def update_share_request_purpose(context: Context, source, shareUri: str = None, requestPurpose: str = None):
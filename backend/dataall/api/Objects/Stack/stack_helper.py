@@ -1,4 +1,6 @@
+import contextvars
 import os
+from contextlib import contextmanager
 
 import requests
 
@@ -9,6 +11,11 @@ from ....aws.handlers.ecs import Ecs
 from ....db import models
 from ....utils import Parameter
 
+DESCRIBE_FRESHNESS = int(os.getenv('STACK_DESCRIBE_FRESHNESS_SECONDS', '60'))
+STABLE_DESCRIBE_INTERVAL = int(os.getenv('STACK_STABLE_DESCRIBE_SECONDS', '86400'))
+
+_pending_refreshes = contextvars.ContextVar('stack_refreshes', default=None)
+
 
 def get_stack_with_cfn_resources(context: Context, targetUri: str, environmentUri: str):
     with context.engine.scoped_session() as session:
@@ -29,23 +36,86 @@ def get_stack_with_cfn_resources(context: Context, targetUri: str, environmentUr
             )
             return stack
 
-        cfn_task = save_describe_stack_task(session, env, stack, targetUri)
-        Worker.queue(engine=context.engine, task_ids=[cfn_task.taskUri])
+        request_stack_refresh(context.engine, session, env, stack, targetUri)
     return stack
 
 
+def request_stack_refresh(engine, session, environment, stack, target_uri):
+    """
+    Requests a CloudFormation describe of the stack, deduplicated within
+    STACK_DESCRIBE_FRESHNESS_SECONDS. Stacks in a stable status are described at most
+    every STACK_STABLE_DESCRIBE_SECONDS.
+    Inside batch_stack_refreshes the describe is deferred to the batch, otherwise it is queued.
+    Explicit refreshes are not throttled: the getStack query describes the stack
+    synchronously, and the cdkproxy expires the claim when a deployment finishes.
+    """
+    if not db.api.Stack.claim_stack_refresh(
+        session, stack.stackUri, DESCRIBE_FRESHNESS, STABLE_DESCRIBE_INTERVAL
+    ):
+        return False
+    session.commit()
+    payload = describe_stack_payload(environment, stack, target_uri)
+    pending = _pending_refreshes.get()
+    if pending is not None:
+        pending.append(payload)
+    else:
+        queue_stacks_refresh(engine, [payload], session)
+    return True
+
+
+@contextmanager
+def batch_stack_refreshes(engine):
+    """Coalesces the stack refreshes requested in the block into one worker task"""
+    pending = []
+    token = _pending_refreshes.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_refreshes.reset(token)
+        if pending:
+            queue_stacks_refresh(engine, pending)
+
+
+def queue_stacks_refresh(engine, stacks: [dict], session=None):
+    """Queues one describe task for the stacks, saved with the session if provided"""
+    if len(stacks) == 1:
+        cfn_task = models.Task(
+            targetUri=stacks[0]['stackUri'],
+            action='cloudformation.stack.describe_resources',
+            payload=stacks[0],
+        )
+    else:
+        cfn_task = models.Task(
+            targetUri=','.join(stack['stackUri'] for stack in stacks),
+            action='cloudformation.stacks.describe_resources',
+            payload={'stacks': stacks},
+        )
+    if session:
+        session.add(cfn_task)
+        session.commit()
+    else:
+        with engine.scoped_session() as session:
+            session.add(cfn_task)
+    Worker.queue(engine=engine, task_ids=[cfn_task.taskUri])
+    return cfn_task
+
+
+def describe_stack_payload(environment, stack, target_uri):
+    return {
+        'accountid': environment.AwsAccountId,
+        'region': environment.region,
+        'role_arn': environment.CDKRoleArn,
+        'stack_name': stack.name,
+        'stackUri': stack.stackUri,
+        'targetUri': target_uri,
+    }
+
+
 def save_describe_stack_task(session, environment, stack, target_uri):
     cfn_task = models.Task(
         targetUri=stack.stackUri,
         action='cloudformation.stack.describe_resources',
-        payload={
-            'accountid': environment.AwsAccountId,
-            'region': environment.region,
-            'role_arn': environment.CDKRoleArn,
-            'stack_name': stack.name,
-            'stackUri': stack.stackUri,
-            'targetUri': target_uri,
-        },
+        payload=describe_stack_payload(environment, stack, target_uri),
     )
     session.add(cfn_task)
     session.commit()
@@ -25,6 +25,44 @@ runAthenaSqlQuery = gql.QueryField(
         gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
         gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
         gql.Argument(name='sqlQuery', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='pageSize', type=gql.Integer),
     ],
     resolver=run_sql_query,
 )
+
+
+getAthenaSqlQueryResults = gql.QueryField(
+    name='getAthenaSqlQueryResults',
+    type=gql.Ref('AthenaQueryResult'),
+    args=[
+        gql.Argument(name='environmentUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='AthenaQueryId', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='nextToken', type=gql.String),
+        gql.Argument(name='pageSize', type=gql.Integer),
+    ],
+    resolver=get_sql_query_results,
+)
+
+
+getAthenaSqlQueryStatus = gql.QueryField(
+    name='getAthenaSqlQueryStatus',
+    type=gql.Ref('AthenaQueryResult'),
+    args=[
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='AthenaQueryId', type=gql.NonNullableType(gql.String)),
+    ],
+    resolver=get_sql_query_status,
+)
+
+
+getAthenaSqlQueryResultsPage = gql.QueryField(
+    name='getAthenaSqlQueryResultsPage',
+    type=gql.Ref('AthenaQueryResult'),
+    args=[
+        gql.Argument(name='worksheetUri', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='AthenaQueryId', type=gql.NonNullableType(gql.String)),
+        gql.Argument(name='page', type=gql.Integer),
+    ],
+    resolver=get_sql_query_results_page,
+)
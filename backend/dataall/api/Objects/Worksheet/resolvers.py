@@ -2,6 +2,7 @@ from sqlalchemy import and_
 
 from .... import db
 from ..AthenaQueryResult import helpers as athena_helpers
+from ....aws.handlers.athena import AthenaResult, TERMINAL_QUERY_STATES
 from ....api.constants import WorksheetRole
 from ....api.context import Context
 from ....db import paginate, exceptions, permissions, models
@@ -135,8 +136,50 @@ def resolve_shares(context: Context, source: models.Worksheet, filter: dict = No
 
 
 def run_sql_query(
-    context: Context, source, environmentUri: str = None, worksheetUri: str = None, sqlQuery: str = None
+    context: Context,
+    source,
+    environmentUri: str = None,
+    worksheetUri: str = None,
+    sqlQuery: str = None,
+    pageSize: int = None,
 ):
+    environment, env_group = _get_query_environment(context, environmentUri, worksheetUri)
+    return {
+        **athena_helpers.run_query_with_role(
+            environment=environment,
+            environment_group=env_group,
+            sql=sqlQuery,
+            page_size=pageSize,
+        ),
+        'AwsAccountId': environment.AwsAccountId,
+        'region': environment.region,
+    }
+
+
+def get_sql_query_results(
+    context: Context,
+    source,
+    environmentUri: str = None,
+    worksheetUri: str = None,
+    AthenaQueryId: str = None,
+    nextToken: str = None,
+    pageSize: int = None,
+):
+    environment, env_group = _get_query_environment(context, environmentUri, worksheetUri)
+    return {
+        **athena_helpers.get_query_results_with_role(
+            environment=environment,
+            environment_group=env_group,
+            query_id=AthenaQueryId,
+            next_token=nextToken,
+            page_size=pageSize,
+        ),
+        'AwsAccountId': environment.AwsAccountId,
+        'region': environment.region,
+    }
+
+
+def _get_query_environment(context: Context, environmentUri, worksheetUri):
     with context.engine.scoped_session() as session:
         ResourcePolicy.check_user_resource_permission(
             session=session,
@@ -151,10 +194,135 @@ def run_sql_query(
         env_group = db.api.Environment.get_environment_group(
             session, worksheet.SamlAdminGroupName, environment.environmentUri
         )
+    return environment, env_group
+
 
-    return athena_helpers.run_query_with_role(
+def start_sql_query(
+    context: Context,
+    source,
+    environmentUri: str = None,
+    worksheetUri: str = None,
+    sqlQuery: str = None,
+    pageSize: int = None,
+):
+    page_size = athena_helpers.validate_page_size(pageSize or athena_helpers.MAX_PAGE_SIZE)
+    environment, env_group = _get_query_environment(context, environmentUri, worksheetUri)
+    execution = athena_helpers.start_query_with_role(
         environment=environment, environment_group=env_group, sql=sqlQuery
     )
+    with context.engine.scoped_session() as session:
+        db.api.Worksheet.save_query_execution(
+            session, worksheetUri, environment, sqlQuery, execution, page_size
+        )
+    return {
+        **athena_helpers.to_query_result(execution),
+        'AwsAccountId': environment.AwsAccountId,
+        'region': environment.region,
+    }
+
+
+def get_sql_query_status(
+    context: Context, source, worksheetUri: str = None, AthenaQueryId: str = None
+):
+    query_result, _, _ = _get_query_execution(context, worksheetUri, AthenaQueryId)
+    return _to_query_result(query_result)
+
+
+def get_sql_query_results_page(
+    context: Context,
+    source,
+    worksheetUri: str = None,
+    AthenaQueryId: str = None,
+    page: int = None,
+):
+    """
+    Returns a page of the results of a query started with startAthenaSqlQuery.
+    Pages are read from Athena the first time they are requested and are then
+    served from the database for the lifetime of the query result.
+    """
+    page = 1 if page is None else page
+    if page < 1:
+        raise exceptions.InvalidInput('page', page, 'greater than 0')
+    query_result, environment, env_group = _get_query_execution(
+        context, worksheetUri, AthenaQueryId
+    )
+    if query_result.status != 'SUCCEEDED':
+        return {**_to_query_result(query_result), 'page': page, 'hasNext': False}
+
+    with context.engine.scoped_session() as session:
+        cached = db.api.Worksheet.get_query_result_page(session, AthenaQueryId, page)
+        cached = (cached.page, cached.result, cached.nextToken) if cached else None
+
+    result, next_token = None, None
+    if cached and cached[0] == page:
+        result, next_token = AthenaResult.from_dict(cached[1]), cached[2]
+    elif not cached or cached[2]:
+        start, token = (cached[0], cached[2]) if cached else (0, None)
+        pages = athena_helpers.read_query_result_pages_with_role(
+            environment=environment,
+            environment_group=env_group,
+            query_id=AthenaQueryId,
+            next_token=token,
+            page_size=query_result.pageSize or athena_helpers.MAX_PAGE_SIZE,
+            count=page - start,
+        )
+        with context.engine.scoped_session() as session:
+            for index, (page_result, page_token) in enumerate(pages):
+                db.api.Worksheet.save_query_result_page(
+                    session, AthenaQueryId, start + index + 1, page_result.to_dict(), page_token
+                )
+        if start + len(pages) == page:
+            result, next_token = pages[-1]
+
+    return {
+        **_to_query_result(query_result, result, next_token),
+        'page': page,
+        'hasNext': bool(next_token),
+    }
+
+
+def _get_query_execution(context: Context, worksheetUri, AthenaQueryId):
+    """Returns the query execution, its status is refreshed from Athena until it is finished"""
+    with context.engine.scoped_session() as session:
+        query_result = db.api.Worksheet.get_query_execution(
+            session, worksheetUri, AthenaQueryId
+        )
+        if not query_result.environmentUri:
+            raise exceptions.ObjectNotFound('WorksheetQueryResult', AthenaQueryId)
+    environment, env_group = _get_query_environment(
+        context, query_result.environmentUri, worksheetUri
+    )
+    if query_result.status not in TERMINAL_QUERY_STATES:
+        execution = athena_helpers.get_query_execution_with_role(
+            environment=environment, environment_group=env_group, query_id=AthenaQueryId
+        )
+        with context.engine.scoped_session() as session:
+            query_result = db.api.Worksheet.get_query_execution(
+                session, worksheetUri, AthenaQueryId
+            )
+            db.api.Worksheet.update_query_execution(session, query_result, execution)
+    return query_result, environment, env_group
+
+
+def _to_query_result(
+    query_result: models.WorksheetQueryResult, result: AthenaResult = None, next_token=None
+):
+    return {
+        **athena_helpers.to_query_result(
+            {
+                'AthenaQueryId': query_result.AthenaQueryId,
+                'Status': query_result.status,
+                'Error': query_result.error,
+                'ElapsedTimeInMs': query_result.ElapsedTimeInMs,
+                'DataScannedInBytes': query_result.DataScannedInBytes,
+                'OutputLocation': query_result.OutputLocation,
+            },
+            result,
+            next_token,
+        ),
+        'AwsAccountId': query_result.AwsAccountId,
+        'region': query_result.region,
+    }
 
 
 def delete_worksheet(context, source, worksheetUri: str = None):
@@ -11,6 +11,7 @@ from .graphql_scalar import (
     AWSDateTime,
     Boolean,
     Date,
+    Float,
     Integer,
     Number,
     Scalar,
@@ -33,6 +34,7 @@ __all__ = [
     'Scalar',
     'ID',
     'Integer',
+    'Float',
     'String',
     'Number',
     'Boolean',
@@ -0,0 +1,279 @@
+import json
+import logging
+import math
+
+from botocore.exceptions import ClientError
+from pyathena import connect
+
+from .service_handlers import Worker
+from .sts import SessionHelper
+from .waiter import Waiter
+from ... import db
+from ...db import models
+from ...utils import json_utils
+
+log = logging.getLogger('aws:athena')
+
+# GetQueryResults returns at most 1000 rows, the first page includes the header row
+MAX_RESULTS = 1000
+PAGE_SIZE = MAX_RESULTS - 1
+TERMINAL_QUERY_STATES = ['SUCCEEDED', 'FAILED', 'CANCELLED']
+INTEGER_TYPES = ['tinyint', 'smallint', 'integer', 'int', 'bigint']
+FLOAT_TYPES = ['float', 'real', 'double']
+
+
+class AthenaResult:
+    """
+    Columnar result of an Athena query: the schema once and one vector of values per column.
+    Values are JSON serializable, numbers, booleans and nulls are kept as such.
+    """
+
+    def __init__(self, columns, vectors, query_id=None, elapsed_time=None, data_scanned=None):
+        self.columns = columns
+        self.vectors = vectors
+        self.query_id = query_id
+        self.elapsed_time = elapsed_time
+        self.data_scanned = data_scanned
+
+    @property
+    def row_count(self):
+        return len(self.vectors[0]) if self.vectors else 0
+
+    def rows(self):
+        return [list(row) for row in zip(*self.vectors)]
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'vectors': self.vectors,
+            'queryId': self.query_id,
+            'elapsedTime': self.elapsed_time,
+            'dataScanned': self.data_scanned,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['columns'],
+            data['vectors'],
+            data.get('queryId'),
+            data.get('elapsedTime'),
+            data.get('dataScanned'),
+        )
+
+
+class Athena:
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def get_work_group_name(boto3_session, region, work_group, default='primary'):
+        try:
+            response = boto3_session.client('athena', region_name=region).get_work_group(
+                WorkGroup=work_group
+            )
+            return response.get('WorkGroup', {}).get('Name', default)
+        except ClientError as e:
+            log.info(f'Workgroup {work_group} can not be found due to: {e}')
+            return default
+
+    @staticmethod
+    def run_query(boto3_session, region, work_group, s3_staging_dir, sql, max_rows=None, page_size=PAGE_SIZE):
+        """
+        Runs the query and reads its results page by page
+        Parameters
+        ----------
+        boto3_session : session of the account running the query
+        max_rows : stops reading after max_rows rows, all the rows are read if None
+
+        Returns
+        -------
+        AthenaResult
+        """
+        creds = boto3_session.get_credentials()
+        connection = connect(
+            aws_access_key_id=creds.access_key,
+            aws_secret_access_key=creds.secret_key,
+            aws_session_token=creds.token,
+            work_group=work_group,
+            s3_staging_dir=s3_staging_dir,
+            region_name=region,
+        )
+        cursor = connection.cursor(arraysize=page_size)
+        cursor.execute(sql)
+        return Athena.read_cursor(cursor, max_rows, page_size)
+
+    @staticmethod
+    def run_table_preview(query: dict) -> AthenaResult:
+        """
+        Runs a table preview query
+        Parameters
+        ----------
+        query : dict with the accountid and region of the table, the environment
+            work_group and work_group_region, the s3_staging_dir and the sql
+        """
+        boto3_session = SessionHelper.remote_session(accountid=query['accountid'])
+        return Athena.run_query(
+            boto3_session,
+            region=query['region'],
+            work_group=Athena.get_work_group_name(
+                boto3_session, query['work_group_region'], query['work_group']
+            ),
+            s3_staging_dir=query['s3_staging_dir'],
+            sql=query['sql'],
+        )
+
+    @staticmethod
+    @Worker.handler(path='athena.table.preview.refresh')
+    def refresh_table_preview(engine, task: models.Task):
+        result = Athena.run_table_preview(task.payload['query'])
+        with engine.scoped_session() as session:
+            db.api.DatasetTable.save_table_preview(
+                session,
+                task.targetUri,
+                task.payload['query']['sql'],
+                task.payload['version'],
+                result.to_dict(),
+            )
+        return {'rows': result.row_count}
+
+    @staticmethod
+    def start_query(client, sql, work_group, output_location) -> str:
+        response = client.start_query_execution(
+            QueryString=sql,
+            WorkGroup=work_group,
+            ResultConfiguration={'OutputLocation': output_location},
+        )
+        return response['QueryExecutionId']
+
+    @staticmethod
+    def get_query_execution(client, query_id) -> dict:
+        execution = client.get_query_execution(QueryExecutionId=query_id)['QueryExecution']
+        status = execution.get('Status', {})
+        statistics = execution.get('Statistics', {})
+        return {
+            'AthenaQueryId': query_id,
+            'Status': status.get('State'),
+            'Error': status.get('StateChangeReason')
+            if status.get('State') in ['FAILED', 'CANCELLED']
+            else None,
+            'ElapsedTimeInMs': statistics.get('TotalExecutionTimeInMillis'),
+            'DataScannedInBytes': statistics.get('DataScannedInBytes'),
+            'OutputLocation': execution.get('ResultConfiguration', {}).get('OutputLocation'),
+        }
+
+    @staticmethod
+    def wait_for_query(client, query_id, timeout) -> dict:
+        """Polls the query execution until it is finished or the timeout is reached"""
+        execution = {}
+
+        def finished():
+            execution.update(Athena.get_query_execution(client, query_id))
+            return execution['Status'] in TERMINAL_QUERY_STATES
+
+        Waiter.wait_until(
+            finished, f'Athena query {query_id}', timeout=timeout, delay=0.5, max_delay=5
+        )
+        return execution
+
+    @staticmethod
+    def stop_query(client, query_id):
+        """Cancels the query execution, a query finishing meanwhile is left as is"""
+        try:
+            client.stop_query_execution(QueryExecutionId=query_id)
+            log.info(f'Athena query {query_id} cancelled')
+        except ClientError as e:
+            log.error(f'Failed to cancel Athena query {query_id}: {e}')
+
+    @staticmethod
+    def get_query_results_page(client, query_id, next_token=None, page_size=PAGE_SIZE):
+        """
+        Reads one page of the results of a finished query
+        Returns
+        -------
+        (AthenaResult with typed values, token of the next page or None)
+        """
+        params = {'QueryExecutionId': query_id, 'MaxResults': min(page_size, PAGE_SIZE)}
+        if next_token:
+            params['NextToken'] = next_token
+        else:
+            # One more row for the header so that the page holds page_size rows
+            params['MaxResults'] += 1
+        response = client.get_query_results(**params)
+        columns = [
+            {'name': c['Name'], 'type': c['Type']}
+            for c in response['ResultSet']['ResultSetMetadata']['ColumnInfo']
+        ]
+        rows = [
+            [d.get('VarCharValue') for d in row['Data']]
+            for row in response['ResultSet']['Rows']
+        ]
+        # The first row of a query result holds the column names
+        if not next_token and rows and rows[0] == [c['name'] for c in columns]:
+            rows = rows[1:]
+        vectors = [
+            [Athena.parse_value(row[i], column['type']) for row in rows]
+            for i, column in enumerate(columns)
+        ]
+        return AthenaResult(columns, vectors, query_id=query_id), response.get('NextToken')
+
+    @staticmethod
+    def read_query_results(client, query_id, page_size=PAGE_SIZE, max_rows=None) -> AthenaResult:
+        """Reads the results of a finished query page by page"""
+        result, next_token = Athena.get_query_results_page(client, query_id, page_size=page_size)
+        while next_token and (max_rows is None or result.row_count < max_rows):
+            page, next_token = Athena.get_query_results_page(
+                client, query_id, next_token, page_size
+            )
+            for vector, values in zip(result.vectors, page.vectors):
+                vector.extend(values)
+        if max_rows is not None:
+            result.vectors = [vector[:max_rows] for vector in result.vectors]
+        return result
+
+    @staticmethod
+    def parse_value(value, athena_type):
+        if value is None:
+            return None
+        try:
+            if athena_type in INTEGER_TYPES:
+                return int(value)
+            if athena_type in FLOAT_TYPES:
+                number = float(value)
+                return number if math.isfinite(number) else value
+        except ValueError:
+            return value
+        if athena_type == 'boolean':
+            return value == 'true'
+        return value
+
+    @staticmethod
+    def read_cursor(cursor, max_rows=None, page_size=PAGE_SIZE) -> AthenaResult:
+        columns = [{'name': d[0], 'type': d[1]} for d in cursor.description]
+        vectors = [[] for _ in columns]
+        count = 0
+        while max_rows is None or count < max_rows:
+            size = page_size if max_rows is None else min(page_size, max_rows - count)
+            rows = cursor.fetchmany(size)
+            if not rows:
+                break
+            for row in rows:
+                for vector, value in zip(vectors, row):
+                    vector.append(Athena.encode_value(value))
+            count += len(rows)
+        return AthenaResult(
+            columns,
+            vectors,
+            query_id=cursor.query_id,
+            elapsed_time=cursor.total_execution_time_in_millis,
+            data_scanned=cursor.data_scanned_in_bytes,
+        )
+
+    @staticmethod
+    def encode_value(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, default=json_utils.json_decoder)
+        encoded = json_utils.json_decoder(value)
+        return encoded if isinstance(encoded, str) else str(value)
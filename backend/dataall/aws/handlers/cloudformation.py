@@ -1,15 +1,19 @@
 import logging
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import ClientError
 
 from .service_handlers import Worker
 from .sts import SessionHelper
-from ...db import models, Engine
+from ...db import models, Engine, in_current_context
 from ...utils import json_utils
 
 log = logging.getLogger(__name__)
 
+DESCRIBE_MAX_WORKERS = int(os.getenv('STACK_DESCRIBE_MAX_WORKERS', '4'))
+
 
 class CloudFormation:
     def __init__(self):
@@ -102,14 +106,36 @@ class CloudFormation:
     @staticmethod
     @Worker.handler(path='cloudformation.stack.describe_resources')
     def describe_stack_resources(engine, task: models.Task):
+        CloudFormation.update_stack_resources(engine, task.payload)
+
+    @staticmethod
+    @Worker.handler(path='cloudformation.stacks.describe_resources')
+    def describe_stacks_resources(engine, task: models.Task):
+        """Describes a batch of stacks concurrently, a failing stack does not fail the others"""
+
+        def update(payload):
+            try:
+                CloudFormation.update_stack_resources(engine, payload)
+                return True
+            except Exception as e:
+                log.error(f"Failed to describe stack {payload['stackUri']}: {e}", exc_info=True)
+                return False
+
+        with ThreadPoolExecutor(max_workers=DESCRIBE_MAX_WORKERS) as pool:
+            results = list(pool.map(in_current_context(update), task.payload['stacks']))
+        return {'described': results.count(True), 'failed': results.count(False)}
+
+    @staticmethod
+    def update_stack_resources(engine, payload: dict):
+        """Saves the status, outputs, resources and events of the CloudFormation stack on the stack"""
         try:
             filtered_resources = []
             filtered_events = []
             filtered_outputs = {}
             data = {
-                'accountid': task.payload['accountid'],
-                'region': task.payload['region'],
-                'stack_name': task.payload['stack_name'],
+                'accountid': payload['accountid'],
+                'region': payload['region'],
+                'stack_name': payload['stack_name'],
             }
 
             cfn_stack = CloudFormation._get_stack(**data)
@@ -126,7 +152,7 @@ class CloudFormation:
             events = CloudFormation._describe_stack_events(**data)['StackEvents']
             with engine.scoped_session() as session:
                 stack: models.Stack = session.query(models.Stack).get(
-                    task.payload['stackUri']
+                    payload['stackUri']
                 )
                 stack.status = status
                 stack.stackid = stack_arn
@@ -162,7 +188,7 @@ class CloudFormation:
         except ClientError as e:
             with engine.scoped_session() as session:
                 stack: models.Stack = session.query(models.Stack).get(
-                    task.payload['stackUri']
+                    payload['stackUri']
                 )
                 if not stack.error:
                     stack.error = {
@@ -1,7 +1,43 @@
+import os
+import threading
+from collections import OrderedDict
+
 from .service_handlers import Worker
 from .sts import SessionHelper
 from ...db import models, Engine
 
+LISTINGS_CACHE_SIZE = int(os.getenv('CODECOMMIT_LISTINGS_CACHE_SIZE', '256'))
+
+
+class ListingsCache:
+    """Least recently used listings, a listing of a commit never changes"""
+
+    def __init__(self, size):
+        self.size = size
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._listings:
+                return None
+            self._listings.move_to_end(key)
+            return self._listings[key]
+
+    def set(self, key, listing):
+        with self._lock:
+            self._listings[key] = listing
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.size:
+                self._listings.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+
+
+_listings = ListingsCache(LISTINGS_CACHE_SIZE)
+
 
 class CodeCommit:
     def __init__(self):
@@ -36,50 +72,55 @@ class CodeCommit:
     def ls(engine: Engine, task: models.Task):
         with engine.scoped_session() as session:
             (pipe, env, client) = CodeCommit._unpack(session, task)
-            response = client.get_folder(
-                repositoryName=pipe.repo,
-                commitSpecifier=task.payload.get('branch', 'master'),
-                folderPath=task.payload.get('folderPath'),
-            )
-            nodes = []
-            for sub_folder in response['subFolders']:
-                get_folder_response = client.get_folder(
-                    repositoryName=pipe.repo,
-                    commitSpecifier=task.payload.get('branch', 'master'),
-                    folderPath=sub_folder['absolutePath'],
-                )
-                get_commit = client.get_commit(
-                    repositoryName=pipe.repo, commitId=get_folder_response['commitId']
-                )
-                commit = get_commit['commit']
-                nodes.append(
-                    {
-                        'type': 'folder',
-                        'author': commit['author'],
-                        'relativePath': sub_folder['relativePath'],
-                        'absolutePath': sub_folder['absolutePath'],
-                    }
-                )
-            for file in response['files']:
-                get_file_response = client.get_file(
-                    repositoryName=pipe.repo,
-                    commitSpecifier=task.payload.get('branch', 'master'),
-                    filePath=file['absolutePath'],
-                )
-                get_commit = client.get_commit(
-                    repositoryName=pipe.repo, commitId=get_file_response['commitId']
-                )
-                commit = get_commit['commit']
-                nodes.append(
-                    {
-                        'type': 'file',
-                        'author': commit['author'],
-                        'relativePath': file['relativePath'],
-                        'absolutePath': file['absolutePath'],
-                    }
-                )
+        return CodeCommit.list_folder(
+            client,
+            pipe.repo,
+            task.payload.get('branch', 'master'),
+            task.payload.get('folderPath'),
+        )
+
+    @staticmethod
+    def list_folder(client, repository, commit_specifier, folder_path):
+        """
+        Lists the subfolders and files of a folder with the author of their commit.
+        The folder is resolved to the commit of the specifier with one call, it is the
+        commit of every entry: get_folder and get_file return the commit of the
+        specifier, not the last commit changing the path. Listings of a commit are cached.
+        Returns
+        -------
+        list of nodes with their type, author, relativePath and absolutePath
+        """
+        response = client.get_folder(
+            repositoryName=repository,
+            commitSpecifier=commit_specifier,
+            folderPath=folder_path,
+        )
+        key = (repository, response['commitId'], response.get('folderPath', folder_path))
+        nodes = _listings.get(key)
+        if nodes is not None:
             return nodes
 
+        entries = [('folder', f) for f in response['subFolders']] + [
+            ('file', f) for f in response['files']
+        ]
+        author = None
+        if entries:
+            author = client.get_commit(
+                repositoryName=repository, commitId=response['commitId']
+            )['commit']['author']
+
+        nodes = [
+            {
+                'type': node_type,
+                'author': author,
+                'relativePath': node['relativePath'],
+                'absolutePath': node['absolutePath'],
+            }
+            for node_type, node in entries
+        ]
+        _listings.set(key, nodes)
+        return nodes
+
     @staticmethod
     @Worker.handler(path='repo.datapipeline.branches')
     def list_branches(engine: Engine, task: models.Task):
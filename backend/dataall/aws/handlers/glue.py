@@ -737,6 +737,78 @@ class Glue:
             session.commit()
             return profiling.status
 
+    @staticmethod
+    @Worker.handler('glue.job.profiling_runs_status')
+    def refresh_profiling_runs_status(engine, task: models.Task):
+        return Glue.poll_profiling_runs(engine, task.payload['profilingRunUris'])
+
+    @staticmethod
+    def poll_profiling_runs(engine, profiling_run_uris: [str]) -> dict:
+        """
+        Refreshes the status of profiling runs with one Glue poll per profiling job
+        Returns
+        -------
+        dict of profilingRunUri to the new status
+        """
+        statuses = {}
+        if not profiling_run_uris:
+            return statuses
+        with engine.scoped_session() as session:
+            rows = (
+                session.query(models.DatasetProfilingRun, models.Dataset)
+                .join(
+                    models.Dataset,
+                    models.Dataset.datasetUri == models.DatasetProfilingRun.datasetUri,
+                )
+                .filter(models.DatasetProfilingRun.profilingRunUri.in_(profiling_run_uris))
+                .all()
+            )
+            jobs = {}
+            for profiling, dataset in rows:
+                if profiling.GlueJobRunId:
+                    jobs.setdefault(
+                        (dataset.AwsAccountId, dataset.region, dataset.GlueProfilingJobName), {}
+                    )[profiling.GlueJobRunId] = profiling
+
+            for (accountid, region, job_name), runs in jobs.items():
+                try:
+                    states = Glue.get_job_runs_states(accountid, region, job_name, set(runs))
+                except ClientError as e:
+                    log.error(f'Failed to get runs of job {job_name} due to: {e}')
+                    continue
+                for run_id, state in states.items():
+                    runs[run_id].status = state
+                    statuses[runs[run_id].profilingRunUri] = state
+        log.info(f'Refreshed profiling runs status: {statuses}')
+        return statuses
+
+    @staticmethod
+    def get_job_runs_states(accountid, region, job_name, run_ids: set, max_pages=2) -> dict:
+        """
+        Reads the states of the job runs from the most recent runs of the job,
+        runs older than max_pages pages are read one by one
+        """
+        session = SessionHelper.remote_session(accountid=accountid)
+        client = session.client('glue', region_name=region)
+        states = {}
+        pending = set(run_ids)
+        paginator = client.get_paginator('get_job_runs')
+        pages = paginator.paginate(JobName=job_name, PaginationConfig={'PageSize': 200})
+        for page_number, page in enumerate(pages):
+            for run in page['JobRuns']:
+                if run['Id'] in pending:
+                    states[run['Id']] = run['JobRunState']
+                    pending.discard(run['Id'])
+            if not pending or page_number + 1 >= max_pages:
+                break
+        for run_id in pending:
+            try:
+                response = client.get_job_run(JobName=job_name, RunId=run_id)
+                states[run_id] = response['JobRun']['JobRunState']
+            except ClientError as e:
+                log.error(f'Failed to get job run {run_id} due to: {e}')
+        return states
+
     @staticmethod
     def get_job_run(**data):
         accountid = data['accountid']
@@ -7,6 +7,7 @@ from .sts import SessionHelper
 
 log = logging.getLogger('aws:lakeformation')
 PIVOT_ROLE_NAME_PREFIX = "dataallPivotRole"
+BATCH_PERMISSIONS_MAX_ENTRIES = 20
 
 
 class LakeFormation:
@@ -153,6 +154,55 @@ class LakeFormation:
                 f'permission on table {database}|{table} due to {e}'
             )
 
+    @staticmethod
+    def send_batch_permissions(client, accountid, entries, revoke=False) -> [dict]:
+        """
+        Sends grant or revoke entries in chunks of the API maximum
+        :param client:
+        :param accountid:
+        :param entries:
+        :param revoke: True to revoke, False to grant
+        :return: failures of all the chunks
+        """
+        operation = client.batch_revoke_permissions if revoke else client.batch_grant_permissions
+        entries_chunks: list = [
+            entries[i: i + BATCH_PERMISSIONS_MAX_ENTRIES]
+            for i in range(0, len(entries), BATCH_PERMISSIONS_MAX_ENTRIES)
+        ]
+        failures = []
+        for entries_chunk in entries_chunks:
+            response = operation(CatalogId=accountid, Entries=entries_chunk)
+            log.info(f'Batch {"Revoke" if revoke else "Grant"} response: {response}')
+            failures.extend(response.get('Failures', []))
+        return failures
+
+    @staticmethod
+    def is_ignorable_revoke_failure(failure) -> bool:
+        """
+        Revoking permissions that are already gone is not a failure
+        """
+        return failure['Error']['ErrorCode'] == 'InvalidInputException' and (
+            'Grantee has no permissions' in failure['Error']['ErrorMessage']
+            or 'No permissions revoked' in failure['Error']['ErrorMessage']
+            or 'not found' in failure['Error']['ErrorMessage']
+        )
+
+    @staticmethod
+    def batch_grant_permissions(client, accountid, entries) -> [dict]:
+        """
+        Batch grant permissions to entries
+        Failures are returned per entry so that callers can map them to their resources
+        :param client:
+        :param accountid:
+        :param entries:
+        :return: list of failures
+        """
+        log.info(f'Batch Granting {entries}')
+        failures = LakeFormation.send_batch_permissions(client, accountid, entries)
+        if failures:
+            log.warning(f'Batch Grant ended with failures: {failures}')
+        return failures
+
     @staticmethod
     def batch_revoke_permissions(client, accountid, entries):
         """
@@ -164,25 +214,12 @@ class LakeFormation:
         :return:
         """
         log.info(f'Batch Revoking {entries}')
-        entries_chunks: list = [entries[i : i + 20] for i in range(0, len(entries), 20)]
         failures = []
         try:
-            for entries_chunk in entries_chunks:
-                response = client.batch_revoke_permissions(
-                    CatalogId=accountid, Entries=entries_chunk
-                )
-                log.info(f'Batch Revoke response: {response}')
-                failures.extend(response.get('Failures'))
+            failures = LakeFormation.send_batch_permissions(client, accountid, entries, revoke=True)
 
             for failure in failures:
-                if not (
-                    failure['Error']['ErrorCode'] == 'InvalidInputException'
-                    and (
-                        'Grantee has no permissions' in failure['Error']['ErrorMessage']
-                        or 'No permissions revoked' in failure['Error']['ErrorMessage']
-                        or 'not found' in failure['Error']['ErrorMessage']
-                    )
-                ):
+                if not LakeFormation.is_ignorable_revoke_failure(failure):
                     raise ClientError(
                         error_response={
                             'Error': {
@@ -196,127 +233,3 @@ class LakeFormation:
         except ClientError as e:
             log.warning(f'Batch Revoke ended with failures: {failures}')
             raise e
-
-    @staticmethod
-    def grant_resource_link_permission_on_target(client, source, target):
-        for principal in target['principals']:
-            try:
-                table_grant = dict(
-                    Principal={'DataLakePrincipalIdentifier': principal},
-                    Resource={
-                        'TableWithColumns': {
-                            'DatabaseName': source['database'],
-                            'Name': source['tablename'],
-                            'ColumnWildcard': {},
-                            'CatalogId': source['accountid'],
-                        }
-                    },
-                    Permissions=['DESCRIBE', 'SELECT'],
-                    PermissionsWithGrantOption=[],
-                )
-                client.grant_permissions(**table_grant)
-                log.info(
-                    f'Successfully granted permissions DESCRIBE,SELECT to {principal} on target '
-                    f'{source["accountid"]}://{source["database"]}/{source["tablename"]}'
-                )
-            except ClientError as e:
-                logging.error(
-                    f'Failed granting principal {principal} '
-                    'read access to resource link on target'
-                    f' {source["accountid"]}://{source["database"]}/{source["tablename"]} '
-                    f'due to: {e}'
-                )
-                raise e
-
-    @staticmethod
-    def grant_resource_link_permission(client, source, target, target_database):
-        for principal in target['principals']:
-            resourcelink_grant = dict(
-                Principal={'DataLakePrincipalIdentifier': principal},
-                Resource={
-                    'Table': {
-                        'DatabaseName': target_database,
-                        'Name': source['tablename'],
-                        'CatalogId': target['accountid'],
-                    }
-                },
-                # Resource link only supports DESCRIBE and DROP permissions no SELECT
-                Permissions=['DESCRIBE'],
-            )
-            try:
-                client.grant_permissions(**resourcelink_grant)
-                log.info(
-                    f'Granted resource link DESCRIBE access '
-                    f'to principal {principal} on {target["accountid"]}://{target_database}/{source["tablename"]}'
-                )
-            except ClientError as e:
-                logging.error(
-                    f'Failed granting principal {principal} '
-                    f'read access to resource link on {target["accountid"]}://{target_database}/{source["tablename"]} '
-                    f'due to: {e}'
-                )
-                raise e
-
-    @staticmethod
-    def revoke_source_table_access(**data):
-        """
-        Revokes permissions for a principal in a cross account sharing setup
-        Parameters
-        ----------
-        data :
-
-        Returns
-        -------
-
-        """
-        logging.info(f'Revoking source table access: {data} ...')
-        target_accountid = data['target_accountid']
-        region = data['region']
-        target_principals = data['target_principals']
-        source_database = data['source_database']
-        source_table = data['source_table']
-        source_accountid = data['source_accountid']
-        for target_principal in target_principals:
-            try:
-
-                aws_session = SessionHelper.remote_session(target_accountid)
-                lakeformation = aws_session.client('lakeformation', region_name=region)
-
-                logging.info('Revoking DESCRIBE permission...')
-                lakeformation.revoke_permissions(
-                    Principal=dict(DataLakePrincipalIdentifier=target_principal),
-                    Resource=dict(
-                        Table=dict(
-                            CatalogId=source_accountid,
-                            DatabaseName=source_database,
-                            Name=source_table,
-                        )
-                    ),
-                    Permissions=['DESCRIBE'],
-                    PermissionsWithGrantOption=[],
-                )
-                logging.info('Successfully revoked DESCRIBE permissions')
-
-                logging.info('Revoking SELECT permission...')
-                lakeformation.revoke_permissions(
-                    Principal=dict(DataLakePrincipalIdentifier=target_principal),
-                    Resource=dict(
-                        TableWithColumns=dict(
-                            CatalogId=source_accountid,
-                            DatabaseName=source_database,
-                            Name=source_table,
-                            ColumnWildcard={},
-                        )
-                    ),
-                    Permissions=['SELECT'],
-                    PermissionsWithGrantOption=[],
-                )
-                logging.info('Successfully revoked DESCRIBE permissions')
-
-            except ClientError as e:
-                logging.error(
-                    f'Failed to revoke permissions for {target_principal} '
-                    f'on source table {source_accountid}/{source_database}/{source_table} '
-                    f'due to: {e}'
-                )
-                raise e
@@ -2,6 +2,9 @@ import logging
 import re
 import os
 import ast
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 
 from botocore.exceptions import ClientError
 from .sts import SessionHelper
@@ -11,10 +14,46 @@ from .parameter_store import ParameterStoreManager
 logger = logging.getLogger('QuicksightHandler')
 logger.setLevel(logging.DEBUG)
 
+SETTINGS_TTL = int(os.getenv('QUICKSIGHT_SETTINGS_TTL', '86400'))
+CLIENT_TTL = int(os.getenv('QUICKSIGHT_CLIENT_TTL', '900'))
+
+
+class TimedCache:
+    """Thread safe cache keeping each value with the time it was retrieved, values expire after ttl seconds"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_entry(self, key):
+        """Returns (value, retrieved) or None if the key is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and (datetime.now() - entry[1]).total_seconds() < self.ttl:
+            return entry
+        return None
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key, value, retrieved: datetime = None):
+        with self._lock:
+            self._entries[key] = (value, retrieved or datetime.now())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 
 class Quicksight:
 
     _DEFAULT_GROUP_NAME = 'dataall'
+    _sessions = TimedCache(CLIENT_TTL)
+    _clients = TimedCache(CLIENT_TTL)
+    _identity_regions = TimedCache(SETTINGS_TTL)
+    _subscriptions = TimedCache(SETTINGS_TTL)
 
     def __init__(self):
         pass
@@ -22,13 +61,21 @@ class Quicksight:
     @staticmethod
     def get_quicksight_client(AwsAccountId, region='eu-west-1'):
         """Returns a boto3 quicksight client in the provided account/region
+        Sessions and clients are reused for CLIENT_TTL seconds, before their assumed role credentials expire
         Args:
             AwsAccountId(str) : aws account id
             region(str) : aws region
         Returns : boto3.client ("quicksight")
         """
-        session = SessionHelper.remote_session(accountid=AwsAccountId)
-        return session.client('quicksight', region_name=region)
+        client = Quicksight._clients.get((AwsAccountId, region))
+        if not client:
+            session = Quicksight._sessions.get(AwsAccountId)
+            if not session:
+                session = SessionHelper.remote_session(accountid=AwsAccountId)
+                Quicksight._sessions.set(AwsAccountId, session)
+            client = session.client('quicksight', region_name=region)
+            Quicksight._clients.set((AwsAccountId, region), client)
+        return client
 
     @staticmethod
     def get_identity_region(AwsAccountId):
@@ -36,11 +83,20 @@ class Quicksight:
         However, when using Quicksight user/group apis in the wrong region,
         the client will throw and exception showing the region Quicksight's using as its
         identity region.
+        The region is cached per account for SETTINGS_TTL seconds.
         Args:
             AwsAccountId(str) : aws account id
         Returns: str
             the region quicksight uses as identity region
         """
+        identity_region = Quicksight._identity_regions.get(AwsAccountId)
+        if not identity_region:
+            identity_region = Quicksight._discover_identity_region(AwsAccountId)
+            Quicksight._identity_regions.set(AwsAccountId, identity_region)
+        return identity_region
+
+    @staticmethod
+    def _discover_identity_region(AwsAccountId):
         identity_region_rex = re.compile('Please use the (?P<region>.*) endpoint.')
         identity_region = 'us-east-1'
         client = Quicksight.get_quicksight_client(AwsAccountId=AwsAccountId, region=identity_region)
@@ -66,19 +122,22 @@ class Quicksight:
         Returns : boto3.client ("quicksight")
 
         """
-        identity_region = Quicksight.get_identity_region(AwsAccountId)
-        session = SessionHelper.remote_session(accountid=AwsAccountId)
-        return session.client('quicksight', region_name=identity_region)
+        return Quicksight.get_quicksight_client(
+            AwsAccountId, region=Quicksight.get_identity_region(AwsAccountId)
+        )
 
     @staticmethod
     def check_quicksight_enterprise_subscription(AwsAccountId, region=None):
         """Use the DescribeAccountSubscription operation to receive a description of a Amazon QuickSight account's subscription. A successful API call returns an AccountInfo object that includes an account's name, subscription status, authentication type, edition, and notification email address.
+        Active subscriptions are cached per account for SETTINGS_TTL seconds.
         Args:
             AwsAccountId(str) : aws account id
             region(str): aws region
         Returns: bool
             True if Quicksight Enterprise Edition is enabled in the AWS Account
         """
+        if Quicksight._subscriptions.get(AwsAccountId) == 'ACCOUNT_CREATED':
+            return True
         logger.info(f'Checking Quicksight subscription in AWS account = {AwsAccountId}')
         client = Quicksight.get_quicksight_client(AwsAccountId=AwsAccountId, region=region)
         try:
@@ -91,6 +150,7 @@ class Quicksight:
                         f"Quicksight Subscription found in Account: {AwsAccountId} of incorrect type: {response['AccountInfo']['Edition']}")
                 else:
                     if response['AccountInfo']['AccountSubscriptionStatus'] == 'ACCOUNT_CREATED':
+                        Quicksight._subscriptions.set(AwsAccountId, 'ACCOUNT_CREATED')
                         return True
                     else:
                         raise Exception(
@@ -103,6 +163,42 @@ class Quicksight:
             raise Exception('Access denied to Quicksight for selected role')
         return False
 
+    @staticmethod
+    @contextmanager
+    def environment_settings(environment):
+        """
+        Seeds the account caches with the identity region and subscription status
+        persisted on the environment when they are not expired, and persists the
+        values retrieved in the block on the environment.
+        The environment must be attached to an open session for the update to be saved.
+        """
+        account = environment.AwsAccountId
+        if environment.quicksightSettingsUpdated:
+            if environment.quicksightIdentityRegion and not Quicksight._identity_regions.get_entry(account):
+                Quicksight._identity_regions.set(
+                    account, environment.quicksightIdentityRegion, environment.quicksightSettingsUpdated
+                )
+            if environment.quicksightSubscriptionStatus and not Quicksight._subscriptions.get_entry(account):
+                Quicksight._subscriptions.set(
+                    account, environment.quicksightSubscriptionStatus, environment.quicksightSettingsUpdated
+                )
+        try:
+            yield environment
+        finally:
+            region = Quicksight._identity_regions.get_entry(account)
+            subscription = Quicksight._subscriptions.get_entry(account)
+            entries = [entry for entry in (region, subscription) if entry]
+            if entries:
+                # the oldest retrieval time is kept so that no value outlives its TTL
+                settings = {
+                    'quicksightIdentityRegion': region[0] if region else None,
+                    'quicksightSubscriptionStatus': subscription[0] if subscription else None,
+                    'quicksightSettingsUpdated': min(entry[1] for entry in entries),
+                }
+                for name, value in settings.items():
+                    if getattr(environment, name) != value:
+                        setattr(environment, name, value)
+
     @staticmethod
     def create_quicksight_group(AwsAccountId, GroupName=_DEFAULT_GROUP_NAME):
         """Creates a Quicksight group called GroupName
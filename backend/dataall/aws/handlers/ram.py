@@ -1,11 +1,13 @@
 import logging
-import time
 
 from botocore.exceptions import ClientError
 
 from .sts import SessionHelper
+from .waiter import Waiter
 
 log = logging.getLogger('aws:ram')
+RESOURCE_SHARE_CREATION_TIMEOUT = 30
+INVITATION_ACCEPTANCE_TIMEOUT = 30
 
 
 class Ram:
@@ -60,6 +62,15 @@ class Ram:
                 )
                 raise e
 
+    @staticmethod
+    def is_resource_share_invitation_accepted(client, resource_share_invitation_arn):
+        response = client.get_resource_share_invitations(
+            resourceShareInvitationArns=[resource_share_invitation_arn]
+        )
+        return any(
+            i['status'] == 'ACCEPTED' for i in response.get('resourceShareInvitations', [])
+        )
+
     @staticmethod
     def accept_ram_invitation(**data):
         """
@@ -84,7 +95,12 @@ class Ram:
             f'arn:aws:glue:{source["region"]}:{source["accountid"]}:'
             f'table/{data["source"]["database"]}/{data["source"]["tablename"]}'
         )
-        associations = Ram.list_resource_share_associations(source_ram, resource_arn)
+        # Lake Formation creates the resource share asynchronously after the grant
+        associations = Waiter.wait_until(
+            lambda: Ram.list_resource_share_associations(source_ram, resource_arn),
+            f'RAM resource share of {resource_arn}',
+            timeout=RESOURCE_SHARE_CREATION_TIMEOUT,
+        ) or []
         resource_share_arns = [a['resourceShareArn'] for a in associations]
 
         ram_invitations = Ram.get_resource_share_invitations(
@@ -103,7 +119,13 @@ class Ram:
                         target_ram, invitation['resourceShareInvitationArn']
                     )
                     # Ram invitation acceptance is slow
-                    time.sleep(5)
+                    Waiter.wait_until(
+                        lambda: Ram.is_resource_share_invitation_accepted(
+                            target_ram, invitation['resourceShareInvitationArn']
+                        ),
+                        f'RAM invitation {invitation["resourceShareInvitationArn"]} acceptance',
+                        timeout=INVITATION_ACCEPTANCE_TIMEOUT,
+                    )
                 elif (
                     invitation['status'] == 'EXPIRED'
                     or invitation['status'] == 'REJECTED'
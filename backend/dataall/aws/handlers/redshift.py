@@ -1,5 +1,7 @@
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from botocore.exceptions import ClientError
@@ -7,11 +9,16 @@ from botocore.exceptions import ClientError
 from .glue import Glue
 from .service_handlers import Worker
 from .sts import SessionHelper
+from .waiter import Waiter
 from ... import db
-from ...db import models
+from ...db import models, in_current_context
 
 log = logging.getLogger(__name__)
 
+MAX_WORKERS = int(os.getenv('REDSHIFT_MAX_WORKERS', '4'))
+STATEMENT_TIMEOUT = int(os.getenv('REDSHIFT_STATEMENT_TIMEOUT', '900'))
+TERMINAL_STATEMENT_STATES = ['FINISHED', 'FAILED', 'ABORTED']
+
 
 class Redshift:
     def __init__(self):
@@ -132,14 +139,14 @@ class Redshift:
         accountid = data['accountid']
         region = data.get('region', 'eu-west-1')
         session = SessionHelper.remote_session(accountid)
-        client_redshift = session.client('redshift', region_name=region)
         client_redshift_data = session.client('redshift-data', region_name=region)
         try:
-            response = client_redshift.describe_clusters(
-                ClusterIdentifier=data['cluster_id'], MaxRecords=100
-            )
-            cluster = response.get('Clusters')[0]
-            database = data.get('database', cluster.get('DBName'))
+            database = data.get('database')
+            if not database:
+                response = session.client(
+                    'redshift', region_name=region
+                ).describe_clusters(ClusterIdentifier=data['cluster_id'], MaxRecords=100)
+                database = response.get('Clusters')[0].get('DBName')
             statement = dict(
                 ClusterIdentifier=data['cluster_id'],
                 Database=database,
@@ -156,6 +163,46 @@ class Redshift:
             log.error(e, exc_info=True)
             raise e
 
+    @staticmethod
+    def batch_execute(client_redshift_data, cluster_id, database, sqls, dbuser) -> str:
+        """
+        Submits the statements as a single transaction, they run in order
+        and are rolled back together if one of them fails
+        Returns
+        -------
+        id of the batch statement
+        """
+        response = client_redshift_data.batch_execute_statement(
+            ClusterIdentifier=cluster_id,
+            Database=database,
+            DbUser=dbuser,
+            Sqls=sqls,
+        )
+        return response['Id']
+
+    @staticmethod
+    def wait_for_statement(client_redshift_data, statement_id, timeout=STATEMENT_TIMEOUT) -> dict:
+        """Polls the statement until it is finished, raises if it failed or did not finish in time"""
+        statement = {}
+
+        def finished():
+            statement.update(client_redshift_data.describe_statement(Id=statement_id))
+            return statement['Status'] in TERMINAL_STATEMENT_STATES
+
+        Waiter.wait_until(
+            finished,
+            f'Redshift statement {statement_id}',
+            timeout=timeout,
+            delay=1,
+            max_delay=30,
+        )
+        if statement['Status'] != 'FINISHED':
+            raise Exception(
+                f"Redshift statement {statement_id} is {statement['Status']}: "
+                f"{statement.get('Error') or f'not finished within {timeout} seconds'}"
+            )
+        return statement
+
     @staticmethod
     @Worker.handler(path='redshift.cluster.init_database')
     def init_datahub_db(engine, task: models.Task):
@@ -450,10 +497,17 @@ class Redshift:
                 session, task.payload['tableUri']
             )
 
-            env_clusters = (
-                session.query(models.RedshiftCluster)
+            cluster_tables = (
+                session.query(models.RedshiftCluster, models.RedshiftClusterDatasetTable)
+                .join(
+                    models.RedshiftClusterDatasetTable,
+                    models.RedshiftClusterDatasetTable.clusterUri
+                    == models.RedshiftCluster.clusterUri,
+                )
                 .filter(
                     models.RedshiftCluster.environmentUri == environment.environmentUri,
+                    models.RedshiftClusterDatasetTable.datasetUri == dataset.datasetUri,
+                    models.RedshiftClusterDatasetTable.tableUri == table.tableUri,
                 )
                 .all()
             )
@@ -486,63 +540,76 @@ class Redshift:
             )
             log.info(f'DDL Columns: {ddl_columns}')
 
-            for cluster in env_clusters:
-                cluster_dataset_table = (
-                    db.api.RedshiftCluster.get_cluster_dataset_table(
-                        session, cluster.clusterUri, dataset.datasetUri, table.tableUri
-                    )
+            copies = []
+            for cluster, cluster_dataset_table in cluster_tables:
+                log.info(
+                    f'Cluster {cluster}|{environment.AwsAccountId} '
+                    f'copy from {dataset.name} for table {table.GlueTableName} is enabled'
                 )
-                if cluster_dataset_table:
-                    log.info(
-                        f'Cluster {cluster}|{environment.AwsAccountId} '
-                        f'copy from {dataset.name} for table {table.GlueTableName} is enabled'
-                    )
-                    queries = list()
-                    queries.append(
-                        f'CREATE SCHEMA IF NOT EXISTS {cluster_dataset_table.schema}'
-                    )
-                    queries.append(
-                        f'GRANT ALL ON SCHEMA {cluster_dataset_table.schema} TO {cluster.databaseUser}'
-                    )
-                    queries.append(
-                        f'GRANT ALL ON SCHEMA {cluster_dataset_table.schema} TO GROUP PUBLIC'
-                    )
-                    queries.append(
-                        Redshift.get_create_table_statement(
-                            cluster_dataset_table.schema,
-                            table.GlueTableName,
-                            ddl_columns,
-                        )
-                    )
-                    queries.append(
-                        f'GRANT ALL ON TABLE {cluster_dataset_table.schema}.{table.GlueTableName} TO {cluster.databaseUser}'
-                    )
-                    queries.append(
-                        f'GRANT ALL ON TABLE {cluster_dataset_table.schema}.{table.GlueTableName} TO GROUP PUBLIC'
-                    )
-                    data_prefix = Redshift.get_data_prefix(cluster_dataset_table)
-                    queries.extend(
-                        Redshift.get_merge_table_statements(
+                copies.append(
+                    {
+                        'accountid': cluster.AwsAccountId,
+                        'region': cluster.region,
+                        'cluster_id': cluster.name,
+                        'database': cluster.databaseName,
+                        'dbuser': cluster.databaseUser,
+                        'sqls': Redshift.get_copy_statements(
                             cluster_dataset_table.schema,
                             table.GlueTableName,
-                            data_prefix,
+                            Redshift.get_data_prefix(cluster_dataset_table),
                             environment.EnvironmentDefaultIAMRoleArn,
                             ddl_columns,
-                        )
-                    )
-                    for query in queries:
-                        Redshift.run_query(
-                            **{
-                                'accountid': cluster.AwsAccountId,
-                                'region': cluster.region,
-                                'cluster_id': cluster.name,
-                                'database': cluster.databaseName,
-                                'dbuser': cluster.databaseUser,
-                                'sql_query': query,
-                            }
-                        )
+                            cluster.databaseUser,
+                        ),
+                    }
+                )
+
+        Redshift.run_copies(copies)
         return True
 
+    @staticmethod
+    def run_copies(copies: [dict]):
+        """
+        Runs the statements of each cluster as one transaction, clusters are copied
+        concurrently. Redshift Data API clients are created once per account and region.
+        Raises after all the copies are done if any of them failed
+        """
+        sessions, clients = {}, {}
+        for copy in copies:
+            key = (copy['accountid'], copy['region'])
+            if key not in clients:
+                if copy['accountid'] not in sessions:
+                    sessions[copy['accountid']] = SessionHelper.remote_session(
+                        copy['accountid']
+                    )
+                clients[key] = sessions[copy['accountid']].client(
+                    'redshift-data', region_name=copy['region']
+                )
+
+        def run(copy):
+            client = clients[(copy['accountid'], copy['region'])]
+            statement_id = Redshift.batch_execute(
+                client, copy['cluster_id'], copy['database'], copy['sqls'], copy['dbuser']
+            )
+            log.info(f"Copy to cluster {copy['cluster_id']} submitted as {statement_id}")
+            return Redshift.wait_for_statement(client, statement_id)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [(copy, pool.submit(in_current_context(run), copy)) for copy in copies]
+            for copy, future in futures:
+                try:
+                    statement = future.result()
+                    log.info(
+                        f"Copy to cluster {copy['cluster_id']} finished "
+                        f"in {statement.get('Duration', 0) / 1e9:.1f}s"
+                    )
+                except Exception as e:
+                    log.error(f"Copy to cluster {copy['cluster_id']} failed: {e}")
+                    failed.append(copy['cluster_id'])
+        if failed:
+            raise Exception(f"Copy failed on clusters {', '.join(failed)}")
+
     @staticmethod
     def get_data_prefix(table: models.RedshiftClusterDatasetTable):
         data_prefix = (
@@ -586,28 +653,36 @@ class Redshift:
     def get_merge_table_statements(
         schema, table_name, data_prefix, iam_role_arn, columns
     ):
+        """
+        Loads the data in a staging table then swaps it with the table.
+        The statements are meant to run in a single transaction
+        """
         statements = list()
+        statements.append(f'DROP TABLE IF EXISTS "{schema}"."{table_name}_stage"')
+        statements.append(f'CREATE TABLE "{schema}"."{table_name}_stage"({columns})')
         statements.append(
-            f"""CREATE TABLE "{schema}"."{table_name}_stage"({columns});"""
+            f"""COPY "{schema}"."{table_name}_stage" FROM '{data_prefix}' iam_role '{iam_role_arn}' format as parquet"""
         )
+        statements.append(f'DROP TABLE IF EXISTS "{schema}"."{table_name}"')
         statements.append(
-            f"""COPY "{schema}"."{table_name}_stage" FROM '{data_prefix}' iam_role '{iam_role_arn}' format as parquet;"""
+            f'ALTER TABLE "{schema}"."{table_name}_stage" RENAME TO "{table_name}"'
         )
-        statements.append(
-            f"""CREATE TABLE "{schema}"."{table_name}_stage"({columns};"""
-        )
-        statements.append(
-            f"""
-                        -- Start a new transaction
-                        begin transaction;
-
-                        drop table if exists "{schema}"."{table_name}";
-
-                        -- Insert all the rows from the staging table into the target table
-                        alter table "{schema}"."{table_name}_stage" rename to "{table_name}";
+        return statements
 
-                        -- End transaction and commit
-                        end transaction;
-        """
+    @staticmethod
+    def get_copy_statements(
+        schema, table_name, data_prefix, iam_role_arn, columns, database_user
+    ):
+        """Statements copying the table to the cluster, the grants on the table follow the swap"""
+        statements = list()
+        statements.append(f'CREATE SCHEMA IF NOT EXISTS {schema}')
+        statements.append(f'GRANT ALL ON SCHEMA {schema} TO {database_user}')
+        statements.append(f'GRANT ALL ON SCHEMA {schema} TO GROUP PUBLIC')
+        statements.extend(
+            Redshift.get_merge_table_statements(
+                schema, table_name, data_prefix, iam_role_arn, columns
+            )
         )
+        statements.append(f'GRANT ALL ON TABLE {schema}.{table_name} TO {database_user}')
+        statements.append(f'GRANT ALL ON TABLE {schema}.{table_name} TO GROUP PUBLIC')
         return statements
@@ -3,6 +3,8 @@ import os
 import time
 from functools import wraps
 
+from ...db import utils
+from ...db.instrumentation import collect_sql_stats
 from ...db.models import Task
 from ...utils.json_utils import to_json
 
@@ -64,6 +66,36 @@ class WorkerHandler:
         else:
             log.info(f'Worker disabled, tasks {task_ids} wont be processed')
 
+    def invoke(self, engine, action: str, target_uri: str, payload: dict = None):
+        """
+        Runs the handler of the action inline with an ephemeral task that is not persisted,
+        for synchronous work whose response is returned to the caller.
+        Returns
+        -------
+        dict with the response, error and status of the task
+        """
+        if not self.enabled:
+            log.info(f'Worker disabled, action {action} wont be processed')
+            return None
+        handler = self.handlers.get(action)
+        if not handler:
+            raise Exception(f'No handler defined for {action}')
+        task = Task(
+            taskUri=utils.uuid('Task')(None),
+            action=action,
+            targetUri=target_uri,
+            payload=payload or {},
+            status='started',
+        )
+        log.info(f'Invoking handler {handler} for action {action}|{target_uri}')
+        error, response, status = self.handle_task(engine, task, handler)
+        return {
+            'taskUri': task.taskUri,
+            'response': response,
+            'error': error,
+            'status': status,
+        }
+
     def get_task_handler(self, engine, taskid):
         with engine.scoped_session() as session:
             task = session.query(Task).get(taskid)
@@ -86,7 +118,8 @@ class WorkerHandler:
         error = {}
         response = {}
         try:
-            response = handler(engine, task)
+            with collect_sql_stats(operation=task.action):
+                response = handler(engine, task)
             status = 'completed'
         except Exception as e:
             log.error(
@@ -0,0 +1,61 @@
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger('aws:waiter')
+
+
+class Waiter:
+    """
+    Polls AWS resources until they are ready instead of sleeping fixed intervals.
+    The time spent waiting is accumulated per thread so that long-running
+    processes (e.g. a share) can report their total wait time.
+    """
+
+    _stats = threading.local()
+
+    @staticmethod
+    def wait_until(
+        check,
+        description: str,
+        timeout: float = 60,
+        delay: float = 1,
+        max_delay: float = 15,
+        backoff: float = 2,
+        jitter: float = 0.25,
+    ):
+        """
+        Calls check until it returns a truthy value or the deadline is reached
+        :param check: callable without arguments, returns a truthy value when the resource is ready
+        :param description: what is awaited, used in logs
+        :param timeout: deadline in seconds
+        :param delay: first delay between two checks in seconds
+        :param max_delay: maximum delay between two checks in seconds
+        :param backoff: delay multiplier applied after each check
+        :param jitter: random +/- ratio applied to each delay
+        :return: the last value returned by check, falsy if the deadline was reached
+        """
+        deadline = time.monotonic() + timeout
+        result = check()
+        while not result:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.warning(f'Timed out after {timeout}s waiting for {description}')
+                break
+            pause = min(min(delay, max_delay) * (1 + random.uniform(-jitter, jitter)), remaining)
+            log.info(f'Waiting {pause:.1f}s for {description}...')
+            time.sleep(pause)
+            Waiter._stats.wait_time = Waiter.get_wait_time() + pause
+            delay *= backoff
+            result = check()
+        return result
+
+    @staticmethod
+    def get_wait_time() -> float:
+        """Seconds waited by the current thread since the last reset"""
+        return getattr(Waiter._stats, 'wait_time', 0)
+
+    @staticmethod
+    def reset_wait_time():
+        Waiter._stats.wait_time = 0
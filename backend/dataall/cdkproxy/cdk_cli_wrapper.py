@@ -85,6 +85,7 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                     meta = describe_stack(stack)
                     stack.stackid = meta['StackId']
                     stack.status = meta['StackStatus']
+                    Stack.expire_stack_refresh(stack)
                     update_stack_output(session, stack)
                     return
 
@@ -175,6 +176,7 @@ def deploy_cdk_stack(engine: Engine, stackid: str, app_path: str = None, path: s
                 meta = describe_stack(stack)
                 stack.stackid = meta['StackId']
                 stack.status = meta['StackStatus']
+                Stack.expire_stack_refresh(stack)
                 update_stack_output(session, stack)
             else:
                 stack.status = 'CREATE_FAILED'
@@ -13,5 +13,11 @@ from .connection import (
     init_permissions,
 )
 from .dbconfig import DbConfig
+from .instrumentation import (
+    collect_sql_stats,
+    current_sql_stats,
+    in_current_context,
+    SQL_STATS_DEBUG,
+)
 from .paginator import paginate
 from . import api
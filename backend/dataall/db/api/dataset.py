@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from sqlalchemy.orm import Query
 
 from . import (
@@ -15,6 +15,7 @@ from . import (
 )
 from . import Organization
 from .. import models, api, exceptions, permissions, paginate
+from ..search import contains_term
 from ..models.Enums import Language, ConfidentialityClassification
 from ...utils.naming_convention import (
     NamingConventionService,
@@ -277,15 +278,10 @@ class Dataset:
         )
         if data and data.get('term'):
             query = query.filter(
-                or_(
-                    *[
-                        models.DatasetStorageLocation.name.ilike(
-                            '%' + data.get('term') + '%'
-                        ),
-                        models.DatasetStorageLocation.S3Prefix.ilike(
-                            '%' + data.get('term') + '%'
-                        ),
-                    ]
+                contains_term(
+                    data.get('term'),
+                    models.DatasetStorageLocation.name,
+                    models.DatasetStorageLocation.S3Prefix,
                 )
             )
         return paginate(
@@ -308,13 +304,10 @@ class Dataset:
         )
         if data and data.get('term'):
             query = query.filter(
-                or_(
-                    *[
-                        models.DatasetTable.name.ilike('%' + data.get('term') + '%'),
-                        models.DatasetTable.GlueTableName.ilike(
-                            '%' + data.get('term') + '%'
-                        ),
-                    ]
+                contains_term(
+                    data.get('term'),
+                    models.DatasetTable.name,
+                    models.DatasetTable.GlueTableName,
                 )
             )
         return paginate(
@@ -728,3 +721,78 @@ class Dataset:
             .filter(models.DatasetStorageLocation.datasetUri == dataset_uri)
             .count()
         )
+
+    @staticmethod
+    def update_dataset_counters(session, dataset_uri, tables=0, locations=0, upvotes=0):
+        """
+        Increments the tables, folders and upvotes counters of the dataset
+        in the current transaction, the dataset updated date is left unchanged
+        """
+        session.query(models.Dataset).filter(
+            models.Dataset.datasetUri == dataset_uri
+        ).update(
+            {
+                models.Dataset.tablesCount: models.Dataset.tablesCount + tables,
+                models.Dataset.locationsCount: models.Dataset.locationsCount + locations,
+                models.Dataset.upvotesCount: models.Dataset.upvotesCount + upvotes,
+                models.Dataset.updated: models.Dataset.updated,
+            },
+            synchronize_session='evaluate',
+        )
+
+    @staticmethod
+    def repair_dataset_counters(session, dataset_uris: [str] = None) -> [str]:
+        """
+        Recomputes the counters of the datasets, or of all the datasets,
+        from their tables, folders and upvotes
+        Returns
+        -------
+        uris of the datasets whose counters were out of date
+        """
+        tables = (
+            session.query(func.count(models.DatasetTable.tableUri))
+            .filter(models.DatasetTable.datasetUri == models.Dataset.datasetUri)
+            .correlate(models.Dataset)
+            .as_scalar()
+        )
+        locations = (
+            session.query(func.count(models.DatasetStorageLocation.locationUri))
+            .filter(models.DatasetStorageLocation.datasetUri == models.Dataset.datasetUri)
+            .correlate(models.Dataset)
+            .as_scalar()
+        )
+        upvotes = (
+            session.query(func.count(models.Vote.voteUri))
+            .filter(
+                and_(
+                    models.Vote.targetUri == models.Dataset.datasetUri,
+                    models.Vote.targetType == 'dataset',
+                    models.Vote.upvote == True,
+                )
+            )
+            .correlate(models.Dataset)
+            .as_scalar()
+        )
+        query = session.query(models.Dataset.datasetUri).filter(
+            or_(
+                models.Dataset.tablesCount != tables,
+                models.Dataset.locationsCount != locations,
+                models.Dataset.upvotesCount != upvotes,
+            )
+        )
+        if dataset_uris is not None:
+            query = query.filter(models.Dataset.datasetUri.in_(dataset_uris))
+        repaired = [row.datasetUri for row in query]
+        if repaired:
+            session.query(models.Dataset).filter(
+                models.Dataset.datasetUri.in_(repaired)
+            ).update(
+                {
+                    models.Dataset.tablesCount: tables,
+                    models.Dataset.locationsCount: locations,
+                    models.Dataset.upvotesCount: upvotes,
+                    models.Dataset.updated: models.Dataset.updated,
+                },
+                synchronize_session=False,
+            )
+        return repaired
@@ -5,6 +5,7 @@ from sqlalchemy import and_, or_
 
 from . import has_tenant_perm, has_resource_perm, Glossary
 from .. import models, api, paginate, permissions, exceptions
+from ..search import contains_term
 from .dataset import Dataset
 
 logger = logging.getLogger(__name__)
@@ -52,6 +53,7 @@ class DatasetStorageLocation:
             region=dataset.region,
         )
         session.add(location)
+        Dataset.update_dataset_counters(session, dataset.datasetUri, locations=1)
         session.commit()
 
         if 'terms' in data.keys():
@@ -84,7 +86,7 @@ class DatasetStorageLocation:
         if data.get('term'):
             term = data.get('term')
             query = query.filter(
-                models.DatasetStorageLocation.label.ilike('%' + term + '%')
+                contains_term(term, models.DatasetStorageLocation.label)
             )
         return paginate(
             query, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -168,6 +170,7 @@ class DatasetStorageLocation:
         ).delete()
 
         session.delete(location)
+        Dataset.update_dataset_counters(session, location.datasetUri, locations=-1)
         Glossary.delete_glossary_terms_links(
             session,
             target_uri=location.locationUri,
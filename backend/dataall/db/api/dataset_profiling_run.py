@@ -1,8 +1,12 @@
-from sqlalchemy import and_
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
 
 from .. import paginate, models
 from ..exceptions import ObjectNotFound
 
+TERMINAL_STATES = ['SUCCEEDED', 'FAILED', 'STOPPED', 'TIMEOUT', 'ERROR']
+
 
 class DatasetProfilingRun:
     def __init__(self):
@@ -84,6 +88,48 @@ class DatasetProfilingRun:
             )
         return run
 
+    @staticmethod
+    def list_unfinished_profiling_runs(session) -> [str]:
+        return [
+            run.profilingRunUri
+            for run in session.query(models.DatasetProfilingRun.profilingRunUri).filter(
+                and_(
+                    models.DatasetProfilingRun.GlueJobRunId.isnot(None),
+                    models.DatasetProfilingRun.status.notin_(TERMINAL_STATES),
+                )
+            )
+        ]
+
+    @staticmethod
+    def request_status_refresh(session, profilingRunUris: [str], window: int) -> [str]:
+        """
+        Flags the unfinished runs whose status was not checked in the last window seconds
+        Returns
+        -------
+        the uris of the runs whose status must be refreshed
+        """
+        if not profilingRunUris:
+            return []
+        now = datetime.now()
+        run = models.DatasetProfilingRun.__table__
+        rows = session.execute(
+            run.update()
+            .where(
+                and_(
+                    run.c.profilingRunUri.in_(profilingRunUris),
+                    run.c.GlueJobRunId.isnot(None),
+                    run.c.status.notin_(TERMINAL_STATES),
+                    or_(
+                        run.c.lastStatusCheck.is_(None),
+                        run.c.lastStatusCheck < now - timedelta(seconds=window),
+                    ),
+                )
+            )
+            .values(lastStatusCheck=now)
+            .returning(run.c.profilingRunUri)
+        ).fetchall()
+        return [row[0] for row in rows]
+
     @staticmethod
     def list_profiling_runs(session, datasetUri, filter: dict = None):
         if not filter:
@@ -1,9 +1,14 @@
+import hashlib
+import json
 import logging
+import re
+from datetime import datetime, timedelta
 from typing import List
 
 from sqlalchemy.sql import and_
 
 from .. import models, api, permissions, exceptions, paginate
+from ..search import contains_term
 from . import has_tenant_perm, has_resource_perm, Glossary, ResourcePolicy, Environment
 from ..models import Dataset
 from ...utils import json_utils
@@ -57,6 +62,7 @@ class DatasetTable:
             region=dataset.region,
         )
         session.add(table)
+        api.Dataset.update_dataset_counters(session, uri, tables=1)
         if data.get('terms') is not None:
             Glossary.set_glossary_terms_links(
                 session, username, table.tableUri, 'DatasetTable', data.get('terms', [])
@@ -93,7 +99,7 @@ class DatasetTable:
         )
         if data.get('term'):
             term = data.get('term')
-            query = query.filter(models.DatasetTable.label.ilike('%' + term + '%'))
+            query = query.filter(contains_term(term, models.DatasetTable.label))
         return paginate(
             query, page=data.get('page', 1), page_size=data.get('pageSize', 10)
         ).to_dict()
@@ -168,6 +174,7 @@ class DatasetTable:
             models.ShareObjectItem.itemUri == table.tableUri,
         ).delete()
         session.delete(table)
+        api.Dataset.update_dataset_counters(session, table.datasetUri, tables=-1)
         Glossary.delete_glossary_terms_links(
             session, target_uri=table.tableUri, target_type='DatasetTable'
         )
@@ -262,6 +269,7 @@ class DatasetTable:
                         ),
                     )
                     session.add(updated_table)
+                    api.Dataset.update_dataset_counters(session, dataset.datasetUri, tables=1)
                     session.commit()
                     # ADD DATASET TABLE PERMISSIONS
                     env = Environment.get_environment_by_uri(session, dataset.environmentUri)
@@ -343,6 +351,96 @@ class DatasetTable:
         ).delete()
         session.commit()
 
+    @staticmethod
+    def validate_preview_columns(session, table: models.DatasetTable, columns: [str] = None):
+        """
+        Checks that the columns projected in a table preview are columns of the table
+        which can be quoted as SQL identifiers
+        """
+        if not columns:
+            return []
+        table_columns = {
+            c.name
+            for c in session.query(models.DatasetTableColumn.name).filter(
+                and_(
+                    models.DatasetTableColumn.tableUri == table.tableUri,
+                    models.DatasetTableColumn.deleted.is_(None),
+                )
+            )
+        }
+        unknown = [c for c in columns if c not in table_columns]
+        if unknown:
+            raise exceptions.InvalidInput(
+                'columns', ', '.join(unknown), f'must be columns of table {table.GlueTableName}'
+            )
+        invalid = [c for c in columns if re.search(r'\W', c)]
+        if invalid:
+            raise exceptions.InvalidInput(
+                'columns',
+                ', '.join(invalid),
+                'can only be projected when made of letters, digits and underscores',
+            )
+        return list(dict.fromkeys(columns))
+
+    @staticmethod
+    def get_preview_version(session, table: models.DatasetTable) -> str:
+        """
+        Marker of the Glue table state as last synced: table parameters and columns.
+        A cached preview computed for another marker is not served.
+        """
+        columns = (
+            session.query(
+                models.DatasetTableColumn.name, models.DatasetTableColumn.typeName
+            )
+            .filter(models.DatasetTableColumn.tableUri == table.tableUri)
+            .order_by(models.DatasetTableColumn.name)
+            .all()
+        )
+        state = json.dumps(
+            {
+                'properties': table.GlueTableProperties,
+                'columns': [list(c) for c in columns],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(state.encode()).hexdigest()
+
+    @staticmethod
+    def get_table_preview(session, table_uri, sql) -> models.DatasetTablePreview:
+        return session.query(models.DatasetTablePreview).get(
+            (table_uri, hashlib.sha256(sql.encode()).hexdigest())
+        )
+
+    @staticmethod
+    def save_table_preview(session, table_uri, sql, version, result: dict):
+        query_hash = hashlib.sha256(sql.encode()).hexdigest()
+        preview = session.query(models.DatasetTablePreview).get((table_uri, query_hash))
+        if not preview:
+            preview = models.DatasetTablePreview(tableUri=table_uri, queryHash=query_hash)
+            session.add(preview)
+        preview.version = version
+        preview.result = result
+        preview.created = datetime.now()
+        preview.refreshRequested = None
+        return preview
+
+    @staticmethod
+    def request_table_preview_refresh(
+        session, preview: models.DatasetTablePreview, window: int
+    ) -> bool:
+        """
+        Flags the cached preview as being refreshed.
+        Returns False if a refresh was already requested less than window seconds ago
+        """
+        now = datetime.now()
+        if preview.refreshRequested and preview.refreshRequested > now - timedelta(
+            seconds=window
+        ):
+            return False
+        preview.refreshRequested = now
+        return True
+
     @staticmethod
     def get_table_by_s3_prefix(session, s3_prefix, accountid, region):
         table: models.DatasetTable = (
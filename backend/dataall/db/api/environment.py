@@ -6,6 +6,7 @@ from sqlalchemy.orm import Query
 from sqlalchemy.sql import and_
 
 from .. import exceptions, permissions, models, api
+from ..search import contains_term
 from . import (
     has_resource_perm,
     has_tenant_perm,
@@ -984,7 +985,7 @@ class Environment:
 
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains_term(term, models.ShareObjectItem.itemName))
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -1077,7 +1078,7 @@ class Environment:
             )
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains_term(term, models.ShareObjectItem.itemName))
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
@@ -1197,7 +1198,7 @@ class Environment:
             )
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(models.ShareObjectItem.itemName.ilike('%' + term + '%'))
+            q = q.filter(contains_term(term, models.ShareObjectItem.itemName))
 
         return paginate(
             query=q, page=data.get('page', 1), page_size=data.get('pageSize', 10)
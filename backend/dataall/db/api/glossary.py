@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import asc, or_, and_, literal, case
-from sqlalchemy.orm import with_expression, aliased
+from sqlalchemy import asc, or_, and_, literal, select, union
+from sqlalchemy.orm import with_expression
 
 from .. import models, exceptions, permissions, paginate
+from ..search import contains_term
 from .permission_checker import (
     has_tenant_perm,
 )
@@ -12,6 +13,24 @@ from ..models.Glossary import GlossaryNodeStatus
 
 logger = logging.getLogger(__name__)
 
+# Models of the term link target types, with the type name of the associations
+TERM_LINK_TARGETS = {
+    'Dataset': (models.Dataset, models.Dataset.datasetUri, 'dataset'),
+    'DatasetTable': (models.DatasetTable, models.DatasetTable.tableUri, 'table'),
+    'Column': (models.DatasetTableColumn, models.DatasetTableColumn.columnUri, 'column'),
+    'Folder': (
+        models.DatasetStorageLocation,
+        models.DatasetStorageLocation.locationUri,
+        'folder',
+    ),
+    'DatasetStorageLocation': (
+        models.DatasetStorageLocation,
+        models.DatasetStorageLocation.locationUri,
+        'folder',
+    ),
+    'Dashboard': (models.Dashboard, models.Dashboard.dashboardUri, 'dashboard'),
+}
+
 
 class Glossary:
     @staticmethod
@@ -31,6 +50,7 @@ class Glossary:
         session.add(g)
         session.commit()
         g.path = f'/{g.nodeUri}'
+        Glossary.add_to_tree(session, g)
         return g
 
     @staticmethod
@@ -52,6 +72,7 @@ class Glossary:
         session.add(cat)
         session.commit()
         cat.path = parent.path + '/' + cat.nodeUri
+        Glossary.add_to_tree(session, cat, parent)
         return cat
 
     @staticmethod
@@ -77,8 +98,38 @@ class Glossary:
         session.add(term)
         session.commit()
         term.path = parent.path + '/' + term.nodeUri
+        Glossary.add_to_tree(session, term, parent)
         return term
 
+    @staticmethod
+    def add_to_tree(session, node: models.GlossaryNode, parent: models.GlossaryNode = None):
+        """Adds the node to the ancestors closure, as itself and below the ancestors of its parent"""
+        session.add(
+            models.GlossaryNodeAncestor(
+                nodeUri=node.nodeUri, ancestorUri=node.nodeUri, depth=0
+            )
+        )
+        if parent:
+            ancestors = models.GlossaryNodeAncestor
+            session.execute(
+                ancestors.__table__.insert().from_select(
+                    ['nodeUri', 'ancestorUri', 'depth'],
+                    select(
+                        [literal(node.nodeUri), ancestors.ancestorUri, ancestors.depth + 1]
+                    ).where(ancestors.nodeUri == parent.nodeUri),
+                )
+            )
+
+    @staticmethod
+    def descendants(session, node_uri, include_self=False):
+        """Query of the uris of the nodes below the node"""
+        q = session.query(models.GlossaryNodeAncestor.nodeUri).filter(
+            models.GlossaryNodeAncestor.ancestorUri == node_uri
+        )
+        if not include_self:
+            q = q.filter(models.GlossaryNodeAncestor.depth > 0)
+        return q
+
     @staticmethod
     @has_tenant_perm(permissions.MANAGE_GLOSSARIES)
     def delete_node(session, username, groups, uri, data=None, check_perm=None):
@@ -90,7 +141,9 @@ class Glossary:
         if node.nodeType in ['G', 'C']:
             children = session.query(models.GlossaryNode).filter(
                 and_(
-                    models.GlossaryNode.path.startswith(node.path),
+                    models.GlossaryNode.nodeUri.in_(
+                        Glossary.descendants(session, node.nodeUri)
+                    ),
                     models.GlossaryNode.deleted.is_(None),
                 )
             )
@@ -163,10 +216,7 @@ class Glossary:
         term = data.get('term')
         if term:
             q = q.filter(
-                or_(
-                    models.GlossaryNode.label.ilike('%' + term + '%'),
-                    models.GlossaryNode.readme.ilike('%' + term + '%'),
-                )
+                contains_term(term, models.GlossaryNode.label, models.GlossaryNode.readme)
             )
         return paginate(
             q, page_size=data.get('pageSize', 10), page=data.get('page', 1)
@@ -217,77 +267,33 @@ class Glossary:
 
     @staticmethod
     def hierarchical_search(session, username, groups, uri, data=None, check_perm=None):
-        q = session.query(models.GlossaryNode).options(
-            with_expression(models.GlossaryNode.isMatch, literal(True))
-        )
-        q = q.filter(models.GlossaryNode.deleted.is_(None))
+        """
+        Nodes matching the term with their ancestors and descendants, read from
+        the ancestors closure instead of comparing the paths of all the nodes
+        """
         term = data.get('term', None)
-        if term:
-            q = q.filter(
-                or_(
-                    models.GlossaryNode.label.ilike('%' + term.upper() + '%'),
-                    models.GlossaryNode.readme.ilike('%' + term.upper() + '%'),
-                )
-            )
-        matches = q.subquery('matches')
-        parents = aliased(models.GlossaryNode, name='parents')
-        children = aliased(models.GlossaryNode, name='children')
-
-        if term:
-            parent_expr = case(
-                [
-                    (
-                        or_(
-                            parents.label.ilike(f'%{term}%'),
-                            parents.readme.ilike(f'%{term}%'),
-                        )
-                    )
-                ],
-                else_=literal(False),
-            )
+        q = (
+            session.query(models.GlossaryNode)
+            .filter(models.GlossaryNode.deleted.is_(None))
+            .order_by(models.GlossaryNode.path)
+        )
+        if not term:
+            q = q.options(with_expression(models.GlossaryNode.isMatch, literal(False)))
         else:
-            parent_expr = literal(False)
-
-        ascendants = (
-            session.query(parents)
-            .options(with_expression(parents.isMatch, parent_expr))
-            .join(
-                and_(
-                    matches,
-                    matches.c.path.startswith(parents.path),
-                    matches,
-                    matches.c.deleted.is_(None),
-                )
+            match_expr = contains_term(
+                term, models.GlossaryNode.label, models.GlossaryNode.readme
             )
-        )
-
-        if term:
-            child_expr = case(
-                [
-                    (
-                        or_(
-                            children.label.ilike(f'%{term}%'),
-                            children.readme.ilike(f'%{term}%'),
-                        ),
-                        and_(children.deleted.is_(None)),
-                    )
-                ],
-                else_=literal(False),
+            matches = session.query(models.GlossaryNode.nodeUri).filter(
+                models.GlossaryNode.deleted.is_(None), match_expr
             )
-        else:
-            child_expr = literal(False)
-
-        descendants = (
-            session.query(children)
-            .options(with_expression(children.isMatch, child_expr))
-            .join(
-                matches,
-                children.path.startswith(matches.c.path),
+            ancestors = models.GlossaryNodeAncestor
+            related = union(
+                select([ancestors.ancestorUri]).where(ancestors.nodeUri.in_(matches)),
+                select([ancestors.nodeUri]).where(ancestors.ancestorUri.in_(matches)),
+            )
+            q = q.options(with_expression(models.GlossaryNode.isMatch, match_expr)).filter(
+                models.GlossaryNode.nodeUri.in_(related)
             )
-        )
-
-        all = ascendants.union(descendants)
-        q = all.order_by(models.GlossaryNode.path)
 
         return paginate(
             q, page=data.get('page', 1), page_size=data.get('pageSize', 100)
@@ -322,7 +328,11 @@ class Glossary:
     def list_node_children(session, source, filter):
         q = (
             session.query(models.GlossaryNode)
-            .filter(models.GlossaryNode.path.startswith(source.path + '/'))
+            .filter(
+                models.GlossaryNode.nodeUri.in_(
+                    Glossary.descendants(session, source.nodeUri)
+                )
+            )
             .order_by(asc(models.GlossaryNode.path))
         )
         term = filter.get('term')
@@ -346,73 +356,64 @@ class Glossary:
     ):
         source = data['source']
         filter = data['filter']
-        datasets = session.query(
-            models.Dataset.datasetUri.label('targetUri'),
-            literal('dataset').label('targetType'),
-            models.Dataset.label.label('label'),
-            models.Dataset.name.label('name'),
-            models.Dataset.description.label('description'),
-        )
-        tables = session.query(
-            models.DatasetTable.tableUri.label('targetUri'),
-            literal('table').label('targetType'),
-            models.DatasetTable.label.label('label'),
-            models.DatasetTable.name.label('name'),
-            models.DatasetTable.description.label('description'),
-        )
-        columns = session.query(
-            models.DatasetTableColumn.columnUri.label('targetUri'),
-            literal('column').label('targetType'),
-            models.DatasetTableColumn.label.label('label'),
-            models.DatasetTableColumn.name.label('name'),
-            models.DatasetTableColumn.description.label('description'),
-        )
-        folders = session.query(
-            models.DatasetStorageLocation.locationUri.label('targetUri'),
-            literal('folder').label('targetType'),
-            models.DatasetStorageLocation.label.label('label'),
-            models.DatasetStorageLocation.name.label('name'),
-            models.DatasetStorageLocation.description.label('description'),
-        )
-
-        dashboards = session.query(
-            models.Dashboard.dashboardUri.label('targetUri'),
-            literal('dashboard').label('targetType'),
-            models.Dashboard.label.label('label'),
-            models.Dashboard.name.label('name'),
-            models.Dashboard.description.label('description'),
-        )
-
-        linked_objects = datasets.union(tables, columns, folders, dashboards).subquery(
-            'linked_objects'
-        )
 
-        path = models.GlossaryNode.path
-        q = (
-            session.query(models.TermLink)
-            .options(with_expression(models.TermLink.path, path))
-            .join(
-                models.GlossaryNode,
-                models.GlossaryNode.nodeUri == models.TermLink.nodeUri,
-            )
-            .join(
-                linked_objects, models.TermLink.targetUri == linked_objects.c.targetUri
-            )
+        links = session.query(models.TermLink).join(
+            models.GlossaryNode,
+            models.GlossaryNode.nodeUri == models.TermLink.nodeUri,
         )
         if source.nodeType == 'T':
-            q = q.filter(models.TermLink.nodeUri == source.nodeUri)
+            links = links.filter(models.TermLink.nodeUri == source.nodeUri)
         elif source.nodeType in ['C', 'G']:
-            q = q.filter(models.GlossaryNode.path.startswith(source.path))
+            links = links.filter(
+                models.TermLink.nodeUri.in_(
+                    Glossary.descendants(session, source.nodeUri)
+                )
+            )
         else:
             raise Exception(f'InvalidNodeType ({source.nodeUri}/{source.nodeType})')
 
+        # Only the target types linked to the terms are read, and only their linked rows
+        targets = []
+        linked_types = links.with_entities(models.TermLink.targetType).distinct()
+        for (target_type,) in linked_types:
+            if target_type not in TERM_LINK_TARGETS:
+                continue
+            model, target_uri, type_name = TERM_LINK_TARGETS[target_type]
+            targets.append(
+                session.query(
+                    target_uri.label('targetUri'),
+                    literal(type_name).label('targetType'),
+                    model.label.label('label'),
+                    model.name.label('name'),
+                    model.description.label('description'),
+                ).filter(
+                    target_uri.in_(
+                        links.filter(models.TermLink.targetType == target_type)
+                        .with_entities(models.TermLink.targetUri)
+                    )
+                )
+            )
+        if not targets:
+            return paginate(
+                links.filter(literal(False)),
+                page=filter.get('page', 1),
+                page_size=filter.get('pageSize', 25),
+            ).to_dict()
+        linked_objects = targets[0].union(*targets[1:]).subquery('linked_objects')
+
+        path = models.GlossaryNode.path
+        q = links.options(with_expression(models.TermLink.path, path)).join(
+            linked_objects, models.TermLink.targetUri == linked_objects.c.targetUri
+        )
+
         term = filter.get('term')
         if term:
             q = q.filter(
-                or_(
-                    linked_objects.c.label.ilike('%' + term + '%'),
-                    linked_objects.c.description.ilike(f'%{term}'),
-                    linked_objects.c.targetType.ilike(f'%{term}'),
+                contains_term(
+                    term,
+                    linked_objects.c.label,
+                    linked_objects.c.description,
+                    linked_objects.c.targetType,
                 )
             )
         q = q.order_by(asc(path))
@@ -99,6 +99,27 @@ class Notification:
             session.add_all(notifications)
         return notifications
 
+    @staticmethod
+    def notify_new_data_available_from_owners_of_shares(
+        session, dataset: models.Dataset, shares: [models.ShareObject], s3_prefix
+    ) -> int:
+        rows = [
+            {
+                'type': models.NotificationType.DATASET_VERSION,
+                'username': user,
+                'target_uri': f'{share.shareUri}|{dataset.datasetUri}',
+                'message': f'New data (at {s3_prefix}) is available from dataset {dataset.datasetUri} shared by owner {dataset.owner}',
+            }
+            for share in shares
+            for user in Notification.get_share_object_targeted_users(
+                session, dataset, share
+            )
+            if user
+        ]
+        if rows:
+            session.bulk_insert_mappings(models.Notification, rows)
+        return len(rows)
+
     @staticmethod
     def get_share_object_targeted_users(session, dataset, share):
         targeted_users = Notification.get_dataset_stewards(
@@ -3,6 +3,7 @@ import logging
 from sqlalchemy import and_, or_, literal
 
 from .. import models, api, exceptions, paginate, permissions
+from ..search import contains_term
 from . import has_resource_perm, ResourcePolicy, DatasetTable, Environment, Dataset
 from ...utils.naming_convention import (
     NamingConventionService,
@@ -546,9 +547,7 @@ class RedshiftCluster:
         )
         if data.get('term'):
             term = data.get('term')
-            q = q.filter(
-                models.DatasetTable.label.ilike('%' + term + '%'),
-            )
+            q = q.filter(contains_term(term, models.DatasetTable.label))
         return paginate(
             q, page=data.get('page', 1), page_size=data.get('pageSize', 20)
         ).to_dict()
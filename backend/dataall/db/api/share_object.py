@@ -1362,72 +1362,41 @@ class ShareObject:
 
     @staticmethod
     def resolve_share_object_statistics(session, uri, **kwargs):
-        share_item_shared_states = ShareItemSM.get_share_item_shared_states()
-        tables = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.itemType == 'DatasetTable',
-                )
-            )
-            .count()
-        )
-        locations = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.itemType == 'DatasetStorageLocation',
-                )
-            )
-            .count()
-        )
-        shared_items = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.status.in_(share_item_shared_states),
-                )
-            )
-            .count()
-        )
-        revoked_items = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.status.in_([ShareItemStatus.Revoke_Succeeded.value]),
-                )
-            )
-            .count()
-        )
+        return ShareObject.resolve_share_objects_statistics(session, [uri])[uri]
+
+    @staticmethod
+    def resolve_share_objects_statistics(session, uris: [str]) -> dict:
+        """
+        Counts the items of the shares in a single pass over their share items
+        Returns
+        -------
+        dict of shareUri to the tables, locations, sharedItems, revokedItems,
+        failedItems and pendingItems counters of the share
+        """
+        item = models.ShareObjectItem
         failed_states = [
             ShareItemStatus.Share_Failed.value,
             ShareItemStatus.Revoke_Failed.value
         ]
-        failed_items = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.status.in_(failed_states),
-                )
-            )
-            .count()
-        )
-        pending_states = [
-            ShareItemStatus.PendingApproval.value
-        ]
-        pending_items = (
-            session.query(models.ShareObjectItem)
-            .filter(
-                and_(
-                    models.ShareObjectItem.shareUri == uri,
-                    models.ShareObjectItem.status.in_(pending_states),
-                )
+        counters = {
+            'tables': item.itemType == ShareableType.Table.value,
+            'locations': item.itemType == ShareableType.StorageLocation.value,
+            'sharedItems': item.status.in_(ShareItemSM.get_share_item_shared_states()),
+            'revokedItems': item.status == ShareItemStatus.Revoke_Succeeded.value,
+            'failedItems': item.status.in_(failed_states),
+            'pendingItems': item.status == ShareItemStatus.PendingApproval.value,
+        }
+        statistics = {uri: {name: 0 for name in counters} for uri in uris}
+        if not uris:
+            return statistics
+        query = (
+            session.query(
+                item.shareUri,
+                *[func.count().filter(condition).label(name) for name, condition in counters.items()],
             )
-            .count()
+            .filter(item.shareUri.in_(uris))
+            .group_by(item.shareUri)
         )
-        return {'tables': tables, 'locations': locations, 'sharedItems': shared_items, 'revokedItems': revoked_items, 'failedItems': failed_items, 'pendingItems': pending_items}
+        for row in query:
+            statistics[row.shareUri] = {name: getattr(row, name) for name in counters}
+        return statistics
@@ -1,4 +1,7 @@
 import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
 
 from . import ResourcePolicy, TargetType
 from .. import exceptions
@@ -10,6 +13,15 @@ from ...utils.naming_convention import (
 
 log = logging.getLogger(__name__)
 
+STABLE_STACK_STATUSES = [
+    'CREATE_COMPLETE',
+    'UPDATE_COMPLETE',
+    'UPDATE_ROLLBACK_COMPLETE',
+    'IMPORT_COMPLETE',
+    'IMPORT_ROLLBACK_COMPLETE',
+]
+NEVER_DESCRIBED = datetime(year=1900, month=1, day=1)
+
 
 class Stack:
     @staticmethod
@@ -95,3 +107,36 @@ class Stack:
         )
         stack = Stack.get_stack_by_target_uri(session, target_uri=uri)
         return stack
+
+    @staticmethod
+    def claim_stack_refresh(
+        session, stack_uri, freshness_window: int, stable_window: int
+    ) -> bool:
+        """
+        Records that the stack is being described now, unless it was described less than
+        freshness_window seconds ago, or it is in a stable status and was described less than
+        stable_window seconds ago.
+        The check and the update are one statement, only one concurrent request claims the refresh.
+        """
+        now = datetime.now()
+        last_seen = models.Stack.lastSeen
+        conditions = [
+            models.Stack.stackUri == stack_uri,
+            or_(last_seen.is_(None), last_seen < now - timedelta(seconds=freshness_window)),
+            or_(
+                ~models.Stack.status.in_(STABLE_STACK_STATUSES),
+                last_seen.is_(None),
+                last_seen < now - timedelta(seconds=stable_window),
+            ),
+        ]
+        claimed = (
+            session.query(models.Stack)
+            .filter(*conditions)
+            .update({models.Stack.lastSeen: now}, synchronize_session=False)
+        )
+        return claimed == 1
+
+    @staticmethod
+    def expire_stack_refresh(stack: models.Stack):
+        """The next resolution of the stack describes it again, whatever its status"""
+        stack.lastSeen = NEVER_DESCRIBED
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 
-from .. import exceptions
+from .. import api, exceptions
 from .. import models
 
 logger = logging.getLogger(__name__)
@@ -35,7 +35,9 @@ class Vote:
             )
             .first()
         )
+        upvotes = int(bool(data['upvote']))
         if vote:
+            upvotes -= int(bool(vote.upvote))
             vote.upvote = data['upvote']
             vote.updated = datetime.now()
 
@@ -48,6 +50,8 @@ class Vote:
             )
             session.add(vote)
 
+        if data['targetType'] == 'dataset' and upvotes:
+            api.Dataset.update_dataset_counters(session, uri, upvotes=upvotes)
         session.commit()
         return vote
 
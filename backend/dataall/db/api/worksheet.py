@@ -1,6 +1,8 @@
 import logging
+from datetime import datetime
 
 from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Query
 
 from .. import exceptions, permissions, paginate
@@ -194,6 +196,7 @@ class Worksheet:
         session, username, groups, uri, data=None, check_perm=None
     ) -> bool:
         worksheet = Worksheet.get_worksheet_by_uri(session, uri)
+        Worksheet.delete_query_results(session, uri)
         session.delete(worksheet)
         ResourcePolicy.delete_resource_policy(
             session=session,
@@ -202,3 +205,95 @@ class Worksheet:
             resource_type=models.Worksheet.__name__,
         )
         return True
+
+    @staticmethod
+    def save_query_execution(
+        session, worksheet_uri, environment: models.Environment, sql, execution: dict, page_size
+    ) -> models.WorksheetQueryResult:
+        query_result = models.WorksheetQueryResult(
+            worksheetUri=worksheet_uri,
+            AthenaQueryId=execution['AthenaQueryId'],
+            queryType='data',
+            sqlBody=sql,
+            AwsAccountId=environment.AwsAccountId,
+            region=environment.region,
+            environmentUri=environment.environmentUri,
+            pageSize=page_size,
+            status=execution['Status'],
+            OutputLocation=execution.get('OutputLocation') or '',
+            created=datetime.now(),
+        )
+        session.add(query_result)
+        return query_result
+
+    @staticmethod
+    def get_query_execution(session, worksheet_uri, query_id) -> models.WorksheetQueryResult:
+        query_result = session.query(models.WorksheetQueryResult).get(query_id)
+        if not query_result or query_result.worksheetUri != worksheet_uri:
+            raise exceptions.ObjectNotFound('WorksheetQueryResult', query_id)
+        return query_result
+
+    @staticmethod
+    def update_query_execution(
+        session, query_result: models.WorksheetQueryResult, execution: dict
+    ) -> models.WorksheetQueryResult:
+        query_result.status = execution['Status']
+        query_result.error = execution.get('Error')
+        query_result.ElapsedTimeInMs = execution.get('ElapsedTimeInMs')
+        query_result.DataScannedInBytes = execution.get('DataScannedInBytes')
+        query_result.OutputLocation = (
+            execution.get('OutputLocation') or query_result.OutputLocation
+        )
+        return query_result
+
+    @staticmethod
+    def get_query_result_page(session, query_id, page) -> models.WorksheetQueryResultPage:
+        """Returns the cached page, or the last cached page before it if it is not cached"""
+        return (
+            session.query(models.WorksheetQueryResultPage)
+            .filter(
+                and_(
+                    models.WorksheetQueryResultPage.AthenaQueryId == query_id,
+                    models.WorksheetQueryResultPage.page <= page,
+                )
+            )
+            .order_by(models.WorksheetQueryResultPage.page.desc())
+            .first()
+        )
+
+    @staticmethod
+    def save_query_result_page(session, query_id, page, result: dict, next_token) -> bool:
+        """Saves the page unless it was saved meanwhile (e.g. by a concurrent request)"""
+        saved = session.execute(
+            insert(models.WorksheetQueryResultPage.__table__)
+            .values(
+                AthenaQueryId=query_id,
+                page=page,
+                result=result,
+                nextToken=next_token,
+                created=datetime.now(),
+            )
+            .on_conflict_do_nothing(index_elements=['AthenaQueryId', 'page'])
+        )
+        return saved.rowcount == 1
+
+    @staticmethod
+    def delete_expired_query_result_pages(session, cutoff: datetime) -> int:
+        """Deletes the result pages saved before cutoff, they are read from Athena again if requested"""
+        return (
+            session.query(models.WorksheetQueryResultPage)
+            .filter(models.WorksheetQueryResultPage.created < cutoff)
+            .delete(synchronize_session=False)
+        )
+
+    @staticmethod
+    def delete_query_results(session, worksheet_uri):
+        query_results = session.query(models.WorksheetQueryResult).filter(
+            models.WorksheetQueryResult.worksheetUri == worksheet_uri
+        )
+        query_ids = [r.AthenaQueryId for r in query_results]
+        if query_ids:
+            session.query(models.WorksheetQueryResultPage).filter(
+                models.WorksheetQueryResultPage.AthenaQueryId.in_(query_ids)
+            ).delete(synchronize_session=False)
+        query_results.delete(synchronize_session=False)
@@ -6,11 +6,12 @@ from contextlib import contextmanager
 import boto3
 import sqlalchemy
 from sqlalchemy.engine import reflection
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from .. import db
 from ..db import Base
 from ..db.dbconfig import DbConfig
+from ..db.instrumentation import instrument
 from ..utils import Parameter, Secrets
 
 try:
@@ -31,6 +32,7 @@ class Engine:
             pool_size=1,
             connect_args={'options': f"-csearch_path={dbconfig.schema}"},
         )
+        instrument(self.engine)
         try:
             if not self.engine.dialect.has_schema(
                 self.engine, dbconfig.schema
@@ -49,12 +51,14 @@ class Engine:
         self._session = None
 
     def session(self):
+        # Sessions are thread-local so that tasks fanning out work on a
+        # thread pool (e.g. shares refresh) never share a connection
         if self._session is None:
-            self._session = sessionmaker(
-                bind=self.engine, autoflush=True, expire_on_commit=False
-            )()
+            self._session = scoped_session(
+                sessionmaker(bind=self.engine, autoflush=True, expire_on_commit=False)
+            )
 
-        return self._session
+        return self._session()
 
     @contextmanager
     def scoped_session(self):
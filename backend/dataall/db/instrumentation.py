@@ -0,0 +1,156 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+
+SQL_STATS_DEBUG = os.getenv('SQL_STATS_DEBUG', 'false').lower() == 'true'
+MAX_STATEMENTS = int(os.getenv('SQL_STATS_MAX_STATEMENTS', '50'))
+MAX_DURATION_MS = float(os.getenv('SQL_STATS_MAX_DURATION_MS', '1000'))
+TOP_STATEMENTS = int(os.getenv('SQL_STATS_TOP_STATEMENTS', '5'))
+
+_current = contextvars.ContextVar('sql_stats', default=None)
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%\(\w+\)s|%s'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?, ...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normalize_statement(statement: str) -> str:
+    """Replaces the literals and parameters of a statement so that executions of the same query are grouped"""
+    for pattern, replacement in _LITERALS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+class SqlStats:
+    """
+    SQL statements executed while collecting, with their count, total duration
+    and the normalized statements that took the most time.
+    Statements are also recorded in the enclosing collection, if any.
+    """
+
+    def __init__(self, operation=None, parent=None, top=TOP_STATEMENTS):
+        self.operation = operation
+        self.parent = parent
+        self.top = top
+        self.statements = 0
+        self.duration = 0.0
+        self._by_statement = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float):
+        normalized = normalize_statement(statement)
+        with self._lock:
+            self.statements += 1
+            self.duration += duration
+            stats = self._by_statement.setdefault(normalized, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+        if self.parent:
+            self.parent.record(statement, duration)
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 3)
+
+    def slowest(self) -> [dict]:
+        with self._lock:
+            statements = sorted(
+                self._by_statement.items(), key=lambda s: s[1][1], reverse=True
+            )[: self.top]
+        return [
+            {
+                'statement': statement,
+                'count': count,
+                'totalMs': round(total * 1000, 3),
+                'maxMs': round(longest * 1000, 3),
+            }
+            for statement, (count, total, longest) in statements
+        ]
+
+    def exceeds(self, max_statements=None, max_duration_ms=None):
+        return self.statements > (max_statements or MAX_STATEMENTS) or self.duration_ms > (
+            max_duration_ms or MAX_DURATION_MS
+        )
+
+    def to_dict(self):
+        return {
+            'operation': self.operation,
+            'statements': self.statements,
+            'durationMs': self.duration_ms,
+            'slowest': self.slowest(),
+        }
+
+
+def current_sql_stats() -> SqlStats:
+    return _current.get()
+
+
+@contextmanager
+def collect_sql_stats(operation=None, summary=False):
+    """
+    Collects the SQL statements executed by the engines in the block.
+    A structured log is written when the statements count or the total
+    duration exceed SQL_STATS_MAX_STATEMENTS or SQL_STATS_MAX_DURATION_MS,
+    or in any case when summary is True
+    """
+    stats = SqlStats(operation, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        if stats.exceeds():
+            log.warning(json.dumps({'message': 'SQL thresholds exceeded', **stats.to_dict()}))
+        elif summary:
+            log.info(json.dumps({'message': 'SQL statistics', **stats.to_dict()}))
+
+
+def in_current_context(fn):
+    """
+    Binds fn to the context of the calling thread. Threads, including thread
+    pool workers, do not inherit context variables: without it the statements
+    of fn are missing from the current SQL statistics collection.
+    Each call runs in its own copy of the context, so the wrapped callable can
+    run on several threads at once (e.g. with pool.map)
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def instrument(engine):
+    """Times the statements executed by the SQLAlchemy engine"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault('sql_stats_start', []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get('sql_stats_start')
+    if stats is None or not starts:
+        return
+    stats.record(statement, perf_counter() - starts.pop())
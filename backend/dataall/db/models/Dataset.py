@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Integer, String
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import query_expression
 
@@ -44,7 +44,11 @@ class Dataset(Resource, Base):
     bucketPolicyCreated = Column(Boolean, default=False)
 
     # bookmarked = Column(Integer, default=0)
-    # upvotes=Column(Integer, default=0)
+
+    # Counters maintained with the tables, folders and upvotes of the dataset
+    tablesCount = Column(Integer, nullable=False, default=0, server_default='0')
+    locationsCount = Column(Integer, nullable=False, default=0, server_default='0')
+    upvotesCount = Column(Integer, nullable=False, default=0, server_default='0')
 
     businessOwnerEmail = Column(String, nullable=True)
     businessOwnerDelegationEmails = Column(postgresql.ARRAY(String), nullable=True)
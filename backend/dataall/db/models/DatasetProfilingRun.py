@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, DateTime, String
 from sqlalchemy.dialects.postgresql import JSON
 
 from .. import Base, Resource, utils
@@ -18,3 +18,4 @@ class DatasetProfilingRun(Resource, Base):
     AwsAccountId = Column(String)
     results = Column(JSON, default={})
     status = Column(String, default='Created')
+    lastStatusCheck = Column(DateTime, nullable=True)
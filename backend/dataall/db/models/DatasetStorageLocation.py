@@ -6,7 +6,7 @@ from .. import Base, Resource, utils
 
 class DatasetStorageLocation(Resource, Base):
     __tablename__ = 'dataset_storage_location'
-    datasetUri = Column(String, nullable=False)
+    datasetUri = Column(String, nullable=False, index=True)
     locationUri = Column(String, primary_key=True, default=utils.uuid('location'))
     AWSAccountId = Column(String, nullable=False)
     S3BucketName = Column(String, nullable=False)
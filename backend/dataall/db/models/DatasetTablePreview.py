@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSON
+
+from .. import Base
+
+
+class DatasetTablePreview(Base):
+    __tablename__ = 'dataset_table_preview'
+    tableUri = Column(String, primary_key=True)
+    queryHash = Column(String, primary_key=True)
+    version = Column(String, nullable=False)
+    result = Column(JSON, nullable=False)
+    created = Column(DateTime, default=datetime.now)
+    refreshRequested = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, DateTime, String
 from sqlalchemy.orm import query_expression
 
 from .. import Base
@@ -25,6 +25,9 @@ class Environment(Resource, Base):
     roleCreated = Column(Boolean, nullable=False, default=False)
 
     dashboardsEnabled = Column(Boolean, default=False)
+    quicksightIdentityRegion = Column(String, nullable=True)
+    quicksightSubscriptionStatus = Column(String, nullable=True)
+    quicksightSettingsUpdated = Column(DateTime, nullable=True)
     notebooksEnabled = Column(Boolean, default=True)
     mlStudiosEnabled = Column(Boolean, default=True)
     pipelinesEnabled = Column(Boolean, default=True)
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, String, DateTime, Enum
+from sqlalchemy import Boolean, Column, String, DateTime, Enum, Index, Integer
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import query_expression
 
@@ -19,8 +19,11 @@ class GlossaryNodeStatus(enum.Enum):
 
 class GlossaryNode(Base):
     __tablename__ = 'glossary_node'
+    __table_args__ = (
+        Index('ix_glossary_node_path', 'path', postgresql_ops={'path': 'text_pattern_ops'}),
+    )
     nodeUri = Column(String, primary_key=True, default=utils.uuid('glossary_node'))
-    parentUri = Column(String, nullable=True)
+    parentUri = Column(String, nullable=True, index=True)
     nodeType = Column(String, default='G')
     status = Column(
         String, Enum(GlossaryNodeStatus), default=GlossaryNodeStatus.draft.value
@@ -37,6 +40,15 @@ class GlossaryNode(Base):
     isMatch = query_expression()
 
 
+class GlossaryNodeAncestor(Base):
+    """Closure of the glossary tree, a row per node and ancestor including the node itself at depth 0"""
+
+    __tablename__ = 'glossary_node_ancestor'
+    nodeUri = Column(String, primary_key=True)
+    ancestorUri = Column(String, primary_key=True, index=True)
+    depth = Column(Integer, nullable=False)
+
+
 class GlossarySchemaDefinition:
     __tablename__ = 'glossary_schema'
     schemaUri = Column(String, primary_key=True, default=utils.uuid('glossary_schema'))
@@ -53,8 +65,8 @@ class GlossarySchemaMap:
 class TermLink(Base):
     __tablename__ = 'term_link'
     linkUri = Column(String, primary_key=True, default=utils.uuid('term_link'))
-    nodeUri = Column(String, nullable=False)
-    targetUri = Column(String, nullable=False)
+    nodeUri = Column(String, nullable=False, index=True)
+    targetUri = Column(String, nullable=False, index=True)
     targetType = Column(String, nullable=False)
     approvedBySteward = Column(Boolean, default=False)
     approvedByOwner = Column(Boolean, default=False)
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, Enum, DateTime
+from sqlalchemy import Column, String, Boolean, Enum, DateTime, Index
 
 from .. import Base
 from .. import utils
@@ -18,6 +18,9 @@ class NotificationType(enum.Enum):
 
 class Notification(Base):
     __tablename__ = 'notification'
+    __table_args__ = (
+        Index('ix_notification_username_is_read_deleted', 'username', 'is_read', 'deleted'),
+    )
     notificationUri = Column(
         String, primary_key=True, default=utils.uuid('notificationtype')
     )
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, String, DateTime
+from sqlalchemy import Boolean, Column, String, DateTime, Index
 from sqlalchemy.orm import query_expression
 
 from .Enums import ShareObjectStatus
@@ -18,6 +18,14 @@ def _uuid4():
 
 class ShareObject(Base):
     __tablename__ = 'share_object'
+    __table_args__ = (
+        Index(
+            'ix_share_object_datasetUri_environmentUri_principalId',
+            'datasetUri',
+            'environmentUri',
+            'principalId',
+        ),
+    )
     shareUri = Column(
         String, nullable=False, primary_key=True, default=utils.uuid('share')
     )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String
 
 from .Enums import ShareItemStatus
 from .. import Base, utils
@@ -8,6 +8,10 @@ from .. import Base, utils
 
 class ShareObjectItem(Base):
     __tablename__ = 'share_object_item'
+    __table_args__ = (
+        Index('ix_share_object_item_shareUri_status', 'shareUri', 'status'),
+        Index('ix_share_object_item_itemUri', 'itemUri'),
+    )
     shareUri = Column(String, nullable=False)
     shareItemUri = Column(
         String, default=utils.uuid('shareitem'), nullable=False, primary_key=True
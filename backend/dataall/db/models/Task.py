@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String
 from sqlalchemy.dialects import postgresql
 
 from .. import Base
@@ -9,16 +9,20 @@ from .. import utils
 
 class Task(Base):
     __tablename__ = 'task'
+    __table_args__ = (
+        Index('ix_task_status_created', 'status', 'created'),
+        Index('ix_task_targetUri_action', 'targetUri', 'action'),
+    )
     taskUri = Column(
         String, nullable=False, default=utils.uuid('Task'), primary_key=True
     )
     targetUri = Column(String, nullable=False)
     cronexpr = Column(String, nullable=True)
     status = Column(String, nullable=False, default='pending')
-    action = Column(String, nullable=False)
+    action = Column(String, nullable=False, index=True)
     payload = Column(postgresql.JSON, nullable=True)
-    created = Column(DateTime, default=datetime.datetime.now())
-    updated = Column(DateTime, onupdate=datetime.datetime.now())
+    created = Column(DateTime, default=datetime.datetime.now)
+    updated = Column(DateTime, onupdate=datetime.datetime.now)
     response = Column(postgresql.JSON)
     error = Column(postgresql.JSON)
     lastSeen = Column(
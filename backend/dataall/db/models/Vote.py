@@ -1,12 +1,13 @@
 import datetime
 
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 
 from .. import Base, utils
 
 
 class Vote(Base):
     __tablename__ = 'vote'
+    __table_args__ = (Index('ix_vote_targetUri_targetType', 'targetUri', 'targetType'),)
     voteUri = Column(String, primary_key=True, default=utils.uuid('vote'))
     username = Column(String, nullable=False)
     targetUri = Column(String, nullable=False)
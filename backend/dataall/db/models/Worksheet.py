@@ -1,7 +1,7 @@
 import datetime
 import enum
 
-from sqlalchemy import Column, Boolean, DateTime, Integer, Enum, String
+from sqlalchemy import BigInteger, Column, Boolean, DateTime, Integer, Enum, String
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import query_expression
 
@@ -36,9 +36,20 @@ class WorksheetQueryResult(Base):
     region = Column(String, nullable=False)
     OutputLocation = Column(String, nullable=False)
     error = Column(String, nullable=True)
-    ElapsedTimeInMs = Column(Integer, nullable=True)
-    DataScannedInBytes = Column(Integer, nullable=True)
+    ElapsedTimeInMs = Column(BigInteger, nullable=True)
+    DataScannedInBytes = Column(BigInteger, nullable=True)
     created = Column(DateTime, default=datetime.datetime.now)
+    environmentUri = Column(String, nullable=True)
+    pageSize = Column(Integer, nullable=True)
+
+
+class WorksheetQueryResultPage(Base):
+    __tablename__ = 'worksheet_query_result_page'
+    AthenaQueryId = Column(String, primary_key=True)
+    page = Column(Integer, primary_key=True)
+    result = Column(postgresql.JSON, nullable=False)
+    nextToken = Column(String, nullable=True)
+    created = Column(DateTime, default=datetime.datetime.now, index=True)
 
 
 class WorksheetShare(Base):
@@ -10,11 +10,12 @@ from .DatasetQualityRule import DatasetQualityRule
 from .DatasetStorageLocation import DatasetStorageLocation
 from .DatasetTable import DatasetTable
 from .DatasetTableColumn import DatasetTableColumn
+from .DatasetTablePreview import DatasetTablePreview
 from .DatasetTableProfilingJob import DatasetTableProfilingJob
 from .Environment import Environment
 from .EnvironmentGroup import EnvironmentGroup
 from .FeedMessage import FeedMessage
-from .Glossary import GlossaryNode, TermLink
+from .Glossary import GlossaryNode, GlossaryNodeAncestor, TermLink
 from .Group import Group
 from .ConsumptionRole import ConsumptionRole
 from .GroupMember import GroupMember
@@ -42,5 +43,10 @@ from .TenantPolicyPermission import TenantPolicyPermission
 from .TenantAdministrator import TenantAdministrator
 from .User import User
 from .Vpc import Vpc
-from .Worksheet import Worksheet, WorksheetQueryResult, WorksheetShare
+from .Worksheet import (
+    Worksheet,
+    WorksheetQueryResult,
+    WorksheetQueryResultPage,
+    WorksheetShare,
+)
 from .Vote import Vote
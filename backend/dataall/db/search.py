@@ -0,0 +1,28 @@
+from sqlalchemy import or_
+
+# Text columns filtered with contains_term, each one has a pg_trgm GIN index
+# (see migration 6e2b9c4d7a18) so the filters are not sequential scans.
+TRIGRAM_INDEXES = {
+    'dataset_table': ['name', 'label', 'GlueTableName'],
+    'dataset_table_column': ['label', 'description'],
+    'dataset_storage_location': ['name', 'label', 'S3Prefix'],
+    'share_object_item': ['itemName'],
+    'glossary_node': ['label', 'readme'],
+}
+
+
+def escape_like(term: str) -> str:
+    """Escapes the LIKE wildcards of a term with the Postgres default escape character"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def contains_term(term: str, *columns):
+    """
+    Case insensitive match of the term anywhere in any of the columns.
+    Emits a plain `column ILIKE '%term%'` per column, the shape a pg_trgm
+    GIN index (gin_trgm_ops) can serve, Postgres combines the indexes of the
+    columns with a BitmapOr. The wildcards of the term are matched literally.
+    Terms shorter than 3 characters have no trigram and still scan the table.
+    """
+    pattern = f'%{escape_like(term.strip())}%'
+    return or_(*[column.ilike(pattern) for column in columns])
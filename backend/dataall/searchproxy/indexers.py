@@ -53,6 +53,9 @@ def upsert_dataset(session, es, datasetUri: str):
             models.Dataset.created,
             models.Dataset.updated,
             models.Dataset.deleted,
+            models.Dataset.tablesCount,
+            models.Dataset.locationsCount,
+            models.Dataset.upvotesCount,
         )
         .join(
             models.Organization,
@@ -65,11 +68,6 @@ def upsert_dataset(session, es, datasetUri: str):
         .filter(models.Dataset.datasetUri == datasetUri)
         .first()
     )
-    count_tables = db.api.Dataset.count_dataset_tables(session, datasetUri)
-    count_folders = db.api.Dataset.count_dataset_locations(session, datasetUri)
-    count_upvotes = db.api.Vote.count_upvotes(
-        session, None, None, datasetUri, {'targetType': 'dataset'}
-    )
 
     if dataset:
         glossary = get_target_glossary_terms(session, datasetUri)
@@ -98,9 +96,9 @@ def upsert_dataset(session, es, datasetUri: str):
                 'updated': dataset.updated,
                 'deleted': dataset.deleted,
                 'glossary': glossary,
-                'tables': count_tables,
-                'folders': count_folders,
-                'upvotes': count_upvotes,
+                'tables': dataset.tablesCount,
+                'folders': dataset.locationsCount,
+                'upvotes': dataset.upvotesCount,
             },
         )
     return dataset
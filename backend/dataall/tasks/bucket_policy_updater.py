@@ -1,14 +1,17 @@
+import copy
 import json
 import logging
 import os
 import sys
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import ClientError
 from sqlalchemy import and_
 
 from ..aws.handlers.sts import SessionHelper
-from ..db import get_engine
+from ..db import get_engine, collect_sql_stats, in_current_context
 from ..db import models, api
 
 root = logging.getLogger()
@@ -18,10 +21,14 @@ if not root.hasHandlers():
 log = logging.getLogger(__name__)
 
 
+MAX_WORKERS = int(os.getenv('BUCKET_POLICIES_MAX_WORKERS', '4'))
+
+
 class BucketPoliciesUpdater:
-    def __init__(self, engine, event=None):
+    def __init__(self, engine, event=None, max_workers=MAX_WORKERS):
         self.engine = engine
         self.event = event
+        self.max_workers = max(1, max_workers)
         self.reports = []
 
     def sync_imported_datasets_bucket_policies(self):
@@ -36,67 +43,145 @@ class BucketPoliciesUpdater:
                 )
                 .all()
             )
-            log.info(f'Found {len(imported_datasets)} imported datasets')
+        log.info(f'Found {len(imported_datasets)} imported datasets')
 
-            for dataset in imported_datasets:
-                account_prefixes = {}
+        dataset_uris = [dataset.datasetUri for dataset in imported_datasets]
+        shared_tables = self.get_shared_tables_by_dataset(dataset_uris)
+        shared_folders = self.get_shared_folders_by_dataset(dataset_uris)
 
-                shared_tables = self.get_shared_tables(dataset)
-                log.info(
-                    f'Found {len(shared_tables)} shared tables with dataset {dataset.S3BucketName}'
-                )
+        accounts = {}
+        for dataset in imported_datasets:
+            accounts.setdefault(dataset.AwsAccountId, []).append(dataset)
 
-                shared_folders = self.get_shared_folders(dataset)
-                log.info(
-                    f'Found {len(shared_folders)} shared folders with dataset {dataset.S3BucketName}'
+        self.reports = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(
+                    in_current_context(self.sync_account_bucket_policies),
+                    datasets,
+                    shared_tables,
+                    shared_folders,
                 )
+                for datasets in accounts.values()
+            ]
+            for future in futures:
+                self.reports.extend(future.result())
+
+        log.info(f'Bucket policies update summary: {json.dumps(self.summarize(self.reports))}')
+        if any(r['status'] == 'FAILED' for r in self.reports):
+            raise Exception(
+                'Failed to update one or more bucket policies'
+                f'Check the reports: {self.reports}'
+            )
+        return self.reports
+
+    def sync_account_bucket_policies(self, datasets, shared_tables, shared_folders):
+        """
+        Updates the bucket policies of the datasets of one AWS account, one after the other
+        """
+        return [
+            self.sync_dataset_bucket_policy(
+                dataset,
+                shared_tables.get(dataset.datasetUri, []),
+                shared_folders.get(dataset.datasetUri, []),
+            )
+            for dataset in datasets
+        ]
+
+    def sync_dataset_bucket_policy(self, dataset, shared_tables, shared_folders):
+        """
+        Adds the accounts of the shared tables and folders to the dataset bucket policy.
+        The policy is written only if it changed.
+        Returns the report of the dataset
+        """
+        started = time.time()
+        report = {
+            'datasetUri': dataset.datasetUri,
+            'bucketName': dataset.S3BucketName,
+            'accountId': dataset.AwsAccountId,
+            'sharedTables': len(shared_tables),
+            'sharedFolders': len(shared_folders),
+            'updated': False,
+        }
+        log.info(
+            f'Found {len(shared_tables)} shared tables and {len(shared_folders)} '
+            f'shared folders with dataset {dataset.S3BucketName}'
+        )
+        try:
+            account_prefixes = self.get_account_prefixes(shared_tables, shared_folders)
 
-                for table in shared_tables:
-                    data_prefix = self.clear_table_location_from_delta_path(table)
-                    prefix = data_prefix.rstrip('/') + '/*'
-                    accountid = table.TargetAwsAccountId
+            client = self.init_s3_client(dataset)
 
-                    prefix = f"arn:aws:s3:::{prefix.split('s3://')[1]}"
-                    self.group_prefixes_by_accountid(
-                        accountid, prefix, account_prefixes
-                    )
+            policy = self.get_bucket_policy(client, dataset)
+            existing_policy = self.normalize_policy(policy)
 
-                    bucket = (
-                        f"arn:aws:s3:::{prefix.split('arn:aws:s3:::')[1].split('/')[0]}"
-                    )
-                    self.group_prefixes_by_accountid(
-                        accountid, bucket, account_prefixes
-                    )
+            policy = BucketPoliciesUpdater.update_policy(account_prefixes, copy.deepcopy(policy))
 
-                for folder in shared_folders:
-                    prefix = f'arn:aws:s3:::{folder.S3Prefix}' + '/*'
-                    accountid = folder.AwsAccountId
-                    self.group_prefixes_by_accountid(
-                        accountid, prefix, account_prefixes
-                    )
-                    bucket = (
-                        f"arn:aws:s3:::{prefix.split('arn:aws:s3:::')[1].split('/')[0]}"
-                    )
-                    self.group_prefixes_by_accountid(
-                        accountid, bucket, account_prefixes
-                    )
+            if self.normalize_policy(policy) == existing_policy:
+                log.info(f'Bucket policy of {dataset.S3BucketName} is up to date, skipping...')
+                report.update({'status': 'SUCCEEDED'})
+            else:
+                report.update(self.put_bucket_policy(client, dataset, policy))
+                report['updated'] = report['status'] == 'SUCCEEDED'
+        except Exception as e:
+            log.exception(f'Failed to sync bucket policy of {dataset.S3BucketName}')
+            report.update({'status': 'FAILED', 'error': str(e)})
 
-                client = self.init_s3_client(dataset)
+        report['duration'] = round(time.time() - started, 2)
+        return report
 
-                policy = self.get_bucket_policy(client, dataset)
+    @staticmethod
+    def summarize(reports):
+        return {
+            'datasets': len(reports),
+            'updated': len([r for r in reports if r.get('updated')]),
+            'unchanged': len(
+                [r for r in reports if r['status'] == 'SUCCEEDED' and not r.get('updated')]
+            ),
+            'failed': [r['datasetUri'] for r in reports if r['status'] == 'FAILED'],
+            'duration': round(sum(r.get('duration', 0) for r in reports), 2),
+        }
 
-                BucketPoliciesUpdater.update_policy(account_prefixes, policy)
+    @staticmethod
+    def normalize_policy(policy):
+        """
+        Canonical JSON representation of a bucket policy,
+        insensitive to keys order and to single resources written as strings
+        """
+        if isinstance(policy, str):
+            policy = json.loads(policy)
 
-                report = self.put_bucket_policy(client, dataset, policy)
+        def normalize(value):
+            if isinstance(value, dict):
+                return {k: normalize(v) for k, v in value.items()}
+            if isinstance(value, list):
+                items = [normalize(v) for v in value]
+                return items[0] if len(items) == 1 else items
+            return value
 
-                self.reports.append(report)
+        return json.dumps(normalize(policy), sort_keys=True)
 
-            if any(r['status'] == 'FAILED' for r in self.reports):
-                raise Exception(
-                    'Failed to update one or more bucket policies'
-                    f'Check the reports: {self.reports}'
-                )
-            return self.reports
+    @classmethod
+    def get_account_prefixes(cls, shared_tables, shared_folders):
+        account_prefixes = {}
+        for table in shared_tables:
+            data_prefix = cls.clear_table_location_from_delta_path(table)
+            prefix = data_prefix.rstrip('/') + '/*'
+            accountid = table.TargetAwsAccountId
+
+            prefix = f"arn:aws:s3:::{prefix.split('s3://')[1]}"
+            cls.group_prefixes_by_accountid(accountid, prefix, account_prefixes)
+
+            bucket = f"arn:aws:s3:::{prefix.split('arn:aws:s3:::')[1].split('/')[0]}"
+            cls.group_prefixes_by_accountid(accountid, bucket, account_prefixes)
+
+        for folder in shared_folders:
+            prefix = f'arn:aws:s3:::{folder.S3Prefix}' + '/*'
+            accountid = folder.AwsAccountId
+            cls.group_prefixes_by_accountid(accountid, prefix, account_prefixes)
+            bucket = f"arn:aws:s3:::{prefix.split('arn:aws:s3:::')[1].split('/')[0]}"
+            cls.group_prefixes_by_accountid(accountid, bucket, account_prefixes)
+        return account_prefixes
 
     @staticmethod
     def clear_table_location_from_delta_path(table):
@@ -164,9 +249,24 @@ class BucketPoliciesUpdater:
         return account_prefixes
 
     def get_shared_tables(self, dataset) -> typing.List[models.ShareObjectItem]:
+        return self.get_shared_tables_by_dataset([dataset.datasetUri]).get(dataset.datasetUri, [])
+
+    def get_shared_folders(self, dataset) -> typing.List[models.DatasetStorageLocation]:
+        return self.get_shared_folders_by_dataset([dataset.datasetUri]).get(dataset.datasetUri, [])
+
+    def get_shared_tables_by_dataset(self, dataset_uris) -> dict:
+        """
+        Fetches the shared tables of all the datasets in one query
+        Returns
+        -------
+        dict of datasetUri to the list of its shared tables
+        """
+        if not dataset_uris:
+            return {}
         with self.engine.scoped_session() as session:
             tables = (
                 session.query(
+                    models.DatasetTable.datasetUri.label('datasetUri'),
                     models.DatasetTable.GlueDatabaseName.label('GlueDatabaseName'),
                     models.DatasetTable.GlueTableName.label('GlueTableName'),
                     models.DatasetTable.S3Prefix.label('S3Prefix'),
@@ -192,19 +292,28 @@ class BucketPoliciesUpdater:
                 )
                 .filter(
                     and_(
-                        models.DatasetTable.datasetUri == dataset.datasetUri,
+                        models.DatasetTable.datasetUri.in_(dataset_uris),
                         models.DatasetTable.deleted.is_(None),
                         models.ShareObjectItem.status
                         == models.Enums.ShareObjectStatus.Approved.value,
                     )
                 )
             ).all()
-        return tables
-
-    def get_shared_folders(self, dataset) -> typing.List[models.DatasetStorageLocation]:
+        return self.group_by_dataset(tables)
+
+    def get_shared_folders_by_dataset(self, dataset_uris) -> dict:
+        """
+        Fetches the shared folders of all the datasets in one query
+        Returns
+        -------
+        dict of datasetUri to the list of its shared folders
+        """
+        if not dataset_uris:
+            return {}
         with self.engine.scoped_session() as session:
             locations = (
                 session.query(
+                    models.DatasetStorageLocation.datasetUri.label('datasetUri'),
                     models.DatasetStorageLocation.locationUri.label('locationUri'),
                     models.DatasetStorageLocation.S3BucketName.label('S3BucketName'),
                     models.DatasetStorageLocation.S3Prefix.label('S3Prefix'),
@@ -229,14 +338,21 @@ class BucketPoliciesUpdater:
                 )
                 .filter(
                     and_(
-                        models.DatasetStorageLocation.datasetUri == dataset.datasetUri,
+                        models.DatasetStorageLocation.datasetUri.in_(dataset_uris),
                         models.DatasetStorageLocation.deleted.is_(None),
                         models.ShareObjectItem.status
                         == models.Enums.ShareObjectStatus.Approved.value,
                     )
                 )
             ).all()
-        return locations
+        return self.group_by_dataset(locations)
+
+    @staticmethod
+    def group_by_dataset(rows) -> dict:
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row.datasetUri, []).append(row)
+        return grouped
 
     @classmethod
     def init_s3_client(cls, dataset):
@@ -320,5 +436,6 @@ if __name__ == '__main__':
     ENGINE = get_engine(envname=ENVNAME)
     log.info('Updating bucket policies for shared datasets...')
     service = BucketPoliciesUpdater(engine=ENGINE)
-    service.sync_imported_datasets_bucket_policies()
+    with collect_sql_stats(operation='tasks.bucket_policy_updater', summary=True):
+        service.sync_imported_datasets_bucket_policies()
     log.info('Bucket policies for shared datasets update successfully...')
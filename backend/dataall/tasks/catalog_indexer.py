@@ -3,7 +3,7 @@ import os
 import sys
 
 from .. import db
-from ..db import get_engine, exceptions
+from ..db import get_engine, exceptions, collect_sql_stats
 from ..db import models
 from ..searchproxy import indexers
 from ..searchproxy.connect import (
@@ -59,4 +59,5 @@ if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
     ES = connect(envname=ENVNAME)
-    index_objects(engine=ENGINE, es=ES)
+    with collect_sql_stats(operation='tasks.catalog_indexer', summary=True):
+        index_objects(engine=ENGINE, es=ES)
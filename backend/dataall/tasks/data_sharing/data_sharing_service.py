@@ -1,13 +1,17 @@
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .share_processors.lf_process_cross_account_share import ProcessLFCrossAccountShare
 from .share_processors.lf_process_same_account_share import ProcessLFSameAccountShare
 from .share_processors.s3_process_share import ProcessS3Share
+from .share_refresh_executor import ShareRefreshExecutor, MAX_WORKERS
 
 from ...aws.handlers.ram import Ram
 from ...aws.handlers.sts import SessionHelper
-from ...db import api, models, Engine
+from ...aws.handlers.waiter import Waiter
+from ...db import api, models, Engine, in_current_context
 from ...utils import Parameter
 
 log = logging.getLogger(__name__)
@@ -36,6 +40,7 @@ class DataSharingService:
         True if sharing succeeds,
         False if folder or table sharing failed
         """
+        Waiter.reset_wait_time()
         with engine.scoped_session() as session:
             (
                 source_env_group,
@@ -99,6 +104,7 @@ class DataSharingService:
         new_share_state = Share_SM.run_transition(models.Enums.ShareObjectActions.Finish.value)
         Share_SM.update_state(session, share, new_share_state)
 
+        log.info(f'Total wait time for AWS resources of share {share_uri}: {Waiter.get_wait_time():.1f}s')
         return approved_tables_succeed if approved_folders_succeed else False
 
     @classmethod
@@ -122,7 +128,7 @@ class DataSharingService:
         True if revoke succeeds
         False if folder or table revoking failed
         """
-
+        Waiter.reset_wait_time()
         with engine.scoped_session() as session:
             (
                 source_env_group,
@@ -219,6 +225,7 @@ class DataSharingService:
                 new_share_state = Share_SM.run_transition(models.Enums.ShareObjectActions.Finish.value)
             Share_SM.update_state(session, share, new_share_state)
 
+            log.info(f'Total wait time for AWS resources of share {share_uri}: {Waiter.get_wait_time():.1f}s')
             return revoked_tables_succeed and revoked_folders_succeed
 
     @classmethod
@@ -239,12 +246,31 @@ class DataSharingService:
             )
         )
 
+    @classmethod
+    def refresh_share(cls, engine: Engine, share_uri: str, status: str) -> bool:
+        """
+        Triggers the approve or revoke processing of a share depending on its status
+        Parameters
+        ----------
+        engine : db.engine
+        share_uri : share uri
+        status : share object status
+
+        Returns
+        -------
+        True if processing succeeds
+        """
+        if status in [models.ShareObjectStatus.Approved.value]:
+            return cls.approve_share(engine, share_uri)
+        return cls.revoke_share(engine, share_uri)
+
     @classmethod
     def refresh_shares(cls, engine: Engine) -> bool:
         """
         Refreshes the shares at scheduled frequency.
         If a share is in 'Approve' state it triggers an approve ECS sharing task
         If a share is in 'Revoked' state it triggers a revoke ECS sharing task
+        Shares are processed concurrently, serialized per source and target accounts pair
         Also cleans up LFV1 ram resource shares if enabled on SSM
         Parameters
         ----------
@@ -258,7 +284,20 @@ class DataSharingService:
         with engine.scoped_session() as session:
             environments = session.query(models.Environment).all()
             shares = (
-                session.query(models.ShareObject)
+                session.query(
+                    models.ShareObject.shareUri,
+                    models.ShareObject.status,
+                    models.Dataset.AwsAccountId.label('sourceAccountId'),
+                    models.Environment.AwsAccountId.label('targetAccountId'),
+                )
+                .join(
+                    models.Dataset,
+                    models.Dataset.datasetUri == models.ShareObject.datasetUri,
+                )
+                .join(
+                    models.Environment,
+                    models.Environment.environmentUri == models.ShareObject.environmentUri,
+                )
                 .filter(models.ShareObject.status.in_(share_object_refreshable_states))
                 .all()
             )
@@ -271,29 +310,28 @@ class DataSharingService:
             == 'True'
         ):
             log.info('LFV1 Cleanup toggle is enabled')
-            for e in environments:
-                log.info(
-                    f'Cleaning LFV1 ram resource for environment: {e.AwsAccountId}/{e.region}...'
-                )
-                cls.clean_lfv1_ram_resources(e)
+            # RAM resource shares are account and region wide
+            accounts = {(e.AwsAccountId, e.region): e for e in environments}
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                futures = {}
+                for e in accounts.values():
+                    log.info(
+                        f'Cleaning LFV1 ram resource for environment: {e.AwsAccountId}/{e.region}...'
+                    )
+                    futures[pool.submit(in_current_context(cls.clean_lfv1_ram_resources), e)] = e
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        log.error(
+                            f'Failed cleaning LFV1 ram resource for environment '
+                            f'{futures[future].AwsAccountId}/{futures[future].region} due to: {e}'
+                        )
 
         if not shares:
             log.info('No Approved nor Revoked shares found. Nothing to do...')
             return True
 
-        for share in shares:
-            try:
-                log.info(
-                    f'Refreshing share {share.shareUri} with {share.status} status...'
-                )
-                if share.status in [models.ShareObjectStatus.Approved.value]:
-                    cls.approve_share(engine, share.shareUri)
-                else:
-                    cls.revoke_share(engine, share.shareUri)
-
-            except Exception as e:
-                log.error(
-                    f'Failed refreshing share {share.shareUri} with {share.status}. '
-                    f'due to: {e}'
-                )
+        summary = ShareRefreshExecutor(engine, cls.refresh_share).run(shares)
+        log.info(f'Shares refresh summary: {json.dumps(summary.to_dict())}')
         return True
@@ -1,2 +1,3 @@
 from .s3_share_manager import S3ShareManager
 from .lf_share_manager import LFShareManager
+from .s3_policy_batch import S3PolicyBatch
@@ -1,7 +1,6 @@
 import abc
 import logging
 import uuid
-import time
 
 from botocore.exceptions import ClientError
 
@@ -10,10 +9,84 @@ from ....aws.handlers.lakeformation import LakeFormation
 from ....aws.handlers.quicksight import Quicksight
 from ....aws.handlers.sts import SessionHelper
 from ....aws.handlers.ram import Ram
+from ....aws.handlers.waiter import Waiter
 from ....db import api, exceptions, models
 from ....utils.alarm_service import AlarmService
 
 logger = logging.getLogger(__name__)
+LF_PROPAGATION_TIMEOUT = 30
+
+
+class LFPermissionsBatch:
+    """
+    Accumulates the Lake Formation grant or revoke entries of a share
+    and sends them with batch_grant_permissions / batch_revoke_permissions.
+    Every entry is attached to a key (e.g. the tableUri) so that failures
+    can be mapped back to the share items.
+    """
+
+    def __init__(self, accountid: str, region: str, revoke: bool = False):
+        self.accountid = accountid
+        self.region = region
+        self.revoke = revoke
+        self.entries = []
+        self.keys = {}
+
+    def add(self, key: str, principal: str, resource: dict, permissions: [str], permissions_with_grant_option=None):
+        entry_id = str(uuid.uuid4())
+        self.keys[entry_id] = key
+        self.entries.append(
+            {
+                'Id': entry_id,
+                'Principal': {'DataLakePrincipalIdentifier': principal},
+                'Resource': resource,
+                'Permissions': permissions,
+                'PermissionsWithGrantOption': permissions_with_grant_option or [],
+            }
+        )
+
+    def send(self, keys=None) -> dict:
+        """
+        Sends the entries
+        Parameters
+        ----------
+        keys : only send the entries of these keys, all entries if None
+
+        Returns
+        -------
+        dict of key to error message for the failed entries,
+        every key of the entries fails when the batch call itself fails
+        """
+        entries = [e for e in self.entries if keys is None or self.keys[e['Id']] in keys]
+        if not entries:
+            return {}
+        try:
+            client = SessionHelper.remote_session(accountid=self.accountid).client(
+                'lakeformation', region_name=self.region
+            )
+            if self.revoke:
+                failures = [
+                    failure
+                    for failure in LakeFormation.send_batch_permissions(client, self.accountid, entries, revoke=True)
+                    if not LakeFormation.is_ignorable_revoke_failure(failure)
+                ]
+            else:
+                failures = LakeFormation.batch_grant_permissions(client, self.accountid, entries)
+        except ClientError as e:
+            logger.error(
+                f'Failed to {"revoke" if self.revoke else "grant"} Lake Formation permissions '
+                f'in {self.accountid}/{self.region} due to: {e}'
+            )
+            return {self.keys[entry['Id']]: str(e) for entry in entries}
+
+        failed = {}
+        for failure in failures:
+            key = self.keys.get(failure.get('RequestEntry', {}).get('Id'))
+            if key:
+                failed.setdefault(
+                    key, f"{failure['Error']['ErrorCode']}: {failure['Error']['ErrorMessage']}"
+                )
+        return failed
 
 
 class LFShareManager:
@@ -140,6 +213,70 @@ class LFShareManager:
                 ),
             )
 
+    def start_share_items(self, tables: [models.DatasetTable], status: str) -> [tuple]:
+        """
+        For each table:
+            a) update its share item status with Action Start
+            b) check if the table exists on glue catalog
+        Parameters
+        ----------
+        tables : shared or revoked tables
+        status : current status of the share items
+
+        Returns
+        -------
+        List of (table, share item, share item state machine) and dict of tableUri to error
+        for the tables missing from the glue catalog
+        """
+        items = []
+        failed = {}
+        for table in tables:
+            share_item = api.ShareObject.find_share_item_by_table(
+                self.session, self.share, table
+            )
+            if not share_item:
+                logger.info(
+                    f'Share Item not found for {self.share.shareUri} '
+                    f'and Dataset Table {table.GlueTableName} continuing loop...'
+                )
+                continue
+
+            item_SM = api.ShareItemSM(status)
+            new_state = item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
+            item_SM.update_state_single_item(self.session, share_item, new_state)
+            items.append((table, share_item, item_SM))
+            try:
+                self.check_share_item_exists_on_glue_catalog(share_item, table)
+            except Exception as e:
+                failed[table.tableUri] = e
+        return items, failed
+
+    def finish_share_items(self, items: [tuple], failed: dict, status: str) -> bool:
+        """
+        Updates the share items status with Action Success, or Failure for the tables in failed
+        Parameters
+        ----------
+        items : list of (table, share item, share item state machine)
+        failed : dict of tableUri to error
+        status : status of the share items before processing
+
+        Returns
+        -------
+        True if no share item failed
+        """
+        revoke = status == models.ShareItemStatus.Revoke_Approved.value
+        for table, share_item, item_SM in items:
+            if table.tableUri in failed:
+                if revoke:
+                    self.handle_revoke_failure(table, share_item, failed[table.tableUri])
+                else:
+                    self.handle_share_failure(table, share_item, failed[table.tableUri])
+                new_state = item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
+            else:
+                new_state = item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
+            item_SM.update_state_single_item(self.session, share_item, new_state)
+        return not any(table.tableUri in failed for table, _, _ in items)
+
     def grant_pivot_role_all_database_permissions(self) -> bool:
         """
         Grants 'ALL' database Lake Formation permissions to data.all PivotRole
@@ -219,177 +356,12 @@ class LFShareManager:
             database=self.shared_db_name,
         )
 
-    @classmethod
-    def create_resource_link(cls, **data) -> dict:
-        """
-        Creates a resource link to the source shared Glue table
-        Parameters
-        ----------
-        data : data of source and target accounts
-
-        Returns
-        -------
-        boto3 creation response
-        """
-        source = data['source']
-        target = data['target']
-        target_session = SessionHelper.remote_session(accountid=target['accountid'])
-        lakeformation_client = target_session.client(
-            'lakeformation', region_name=target['region']
-        )
-        target_database = target['database']
-        resource_link_input = {
-            'Name': source['tablename'],
-            'TargetTable': {
-                'CatalogId': data['source']['accountid'],
-                'DatabaseName': source['database'],
-                'Name': source['tablename'],
-            },
-        }
-
-        try:
-            resource_link = Glue.create_resource_link(
-                accountid=target['accountid'],
-                region=target['region'],
-                database=target_database,
-                resource_link_name=source['tablename'],
-                resource_link_input=resource_link_input,
-            )
-
-            LakeFormation.grant_resource_link_permission(
-                lakeformation_client, source, target, target_database
-            )
-
-            LakeFormation.grant_resource_link_permission_on_target(
-                lakeformation_client, source, target
-            )
-
-            return resource_link
-
-        except ClientError as e:
-            logger.warning(
-                f'Resource Link {resource_link_input} was not created due to: {e}'
-            )
-            raise e
-
-    def revoke_table_resource_link_access(self, table: models.DatasetTable, principals: [str]):
-        """
-        Revokes access to glue table resource link
-        Parameters
-        ----------
-        table : models.DatasetTable
-        principals: List of strings. IAM role arn and Quicksight groups
-
-        Returns
-        -------
-        True if revoke is successful
-        """
-        if not Glue.table_exists(
-            accountid=self.target_environment.AwsAccountId,
-            region=self.target_environment.region,
-            database=self.shared_db_name,
-            tablename=table.GlueTableName,
-        ):
-            logger.info(
-                f'Resource link could not be found '
-                f'on {self.target_environment.AwsAccountId}/{self.shared_db_name}/{table.GlueTableName} '
-                f'skipping revoke actions...'
-            )
-            return True
-
-        for principal in principals:
-            logger.info(
-                f'Revoking resource link access '
-                f'on {self.target_environment.AwsAccountId}/{self.shared_db_name}/{table.GlueTableName} '
-                f'for principal {principal}'
-
-            )
-            LakeFormation.batch_revoke_permissions(
-                SessionHelper.remote_session(self.target_environment.AwsAccountId).client(
-                    'lakeformation', region_name=self.target_environment.region
-                ),
-                self.target_environment.AwsAccountId,
-                [
-                    {
-                        'Id': str(uuid.uuid4()),
-                        'Principal': {
-                            'DataLakePrincipalIdentifier': principal
-                        },
-                        'Resource': {
-                            'Table': {
-                                'DatabaseName': self.shared_db_name,
-                                'Name': table.GlueTableName,
-                                'CatalogId': self.target_environment.AwsAccountId,
-                            }
-                        },
-                        'Permissions': ['DESCRIBE'],
-                    }
-                ],
-            )
-        return True
-
-    def revoke_source_table_access(self, table, principals: [str]):
-        """
-        Revokes access to the source glue table
-        Parameters
-        ----------
-        table : models.DatasetTable
-
-        Returns
-        -------
-        True if revoke is successful
-        """
-        if not Glue.table_exists(
-            accountid=self.target_environment.AwsAccountId,
-            region=self.target_environment.region,
-            database=self.shared_db_name,
-            tablename=table.GlueTableName,
-        ):
-            logger.info(
-                f'Source table could not be found '
-                f'on {self.source_environment.AwsAccountId}/{self.dataset.GlueDatabaseName}/{table.GlueTableName} '
-                f'skipping revoke actions...'
-            )
-            return True
-
-        logger.info(
-            f'Revoking source table access '
-            f'on {self.source_environment.AwsAccountId}/{self.dataset.GlueDatabaseName}/{table.GlueTableName} '
-            f'for principals {principals}'
-        )
-        LakeFormation.revoke_source_table_access(
-            target_accountid=self.target_environment.AwsAccountId,
-            region=self.target_environment.region,
-            source_database=self.dataset.GlueDatabaseName,
-            source_table=table.GlueTableName,
-            target_principals=principals,
-            source_accountid=self.source_environment.AwsAccountId,
-        )
-        return True
-
-    def delete_resource_link_table(self, table: models.DatasetTable):
-        logger.info(f'Deleting shared table {table.GlueTableName}')
-
-        if not Glue.table_exists(
-                accountid=self.target_environment.AwsAccountId,
-                region=self.target_environment.region,
-                database=self.shared_db_name,
-                tablename=table.GlueTableName,
-        ):
-            return True
-        Glue.delete_table(
-            accountid=self.target_environment.AwsAccountId,
-            region=self.target_environment.region,
-            database=self.shared_db_name,
-            tablename=table.GlueTableName
-        )
-        return True
-
     @classmethod
     def share_table_with_target_account(cls, **data):
         """
         Shares tables using Lake Formation
-        Sharing feature may take some extra seconds
+        Sharing feature may take some extra seconds,
+        RAM invitations acceptance waits for the resource share to be created
         :param data:
         :return:
         """
@@ -411,7 +383,6 @@ class LFShareManager:
                 data['source']['database'],
                 data['source']['tablename'],
             )
-            time.sleep(1)
 
             LakeFormation.grant_permissions_to_table(
                 source_lf_client,
@@ -421,7 +392,6 @@ class LFShareManager:
                 ['DESCRIBE', 'SELECT'],
                 ['DESCRIBE', 'SELECT'],
             )
-            time.sleep(2)
 
             logger.info(
                 f"Granted access to table {data['source']['tablename']} "
@@ -438,6 +408,223 @@ class LFShareManager:
             )
             raise e
 
+    def share_tables_with_target_account(self, tables: [models.DatasetTable]) -> dict:
+        """
+        Shares tables with the target account using Lake Formation batch operations
+        1) revokes IAMAllowedGroups super permission from all the tables
+        2) grants DESCRIBE and SELECT with grant option to the target account on all the tables
+        Parameters
+        ----------
+        tables : tables to share
+
+        Returns
+        -------
+        dict of tableUri to error message for the tables that could not be shared
+        """
+        if not tables:
+            return {}
+        source_accountid = self.source_environment.AwsAccountId
+        source_region = self.source_environment.region
+
+        iam_allowed_groups = LFPermissionsBatch(source_accountid, source_region, revoke=True)
+        grants = LFPermissionsBatch(source_accountid, source_region)
+        for table in tables:
+            resource = {
+                'Table': {
+                    'DatabaseName': table.GlueDatabaseName,
+                    'Name': table.GlueTableName,
+                    'CatalogId': source_accountid,
+                }
+            }
+            iam_allowed_groups.add(table.tableUri, 'EVERYONE', resource, ['ALL'])
+            grants.add(
+                table.tableUri,
+                self.target_environment.AwsAccountId,
+                resource,
+                ['DESCRIBE', 'SELECT'],
+                ['DESCRIBE', 'SELECT'],
+            )
+        not_revoked = iam_allowed_groups.send()
+        if not_revoked:
+            logger.debug(f'Could not revoke IAMAllowedGroups Super permission on tables {not_revoked}')
+
+        # The revoke may take a moment to propagate, grants failing meanwhile are retried with backoff
+        result = {'failed': grants.send()}
+
+        def regrant_failed():
+            result['failed'] = grants.send(keys=result['failed'].keys())
+            return not result['failed']
+
+        if result['failed']:
+            Waiter.wait_until(
+                regrant_failed,
+                f'Lake Formation grants to account {self.target_environment.AwsAccountId}',
+                timeout=LF_PROPAGATION_TIMEOUT,
+            )
+        failed = result['failed']
+        logger.info(
+            f'Granted access to {len(tables) - len(failed)}/{len(tables)} tables '
+            f'to external account {self.target_environment.AwsAccountId}'
+        )
+        return failed
+
+    def create_resource_links(self, tables: [models.DatasetTable]) -> dict:
+        """
+        Creates the resource links of the tables in the shared database
+        and grants the share principals access to them with one batch operation
+        Parameters
+        ----------
+        tables : tables to share
+
+        Returns
+        -------
+        dict of tableUri to error message for the tables that could not be linked
+        """
+        failed = {}
+        grants = LFPermissionsBatch(self.target_environment.AwsAccountId, self.target_environment.region)
+        for table in tables:
+            data = self.build_share_data(table)
+            source = data['source']
+            target = data['target']
+            try:
+                Glue.create_resource_link(
+                    accountid=target['accountid'],
+                    region=target['region'],
+                    database=target['database'],
+                    resource_link_name=source['tablename'],
+                    resource_link_input={
+                        'Name': source['tablename'],
+                        'TargetTable': {
+                            'CatalogId': source['accountid'],
+                            'DatabaseName': source['database'],
+                            'Name': source['tablename'],
+                        },
+                    },
+                )
+            except ClientError as e:
+                logger.warning(f'Resource Link for table {table.GlueTableName} was not created due to: {e}')
+                failed[table.tableUri] = str(e)
+                continue
+
+            for principal in target['principals']:
+                # Resource link only supports DESCRIBE and DROP permissions no SELECT
+                grants.add(
+                    table.tableUri,
+                    principal,
+                    {
+                        'Table': {
+                            'DatabaseName': target['database'],
+                            'Name': source['tablename'],
+                            'CatalogId': target['accountid'],
+                        }
+                    },
+                    ['DESCRIBE'],
+                )
+                grants.add(
+                    table.tableUri,
+                    principal,
+                    {
+                        'TableWithColumns': {
+                            'DatabaseName': source['database'],
+                            'Name': source['tablename'],
+                            'ColumnWildcard': {},
+                            'CatalogId': source['accountid'],
+                        }
+                    },
+                    ['DESCRIBE', 'SELECT'],
+                )
+        failed.update(grants.send())
+        return failed
+
+    def revoke_tables_access(self, tables: [models.DatasetTable], principals: [str]) -> dict:
+        """
+        Revokes the share principals access to the resource links and to the source tables
+        with one batch operation, then deletes the resource links
+        Parameters
+        ----------
+        tables : revoked tables
+        principals: List of strings. IAM role arn and Quicksight groups
+
+        Returns
+        -------
+        dict of tableUri to error message for the tables that could not be revoked
+        """
+        target_accountid = self.target_environment.AwsAccountId
+        revokes = LFPermissionsBatch(target_accountid, self.target_environment.region, revoke=True)
+        linked_tables = []
+        failed = {}
+        for table in tables:
+            try:
+                resource_link = Glue.table_exists(
+                    accountid=target_accountid,
+                    region=self.target_environment.region,
+                    database=self.shared_db_name,
+                    tablename=table.GlueTableName,
+                )
+            except ClientError as e:
+                failed[table.tableUri] = str(e)
+                continue
+            if not resource_link:
+                logger.info(
+                    f'Resource link could not be found '
+                    f'on {target_accountid}/{self.shared_db_name}/{table.GlueTableName} '
+                    f'skipping revoke actions...'
+                )
+                continue
+            linked_tables.append(table)
+            for principal in principals:
+                revokes.add(
+                    table.tableUri,
+                    principal,
+                    {
+                        'Table': {
+                            'DatabaseName': self.shared_db_name,
+                            'Name': table.GlueTableName,
+                            'CatalogId': target_accountid,
+                        }
+                    },
+                    ['DESCRIBE'],
+                )
+                revokes.add(
+                    table.tableUri,
+                    principal,
+                    {
+                        'Table': {
+                            'DatabaseName': self.dataset.GlueDatabaseName,
+                            'Name': table.GlueTableName,
+                            'CatalogId': self.source_environment.AwsAccountId,
+                        }
+                    },
+                    ['DESCRIBE'],
+                )
+                revokes.add(
+                    table.tableUri,
+                    principal,
+                    {
+                        'TableWithColumns': {
+                            'DatabaseName': self.dataset.GlueDatabaseName,
+                            'Name': table.GlueTableName,
+                            'ColumnWildcard': {},
+                            'CatalogId': self.source_environment.AwsAccountId,
+                        }
+                    },
+                    ['SELECT'],
+                )
+        failed.update(revokes.send())
+        for table in linked_tables:
+            if table.tableUri in failed:
+                continue
+            try:
+                Glue.delete_table(
+                    accountid=target_accountid,
+                    region=self.target_environment.region,
+                    database=self.shared_db_name,
+                    tablename=table.GlueTableName,
+                )
+            except Exception as e:
+                failed[table.tableUri] = str(e)
+        return failed
+
     def revoke_external_account_access_on_source_account(self) -> [dict]:
         """
         1) Revokes access to external account
@@ -477,9 +664,9 @@ class LFShareManager:
                     'PermissionsWithGrantOption': ['DESCRIBE', 'SELECT'],
                 }
             )
-            LakeFormation.batch_revoke_permissions(
-                client, self.source_environment.AwsAccountId, revoke_entries
-            )
+        LakeFormation.batch_revoke_permissions(
+            client, self.source_environment.AwsAccountId, revoke_entries
+        )
         return revoke_entries
 
     def delete_ram_resource_shares(self, resource_arn: str) -> [dict]:
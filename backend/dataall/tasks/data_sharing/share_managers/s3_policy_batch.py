@@ -0,0 +1,136 @@
+import json
+import logging
+import threading
+
+from .s3_share_manager import S3ShareManager
+from ....aws.handlers.kms import KMS
+from ....aws.handlers.s3 import S3
+from ....aws.handlers.sts import SessionHelper
+
+logger = logging.getLogger(__name__)
+
+
+class S3PolicyBatch:
+    """
+    Coalesces the dataset bucket policy and KMS key policy updates of shared folders.
+    Folders of one share, or of several shares, are grouped by bucket and by key:
+    each policy is read once, the merged statements are computed once and
+    the policy is written once, only if the computed document changed.
+    Read-modify-write cycles on the same policy are serialized across threads
+    so that shares refreshed concurrently do not lose each other's updates.
+    """
+
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self):
+        self.buckets = {}
+        self.keys = {}
+        self.items = {}
+        self._role_ids = {}
+
+    @classmethod
+    def _lock(cls, resource) -> threading.Lock:
+        with cls._locks_guard:
+            return cls._locks.setdefault(resource, threading.Lock())
+
+    def get_role_id(self, account_id: str, role_name: str):
+        if (account_id, role_name) not in self._role_ids:
+            self._role_ids[(account_id, role_name)] = SessionHelper.get_role_id(account_id, role_name)
+        return self._role_ids[(account_id, role_name)]
+
+    def get_role_ids(self, account_id: str, role_arns: [str]) -> [str]:
+        arns = tuple(sorted(arn for arn in role_arns if arn))
+        if (account_id, arns) not in self._role_ids:
+            self._role_ids[(account_id, arns)] = SessionHelper.get_role_ids(account_id, list(arns))
+        return self._role_ids[(account_id, arns)]
+
+    def add_folder(self, manager: S3ShareManager):
+        """
+        Registers the bucket and key policy updates needed to share a folder
+        Parameters
+        ----------
+        manager : S3ShareManager of the shared folder
+        """
+        region = manager.source_environment.region
+        bucket = ('bucket', manager.source_account_id, region, manager.bucket_name)
+        self.buckets.setdefault(bucket, set()).update([manager.dataset_admin, manager.source_env_admin])
+        self.items.setdefault(bucket, []).append(manager.share_item.shareItemUri)
+
+        key = ('key', manager.source_account_id, region, f"alias/{manager.dataset.KmsAlias}")
+        self.keys.setdefault(key, set()).add((manager.target_account_id, manager.target_requester_IAMRoleName))
+        self.items.setdefault(key, []).append(manager.share_item.shareItemUri)
+
+    def apply(self) -> dict:
+        """
+        Writes the registered bucket and key policies
+        Returns
+        -------
+        dict of shareItemUri to error for the folders whose bucket or key policy could not be updated
+        """
+        failed = {}
+        for resource, admin_roles in self.buckets.items():
+            try:
+                with self._lock(resource):
+                    self.update_bucket_policy(*resource[1:], admin_roles)
+            except Exception as e:
+                logger.error(f'Failed to update bucket policy of {resource[3]} due to: {e}')
+                failed.update({uri: e for uri in self.items[resource] if uri not in failed})
+
+        for resource, requesters in self.keys.items():
+            try:
+                with self._lock(resource):
+                    self.update_key_policy(*resource[1:], requesters)
+            except Exception as e:
+                logger.error(f'Failed to update KMS key policy of {resource[3]} due to: {e}')
+                failed.update({uri: e for uri in self.items[resource] if uri not in failed})
+        return failed
+
+    def update_bucket_policy(self, account_id: str, region: str, bucket_name: str, admin_roles: set) -> bool:
+        """
+        Grants admin access to dataset admin, pivot role and environment admin in the bucket policy.
+        Returns True if the policy was written
+        """
+        bucket_policy = json.loads(S3.get_bucket_policy(account_id, region, bucket_name))
+        if any(
+            statement.get("Sid") in ["AllowAllToAdmin", "DelegateAccessToAccessPoint"]
+            for statement in bucket_policy["Statement"]
+        ):
+            logger.info(f'Bucket policy of {bucket_name} is up to date, skipping...')
+            return False
+
+        exceptions_roleId = [
+            f'{item}:*' for item in self.get_role_ids(
+                account_id,
+                list(admin_roles) + [SessionHelper.get_delegation_role_arn(account_id)],
+            )
+        ]
+        bucket_policy["Statement"].extend(
+            S3ShareManager.build_bucket_admin_statements(bucket_name, account_id, exceptions_roleId)
+        )
+        logger.info(f'Updating bucket policy of {bucket_name}...')
+        S3.create_bucket_policy(account_id, region, bucket_name, json.dumps(bucket_policy))
+        return True
+
+    def update_key_policy(self, account_id: str, region: str, key_alias: str, requesters: set) -> bool:
+        """
+        Allows all the requester roles to decrypt with the KMS key.
+        Returns True if the policy was written
+        """
+        kms_keyId = KMS.get_key_id(account_id, region, key_alias)
+        existing_policy = KMS.get_key_policy(account_id, region, kms_keyId, "default")
+        if not existing_policy:
+            return False
+
+        policy = json.loads(existing_policy)
+        for target_account_id, role_name in sorted(requesters):
+            target_requester_id = self.get_role_id(target_account_id, role_name)
+            if f'{target_requester_id}:*' not in existing_policy:
+                policy["Statement"].append(S3ShareManager.build_key_decrypt_statement(target_requester_id))
+
+        if policy == json.loads(existing_policy):
+            logger.info(f'KMS key policy of {key_alias} is up to date, skipping...')
+            return False
+        logger.info(f'Updating KMS key policy of {key_alias}...')
+        KMS.put_key_policy(account_id, region, kms_keyId, "default", json.dumps(policy))
+        return True
@@ -1,19 +1,18 @@
 import abc
 import logging
 import json
-import time
 
 from ....db import models, api, utils
 from ....aws.handlers.sts import SessionHelper
 from ....aws.handlers.s3 import S3
 from ....aws.handlers.kms import KMS
 from ....aws.handlers.iam import IAM
+from ....aws.handlers.waiter import Waiter
 
 from ....utils.alarm_service import AlarmService
 
 logger = logging.getLogger(__name__)
-ACCESS_POINT_CREATION_TIME = 30
-ACCESS_POINT_CREATION_RETRIES = 5
+ACCESS_POINT_CREATION_TIMEOUT = 150
 
 
 class S3ShareManager:
@@ -91,14 +90,25 @@ class S3ShareManager:
             self.source_account_id,
             [self.dataset_admin, self.source_env_admin, SessionHelper.get_delegation_role_arn(self.source_account_id)]
         )]
+        bucket_policy["Statement"].extend(
+            self.build_bucket_admin_statements(self.bucket_name, self.source_account_id, exceptions_roleId)
+        )
+        S3.create_bucket_policy(self.source_account_id, self.source_environment.region, self.bucket_name, json.dumps(bucket_policy))
+
+    @staticmethod
+    def build_bucket_admin_statements(bucket_name: str, source_account_id: str, exceptions_roleId: [str]) -> [dict]:
+        """
+        Statements granting admin access to the bucket to the admin roles ids
+        and delegating access control to the access points of the account
+        """
         allow_owner_access = {
             "Sid": "AllowAllToAdmin",
             "Effect": "Allow",
             "Principal": "*",
             "Action": "s3:*",
             "Resource": [
-                f"arn:aws:s3:::{self.bucket_name}",
-                f"arn:aws:s3:::{self.bucket_name}/*"
+                f"arn:aws:s3:::{bucket_name}",
+                f"arn:aws:s3:::{bucket_name}/*"
             ],
             "Condition": {
                 "StringLike": {
@@ -112,18 +122,16 @@ class S3ShareManager:
             "Principal": "*",
             "Action": "s3:*",
             "Resource": [
-                f"arn:aws:s3:::{self.bucket_name}",
-                f"arn:aws:s3:::{self.bucket_name}/*"
+                f"arn:aws:s3:::{bucket_name}",
+                f"arn:aws:s3:::{bucket_name}/*"
             ],
             "Condition": {
                 "StringEquals": {
-                    "s3:DataAccessPointAccount": f"{self.source_account_id}"
+                    "s3:DataAccessPointAccount": f"{source_account_id}"
                 }
             }
         }
-        bucket_policy["Statement"].append(allow_owner_access)
-        bucket_policy["Statement"].append(delegated_to_accesspoint)
-        S3.create_bucket_policy(self.source_account_id, self.source_environment.region, self.bucket_name, json.dumps(bucket_policy))
+        return [allow_owner_access, delegated_to_accesspoint]
 
     def grant_target_role_access_policy(self):
         """
@@ -198,13 +206,13 @@ class S3ShareManager:
             )
             access_point_arn = S3.create_bucket_access_point(self.source_account_id, self.source_environment.region, self.bucket_name, self.access_point_name)
             # Access point creation is slow
-            retries = 1
-            while not S3.get_bucket_access_point_arn(self.source_account_id, self.source_environment.region, self.access_point_name) and retries < ACCESS_POINT_CREATION_RETRIES:
-                logger.info(
-                    'Waiting 30s for access point creation to complete..'
-                )
-                time.sleep(ACCESS_POINT_CREATION_TIME)
-                retries += 1
+            Waiter.wait_until(
+                lambda: S3.get_bucket_access_point_arn(
+                    self.source_account_id, self.source_environment.region, self.access_point_name
+                ),
+                f'access point {self.access_point_name} creation to complete',
+                timeout=ACCESS_POINT_CREATION_TIMEOUT,
+            )
         existing_policy = S3.get_access_point_policy(self.source_account_id, self.source_environment.region, self.access_point_name)
         # requester will use this role to access resources
         target_requester_id = SessionHelper.get_role_id(self.target_account_id, self.target_requester_IAMRoleName)
@@ -278,22 +286,7 @@ class S3ShareManager:
         target_requester_id = SessionHelper.get_role_id(self.target_account_id, self.target_requester_IAMRoleName)
         if existing_policy and f'{target_requester_id}:*' not in existing_policy:
             policy = json.loads(existing_policy)
-            policy["Statement"].append(
-                {
-                    "Sid": f"{target_requester_id}",
-                    "Effect": "Allow",
-                    "Principal": {
-                        "AWS": "*"
-                    },
-                    "Action": "kms:Decrypt",
-                    "Resource": "*",
-                    "Condition": {
-                        "StringLike": {
-                            "aws:userId": f"{target_requester_id}:*"
-                        }
-                    }
-                }
-            )
+            policy["Statement"].append(self.build_key_decrypt_statement(target_requester_id))
             KMS.put_key_policy(
                 self.source_account_id,
                 self.source_environment.region,
@@ -302,6 +295,26 @@ class S3ShareManager:
                 json.dumps(policy)
             )
 
+    @staticmethod
+    def build_key_decrypt_statement(target_requester_id: str) -> dict:
+        """
+        Statement allowing the requester role id to decrypt with the dataset KMS key
+        """
+        return {
+            "Sid": f"{target_requester_id}",
+            "Effect": "Allow",
+            "Principal": {
+                "AWS": "*"
+            },
+            "Action": "kms:Decrypt",
+            "Resource": "*",
+            "Condition": {
+                "StringLike": {
+                    "aws:userId": f"{target_requester_id}:*"
+                }
+            }
+        }
+
     def delete_access_point_policy(self):
         logger.info(
             f'Deleting access point policy for access point {self.access_point_name}...'
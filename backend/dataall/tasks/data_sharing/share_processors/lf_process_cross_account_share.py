@@ -36,15 +36,15 @@ class ProcessLFCrossAccountShare(LFShareManager):
         1) Grant ALL permissions to pivotRole for source database in source account
         2) Get share principals (requester IAM role and QS groups) and build shared db name
         3) Create the shared database in target account if it doesn't exist
-        4) For each shared table:
-            a) update its status to SHARE_IN_PROGRESS with Action Start
-            b) check if share item exists on glue catalog raise error if not and flag share item status to failed
-            c) grant external account (target account) access to table -> create RAM invitation and revoke_iamallowedgroups_super_permission_from_table
-            d) accept pending RAM invitation
-            e) create resource link for table in target account
-            f) grant permission to table for requester team IAM role in source account
-            g) grant permission to resource link table for requester team IAM role in target account
-            h) update share item status to SHARE_SUCCESSFUL with Action Success
+        4) Update the status of the shared tables items to SHARE_IN_PROGRESS with Action Start
+        5) Check if share items exist on glue catalog and flag share items status to failed if not
+        6) Grant external account (target account) access to all tables in one batch -> create RAM invitations
+           and revoke_iamallowedgroups_super_permission_from_table
+        7) For each table accept pending RAM invitation
+        8) Create resource links for tables in target account
+           and grant permissions to resource links and tables for requester team IAM role in one batch
+        9) Update share items status to SHARE_SUCCESSFUL with Action Success
+           or SHARE_FAILED with Action Failure for the tables that failed any step
 
         Returns
         -------
@@ -55,75 +55,57 @@ class ProcessLFCrossAccountShare(LFShareManager):
         log.info(
             '##### Starting Sharing tables cross account #######'
         )
-        success = True
         if not self.shared_tables:
             log.info("No tables to share. Skipping...")
-        else:
-            self.grant_pivot_role_all_database_permissions()
+            return True
 
-            shared_db_name = self.build_shared_db_name()
-            principals = self.get_share_principals()
+        self.grant_pivot_role_all_database_permissions()
 
-            self.create_shared_database(
-                self.target_environment, self.dataset, shared_db_name, principals
-            )
-
-            for table in self.shared_tables:
-                log.info(f"Sharing table {table.GlueTableName}...")
-
-                share_item = api.ShareObject.find_share_item_by_table(
-                    self.session, self.share, table
-                )
-
-                if not share_item:
-                    log.info(
-                        f'Share Item not found for {self.share.shareUri} '
-                        f'and Dataset Table {table.GlueTableName} continuing loop...'
-                    )
-                    continue
+        shared_db_name = self.build_shared_db_name()
+        principals = self.get_share_principals()
 
-                shared_item_SM = api.ShareItemSM(models.ShareItemStatus.Share_Approved.value)
-                new_state = shared_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-                shared_item_SM.update_state_single_item(self.session, share_item, new_state)
+        self.create_shared_database(
+            self.target_environment, self.dataset, shared_db_name, principals
+        )
 
-                try:
+        items, failed = self.start_share_items(
+            self.shared_tables, models.ShareItemStatus.Share_Approved.value
+        )
+        tables = [table for table, _, _ in items if table.tableUri not in failed]
+        log.info(f"Sharing tables {[table.GlueTableName for table in tables]}...")
+        failed.update(self.share_tables_with_target_account(tables))
 
-                    self.check_share_item_exists_on_glue_catalog(share_item, table)
+        for table in tables:
+            if table.tableUri in failed:
+                continue
+            try:
+                data = self.build_share_data(table)
+                (
+                    retry_share_table,
+                    failed_invitations,
+                ) = Ram.accept_ram_invitation(**data)
 
-                    data = self.build_share_data(table)
+                if retry_share_table:
                     self.share_table_with_target_account(**data)
+                    Ram.accept_ram_invitation(**data)
+            except Exception as e:
+                failed[table.tableUri] = e
 
-                    (
-                        retry_share_table,
-                        failed_invitations,
-                    ) = Ram.accept_ram_invitation(**data)
-
-                    if retry_share_table:
-                        self.share_table_with_target_account(**data)
-                        Ram.accept_ram_invitation(**data)
-
-                    self.create_resource_link(**data)
-
-                    new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-                except Exception as e:
-                    self.handle_share_failure(table=table, share_item=share_item, error=e)
-                    new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                    shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-                    success = False
-
-        return success
+        failed.update(
+            self.create_resource_links([table for table in tables if table.tableUri not in failed])
+        )
+        return self.finish_share_items(items, failed, models.ShareItemStatus.Share_Approved.value)
 
     def process_revoked_shares(self) -> bool:
         """
-        For each revoked request item:
-            a) update its status to REVOKE_IN_PROGRESS with Action Start
-            b) check if item exists on glue catalog raise error if not and flag item status to failed
-            c) revoke table resource link: undo grant permission to resource link table for team role in target account
-            d) revoke source table access: undo grant permission to table for team role in source account
-            e) delete resource link table
-            h) update share item status to REVOKE_SUCCESSFUL with Action Success
+        1) Update the status of the revoked tables items to REVOKE_IN_PROGRESS with Action Start
+        2) Check if items exist on glue catalog and flag items status to failed if not
+        3) In one batch revoke table resource links and source tables access:
+           undo grant permission to resource link table for team role in target account
+           and undo grant permission to table for team role in source account
+        4) Delete resource link tables
+        5) Update share items status to REVOKE_SUCCESSFUL with Action Success
+           or REVOKE_FAILED with Action Failure for the tables that failed any step
 
         Returns
         -------
@@ -133,41 +115,18 @@ class ProcessLFCrossAccountShare(LFShareManager):
         log.info(
             '##### Starting Revoking tables cross account #######'
         )
-        success = True
         shared_db_name = self.build_shared_db_name()
         principals = self.get_share_principals()
-        for table in self.revoked_tables:
-            share_item = api.ShareObject.find_share_item_by_table(
-                self.session, self.share, table
-            )
-
-            revoked_item_SM = api.ShareItemSM(models.ShareItemStatus.Revoke_Approved.value)
-            new_state = revoked_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-            revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            try:
-
-                self.check_share_item_exists_on_glue_catalog(share_item, table)
-
-                log.info(f'Starting revoke access for table: {table.GlueTableName} in database {shared_db_name} '
-                         f'For principals {principals}')
 
-                self.revoke_table_resource_link_access(table, principals)
-
-                self.revoke_source_table_access(table, principals)
-
-                self.delete_resource_link_table(table)
-
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            except Exception as e:
-                self.handle_revoke_failure(share_item=share_item, table=table, error=e)
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-                success = False
+        items, failed = self.start_share_items(
+            self.revoked_tables, models.ShareItemStatus.Revoke_Approved.value
+        )
+        tables = [table for table, _, _ in items if table.tableUri not in failed]
+        log.info(f'Starting revoke access for tables: {[table.GlueTableName for table in tables]} '
+                 f'in database {shared_db_name} For principals {principals}')
+        failed.update(self.revoke_tables_access(tables, principals))
 
-        return success
+        return self.finish_share_items(items, failed, models.ShareItemStatus.Revoke_Approved.value)
 
     def clean_up_share(self) -> bool:
         """"
@@ -34,13 +34,12 @@ class ProcessLFSameAccountShare(LFShareManager):
         1) Grant ALL permissions to pivotRole for source database in source account
         2) Get share principals (requester IAM role and QS groups) and build shared db name
         3) Create the shared database in target account if it doesn't exist
-        4) For each shared table:
-            a) update its status to SHARE_IN_PROGRESS with Action Start
-            b) check if share item exists on glue catalog raise error if not and flag share item status to failed
-            c) create resource link in account
-            d) grant permission to table for requester team IAM role in account
-            e) grant permission to resource link table for requester team IAM role in account
-            f) update share item status to SHARE_SUCCESSFUL with Action Success
+        4) Update the status of the shared tables items to SHARE_IN_PROGRESS with Action Start
+        5) Check if share items exist on glue catalog and flag share items status to failed if not
+        6) Create resource links in account
+           and grant permissions to resource links and tables for requester team IAM role in one batch
+        7) Update share items status to SHARE_SUCCESSFUL with Action Success
+           or SHARE_FAILED with Action Failure for the tables that failed any step
 
         Returns
         -------
@@ -49,110 +48,56 @@ class ProcessLFSameAccountShare(LFShareManager):
         log.info(
             '##### Starting Sharing tables same account #######'
         )
-
-        success = True
         if not self.shared_tables:
             log.info("No tables to share. Skipping...")
+            return True
 
-        else:
-            self.grant_pivot_role_all_database_permissions()
-
-            shared_db_name = self.build_shared_db_name()
-            principals = self.get_share_principals()
-
-            self.create_shared_database(
-                self.target_environment, self.dataset, shared_db_name, principals
-            )
-
-        for table in self.shared_tables:
-
-            share_item = api.ShareObject.find_share_item_by_table(
-                self.session, self.share, table
-            )
+        self.grant_pivot_role_all_database_permissions()
 
-            if not share_item:
-                log.info(
-                    f'Share Item not found for {self.share.shareUri} '
-                    f'and Dataset Table {table.GlueTableName} continuing loop...'
-                )
-                continue
-            shared_item_SM = api.ShareItemSM(models.ShareItemStatus.Share_Approved.value)
-            new_state = shared_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-            shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            try:
-                log.info(f'Starting sharing access for table: {table.GlueTableName}')
-                self.check_share_item_exists_on_glue_catalog(share_item, table)
-
-                data = self.build_share_data(table)
-                self.create_resource_link(**data)
+        shared_db_name = self.build_shared_db_name()
+        principals = self.get_share_principals()
 
-                new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                shared_item_SM.update_state_single_item(self.session, share_item, new_state)
+        self.create_shared_database(
+            self.target_environment, self.dataset, shared_db_name, principals
+        )
 
-            except Exception as e:
-                self.handle_share_failure(table, share_item, e)
-                new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                shared_item_SM.update_state_single_item(self.session, share_item, new_state)
-                success = False
+        items, failed = self.start_share_items(
+            self.shared_tables, models.ShareItemStatus.Share_Approved.value
+        )
+        tables = [table for table, _, _ in items if table.tableUri not in failed]
+        log.info(f'Starting sharing access for tables: {[table.GlueTableName for table in tables]}')
+        failed.update(self.create_resource_links(tables))
 
-        return success
+        return self.finish_share_items(items, failed, models.ShareItemStatus.Share_Approved.value)
 
     def process_revoked_shares(self) -> bool:
         """
-        For each revoked request item:
-            a) update its status to REVOKE_IN_PROGRESS with Action Start
-            b) check if item exists on glue catalog raise error if not and flag item status to failed
-            c) revoke table resource link: undo grant permission to resource link table for team role in account
-            d) revoke source table access: undo grant permission to table for team role in account
-            e) delete resource link table
-            h) update share item status to REVOKE_SUCCESSFUL with Action Success
+        1) Update the status of the revoked tables items to REVOKE_IN_PROGRESS with Action Start
+        2) Check if items exist on glue catalog and flag items status to failed if not
+        3) In one batch revoke table resource links and source tables access:
+           undo grant permission to resource link table for team role in account
+           and undo grant permission to table for team role in account
+        4) Delete resource link tables
+        5) Update share items status to REVOKE_SUCCESSFUL with Action Success
+           or REVOKE_FAILED with Action Failure for the tables that failed any step
 
         Returns
         -------
         True if share is revoked successfully
         False if revoke fails
         """
-        success = True
         shared_db_name = self.build_shared_db_name()
         principals = self.get_share_principals()
-        for table in self.revoked_tables:
-            share_item = api.ShareObject.find_share_item_by_table(
-                self.session, self.share, table
-            )
-            if not share_item:
-                log.info(
-                    f'Share Item not found for {self.share.shareUri} '
-                    f'and Dataset Table {table.GlueTableName} continuing loop...'
-                )
-                continue
-
-            revoked_item_SM = api.ShareItemSM(models.ShareItemStatus.Revoke_Approved.value)
-            new_state = revoked_item_SM.run_transition(models.Enums.ShareObjectActions.Start.value)
-            revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            try:
-                self.check_share_item_exists_on_glue_catalog(share_item, table)
-
-                log.info(f'Starting revoke access for table: {table.GlueTableName} in database {shared_db_name} '
-                         f'For principals {principals}')
-
-                self.revoke_table_resource_link_access(table, principals)
 
-                self.revoke_source_table_access(table, principals)
-
-                self.delete_resource_link_table(table)
-
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-
-            except Exception as e:
-                self.handle_revoke_failure(share_item, table, e)
-                new_state = revoked_item_SM.run_transition(models.Enums.ShareItemActions.Failure.value)
-                revoked_item_SM.update_state_single_item(self.session, share_item, new_state)
-                success = False
+        items, failed = self.start_share_items(
+            self.revoked_tables, models.ShareItemStatus.Revoke_Approved.value
+        )
+        tables = [table for table, _, _ in items if table.tableUri not in failed]
+        log.info(f'Starting revoke access for tables: {[table.GlueTableName for table in tables]} '
+                 f'in database {shared_db_name} For principals {principals}')
+        failed.update(self.revoke_tables_access(tables, principals))
 
-        return success
+        return self.finish_share_items(items, failed, models.ShareItemStatus.Revoke_Approved.value)
 
     def clean_up_share(self) -> bool:
         """"
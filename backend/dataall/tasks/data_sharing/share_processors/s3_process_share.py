@@ -1,7 +1,7 @@
 import logging
 
 from ....db import models, api
-from ..share_managers import S3ShareManager
+from ..share_managers import S3ShareManager, S3PolicyBatch
 
 
 log = logging.getLogger(__name__)
@@ -45,11 +45,10 @@ class ProcessS3Share(S3ShareManager):
     ) -> bool:
         """
         1) update_share_item_status with Start action
-        2) (one time only) manage_bucket_policy - grants permission in the bucket policy
+        2) update the bucket policy and the KMS key policy once for all the folders
         3) grant_target_role_access_policy
         4) manage_access_point_and_policy
-        5) update_dataset_bucket_key_policy
-        6) update_share_item_status with Finish action
+        5) update_share_item_status with Finish action
 
         Returns
         -------
@@ -58,7 +57,8 @@ class ProcessS3Share(S3ShareManager):
         log.info(
             '##### Starting Sharing folders #######'
         )
-        success = True
+        sharing_folders = []
+        policy_batch = S3PolicyBatch()
         for folder in share_folders:
             log.info(f'sharing folder: {folder}')
             sharing_item = api.ShareObject.find_share_item_by_folder(
@@ -80,12 +80,18 @@ class ProcessS3Share(S3ShareManager):
                 source_env_group,
                 env_group,
             )
+            policy_batch.add_folder(sharing_folder)
+            sharing_folders.append((sharing_item, shared_item_SM, sharing_folder))
+
+        failed = policy_batch.apply()
 
+        success = True
+        for sharing_item, shared_item_SM, sharing_folder in sharing_folders:
             try:
-                sharing_folder.manage_bucket_policy()
+                if sharing_item.shareItemUri in failed:
+                    raise failed[sharing_item.shareItemUri]
                 sharing_folder.grant_target_role_access_policy()
                 sharing_folder.manage_access_point_and_policy()
-                sharing_folder.update_dataset_bucket_key_policy()
 
                 new_state = shared_item_SM.run_transition(models.Enums.ShareItemActions.Success.value)
                 shared_item_SM.update_state_single_item(session, sharing_item, new_state)
@@ -0,0 +1,174 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ...aws.handlers.waiter import Waiter
+from ...db import in_current_context
+
+log = logging.getLogger(__name__)
+
+MAX_WORKERS = int(os.getenv('SHARES_REFRESH_MAX_WORKERS', '4'))
+SHARE_TIMEOUT = int(os.getenv('SHARES_REFRESH_SHARE_TIMEOUT', '900'))
+
+
+class ShareRefreshSummary:
+    """Outcome of a shares refresh run"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.duration = 0
+        self.succeeded = []
+        self.failed = []
+        self.timed_out = []
+        self.skipped = []
+        self.wait_times = {}
+        self._lock = threading.Lock()
+
+    def add(self, outcome: str, share_uri: str, error: str = None, wait_time: float = None):
+        with self._lock:
+            if wait_time is not None:
+                self.wait_times[share_uri] = round(wait_time, 2)
+            if outcome == 'succeeded':
+                self.succeeded.append(share_uri)
+            elif outcome == 'timed_out':
+                self.timed_out.append(share_uri)
+            elif outcome == 'skipped':
+                self.skipped.append(share_uri)
+            else:
+                self.failed.append({'shareUri': share_uri, 'error': error})
+
+    def finish(self):
+        self.duration = round(time.time() - self.started, 2)
+        return self
+
+    @property
+    def total(self):
+        return len(self.succeeded) + len(self.failed) + len(self.timed_out) + len(self.skipped)
+
+    @property
+    def throughput(self):
+        """Processed shares per minute"""
+        processed = self.total - len(self.skipped)
+        return round(processed * 60 / self.duration, 2) if self.duration else float(processed)
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'timed_out': len(self.timed_out),
+            'skipped': len(self.skipped),
+            'duration': self.duration,
+            'shares_per_minute': self.throughput,
+            'wait_time': round(sum(self.wait_times.values()), 2),
+            'wait_times': self.wait_times,
+            'failures': self.failed,
+            'timeouts': self.timed_out,
+        }
+
+
+class ShareRefreshExecutor:
+    """
+    Processes share refreshes concurrently.
+    Shares are grouped by (source account, target account): groups run in parallel
+    up to max_workers, shares within a group run one after the other to avoid
+    conflicting Lake Formation and RAM operations on the same pair of accounts.
+    """
+
+    def __init__(self, engine, process_share, max_workers=MAX_WORKERS, share_timeout=SHARE_TIMEOUT):
+        """
+        Parameters
+        ----------
+        engine : db.engine
+        process_share : callable(engine, share_uri, status) running the refresh of one share,
+            returning False when some items failed
+        max_workers : maximum number of account pairs processed at the same time
+        share_timeout : maximum seconds to wait for a single share
+        """
+        self.engine = engine
+        self.process_share = process_share
+        self.max_workers = max(1, max_workers)
+        self.share_timeout = share_timeout
+
+    @staticmethod
+    def group_by_accounts(shares) -> dict:
+        """
+        Groups shares by (source account, target account)
+        Parameters
+        ----------
+        shares : rows with shareUri, status, sourceAccountId and targetAccountId
+
+        Returns
+        -------
+        dict of account pair to the list of its shares
+        """
+        groups = {}
+        for share in shares:
+            groups.setdefault((share.sourceAccountId, share.targetAccountId), []).append(share)
+        return groups
+
+    def run(self, shares) -> ShareRefreshSummary:
+        summary = ShareRefreshSummary()
+        groups = self.group_by_accounts(shares)
+        log.info(
+            f'Refreshing {len(shares)} shares in {len(groups)} account groups '
+            f'with {self.max_workers} workers...'
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(in_current_context(self._process_group), group, summary): accounts
+                for accounts, group in groups.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    log.error(f'Failed refreshing shares for accounts {futures[future]} due to: {e}')
+        return summary.finish()
+
+    def _process_group(self, shares, summary: ShareRefreshSummary):
+        for index, share in enumerate(shares):
+            outcome, error, wait_time = self._process_with_timeout(share)
+            summary.add(outcome, share.shareUri, error, wait_time)
+            if outcome == 'timed_out':
+                # The timed out share may still be running, starting the next one
+                # would break the serialization for this pair of accounts
+                for remaining in shares[index + 1:]:
+                    log.warning(
+                        f'Skipping share {remaining.shareUri}, it will be refreshed on the next run'
+                    )
+                    summary.add('skipped', remaining.shareUri)
+                return
+
+    def _process_with_timeout(self, share):
+        result = {}
+
+        def target():
+            Waiter.reset_wait_time()
+            try:
+                log.info(f'Refreshing share {share.shareUri} with {share.status} status...')
+                if self.process_share(self.engine, share.shareUri, share.status) is False:
+                    result['outcome'] = 'failed'
+                    result['error'] = 'Some share items failed'
+                else:
+                    result['outcome'] = 'succeeded'
+            except Exception as e:
+                log.error(
+                    f'Failed refreshing share {share.shareUri} with {share.status}. '
+                    f'due to: {e}'
+                )
+                result['outcome'] = 'failed'
+                result['error'] = str(e)
+            result['wait_time'] = Waiter.get_wait_time()
+
+        worker = threading.Thread(
+            target=in_current_context(target), name=f'share-{share.shareUri}', daemon=True
+        )
+        worker.start()
+        worker.join(self.share_timeout)
+        if worker.is_alive():
+            log.error(f'Refreshing share {share.shareUri} timed out after {self.share_timeout}s')
+            return 'timed_out', None, None
+        return result.get('outcome', 'failed'), result.get('error'), result.get('wait_time')
@@ -0,0 +1,30 @@
+import logging
+import os
+import sys
+
+from .. import db
+from ..db import get_engine, collect_sql_stats
+
+root = logging.getLogger()
+root.setLevel(logging.INFO)
+if not root.hasHandlers():
+    root.addHandler(logging.StreamHandler(sys.stdout))
+log = logging.getLogger(__name__)
+
+
+def repair_dataset_counters(engine, dataset_uris: [str] = None) -> [str]:
+    """Recomputes the tables, folders and upvotes counters of the datasets that drifted"""
+    with engine.scoped_session() as session:
+        repaired = db.api.Dataset.repair_dataset_counters(session, dataset_uris)
+    if repaired:
+        log.warning(f'Repaired counters of {len(repaired)} datasets: {repaired}')
+    else:
+        log.info('Dataset counters are consistent')
+    return repaired
+
+
+if __name__ == '__main__':
+    ENVNAME = os.environ.get('envname', 'local')
+    ENGINE = get_engine(envname=ENVNAME)
+    with collect_sql_stats(operation='tasks.dataset_counters', summary=True):
+        repair_dataset_counters(engine=ENGINE)
@@ -0,0 +1,35 @@
+import logging
+import os
+import sys
+
+from .. import db
+from ..aws.handlers.glue import Glue
+from ..db import get_engine, collect_sql_stats
+
+root = logging.getLogger()
+root.setLevel(logging.INFO)
+if not root.hasHandlers():
+    root.addHandler(logging.StreamHandler(sys.stdout))
+log = logging.getLogger(__name__)
+
+STATUS_REFRESH_WINDOW = int(os.getenv('PROFILING_STATUS_REFRESH_WINDOW', '60'))
+
+
+def refresh_profiling_runs_status(engine):
+    """Refreshes the status of all the profiling runs that are not finished yet"""
+    with engine.scoped_session() as session:
+        unfinished = db.api.DatasetProfilingRun.list_unfinished_profiling_runs(session)
+        uris = db.api.DatasetProfilingRun.request_status_refresh(
+            session, unfinished, STATUS_REFRESH_WINDOW
+        )
+    log.info(
+        f'Found {len(unfinished)} unfinished profiling runs, refreshing {len(uris)} of them'
+    )
+    return Glue.poll_profiling_runs(engine, uris)
+
+
+if __name__ == '__main__':
+    ENVNAME = os.environ.get('envname', 'local')
+    ENGINE = get_engine(envname=ENVNAME)
+    with collect_sql_stats(operation='tasks.profiling_runs_status', summary=True):
+        refresh_profiling_runs_status(engine=ENGINE)
@@ -3,7 +3,7 @@ import os
 import sys
 
 from .data_sharing.data_sharing_service import DataSharingService
-from ..db import get_engine
+from ..db import get_engine, collect_sql_stats
 
 root = logging.getLogger()
 root.setLevel(logging.INFO)
@@ -22,13 +22,14 @@ if __name__ == '__main__':
         share_item_uri = os.getenv('shareItemUri')
         handler = os.getenv('handler')
 
-        if handler == 'approve_share':
-            log.info(f'Starting processing task for share : {share_uri}...')
-            DataSharingService.approve_share(engine=ENGINE, share_uri=share_uri)
+        with collect_sql_stats(operation=f'tasks.share_manager.{handler}', summary=True):
+            if handler == 'approve_share':
+                log.info(f'Starting processing task for share : {share_uri}...')
+                DataSharingService.approve_share(engine=ENGINE, share_uri=share_uri)
 
-        elif handler == 'revoke_share':
-            log.info(f'Starting revoking task for share : {share_uri}...')
-            DataSharingService.revoke_share(engine=ENGINE, share_uri=share_uri)
+            elif handler == 'revoke_share':
+                log.info(f'Starting revoking task for share : {share_uri}...')
+                DataSharingService.revoke_share(engine=ENGINE, share_uri=share_uri)
 
         log.info('Sharing task finished successfully')
 
@@ -3,7 +3,7 @@ import os
 import sys
 
 from .data_sharing.data_sharing_service import DataSharingService
-from ..db import get_engine
+from ..db import get_engine, collect_sql_stats
 
 root = logging.getLogger()
 root.setLevel(logging.INFO)
@@ -19,7 +19,8 @@ if __name__ == '__main__':
         ENGINE = get_engine(envname=ENVNAME)
 
         log.info('Starting refresh shares task...')
-        DataSharingService.refresh_shares(engine=ENGINE)
+        with collect_sql_stats(operation='tasks.shares_refresh', summary=True):
+            DataSharingService.refresh_shares(engine=ENGINE)
 
         log.info('Sharing task finished successfully')
 
@@ -6,7 +6,7 @@ import time
 from .. import db
 from ..db import models
 from ..aws.handlers.ecs import Ecs
-from ..db import get_engine
+from ..db import get_engine, collect_sql_stats
 from ..utils import Parameter
 
 root = logging.getLogger()
@@ -64,4 +64,5 @@ def update_stack(session, envname, target_uri, wait=False):
 if __name__ == '__main__':
     envname = os.environ.get('envname', 'local')
     engine = get_engine(envname=envname)
-    update_stacks(engine=engine, envname=envname)
+    with collect_sql_stats(operation='tasks.stacks_updater', summary=True):
+        update_stacks(engine=engine, envname=envname)
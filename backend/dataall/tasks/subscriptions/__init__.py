@@ -1,2 +1,2 @@
-from .sqs_poller import poll_queues
+from .sqs_poller import poll_queues, QueueConsumer
 from .subscription_service import SubscriptionService
@@ -2,6 +2,9 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.exceptions import ClientError
@@ -15,61 +18,198 @@ log = logging.getLogger(__name__)
 ENVNAME = os.getenv('envname', 'local')
 region = os.getenv('AWS_REGION', 'eu-west-1')
 
-
-def poll_queues(queues):
-    log.debug(f'Received Queues URL: {queues}')
-
-    messages = []
-
-    for queue in queues:
-
-        sqs = boto3.client(
-            'sqs',
-            region_name=queue['region'],
-            endpoint_url=f"https://sqs.{queue['region']}.amazonaws.com"
-        )
-        try:
-
-            response = sqs.receive_message(
-                QueueUrl=queue['url'],
-                AttributeNames=['SentTimestamp'],
-                MaxNumberOfMessages=10,
-                MessageAttributeNames=['All'],
+WAIT_TIME_SECONDS = int(os.getenv('SUBSCRIPTIONS_WAIT_TIME_SECONDS', '10'))
+TIME_BUDGET = int(os.getenv('SUBSCRIPTIONS_TIME_BUDGET', '600'))
+MAX_WORKERS = int(os.getenv('SUBSCRIPTIONS_MAX_WORKERS', '8'))
+MAX_RECEIVE_COUNT = int(os.getenv('SUBSCRIPTIONS_MAX_RECEIVE_COUNT', '5'))
+MAX_NUMBER_OF_MESSAGES = 10
+
+
+class QueueConsumer:
+    """
+    Consumes the producers queues of the environments.
+    Queues are long-polled concurrently, each queue is received from until it is
+    drained or the time budget is spent. Processed messages are deleted in batches,
+    messages that could not be processed are left on the queue and are delivered
+    again once their visibility timeout expires, until they were received
+    max_receive_count times: they are then discarded.
+    """
+
+    def __init__(
+        self,
+        queues,
+        wait_time=WAIT_TIME_SECONDS,
+        time_budget=TIME_BUDGET,
+        max_workers=MAX_WORKERS,
+        max_receive_count=MAX_RECEIVE_COUNT,
+    ):
+        self.queues = queues
+        self.wait_time = wait_time
+        self.time_budget = time_budget
+        self.max_workers = max(1, max_workers)
+        self.max_receive_count = max_receive_count
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+    def get_client(self, queue_region):
+        with self._clients_lock:
+            if queue_region not in self._clients:
+                self._clients[queue_region] = boto3.client(
+                    'sqs',
+                    region_name=queue_region,
+                    endpoint_url=f'https://sqs.{queue_region}.amazonaws.com',
+                )
+            return self._clients[queue_region]
+
+    def consume(self, process) -> [dict]:
+        """
+        Consumes all the queues
+        Parameters
+        ----------
+        process : callable(message) handling one producer message, raising on failure
+
+        Returns
+        -------
+        list of reports with the received, processed and failed messages of each queue
+        """
+        log.debug(f'Received Queues URL: {self.queues}')
+        deadline = time.monotonic() + self.time_budget
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            reports = list(
+                pool.map(
+                    lambda queue: self.consume_queue(queue, process, deadline),
+                    self.queues,
+                )
             )
-
-            if not response or not response.get('Messages'):
-                log.info(f"No new messages available from queue: {queue['url']}")
-
-            if response and response.get('Messages'):
-
-                log.info(f"Available messages from queue: {response['Messages']}")
-                for message in response['Messages']:
-                    if message.get('Body'):
-                        log.info('Consumed message from queue: %s' % message)
-                        producer_message = json.loads(
-                            json.loads(message.get('Body')).get('Message')
+        log.info(f'Consumed queues: {json.dumps(self.summarize(reports))}')
+        return reports
+
+    def consume_queue(self, queue, process, deadline) -> dict:
+        report = {
+            'url': queue['url'],
+            'received': 0,
+            'processed': 0,
+            'failed': [],
+            'discarded': [],
+            'drained': False,
+        }
+        sqs = self.get_client(queue['region'])
+        seen = set()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    log.warning(f"Time budget spent before draining queue: {queue['url']}")
+                    break
+                response = sqs.receive_message(
+                    QueueUrl=queue['url'],
+                    AttributeNames=['SentTimestamp', 'ApproximateReceiveCount'],
+                    MaxNumberOfMessages=MAX_NUMBER_OF_MESSAGES,
+                    MessageAttributeNames=['All'],
+                    WaitTimeSeconds=int(min(self.wait_time, max(remaining, 0))),
+                )
+                received = (response or {}).get('Messages', [])
+                if not received:
+                    log.info(f"No new messages available from queue: {queue['url']}")
+                    report['drained'] = True
+                    break
+                # Messages failed in this run are delivered again once their visibility timeout expires
+                messages = [m for m in received if m['MessageId'] not in seen]
+                if not messages:
+                    continue
+
+                report['received'] += len(messages)
+                seen.update(m['MessageId'] for m in messages)
+                processed = []
+                discarded = []
+                for message in messages:
+                    try:
+                        if message.get('Body'):
+                            log.info('Consumed message from queue: %s' % message)
+                            producer_message = self.extract_message(message)
+                            log.info(f'Extracted Message: {producer_message}')
+                            process(producer_message)
+                        processed.append(message)
+                    except Exception as e:
+                        log.error(
+                            f"Failed to process message {message['MessageId']} "
+                            f"from queue {queue['url']} due to: {e}"
                         )
-                        log.info(f'Extracted Message: {producer_message}')
-
-                        messages.append(producer_message)
-
-                        try:
-                            log.info(
-                                f'Deleting the original message from the Queue: {message}'
-                            )
-                            delete_response = sqs.delete_message(
-                                QueueUrl=queue['url'],
-                                ReceiptHandle=message.get('ReceiptHandle'),
-                            )
-                            log.info(
-                                f'Deleted message from the Queue response: {delete_response}'
-                            )
-                        except ClientError as e:
+                        report['failed'].append(
+                            {'MessageId': message['MessageId'], 'error': str(e)}
+                        )
+                        if self.receive_count(message) >= self.max_receive_count:
                             log.error(
-                                f'Failed to delete the original message from queue {queue} due to: {e}'
+                                f"Discarding message {message['MessageId']} from queue {queue['url']} "
+                                f'after {self.receive_count(message)} failed attempts: {message.get("Body")}'
                             )
+                            discarded.append(message)
+
+                report['processed'] += len(processed)
+                report['failed'].extend(self.delete_messages(sqs, queue, processed))
+                report['discarded'].extend(m['MessageId'] for m in discarded)
+                self.delete_messages(sqs, queue, discarded)
 
         except ClientError as e:
             log.error(f'Failed to get messages from queue {queue} due to: {e}')
+            report['error'] = str(e)
+
+        return report
+
+    @staticmethod
+    def receive_count(message) -> int:
+        return int(message.get('Attributes', {}).get('ApproximateReceiveCount', 1))
+
+    @staticmethod
+    def extract_message(message):
+        return json.loads(json.loads(message.get('Body')).get('Message'))
+
+    @staticmethod
+    def delete_messages(sqs, queue, messages) -> [dict]:
+        """
+        Deletes the messages by batches of 10
+        Returns
+        -------
+        the messages that could not be deleted, they will be delivered again
+        """
+        failed = []
+        for i in range(0, len(messages), MAX_NUMBER_OF_MESSAGES):
+            chunk = messages[i : i + MAX_NUMBER_OF_MESSAGES]
+            try:
+                response = sqs.delete_message_batch(
+                    QueueUrl=queue['url'],
+                    Entries=[
+                        {'Id': str(index), 'ReceiptHandle': m['ReceiptHandle']}
+                        for index, m in enumerate(chunk)
+                    ],
+                )
+                for failure in response.get('Failed', []):
+                    message = chunk[int(failure['Id'])]
+                    log.error(
+                        f"Failed to delete message {message['MessageId']} from queue "
+                        f"{queue['url']} due to: {failure.get('Message')}"
+                    )
+                    failed.append(
+                        {'MessageId': message['MessageId'], 'error': failure.get('Code')}
+                    )
+            except ClientError as e:
+                log.error(f'Failed to delete messages from queue {queue} due to: {e}')
+                failed.extend({'MessageId': m['MessageId'], 'error': str(e)} for m in chunk)
+        return failed
+
+    @staticmethod
+    def summarize(reports):
+        return {
+            'queues': len(reports),
+            'received': sum(r['received'] for r in reports),
+            'processed': sum(r['processed'] for r in reports),
+            'failed': sum(len(r['failed']) for r in reports),
+            'discarded': sum(len(r['discarded']) for r in reports),
+            'not_drained': [r['url'] for r in reports if not r['drained']],
+        }
+
 
+def poll_queues(queues):
+    messages = []
+    QueueConsumer(queues).consume(messages.append)
     return messages
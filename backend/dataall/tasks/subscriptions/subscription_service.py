@@ -10,9 +10,9 @@ from ... import db
 from ...aws.handlers.service_handlers import Worker
 from ...aws.handlers.sts import SessionHelper
 from ...aws.handlers.sqs import SqsQueue
-from ...db import get_engine
+from ...db import get_engine, collect_sql_stats
 from ...db import models
-from ...tasks.subscriptions import poll_queues
+from ...tasks.subscriptions import QueueConsumer
 from ...utils import json_utils
 
 root = logging.getLogger()
@@ -21,6 +21,8 @@ if not root.hasHandlers():
     root.addHandler(logging.StreamHandler(sys.stdout))
 log = logging.getLogger(__name__)
 
+SNS_PUBLISH_BATCH_MAX_ENTRIES = 10
+
 
 class SubscriptionService:
     def __init__(self):
@@ -51,13 +53,11 @@ class SubscriptionService:
 
         log.info(f'Notifying consumers with messages {messages}')
 
-        with engine.scoped_session() as session:
-
-            for message in messages:
+        for message in messages:
 
-                SubscriptionService.publish_table_update_message(engine, message)
+            SubscriptionService.publish_table_update_message(engine, message)
 
-                SubscriptionService.publish_location_update_message(session, message)
+            SubscriptionService.publish_location_update_message(engine, message)
 
         return True
 
@@ -100,37 +100,38 @@ class SubscriptionService:
                 )
 
     @staticmethod
-    def publish_location_update_message(session, message):
-        location: models.DatasetStorageLocation = (
-            db.api.DatasetStorageLocation.get_location_by_s3_prefix(
-                session,
-                message.get('prefix'),
-                message.get('accountid'),
-                message.get('region'),
+    def publish_location_update_message(engine, message):
+        with engine.scoped_session() as session:
+            location: models.DatasetStorageLocation = (
+                db.api.DatasetStorageLocation.get_location_by_s3_prefix(
+                    session,
+                    message.get('prefix'),
+                    message.get('accountid'),
+                    message.get('region'),
+                )
             )
-        )
-        if not location:
-            log.info(f'No location found for message {message}')
+            if not location:
+                log.info(f'No location found for message {message}')
 
-        else:
-            log.info(f'Found location {location.locationUri}|{location.S3Prefix}')
+            else:
+                log.info(f'Found location {location.locationUri}|{location.S3Prefix}')
 
-            dataset: models.Dataset = session.query(models.Dataset).get(
-                location.datasetUri
-            )
-            log.info(
-                f'Found dataset {dataset.datasetUri}|{dataset.environmentUri}|{dataset.AwsAccountId}'
-            )
-            share_items: [models.ShareObjectItem] = (
-                session.query(models.ShareObjectItem)
-                .filter(models.ShareObjectItem.itemUri == location.locationUri)
-                .all()
-            )
-            log.info(f'Found shared items for location {share_items}')
+                dataset: models.Dataset = session.query(models.Dataset).get(
+                    location.datasetUri
+                )
+                log.info(
+                    f'Found dataset {dataset.datasetUri}|{dataset.environmentUri}|{dataset.AwsAccountId}'
+                )
+                share_items: [models.ShareObjectItem] = (
+                    session.query(models.ShareObjectItem)
+                    .filter(models.ShareObjectItem.itemUri == location.locationUri)
+                    .all()
+                )
+                log.info(f'Found shared items for location {share_items}')
 
-            return SubscriptionService.publish_sns_message(
-                session, message, dataset, share_items, location.S3Prefix
-            )
+                return SubscriptionService.publish_sns_message(
+                    engine, message, dataset, share_items, location.S3Prefix
+                )
 
     @staticmethod
     def store_dataquality_results(session, message):
@@ -206,69 +207,139 @@ class SubscriptionService:
         engine, message, dataset, share_items, prefix, table: models.DatasetTable = None
     ):
         with engine.scoped_session() as session:
-            for item in share_items:
-
-                share_object = SubscriptionService.get_approved_share_object(
-                    session, item
-                )
-
-                if not share_object or not share_object.principalId:
-                    log.error(
-                        f'Share Item with no share object or no principalId ? {item.shareItemUri}'
+            consumers = SubscriptionService.get_share_consumers(session, share_items)
+            if not consumers:
+                log.info(f'No consumers to notify for {prefix}')
+                return
+
+            if table:
+                message['table'] = table.GlueTableName
+            log.info(f'Producer message before notifications: {message}')
+
+            environments = {env.environmentUri: env for _, env in consumers}
+            if table:
+                try:
+                    SubscriptionService.redshift_copy_batch(
+                        engine, message, dataset, list(environments.values()), table
                     )
-                else:
-                    environment = session.query(models.Environment).get(
-                        share_object.principalId
+                except ClientError as e:
+                    log.error(
+                        f'Failed to queue the Redshift copy of {table.GlueTableName} due to: {e}'
                     )
-                    if not environment:
-                        log.error(
-                            f'Environment of share owner was deleted ? {share_object.principalId}'
-                        )
-                    else:
-                        log.info(f'Notifying share owner {share_object.owner}')
-
-                        log.info(
-                            f'found environment {environment.environmentUri}|{environment.AwsAccountId} of share owner {share_object.owner}'
-                        )
-
-                        try:
-
-                            if table:
-                                message['table'] = table.GlueTableName
-
-                            log.info(
-                                f'Producer message before notifications: {message}'
-                            )
-
-                            SubscriptionService.redshift_copy(
-                                engine, message, dataset, environment, table
-                            )
 
-                            message = {
+            topics = {}
+            for share_object, environment in consumers:
+                log.info(
+                    f'Notifying share owner {share_object.owner} on environment '
+                    f'{environment.environmentUri}|{environment.AwsAccountId}'
+                )
+                topics.setdefault(environment.environmentUri, []).append(
+                    {
+                        'Id': share_object.shareUri,
+                        'Message': json.dumps(
+                            {
                                 'location': prefix,
                                 'owner': dataset.owner,
+                                'shareUri': share_object.shareUri,
                                 'message': f'Dataset owner {dataset.owner} '
                                 f'has updated the table shared with you {prefix}',
                             }
+                        ),
+                    }
+                )
 
-                            response = SubscriptionService.sns_call(
-                                message, environment
-                            )
+            notified = []
+            for environment_uri, entries in topics.items():
+                try:
+                    failed = SubscriptionService.sns_publish_batch(
+                        environments[environment_uri], entries
+                    )
+                    notified.extend(
+                        share_object
+                        for share_object, environment in consumers
+                        if environment.environmentUri == environment_uri
+                        and share_object.shareUri not in failed
+                    )
+                except ClientError as e:
+                    log.error(
+                        f'Failed to deliver message {entries} to environment {environment_uri} due to: {e}'
+                    )
 
-                            log.info(f'SNS update publish response {response}')
+            notifications = db.api.Notification.notify_new_data_available_from_owners_of_shares(
+                session=session,
+                dataset=dataset,
+                shares=notified,
+                s3_prefix=prefix,
+            )
+            log.info(f'Created {notifications} notifications for share owners')
 
-                            notifications = db.api.Notification.notify_new_data_available_from_owners(
-                                session=session,
-                                dataset=dataset,
-                                share=share_object,
-                                s3_prefix=prefix,
-                            )
-                            log.info(f'Notifications for share owners {notifications}')
+    @staticmethod
+    def get_share_consumers(session, share_items):
+        """
+        Resolves the approved share objects of the share items and the environments
+        of their owners in one query
+        Returns
+        -------
+        list of (share object, environment) of the shares to notify
+        """
+        share_uris = {item.shareUri for item in share_items}
+        if not share_uris:
+            return []
+        rows = (
+            session.query(models.ShareObject, models.Environment)
+            .outerjoin(
+                models.Environment,
+                models.Environment.environmentUri == models.ShareObject.principalId,
+            )
+            .filter(
+                and_(
+                    models.ShareObject.shareUri.in_(share_uris),
+                    models.ShareObject.status == 'Approved',
+                )
+            )
+            .all()
+        )
+        found = {share_object.shareUri for share_object, _ in rows}
+        for item in share_items:
+            if item.shareUri not in found:
+                log.error(f'Share Item with no approved share object ? {item.shareItemUri}')
+
+        consumers = []
+        for share_object, environment in rows:
+            if not share_object.principalId:
+                log.error(f'Share object with no principalId ? {share_object.shareUri}')
+            elif not environment:
+                log.error(
+                    f'Environment of share owner was deleted ? {share_object.principalId}'
+                )
+            else:
+                consumers.append((share_object, environment))
+        return consumers
 
-                        except ClientError as e:
-                            log.error(
-                                f'Failed to deliver message {message} due to: {e}'
-                            )
+    @staticmethod
+    def sns_publish_batch(environment, entries) -> [str]:
+        """
+        Publishes the entries on the consumers topic of the environment, 10 per call
+        Returns
+        -------
+        the ids of the entries that failed
+        """
+        aws_session = SessionHelper.remote_session(environment.AwsAccountId)
+        sns = aws_session.client('sns', region_name=environment.region)
+        failed = []
+        for i in range(0, len(entries), SNS_PUBLISH_BATCH_MAX_ENTRIES):
+            response = sns.publish_batch(
+                TopicArn=f'arn:aws:sns:{environment.region}:{environment.AwsAccountId}:{environment.subscriptionsConsumersTopicName}',
+                PublishBatchRequestEntries=entries[i : i + SNS_PUBLISH_BATCH_MAX_ENTRIES],
+            )
+            log.info(f'SNS update publish response {response}')
+            for failure in response.get('Failed', []):
+                log.error(
+                    f"Failed to publish message {failure['Id']} on environment "
+                    f"{environment.environmentUri} due to: {failure.get('Message')}"
+                )
+                failed.append(failure['Id'])
+        return failed
 
     @staticmethod
     def sns_call(message, environment):
@@ -287,27 +358,41 @@ class SubscriptionService:
         dataset: models.Dataset,
         environment: models.Environment,
         table: models.DatasetTable,
+    ):
+        return SubscriptionService.redshift_copy_batch(
+            engine, message, dataset, [environment], table
+        )
+
+    @staticmethod
+    def redshift_copy_batch(
+        engine,
+        message,
+        dataset: models.Dataset,
+        environments: [models.Environment],
+        table: models.DatasetTable,
     ):
         log.info(
             f'Redshift copy starting '
-            f'{environment.environmentUri}|{dataset.datasetUri}'
+            f'{[e.environmentUri for e in environments]}|{dataset.datasetUri}'
             f'|{json_utils.to_json(message)}'
         )
         with engine.scoped_session() as session:
-            task = models.Task(
-                action='redshift.subscriptions.copy',
-                targetUri=environment.environmentUri,
-                payload={
-                    'datasetUri': dataset.datasetUri,
-                    'message': json_utils.to_json(message),
-                    'tableUri': table.tableUri,
-                },
-            )
-            session.add(task)
+            tasks = [
+                models.Task(
+                    action='redshift.subscriptions.copy',
+                    targetUri=environment.environmentUri,
+                    payload={
+                        'datasetUri': dataset.datasetUri,
+                        'message': json_utils.to_json(message),
+                        'tableUri': table.tableUri,
+                    },
+                )
+                for environment in environments
+            ]
+            session.add_all(tasks)
             session.commit()
 
-        response = Worker.queue(engine, [task.taskUri])
-        return response
+        return Worker.queue(engine, [task.taskUri for task in tasks])
 
     @staticmethod
     def get_approved_share_object(session, item):
@@ -331,6 +416,11 @@ if __name__ == '__main__':
     log.info('Polling datasets updates...')
     service = SubscriptionService()
     queues = service.get_queues(service.get_environments(ENGINE))
-    messages = poll_queues(queues)
-    service.notify_consumers(ENGINE, messages)
+
+    def process(message):
+        # messages are processed on the consumer threads, statistics are collected per message
+        with collect_sql_stats(operation='tasks.subscriptions.notify_consumers'):
+            service.notify_consumers(ENGINE, [message])
+
+    QueueConsumer(queues).consume(process)
     log.info('Datasets updates shared successfully')
@@ -6,7 +6,7 @@ from operator import and_
 from .. import db
 from ..aws.handlers.glue import Glue
 from ..aws.handlers.sts import SessionHelper
-from ..db import get_engine
+from ..db import get_engine, collect_sql_stats
 from ..db import models
 from ..searchproxy import indexers
 from ..searchproxy.connect import (
@@ -112,4 +112,5 @@ if __name__ == '__main__':
     ENVNAME = os.environ.get('envname', 'local')
     ENGINE = get_engine(envname=ENVNAME)
     ES = connect(envname=ENVNAME)
-    sync_tables(engine=ENGINE, es=ES)
+    with collect_sql_stats(operation='tasks.tables_syncer', summary=True):
+        sync_tables(engine=ENGINE, es=ES)
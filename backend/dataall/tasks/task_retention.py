@@ -0,0 +1,102 @@
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+import boto3
+
+from ..db import get_engine, collect_sql_stats
+from ..db.models import Task
+from ..utils.json_utils import json_decoder
+
+root = logging.getLogger()
+root.setLevel(logging.INFO)
+if not root.hasHandlers():
+    root.addHandler(logging.StreamHandler(sys.stdout))
+log = logging.getLogger(__name__)
+
+RETENTION_DAYS = int(os.getenv('TASK_RETENTION_DAYS', '30'))
+BATCH_SIZE = int(os.getenv('TASK_RETENTION_BATCH_SIZE', '10000'))
+ARCHIVE_PREFIX = os.getenv('TASK_ARCHIVE_PREFIX', 'task-archive')
+FINISHED_STATUSES = ['completed', 'failed']
+
+
+def archive_tasks(
+    engine,
+    bucket: str,
+    prefix: str = ARCHIVE_PREFIX,
+    retention_days: int = RETENTION_DAYS,
+    batch_size: int = BATCH_SIZE,
+    dry_run: bool = False,
+    s3_client=None,
+) -> dict:
+    """
+    Moves the completed and failed tasks older than retention_days to S3.
+    Tasks are archived by batches, each batch is written as a gzip compressed
+    JSON lines object under prefix/dt=<date of the run>/ and deleted once the
+    object is stored. Pending and started tasks are never archived.
+    With dry_run the tasks to archive are only counted.
+    Returns
+    -------
+    dict with the cutoff, the number of tasks archived (or to archive) and the objects keys
+    """
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    summary = {'cutoff': cutoff.isoformat(), 'dryRun': dry_run, 'tasks': 0, 'objects': []}
+    with engine.scoped_session() as session:
+        expired = session.query(Task).filter(
+            Task.status.in_(FINISHED_STATUSES), Task.created < cutoff
+        )
+        if dry_run:
+            summary['tasks'] = expired.count()
+            log.info(f'Dry run, tasks to archive: {json.dumps(summary)}')
+            return summary
+
+        s3_client = s3_client or boto3.client(
+            's3', region_name=os.getenv('AWS_REGION', 'eu-west-1')
+        )
+        run = datetime.now()
+        while True:
+            tasks = expired.order_by(Task.created, Task.taskUri).limit(batch_size).all()
+            if not tasks:
+                break
+            key = (
+                f"{prefix}/dt={run.strftime('%Y-%m-%d')}/"
+                f"tasks-{run.strftime('%H%M%S')}-{len(summary['objects']):05d}.jsonl.gz"
+            )
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=gzip.compress(to_jsonl(tasks).encode('utf-8')),
+                ContentType='application/x-ndjson',
+                ContentEncoding='gzip',
+            )
+            session.query(Task).filter(
+                Task.taskUri.in_([task.taskUri for task in tasks])
+            ).delete(synchronize_session=False)
+            session.commit()
+            summary['tasks'] += len(tasks)
+            summary['objects'].append(key)
+            log.info(f'Archived {len(tasks)} tasks to s3://{bucket}/{key}')
+    log.info(f'Tasks archived: {json.dumps(summary)}')
+    return summary
+
+
+def to_jsonl(tasks: [Task]) -> str:
+    columns = [column.name for column in Task.__table__.columns]
+    return ''.join(
+        json.dumps({c: getattr(task, c) for c in columns}, default=json_decoder) + '\n'
+        for task in tasks
+    )
+
+
+if __name__ == '__main__':
+    ENVNAME = os.environ.get('envname', 'local')
+    ENGINE = get_engine(envname=ENVNAME)
+    with collect_sql_stats(operation='tasks.task_retention', summary=True):
+        archive_tasks(
+            engine=ENGINE,
+            bucket=os.environ['TASK_ARCHIVE_BUCKET'],
+            dry_run=os.getenv('TASK_RETENTION_DRY_RUN', 'false').lower() == 'true',
+        )
@@ -0,0 +1,31 @@
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+from .. import db
+from ..db import get_engine, collect_sql_stats
+
+root = logging.getLogger()
+root.setLevel(logging.INFO)
+if not root.hasHandlers():
+    root.addHandler(logging.StreamHandler(sys.stdout))
+log = logging.getLogger(__name__)
+
+RESULT_PAGES_TTL_HOURS = int(os.getenv('WORKSHEET_RESULT_PAGES_TTL_HOURS', '24'))
+
+
+def delete_expired_result_pages(engine, ttl_hours: int = RESULT_PAGES_TTL_HOURS) -> int:
+    """Deletes the worksheet query result pages cached for more than ttl_hours"""
+    cutoff = datetime.now() - timedelta(hours=ttl_hours)
+    with engine.scoped_session() as session:
+        deleted = db.api.Worksheet.delete_expired_query_result_pages(session, cutoff)
+    log.info(f'Deleted {deleted} worksheet query result pages saved before {cutoff.isoformat()}')
+    return deleted
+
+
+if __name__ == '__main__':
+    ENVNAME = os.environ.get('envname', 'local')
+    ENGINE = get_engine(envname=ENVNAME)
+    with collect_sql_stats(operation='tasks.worksheet_results_cleanup', summary=True):
+        delete_expired_result_pages(engine=ENGINE)
@@ -11,8 +11,10 @@ from dataall import db
 
 sts = boto3.client('sts', region_name='eu-west-1')
 from dataall.api import get_executable_schema
+from dataall.api.Objects.Stack.stack_helper import batch_stack_refreshes
 from dataall.aws.handlers.service_handlers import Worker
 from dataall.db import get_engine, Base, create_schema_and_tables, init_permissions, api
+from dataall.db import collect_sql_stats, SQL_STATS_DEBUG
 from dataall.searchproxy import connect, run_query
 
 import logging
@@ -135,12 +137,16 @@ def graphql_server():
 
     # Note: Passing the request to the context is optional.
     # In Flask, the current request is always accessible as flask.request
-    success, result = graphql_sync(
-        schema,
-        data,
-        context_value=request_context(request.headers, mock=True),
-        debug=app.debug,
-    )
+    with collect_sql_stats(operation=data.get('operationName')) as sql_stats:
+        with batch_stack_refreshes(engine):
+            success, result = graphql_sync(
+                schema,
+                data,
+                context_value=request_context(request.headers, mock=True),
+                debug=app.debug,
+            )
+    if app.debug or SQL_STATS_DEBUG:
+        result['extensions'] = {'sql': sql_stats.to_dict()}
 
     status_code = 200 if success else 400
     return jsonify(result), status_code
@@ -0,0 +1,52 @@
+"""foreign_key_filter_indexes
+
+Revision ID: 2d7e5b8c9f03
+Revises: 8f3a6c1d2e94
+Create Date: 2026-10-19 21:04:52.117630
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2d7e5b8c9f03'
+down_revision = '8f3a6c1d2e94'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_share_object_item_shareUri_status', 'share_object_item', ['shareUri', 'status']),
+    ('ix_share_object_item_itemUri', 'share_object_item', ['itemUri']),
+    (
+        'ix_share_object_datasetUri_environmentUri_principalId',
+        'share_object',
+        ['datasetUri', 'environmentUri', 'principalId'],
+    ),
+    (
+        'ix_dataset_table_datasetUri_LastGlueTableStatus',
+        'dataset_table',
+        ['datasetUri', 'LastGlueTableStatus'],
+    ),
+    (
+        'ix_dataset_table_column_GlueDatabaseName_GlueTableName',
+        'dataset_table_column',
+        ['GlueDatabaseName', 'GlueTableName'],
+    ),
+    ('ix_dataset_storage_location_datasetUri', 'dataset_storage_location', ['datasetUri']),
+    ('ix_term_link_targetUri', 'term_link', ['targetUri']),
+    ('ix_vote_targetUri_targetType', 'vote', ['targetUri', 'targetType']),
+    (
+        'ix_notification_username_is_read_deleted',
+        'notification',
+        ['username', 'is_read', 'deleted'],
+    ),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
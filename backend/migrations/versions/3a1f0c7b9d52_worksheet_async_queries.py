@@ -0,0 +1,46 @@
+"""worksheet_async_queries
+
+Revision ID: 3a1f0c7b9d52
+Revises: 5fc49baecea4
+Create Date: 2026-10-19 13:41:09.207315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3a1f0c7b9d52'
+down_revision = '5fc49baecea4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'worksheet_query_result',
+        sa.Column('environmentUri', sa.String(), nullable=True),
+    )
+    op.add_column(
+        'worksheet_query_result',
+        sa.Column('pageSize', sa.Integer(), nullable=True),
+    )
+    op.create_table(
+        'worksheet_query_result_page',
+        sa.Column('AthenaQueryId', sa.VARCHAR(), autoincrement=False, nullable=False),
+        sa.Column('page', sa.INTEGER(), autoincrement=False, nullable=False),
+        sa.Column('result', postgresql.JSON(), autoincrement=False, nullable=False),
+        sa.Column('nextToken', sa.VARCHAR(), autoincrement=False, nullable=True),
+        sa.Column(
+            'created', postgresql.TIMESTAMP(), autoincrement=False, nullable=True
+        ),
+        sa.PrimaryKeyConstraint(
+            'AthenaQueryId', 'page', name='worksheet_query_result_page_pkey'
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('worksheet_query_result_page')
+    op.drop_column('worksheet_query_result', 'pageSize')
+    op.drop_column('worksheet_query_result', 'environmentUri')
@@ -0,0 +1,30 @@
+"""worksheet_query_result_page_created
+
+Revision ID: 3e9a5c7b2d41
+Revises: 7b4e1d9a3c60
+Create Date: 2026-10-20 14:03:18.215406
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3e9a5c7b2d41'
+down_revision = '7b4e1d9a3c60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f('ix_worksheet_query_result_page_created'),
+        'worksheet_query_result_page',
+        ['created'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_worksheet_query_result_page_created'),
+        table_name='worksheet_query_result_page',
+    )
@@ -0,0 +1,26 @@
+"""task_retention_indexes
+
+Revision ID: 4c8a2d6f1e37
+Revises: 9b4e7f2c6d15
+Create Date: 2026-10-19 17:21:45.310927
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4c8a2d6f1e37'
+down_revision = '9b4e7f2c6d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_status_created', 'task', ['status', 'created'], unique=False)
+    op.create_index('ix_task_targetUri_action', 'task', ['targetUri', 'action'], unique=False)
+    op.create_index(op.f('ix_task_action'), 'task', ['action'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_action'), table_name='task')
+    op.drop_index('ix_task_targetUri_action', table_name='task')
+    op.drop_index('ix_task_status_created', table_name='task')
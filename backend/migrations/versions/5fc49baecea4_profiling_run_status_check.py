@@ -0,0 +1,27 @@
+"""profiling_run_status_check
+
+Revision ID: 5fc49baecea4
+Revises: 96b6a9042799
+Create Date: 2026-10-19 11:02:47.513930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5fc49baecea4'
+down_revision = '96b6a9042799'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'dataset_profiling_run',
+        sa.Column('lastStatusCheck', postgresql.TIMESTAMP(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column('dataset_profiling_run', 'lastStatusCheck')
@@ -0,0 +1,46 @@
+"""trigram_search_indexes
+
+Revision ID: 6e2b9c4d7a18
+Revises: 4c8a2d6f1e37
+Create Date: 2026-10-19 19:02:13.518204
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '6e2b9c4d7a18'
+down_revision = '4c8a2d6f1e37'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    'dataset_table': ['name', 'label', 'GlueTableName'],
+    'dataset_table_column': ['label', 'description'],
+    'dataset_storage_location': ['name', 'label', 'S3Prefix'],
+    'share_object_item': ['itemName'],
+    'glossary_node': ['label', 'readme'],
+}
+
+
+def index_name(table, column):
+    return f'ix_{table}_{column}_trgm'
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            op.create_index(
+                index_name(table, column),
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+
+def downgrade():
+    for table, columns in TRIGRAM_INDEXES.items():
+        for column in columns:
+            op.drop_index(index_name(table, column), table_name=table)
@@ -0,0 +1,40 @@
+"""worksheet_query_statistics_bigint
+
+Revision ID: 7b4e1d9a3c60
+Revises: 2d7e5b8c9f03
+Create Date: 2026-10-20 09:12:37.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7b4e1d9a3c60'
+down_revision = '2d7e5b8c9f03'
+branch_labels = None
+depends_on = None
+
+# Athena statistics do not fit in int4 for queries scanning more than 2 GiB
+COLUMNS = ['ElapsedTimeInMs', 'DataScannedInBytes']
+
+
+def upgrade():
+    for column in COLUMNS:
+        op.alter_column(
+            'worksheet_query_result',
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.BigInteger(),
+            existing_nullable=True,
+        )
+
+
+def downgrade():
+    for column in COLUMNS:
+        op.alter_column(
+            'worksheet_query_result',
+            column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Integer(),
+            existing_nullable=True,
+        )
@@ -0,0 +1,47 @@
+"""dataset_counters
+
+Revision ID: 7d2c4e8a1b63
+Revises: 3a1f0c7b9d52
+Create Date: 2026-10-19 14:26:53.581042
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7d2c4e8a1b63'
+down_revision = '3a1f0c7b9d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for column in ['tablesCount', 'locationsCount', 'upvotesCount']:
+        op.add_column(
+            'dataset',
+            sa.Column(column, sa.Integer(), nullable=False, server_default='0'),
+        )
+    op.execute(
+        '''
+        UPDATE dataset SET
+            "tablesCount" = (
+                SELECT count(*) FROM dataset_table t
+                WHERE t."datasetUri" = dataset."datasetUri"
+            ),
+            "locationsCount" = (
+                SELECT count(*) FROM dataset_storage_location l
+                WHERE l."datasetUri" = dataset."datasetUri"
+            ),
+            "upvotesCount" = (
+                SELECT count(*) FROM vote v
+                WHERE v."targetUri" = dataset."datasetUri"
+                AND v."targetType" = 'dataset'
+                AND v.upvote
+            )
+        '''
+    )
+
+
+def downgrade():
+    for column in ['upvotesCount', 'locationsCount', 'tablesCount']:
+        op.drop_column('dataset', column)
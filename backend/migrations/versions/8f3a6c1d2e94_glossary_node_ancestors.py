@@ -0,0 +1,67 @@
+"""glossary_node_ancestors
+
+Revision ID: 8f3a6c1d2e94
+Revises: 6e2b9c4d7a18
+Create Date: 2026-10-19 20:11:37.902148
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8f3a6c1d2e94'
+down_revision = '6e2b9c4d7a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'glossary_node_ancestor',
+        sa.Column('nodeUri', sa.String(), nullable=False),
+        sa.Column('ancestorUri', sa.String(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('nodeUri', 'ancestorUri'),
+    )
+    op.create_index(
+        op.f('ix_glossary_node_ancestor_ancestorUri'),
+        'glossary_node_ancestor',
+        ['ancestorUri'],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO glossary_node_ancestor ("nodeUri", "ancestorUri", depth)
+        WITH RECURSIVE tree AS (
+            SELECT "nodeUri", "nodeUri" AS "ancestorUri", 0 AS depth
+            FROM glossary_node
+            UNION ALL
+            SELECT tree."nodeUri", node."parentUri", tree.depth + 1
+            FROM tree
+            JOIN glossary_node node ON node."nodeUri" = tree."ancestorUri"
+            WHERE node."parentUri" IS NOT NULL AND node."parentUri" <> ''
+        )
+        SELECT "nodeUri", "ancestorUri", depth FROM tree
+        """
+    )
+    op.create_index(
+        'ix_glossary_node_path',
+        'glossary_node',
+        ['path'],
+        unique=False,
+        postgresql_ops={'path': 'text_pattern_ops'},
+    )
+    op.create_index(
+        op.f('ix_glossary_node_parentUri'), 'glossary_node', ['parentUri'], unique=False
+    )
+    op.create_index(op.f('ix_term_link_nodeUri'), 'term_link', ['nodeUri'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_term_link_nodeUri'), table_name='term_link')
+    op.drop_index(op.f('ix_glossary_node_parentUri'), table_name='glossary_node')
+    op.drop_index('ix_glossary_node_path', table_name='glossary_node')
+    op.drop_index(
+        op.f('ix_glossary_node_ancestor_ancestorUri'), table_name='glossary_node_ancestor'
+    )
+    op.drop_table('glossary_node_ancestor')
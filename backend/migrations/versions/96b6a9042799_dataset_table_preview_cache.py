@@ -0,0 +1,39 @@
+"""dataset_table_preview_cache
+
+Revision ID: 96b6a9042799
+Revises: e1cd4927482b
+Create Date: 2026-10-19 10:12:31.118284
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '96b6a9042799'
+down_revision = 'e1cd4927482b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dataset_table_preview',
+        sa.Column('tableUri', sa.VARCHAR(), autoincrement=False, nullable=False),
+        sa.Column('queryHash', sa.VARCHAR(), autoincrement=False, nullable=False),
+        sa.Column('version', sa.VARCHAR(), autoincrement=False, nullable=False),
+        sa.Column('result', postgresql.JSON(), autoincrement=False, nullable=False),
+        sa.Column(
+            'created', postgresql.TIMESTAMP(), autoincrement=False, nullable=True
+        ),
+        sa.Column(
+            'refreshRequested', postgresql.TIMESTAMP(), autoincrement=False, nullable=True
+        ),
+        sa.PrimaryKeyConstraint(
+            'tableUri', 'queryHash', name='dataset_table_preview_pkey'
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('dataset_table_preview')
@@ -0,0 +1,34 @@
+"""environment_quicksight_settings
+
+Revision ID: 9b4e7f2c6d15
+Revises: 7d2c4e8a1b63
+Create Date: 2026-10-19 16:02:11.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '9b4e7f2c6d15'
+down_revision = '7d2c4e8a1b63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'environment', sa.Column('quicksightIdentityRegion', sa.String(), nullable=True)
+    )
+    op.add_column(
+        'environment',
+        sa.Column('quicksightSubscriptionStatus', sa.String(), nullable=True),
+    )
+    op.add_column(
+        'environment', sa.Column('quicksightSettingsUpdated', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column('environment', 'quicksightSettingsUpdated')
+    op.drop_column('environment', 'quicksightSubscriptionStatus')
+    op.drop_column('environment', 'quicksightIdentityRegion')
@@ -242,6 +242,102 @@ class ContainerStack(pyNestedClass):
             prod_sizing=prod_sizing,
         )
 
+        profiling_runs_status_task, profiling_runs_status_task_def = self.set_scheduled_task(
+            cluster=cluster,
+            command=['python3.8', '-m', 'dataall.tasks.profiling_runs_status'],
+            container_id=f'container',
+            ecr_repository=ecr_repository,
+            environment={
+                'AWS_REGION': self.region,
+                'envname': envname,
+                'LOGLEVEL': 'INFO',
+            },
+            image_tag=cdkproxy_image_tag,
+            log_group=self.create_log_group(
+                envname, resource_prefix, log_group_name='profiling-runs-status'
+            ),
+            schedule_expression=Schedule.expression('rate(10 minutes)'),
+            scheduled_task_id=f'{resource_prefix}-{envname}-profiling-runs-status-schedule',
+            task_id=f'{resource_prefix}-{envname}-profiling-runs-status',
+            task_role=self.task_role,
+            vpc=vpc,
+            security_group=self.scheduled_tasks_sg,
+            prod_sizing=prod_sizing,
+        )
+
+        dataset_counters_task, dataset_counters_task_def = self.set_scheduled_task(
+            cluster=cluster,
+            command=['python3.8', '-m', 'dataall.tasks.dataset_counters'],
+            container_id=f'container',
+            ecr_repository=ecr_repository,
+            environment={
+                'AWS_REGION': self.region,
+                'envname': envname,
+                'LOGLEVEL': 'INFO',
+            },
+            image_tag=cdkproxy_image_tag,
+            log_group=self.create_log_group(
+                envname, resource_prefix, log_group_name='dataset-counters'
+            ),
+            schedule_expression=Schedule.expression('cron(0 2 * * ? *)'),
+            scheduled_task_id=f'{resource_prefix}-{envname}-dataset-counters-schedule',
+            task_id=f'{resource_prefix}-{envname}-dataset-counters',
+            task_role=self.task_role,
+            vpc=vpc,
+            security_group=self.scheduled_tasks_sg,
+            prod_sizing=prod_sizing,
+        )
+
+        task_retention_task, task_retention_task_def = self.set_scheduled_task(
+            cluster=cluster,
+            command=['python3.8', '-m', 'dataall.tasks.task_retention'],
+            container_id=f'container',
+            ecr_repository=ecr_repository,
+            environment={
+                'AWS_REGION': self.region,
+                'envname': envname,
+                'LOGLEVEL': 'INFO',
+                'TASK_ARCHIVE_BUCKET': f'{resource_prefix}-{envname}-{self.account}-{self.region}-resources',
+                'TASK_RETENTION_DAYS': '30',
+                'TASK_RETENTION_DRY_RUN': 'false',
+            },
+            image_tag=cdkproxy_image_tag,
+            log_group=self.create_log_group(
+                envname, resource_prefix, log_group_name='task-retention'
+            ),
+            schedule_expression=Schedule.expression('cron(0 3 * * ? *)'),
+            scheduled_task_id=f'{resource_prefix}-{envname}-task-retention-schedule',
+            task_id=f'{resource_prefix}-{envname}-task-retention',
+            task_role=self.task_role,
+            vpc=vpc,
+            security_group=self.scheduled_tasks_sg,
+            prod_sizing=prod_sizing,
+        )
+
+        worksheet_results_cleanup_task, worksheet_results_cleanup_task_def = self.set_scheduled_task(
+            cluster=cluster,
+            command=['python3.8', '-m', 'dataall.tasks.worksheet_results_cleanup'],
+            container_id=f'container',
+            ecr_repository=ecr_repository,
+            environment={
+                'AWS_REGION': self.region,
+                'envname': envname,
+                'LOGLEVEL': 'INFO',
+                'WORKSHEET_RESULT_PAGES_TTL_HOURS': '24',
+            },
+            image_tag=cdkproxy_image_tag,
+            log_group=self.create_log_group(
+                envname, resource_prefix, log_group_name='worksheet-results-cleanup'
+            ),
+            schedule_expression=Schedule.expression('rate(1 hour)'),
+            scheduled_task_id=f'{resource_prefix}-{envname}-worksheet-results-cleanup-schedule',
+            task_id=f'{resource_prefix}-{envname}-worksheet-results-cleanup',
+            task_role=self.task_role,
+            vpc=vpc,
+            security_group=self.scheduled_tasks_sg,
+            prod_sizing=prod_sizing,
+        )
+
         subscriptions_task, subscription_task_def = self.set_scheduled_task(
             cluster=cluster,
             command=[
@@ -527,6 +623,14 @@ class ContainerStack(pyNestedClass):
                         f'arn:aws:logs:{self.region}:{self.account}:log-group:*{resource_prefix}*',
                     ],
                 ),
+                iam.PolicyStatement(
+                    actions=[
+                        's3:PutObject',
+                    ],
+                    resources=[
+                        f'arn:aws:s3:::{resource_prefix}-{envname}-{self.account}-{self.region}-resources/task-archive/*',
+                    ],
+                ),
                 iam.PolicyStatement(
                     actions=[
                         'ec2:Describe*',
@@ -1,14 +1,21 @@
 import { gql } from 'apollo-boost';
 
-const previewTable2 = (tableUri) => ({
+const previewTable2 = (tableUri, filter) => ({
   variables: {
-    tableUri
+    tableUri,
+    filter
   },
   query: gql`
-    query PreviewTable2($tableUri: String!) {
-      previewTable2(tableUri: $tableUri) {
-        rows
-        fields
+    query PreviewTable2(
+      $tableUri: String!
+      $filter: DatasetTablePreviewFilter
+    ) {
+      previewTable2(tableUri: $tableUri, filter: $filter) {
+        columns {
+          name
+          typeName
+        }
+        data
       }
     }
   `
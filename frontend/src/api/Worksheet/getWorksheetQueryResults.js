@@ -0,0 +1,35 @@
+import { gql } from 'apollo-boost';
+
+const getWorksheetQueryResults = ({ worksheetUri, AthenaQueryId, page }) => ({
+  variables: {
+    worksheetUri,
+    AthenaQueryId,
+    page
+  },
+  query: gql`
+    query GetAthenaSqlQueryResultsPage(
+      $worksheetUri: String!
+      $AthenaQueryId: String!
+      $page: Int
+    ) {
+      getAthenaSqlQueryResultsPage(
+        worksheetUri: $worksheetUri
+        AthenaQueryId: $AthenaQueryId
+        page: $page
+      ) {
+        AthenaQueryId
+        Error
+        Status
+        columns {
+          columnName
+          typeName
+        }
+        vectors
+        page
+        hasNext
+      }
+    }
+  `
+});
+
+export default getWorksheetQueryResults;
@@ -0,0 +1,28 @@
+import { gql } from 'apollo-boost';
+
+const getWorksheetQueryStatus = ({ worksheetUri, AthenaQueryId }) => ({
+  variables: {
+    worksheetUri,
+    AthenaQueryId
+  },
+  fetchPolicy: 'no-cache',
+  query: gql`
+    query GetAthenaSqlQueryStatus(
+      $worksheetUri: String!
+      $AthenaQueryId: String!
+    ) {
+      getAthenaSqlQueryStatus(
+        worksheetUri: $worksheetUri
+        AthenaQueryId: $AthenaQueryId
+      ) {
+        AthenaQueryId
+        Error
+        Status
+        DataScannedInBytes
+        ElapsedTimeInMs
+      }
+    }
+  `
+});
+
+export default getWorksheetQueryStatus;
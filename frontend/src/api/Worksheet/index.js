@@ -8,11 +8,17 @@ import removeWorksheetShare from './removeWorksheetShare';
 import updateWorksheetShare from './updateWorksheetShare';
 import deleteWorksheet from './deleteWorksheet';
 import runAthenaSqlQuery from './runAthenaSqlQuery';
+import startWorksheetQuery from './startWorksheetQuery';
+import getWorksheetQueryStatus from './getWorksheetQueryStatus';
+import getWorksheetQueryResults from './getWorksheetQueryResults';
 
 export {
   listWorksheets,
   createWorksheet,
   runAthenaSqlQuery,
+  startWorksheetQuery,
+  getWorksheetQueryStatus,
+  getWorksheetQueryResults,
   updateWorksheet,
   getWorksheet,
   listWorksheetShares,
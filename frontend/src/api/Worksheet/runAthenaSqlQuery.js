@@ -9,13 +9,12 @@ const runAthenaSqlQuery = ({ sqlQuery, environmentUri, worksheetUri }) => ({
   query: gql`
     query runAthenaSqlQuery($environmentUri: String!, $worksheetUri: String!, $sqlQuery: String!) {
       runAthenaSqlQuery(environmentUri: $environmentUri, worksheetUri: $worksheetUri, sqlQuery: $sqlQuery) {
-        rows {
-          cells {
-            columnName
-            typeName
-            value
-          }
-        }
+        Error
+        AthenaQueryId
+        ElapsedTimeInMs
+        DataScannedInBytes
+        vectors
+        nextToken
         columns {
           columnName
           typeName
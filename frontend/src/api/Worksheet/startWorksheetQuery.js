@@ -1,21 +1,33 @@
 import { gql } from 'apollo-boost';
 
-const startWorksheetQuery = ({ worksheetUri, input }) => ({
+const startWorksheetQuery = ({
+  sqlQuery,
+  environmentUri,
+  worksheetUri,
+  pageSize
+}) => ({
   variables: {
+    sqlQuery,
+    environmentUri,
     worksheetUri,
-    input
+    pageSize
   },
   mutation: gql`
-    mutation StartWorksheetQuery(
+    mutation StartAthenaSqlQuery(
+      $environmentUri: String!
       $worksheetUri: String!
-      $input: WorksheetQueryInput!
+      $sqlQuery: String!
+      $pageSize: Int
     ) {
-      startWorksheetQuery(worksheetUri: $worksheetUri, input: $input) {
+      startAthenaSqlQuery(
+        environmentUri: $environmentUri
+        worksheetUri: $worksheetUri
+        sqlQuery: $sqlQuery
+        pageSize: $pageSize
+      ) {
         AthenaQueryId
         Error
         Status
-        DataScannedInBytes
-        ElapsedTimeInMs
       }
     }
   `
@@ -16,8 +16,9 @@ import { FaBars } from 'react-icons/fa';
 import React from 'react';
 import PropTypes from 'prop-types';
 import Scrollbar from '../../components/Scrollbar';
+import Pager from '../../components/Pager';
 
-const WorksheetResult = ({ results, loading }) => {
+const WorksheetResult = ({ results, loading, onPageChange }) => {
   if (loading) {
     return <CircularProgress />;
   }
@@ -54,8 +55,10 @@ const WorksheetResult = ({ results, loading }) => {
                     results.rows &&
                     results.rows.map((row) => (
                       <TableRow>
-                        {row.cells.map((cell) => (
-                          <TableCell>{cell.value}</TableCell>
+                        {row.values.map((value) => (
+                          <TableCell>
+                            {value === null ? '' : String(value)}
+                          </TableCell>
                         ))}
                       </TableRow>
                     ))}
@@ -63,6 +66,14 @@ const WorksheetResult = ({ results, loading }) => {
               </Table>
             </Box>
           </Scrollbar>
+          {results && results.pages > 1 && (
+            <Pager
+              mgTop={2}
+              mgBottom={2}
+              items={results}
+              onChange={onPageChange}
+            />
+          )}
         </Card>
       </ReactIf.Then>
     </ReactIf.If>
@@ -70,6 +81,7 @@ const WorksheetResult = ({ results, loading }) => {
 };
 WorksheetResult.propTypes = {
   results: PropTypes.object.isRequired,
-  loading: PropTypes.bool.isRequired
+  loading: PropTypes.bool.isRequired,
+  onPageChange: PropTypes.func
 };
 export default WorksheetResult;
@@ -24,7 +24,9 @@ import { useSnackbar } from 'notistack';
 import { useDispatch } from '../../store';
 import getWorksheet from '../../api/Worksheet/getWorksheet';
 import updateWorksheet from '../../api/Worksheet/updateWorksheet';
-import runAthenaSqlQuery from '../../api/Worksheet/runAthenaSqlQuery';
+import startWorksheetQuery from '../../api/Worksheet/startWorksheetQuery';
+import getWorksheetQueryStatus from '../../api/Worksheet/getWorksheetQueryStatus';
+import getWorksheetQueryResults from '../../api/Worksheet/getWorksheetQueryResults';
 import deleteWorksheet from '../../api/Worksheet/deleteWorksheet';
 import useClient from '../../hooks/useClient';
 import listEnvironments from '../../api/Environment/listEnvironments';
@@ -280,34 +282,105 @@ const WorksheetView = () => {
     }
   }, [client, dispatch, enqueueSnackbar, worksheet, sqlBody]);
 
-  const runQuery = useCallback(async () => {
-    try {
-      setRunningQuery(true);
-      const response = await client.query(
-        runAthenaSqlQuery({
-            sqlQuery: sqlBody,
-            environmentUri:currentEnv.environmentUri,
-            worksheetUri: worksheet.worksheetUri
+  const fetchResultsPage = useCallback(
+    async (AthenaQueryId, page) => {
+      const resultsResponse = await client.query(
+        getWorksheetQueryResults({
+          worksheetUri: worksheet.worksheetUri,
+          AthenaQueryId,
+          page
         })
       );
-      if (!response.errors) {
-        const athenaResults = response.data.runAthenaSqlQuery;
-        setResults({
-          rows: athenaResults.rows.map((c, index) => ({ ...c, id: index })),
+      if (!resultsResponse.errors) {
+        const athenaResults = resultsResponse.data.getAthenaSqlQueryResultsPage;
+        setResults((previous) => ({
+          Error: athenaResults.Error,
+          // One vector of values per column, zipped into rows
+          rows: (athenaResults.vectors && athenaResults.vectors.length
+            ? athenaResults.vectors[0]
+            : []
+          ).map((_, index) => ({
+            values: athenaResults.vectors.map((vector) => vector[index]),
+            id: index
+          })),
           columns: athenaResults.columns.map((c, index) => ({
             ...c,
             id: index
-          }))
-        });
+          })),
+          AthenaQueryId,
+          page: athenaResults.page,
+          hasNext: athenaResults.hasNext,
+          // The number of pages is only known once the last one is read
+          pages: Math.max(
+            athenaResults.page + (athenaResults.hasNext ? 1 : 0),
+            previous && previous.AthenaQueryId === AthenaQueryId
+              ? previous.pages
+              : 0
+          )
+        }));
       } else {
+        dispatch({ type: SET_ERROR, error: resultsResponse.errors[0].message });
+      }
+    },
+    [client, dispatch, worksheet]
+  );
+
+  const handleResultsPageChange = useCallback(
+    async (event, page) => {
+      if (page === results.page) {
+        return;
+      }
+      try {
+        setRunningQuery(true);
+        await fetchResultsPage(results.AthenaQueryId, page);
+      } catch (e) {
+        dispatch({ type: SET_ERROR, error: e.message });
+      } finally {
+        setRunningQuery(false);
+      }
+    },
+    [dispatch, fetchResultsPage, results]
+  );
+
+  const runQuery = useCallback(async () => {
+    try {
+      setRunningQuery(true);
+      const response = await client.mutate(
+        startWorksheetQuery({
+          sqlQuery: sqlBody,
+          environmentUri: currentEnv.environmentUri,
+          worksheetUri: worksheet.worksheetUri
+        })
+      );
+      if (response.errors) {
         dispatch({ type: SET_ERROR, error: response.errors[0].message });
+        return;
       }
+      const { AthenaQueryId } = response.data.startAthenaSqlQuery;
+      let status = response.data.startAthenaSqlQuery;
+      let delay = 500;
+      while (!['SUCCEEDED', 'FAILED', 'CANCELLED'].includes(status.Status)) {
+        await new Promise((resolve) => setTimeout(resolve, delay)); // eslint-disable-line no-await-in-loop
+        delay = Math.min(delay * 2, 5000);
+        const statusResponse = await client.query( // eslint-disable-line no-await-in-loop
+          getWorksheetQueryStatus({
+            worksheetUri: worksheet.worksheetUri,
+            AthenaQueryId
+          })
+        );
+        if (statusResponse.errors) {
+          dispatch({ type: SET_ERROR, error: statusResponse.errors[0].message });
+          return;
+        }
+        status = statusResponse.data.getAthenaSqlQueryStatus;
+      }
+      await fetchResultsPage(AthenaQueryId, 1);
     } catch (e) {
       dispatch({ type: SET_ERROR, error: e.message });
     } finally {
       setRunningQuery(false);
     }
-  }, [client, dispatch, currentEnv, sqlBody]);
+  }, [client, dispatch, currentEnv, sqlBody, worksheet, fetchResultsPage]);
 
   const deleteWorksheetfunction = useCallback(async () => {
     const response = await client.mutate(
@@ -670,7 +743,11 @@ const WorksheetView = () => {
           </Box>
           <Divider />
           <Box sx={{ p: 2 }}>
-            <WorksheetResult results={results} loading={runningQuery} />
+            <WorksheetResult
+              results={results}
+              loading={runningQuery}
+              onPageChange={handleResultsPageChange}
+            />
           </Box>
         </Box>
       </Box>
@@ -412,3 +412,61 @@ def test_delete_dashboard(
         username='alice',
     )
     assert len(response.data.searchDashboards['nodes']) == 0
+
+
+class FakeQuicksightClient:
+    class exceptions:
+        class AccessDeniedException(Exception):
+            pass
+
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def __init__(self):
+        self.calls = []
+
+    def describe_group(self, **kwargs):
+        self.calls.append('describe_group')
+        raise self.exceptions.AccessDeniedException(
+            'Operation is being called from endpoint us-east-1, but your identity region is eu-central-1. '
+            'Please use the eu-central-1 endpoint.'
+        )
+
+    def describe_account_subscription(self, **kwargs):
+        self.calls.append('describe_account_subscription')
+        return {'AccountInfo': {'Edition': 'ENTERPRISE', 'AccountSubscriptionStatus': 'ACCOUNT_CREATED'}}
+
+
+def test_quicksight_settings_cached_on_environment(db, env1, mocker):
+    from dataall.aws.handlers.quicksight import Quicksight
+
+    client = FakeQuicksightClient()
+    session_helper = mocker.patch('dataall.aws.handlers.quicksight.SessionHelper')
+    session_helper.remote_session.return_value.client.return_value = client
+    for cache in [Quicksight._sessions, Quicksight._clients, Quicksight._identity_regions, Quicksight._subscriptions]:
+        cache.clear()
+
+    with db.scoped_session() as session:
+        env = session.query(dataall.db.models.Environment).get(env1.environmentUri)
+        with Quicksight.environment_settings(env):
+            for _ in range(3):
+                assert Quicksight.get_identity_region(env.AwsAccountId) == 'eu-central-1'
+                assert Quicksight.check_quicksight_enterprise_subscription(env.AwsAccountId)
+    assert client.calls == ['describe_group', 'describe_account_subscription']
+    assert session_helper.remote_session.call_count == 1
+
+    with db.scoped_session() as session:
+        env = session.query(dataall.db.models.Environment).get(env1.environmentUri)
+        assert env.quicksightIdentityRegion == 'eu-central-1'
+        assert env.quicksightSubscriptionStatus == 'ACCOUNT_CREATED'
+        assert env.quicksightSettingsUpdated
+
+    # a new process starts from the settings persisted on the environment
+    for cache in [Quicksight._identity_regions, Quicksight._subscriptions]:
+        cache.clear()
+    with db.scoped_session() as session:
+        env = session.query(dataall.db.models.Environment).get(env1.environmentUri)
+        with Quicksight.environment_settings(env):
+            assert Quicksight.get_identity_region(env.AwsAccountId) == 'eu-central-1'
+            assert Quicksight.check_quicksight_enterprise_subscription(env.AwsAccountId)
+    assert len(client.calls) == 2
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 
@@ -154,10 +156,39 @@ def test_nopermissions_pipelines(client, env1, db, org1, user, group, pipeline):
     assert len(response.data.listDataPipelines['nodes']) == 0
 
 
+def test_browse_repository_without_persisting_tasks(client, db, user, group, pipeline, mocker):
+    import dataall
+
+    mocker.patch(
+        'dataall.aws.handlers.codecommit.CodeCommit.client', return_value=FakeCodeCommit([])
+    )
+    mocker.patch(
+        'dataall.aws.handlers.codecommit.CodeCommit.list_folder',
+        return_value=[{'type': 'file', 'relativePath': 'README.md'}],
+    )
+    with db.scoped_session() as session:
+        tasks = session.query(dataall.db.models.Task).count()
+    response = client.query(
+        """
+        query browseDataPipelineRepository($input:DataPipelineBrowseInput!){
+            browseDataPipelineRepository(input:$input)
+        }
+        """,
+        input=dict(branch='main', folderPath='/', DataPipelineUri=pipeline.DataPipelineUri),
+        username=user.userName,
+        groups=[group.name],
+    )
+    assert json.loads(response.data.browseDataPipelineRepository) == [
+        {'type': 'file', 'relativePath': 'README.md'}
+    ]
+    with db.scoped_session() as session:
+        assert session.query(dataall.db.models.Task).count() == tasks
+
+
 def test_get_pipeline(client, env1, db, org1, user, group, pipeline, module_mocker):
     module_mocker.patch(
-        'dataall.aws.handlers.service_handlers.Worker.process',
-        return_value=[{'response': 'return value'}],
+        'dataall.aws.handlers.service_handlers.Worker.invoke',
+        return_value={'response': 'return value'},
     )
     module_mocker.patch(
         'dataall.api.Objects.DataPipeline.resolvers._get_creds_from_aws',
@@ -200,6 +231,46 @@ def test_get_pipeline(client, env1, db, org1, user, group, pipeline, module_mock
     assert response.data.browseDataPipelineRepository
 
 
+class FakeCodeCommit:
+    def __init__(self, files):
+        self.files = files
+        self.calls = []
+
+    def get_folder(self, repositoryName, commitSpecifier, folderPath):
+        self.calls.append(('get_folder', folderPath))
+        if folderPath == '/':
+            return {
+                'commitId': 'c1',
+                'folderPath': '/',
+                'subFolders': [{'relativePath': 'src', 'absolutePath': 'src'}],
+                'files': [{'relativePath': f, 'absolutePath': f} for f in self.files],
+            }
+        return {'commitId': 'c1', 'folderPath': folderPath, 'subFolders': [], 'files': []}
+
+    def get_commit(self, repositoryName, commitId):
+        self.calls.append(('get_commit', commitId))
+        return {'commit': {'commitId': commitId, 'author': {'name': f'author-{commitId}'}}}
+
+
+def test_list_repository_folder():
+    from dataall.aws.handlers import codecommit
+
+    codecommit._listings.clear()
+    client = FakeCodeCommit(['README.md', 'app.py'])
+    nodes = codecommit.CodeCommit.list_folder(client, 'repo', 'main', '/')
+
+    assert [(n['type'], n['relativePath'], n['author']['name']) for n in nodes] == [
+        ('folder', 'src', 'author-c1'),
+        ('file', 'README.md', 'author-c1'),
+        ('file', 'app.py', 'author-c1'),
+    ]
+    assert client.calls == [('get_folder', '/'), ('get_commit', 'c1')]
+
+    client.calls = []
+    assert codecommit.CodeCommit.list_folder(client, 'repo', 'main', '/') == nodes
+    assert client.calls == [('get_folder', '/')]
+
+
 def test_delete_pipelines(client, env1, db, org1, user, group, module_mocker, pipeline):
     module_mocker.patch(
         'dataall.aws.handlers.service_handlers.Worker.queue', return_value=True
@@ -3,6 +3,7 @@ import typing
 import pytest
 
 import dataall
+from dataall.tasks.dataset_counters import repair_dataset_counters
 
 
 @pytest.fixture(scope='module', autouse=True)
@@ -244,6 +245,36 @@ def test_add_locations(location, dataset1, db):
     assert nb == 10
 
 
+def test_repair_dataset_counters(client, dataset1, group, db):
+    # Tables and folders added by the fixtures bypass the counters
+    with db.scoped_session() as session:
+        dataall.db.api.Dataset.update_dataset_counters(
+            session, dataset1.datasetUri, tables=1
+        )
+    assert repair_dataset_counters(db) == [dataset1.datasetUri]
+    assert repair_dataset_counters(db) == []
+
+    response = client.query(
+        """
+        query GetDataset($datasetUri:String!){
+            getDataset(datasetUri:$datasetUri){
+                statistics{
+                    tables
+                    locations
+                    upvotes
+                }
+            }
+        }
+        """,
+        username=dataset1.owner,
+        groups=[group.name],
+        datasetUri=dataset1.datasetUri,
+    )
+    assert response.data.getDataset.statistics.tables == 10
+    assert response.data.getDataset.statistics.locations == 10
+    assert response.data.getDataset.statistics.upvotes == 0
+
+
 def test_list_dataset_locations(client, dataset1, group):
     q = """
         query GetDataset($datasetUri:String!,$lFilter:DatasetStorageLocationFilter){
@@ -43,7 +43,7 @@ def table1(dataset1, table_with_permission, group, user):
 def test_start_profiling_run_authorized(org1, env1, dataset1, table1, client, module_mocker, db, user, group):
     module_mocker.patch('requests.post', return_value=True)
     module_mocker.patch(
-        'dataall.aws.handlers.service_handlers.Worker.process', return_value=True
+        'dataall.aws.handlers.service_handlers.Worker.invoke', return_value=True
     )
     dataset1.GlueProfilingJobName = ('profile-job',)
     dataset1.GlueProfilingTriggerSchedule = ('cron(* 2 * * ? *)',)
@@ -74,7 +74,7 @@ def test_start_profiling_run_authorized(org1, env1, dataset1, table1, client, mo
 def test_start_profiling_run_unauthorized(org2, env2, dataset1, table1, client, module_mocker, db, user2, group2):
     module_mocker.patch('requests.post', return_value=True)
     module_mocker.patch(
-        'dataall.aws.handlers.service_handlers.Worker.process', return_value=True
+        'dataall.aws.handlers.service_handlers.Worker.invoke', return_value=True
     )
     dataset1.GlueProfilingJobName = ('profile-job',)
     dataset1.GlueProfilingTriggerSchedule = ('cron(* 2 * * ? *)',)
@@ -211,3 +211,71 @@ def test_list_table_profiling_runs_unauthorized(
         username=user2.userName,
     )
     assert 'UnauthorizedOperation' in response.errors[0].message
+
+
+def test_profiling_runs_status_refresh(client, table1, db, mocker, user, group):
+    with db.scoped_session() as session:
+        run = session.query(dataall.db.models.DatasetProfilingRun).first()
+        run.lastStatusCheck = None
+    queue = mocker.patch(
+        'dataall.api.Objects.DatasetProfiling.resolvers.Worker.queue', return_value=True
+    )
+
+    def list_runs():
+        return client.query(
+            """
+            query listDatasetTableProfilingRuns($tableUri:String!){
+                listDatasetTableProfilingRuns(tableUri:$tableUri){
+                    nodes{
+                        status
+                    }
+                }
+            }
+            """,
+            tableUri=table1.tableUri,
+            groups=[group.name],
+            username=user.userName,
+        ).data.listDatasetTableProfilingRuns['nodes'][0]['status']
+
+    assert list_runs() == 'RUNNING'
+    assert list_runs() == 'RUNNING'
+    queue.assert_called_once()
+    with db.scoped_session() as session:
+        task = session.query(dataall.db.models.Task).get(queue.call_args[1]['task_ids'][0])
+        assert task.action == 'glue.job.profiling_runs_status'
+        assert task.payload['profilingRunUris'] == [run.profilingRunUri]
+
+    get_job_runs_states = mocker.patch(
+        'dataall.aws.handlers.glue.Glue.get_job_runs_states',
+        return_value={'jr_111111111111': 'SUCCEEDED'},
+    )
+    assert dataall.aws.handlers.glue.Glue.refresh_profiling_runs_status(db, task) == {
+        run.profilingRunUri: 'SUCCEEDED'
+    }
+    assert get_job_runs_states.call_args[0][3] == {'jr_111111111111'}
+
+    with db.scoped_session() as session:
+        session.query(dataall.db.models.DatasetProfilingRun).get(
+            run.profilingRunUri
+        ).lastStatusCheck = None
+    assert list_runs() == 'SUCCEEDED'
+    queue.assert_called_once()
+
+
+def test_get_job_runs_states(mocker):
+    client = mocker.MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {'JobRuns': [{'Id': 'jr_1', 'JobRunState': 'RUNNING'}]},
+        {'JobRuns': [{'Id': 'jr_2', 'JobRunState': 'FAILED'}]},
+        {'JobRuns': [{'Id': 'jr_3', 'JobRunState': 'FAILED'}]},
+    ]
+    client.get_job_run.return_value = {'JobRun': {'JobRunState': 'SUCCEEDED'}}
+    mocker.patch(
+        'dataall.aws.handlers.glue.SessionHelper.remote_session',
+        return_value=mocker.MagicMock(client=mocker.MagicMock(return_value=client)),
+    )
+    states = dataall.aws.handlers.glue.Glue.get_job_runs_states(
+        '111111111111', 'eu-west-1', 'job', {'jr_1', 'jr_2', 'jr_3', 'jr_old'}
+    )
+    assert states == {'jr_1': 'RUNNING', 'jr_2': 'FAILED', 'jr_3': 'SUCCEEDED', 'jr_old': 'SUCCEEDED'}
+    assert client.get_job_run.call_count == 2
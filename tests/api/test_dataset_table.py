@@ -1,8 +1,10 @@
 import typing
+from datetime import datetime, timedelta
 
 import pytest
 
 import dataall
+from dataall.aws.handlers.athena import Athena, AthenaResult
 
 
 @pytest.fixture(scope='module', autouse=True)
@@ -123,6 +125,161 @@ def test_add_columns(table, dataset1, db):
         session.add(table_col)
 
 
+def test_preview_table(client, dataset1, db, mocker):
+    with db.scoped_session() as session:
+        table = (
+            session.query(dataall.db.models.DatasetTable)
+            .filter(dataall.db.models.DatasetTable.name == 'table1')
+            .first()
+        )
+    mocker.patch(
+        'dataall.api.Objects.DatasetTable.resolvers.SessionHelper.remote_session',
+        return_value=mocker.MagicMock(),
+    )
+    mocker.patch(
+        'dataall.api.Objects.DatasetTable.resolvers.Athena.get_work_group_name',
+        return_value='primary',
+    )
+    run_query = mocker.patch(
+        'dataall.api.Objects.DatasetTable.resolvers.Athena.run_query',
+        return_value=AthenaResult(
+            [{'name': 'col1', 'type': 'integer'}], [[1, None]]
+        ),
+    )
+    query = """
+        query PreviewTable2($tableUri:String!, $filter:DatasetTablePreviewFilter){
+            previewTable2(tableUri:$tableUri, filter:$filter){
+                fields
+                rows
+                columns { name typeName }
+                data
+                rowCount
+            }
+        }
+        """
+    response = client.query(
+        query,
+        username=dataset1.owner,
+        groups=[dataset1.SamlAdminGroupName],
+        tableUri=table.tableUri,
+        filter={'limit': 10, 'columns': ['col1']},
+    )
+    assert run_query.call_args[1]['sql'] == (
+        f'select col1 from {table.GlueDatabaseName}.{table.GlueTableName} limit 10'
+    )
+    preview = response.data.previewTable2
+    assert preview.fields == ['{"name": "col1"}']
+    assert preview.rows == ['["1"]', '["null"]']
+    assert preview.columns[0].typeName == 'integer'
+    assert preview.data == '[[1, null]]'
+    assert preview.rowCount == 2
+
+    response = client.query(
+        query,
+        username=dataset1.owner,
+        groups=[dataset1.SamlAdminGroupName],
+        tableUri=table.tableUri,
+        filter={'columns': ['unknown']},
+    )
+    assert 'InvalidInput' in response.errors[0].message
+
+    with db.scoped_session() as session:
+        session.add(
+            dataall.db.models.DatasetTableColumn(
+                name='col-2',
+                label='col-2',
+                owner=table.owner,
+                datasetUri=table.datasetUri,
+                tableUri=table.tableUri,
+                AWSAccountId=table.AWSAccountId,
+                GlueDatabaseName=table.GlueDatabaseName,
+                GlueTableName=table.GlueTableName,
+                region=table.region,
+                typeName='String',
+            )
+        )
+    response = client.query(
+        query,
+        username=dataset1.owner,
+        groups=[dataset1.SamlAdminGroupName],
+        tableUri=table.tableUri,
+        filter={'columns': ['col1', 'col-2']},
+    )
+    assert 'InvalidInput' in response.errors[0].message
+    assert run_query.call_count == 1
+    response = client.query(
+        query,
+        username=dataset1.owner,
+        groups=[dataset1.SamlAdminGroupName],
+        tableUri=table.tableUri,
+        filter={'limit': 100000},
+    )
+    assert 'InvalidInput' in response.errors[0].message
+
+
+def test_preview_table_cache(client, dataset1, db, mocker):
+    with db.scoped_session() as session:
+        table = (
+            session.query(dataall.db.models.DatasetTable)
+            .filter(dataall.db.models.DatasetTable.name == 'table2')
+            .first()
+        )
+    run_table_preview = mocker.patch(
+        'dataall.api.Objects.DatasetTable.resolvers.Athena.run_table_preview',
+        return_value=AthenaResult([{'name': 'col1', 'type': 'integer'}], [[1]]),
+    )
+    queue = mocker.patch(
+        'dataall.api.Objects.DatasetTable.resolvers.Worker.queue', return_value=True
+    )
+
+    def preview():
+        response = client.query(
+            """
+            query PreviewTable2($tableUri:String!){
+                previewTable2(tableUri:$tableUri){
+                    data
+                }
+            }
+            """,
+            username=dataset1.owner,
+            groups=[dataset1.SamlAdminGroupName],
+            tableUri=table.tableUri,
+        )
+        assert response.data.previewTable2.data == '[[1]]'
+
+    preview()
+    preview()
+    assert run_table_preview.call_count == 1
+    queue.assert_not_called()
+
+    with db.scoped_session() as session:
+        cached = session.query(dataall.db.models.DatasetTablePreview).filter(
+            dataall.db.models.DatasetTablePreview.tableUri == table.tableUri
+        ).first()
+        cached.created = datetime.now() - timedelta(days=1)
+
+    preview()
+    preview()
+    assert run_table_preview.call_count == 1
+    queue.assert_called_once()
+
+    with db.scoped_session() as session:
+        task = session.query(dataall.db.models.Task).get(queue.call_args[1]['task_ids'][0])
+        assert task.action == 'athena.table.preview.refresh'
+        mocker.patch(
+            'dataall.aws.handlers.athena.Athena.run_table_preview',
+            return_value=AthenaResult([{'name': 'col1', 'type': 'integer'}], [[2]]),
+        )
+        Athena.refresh_table_preview(db, task)
+
+    with db.scoped_session() as session:
+        cached = session.query(dataall.db.models.DatasetTablePreview).filter(
+            dataall.db.models.DatasetTablePreview.tableUri == table.tableUri
+        ).first()
+        assert cached.result['vectors'] == [[2]]
+        assert cached.refreshRequested is None
+
+
 def test_list_dataset_tables(client, dataset1):
     q = """
         query GetDataset($datasetUri:String!,$tableFilter:DatasetTableFilter){
@@ -577,7 +577,58 @@ def test_get_term_associations(t1, client):
         nodeUri=t1.nodeUri,
         username='alice',
     )
-    print(r)
+    assert r.data.getTerm.associations.count == 2
+
+
+def test_glossary_associations_and_hierarchy(client, g1, c1, t1):
+    r = client.query(
+        """
+        query GetGlossary($nodeUri:String!){
+            getGlossary(nodeUri:$nodeUri){
+                associations{
+                    count
+                    nodes{
+                        targetType
+                    }
+                }
+            }
+        }
+        """,
+        nodeUri=g1.nodeUri,
+        username='alice',
+    )
+    associations = r.data.getGlossary.associations
+    assert associations.count == 2
+    assert sorted(node.targetType for node in associations.nodes) == ['Column', 'Dataset']
+
+    r = client.query(
+        """
+        query SearchGlossaryHierarchy($filter:TermFilter){
+            searchGlossaryHierarchy(filter:$filter){
+                count
+                nodes{
+                    ...on Glossary{
+                        nodeUri
+                        isMatch
+                    }
+                    ...on Category{
+                        nodeUri
+                        isMatch
+                    }
+                    ...on Term{
+                        nodeUri
+                        isMatch
+                    }
+                }
+            }
+        }
+        """,
+        filter={'term': 'global customer'},
+        username='alice',
+    )
+    nodes = r.data.searchGlossaryHierarchy.nodes
+    assert [node.nodeUri for node in nodes] == [g1.nodeUri, c1.nodeUri, t1.nodeUri]
+    assert [node.isMatch for node in nodes] == [False, False, True]
 
 
 def test_delete_category(client, c1, group):
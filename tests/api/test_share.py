@@ -1048,6 +1048,58 @@ def test_list_shares_from_me_requester(
     assert get_share_requests_from_me_response.data.getShareRequestsFromMe.count == 2
 
 
+def test_list_shares_from_me_statistics(
+        client, db, user2, group2, share1_draft, share1_item_pa, share3_processed, share3_item_shared
+):
+    # Given a draft share with one pending item and a processed share with one shared item
+    q = """
+        query getShareRequestsFromMe($filter: ShareObjectFilter){
+            getShareRequestsFromMe(filter: $filter){
+                nodes{
+                    shareUri
+                    statistics {
+                      tables
+                      locations
+                      sharedItems
+                      revokedItems
+                      failedItems
+                      pendingItems
+                    }
+                }
+            }
+        }
+    """
+    # When the requester lists the shares sent from him
+    response = client.query(q, username=user2.userName, groups=[group2.name])
+    statistics = {
+        node.shareUri: node.statistics
+        for node in response.data.getShareRequestsFromMe.nodes
+    }
+    # Then the statistics of each share are counted
+    assert statistics[share1_draft.shareUri].tables == 1
+    assert statistics[share1_draft.shareUri].pendingItems == 1
+    assert statistics[share1_draft.shareUri].sharedItems == 0
+    assert statistics[share3_processed.shareUri].tables == 1
+    assert statistics[share3_processed.shareUri].sharedItems == 1
+    assert statistics[share3_processed.shareUri].pendingItems == 0
+
+    with db.scoped_session() as session:
+        batch = dataall.db.api.ShareObject.resolve_share_objects_statistics(
+            session, [share1_draft.shareUri, share3_processed.shareUri, 'unknown']
+        )
+        assert batch[share1_draft.shareUri] == dataall.db.api.ShareObject.resolve_share_object_statistics(
+            session, share1_draft.shareUri
+        )
+        assert batch['unknown'] == {
+            'tables': 0,
+            'locations': 0,
+            'sharedItems': 0,
+            'revokedItems': 0,
+            'failedItems': 0,
+            'pendingItems': 0,
+        }
+
+
 def test_add_share_item(
         client, user2, group2, share1_draft,
 
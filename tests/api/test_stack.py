@@ -57,3 +57,44 @@ def update_stack_query(client, target_uri, target_type, group):
         groups=[group],
     )
     return response
+
+
+def test_stack_refreshes_throttled(db, env_fixture, mocker):
+    from datetime import datetime, timedelta
+
+    import dataall
+    from dataall.api.Objects.Stack import stack_helper
+
+    queue = mocker.patch('dataall.api.Objects.Stack.stack_helper.Worker.queue')
+    with db.scoped_session() as session:
+        env = session.query(dataall.db.models.Environment).get(env_fixture.environmentUri)
+        stacks = [
+            dataall.db.api.Stack.create_stack(
+                session, env.environmentUri, 'refresh', f'refresh-target-{i}', 'environment'
+            )
+            for i in range(2)
+        ]
+
+        def request(stack):
+            return stack_helper.request_stack_refresh(db, session, env, stack, stack.targetUri)
+
+        with stack_helper.batch_stack_refreshes(db):
+            assert [request(stack) for stack in stacks + stacks] == [True, True, False, False]
+        assert queue.call_count == 1
+        task = session.query(dataall.db.models.Task).get(queue.call_args.kwargs['task_ids'][0])
+        assert task.action == 'cloudformation.stacks.describe_resources'
+        assert [s['stackUri'] for s in task.payload['stacks']] == [s.stackUri for s in stacks]
+
+        stable = session.query(dataall.db.models.Stack).get(stacks[0].stackUri)
+        stable.status = 'UPDATE_COMPLETE'
+        stable.lastSeen = datetime.now() - timedelta(minutes=5)
+        session.commit()
+        assert not request(stable)
+        assert queue.call_count == 1
+
+        dataall.db.api.Stack.expire_stack_refresh(stable)
+        session.commit()
+        assert request(stable)
+        task = session.query(dataall.db.models.Task).get(queue.call_args.kwargs['task_ids'][0])
+        assert task.action == 'cloudformation.stack.describe_resources'
+        assert task.payload['stackUri'] == stable.stackUri
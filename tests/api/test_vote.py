@@ -67,6 +67,7 @@ def test_count_votes(client, dataset1, dashboard):
         client, dataset1.datasetUri, 'dataset', dataset1.SamlAdminGroupName
     )
     assert response.data.countUpVotes == 0
+    assert get_dataset_upvotes(client, dataset1) == 0
     response = count_votes_query(
         client, dashboard.dashboardUri, 'dashboard', dataset1.SamlAdminGroupName
     )
@@ -115,6 +116,7 @@ def test_upvote(patch_es, client, dataset1, module_mocker, dashboard):
         client, dataset1.datasetUri, 'dataset', dataset1.SamlAdminGroupName
     )
     assert response.data.countUpVotes == 1
+    assert get_dataset_upvotes(client, dataset1) == 1
     response = get_vote_query(
         client, dataset1.datasetUri, 'dataset', dataset1.SamlAdminGroupName
     )
@@ -155,6 +157,7 @@ def test_upvote(patch_es, client, dataset1, module_mocker, dashboard):
         client, dataset1.datasetUri, 'dataset', dataset1.SamlAdminGroupName
     )
     assert response.data.countUpVotes == 0
+    assert get_dataset_upvotes(client, dataset1) == 0
     response = count_votes_query(
         client, dashboard.dashboardUri, 'dashboard', dataset1.SamlAdminGroupName
     )
@@ -182,3 +185,21 @@ def upvote_mutation(client, target_uri, target_type, upvote, group):
         groups=[group],
     )
     return response
+
+
+def get_dataset_upvotes(client, dataset):
+    response = client.query(
+        """
+        query GetDataset($datasetUri:String!){
+            getDataset(datasetUri:$datasetUri){
+                statistics{
+                    upvotes
+                }
+            }
+        }
+        """,
+        datasetUri=dataset.datasetUri,
+        username='alice',
+        groups=[dataset.SamlAdminGroupName],
+    )
+    return response.data.getDataset.statistics.upvotes
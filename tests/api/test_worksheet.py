@@ -1,4 +1,6 @@
 import pytest
+
+import dataall
 from dataall.api.constants import WorksheetRole
 
 
@@ -146,6 +148,333 @@ def test_update_worksheet(client, worksheet, group):
     assert response.data.updateWorksheet.label == 'change label'
 
 
+class FakeAthena:
+    def __init__(self, pages, state='SUCCEEDED', scanned=34):
+        self.pages = pages
+        self.state = state
+        self.scanned = scanned
+        self.results_calls = []
+        self.stopped = []
+
+    def start_query_execution(self, **kwargs):
+        self.started = kwargs
+        return {'QueryExecutionId': 'q1'}
+
+    def get_query_execution(self, QueryExecutionId):
+        return {
+            'QueryExecution': {
+                'Status': {'State': self.state},
+                'Statistics': {'TotalExecutionTimeInMillis': 12, 'DataScannedInBytes': self.scanned},
+                'ResultConfiguration': {'OutputLocation': 's3://bucket/q1.csv'},
+            }
+        }
+
+    def stop_query_execution(self, QueryExecutionId):
+        self.stopped.append(QueryExecutionId)
+        self.state = 'CANCELLED'
+
+    def get_query_results(self, **kwargs):
+        self.results_calls.append(kwargs)
+        return self.pages[kwargs.get('NextToken')]
+
+
+def results_page(rows, next_token=None):
+    response = {
+        'ResultSet': {
+            'ResultSetMetadata': {
+                'ColumnInfo': [
+                    {'Name': 'id', 'Type': 'integer'},
+                    {'Name': 'active', 'Type': 'boolean'},
+                    {'Name': 'name', 'Type': 'varchar'},
+                ]
+            },
+            'Rows': [{'Data': [{'VarCharValue': v} if v is not None else {} for v in row]} for row in rows],
+        }
+    }
+    if next_token:
+        response['NextToken'] = next_token
+    return response
+
+
+def test_run_athena_sql_query(client, worksheet, env_fixture, group, mocker):
+    athena = FakeAthena(
+        {
+            None: results_page([['id', 'active', 'name'], ['1', 'true', 'a']], 't1'),
+            't1': results_page([['2', 'false', None]]),
+        }
+    )
+    mocker.patch(
+        'dataall.api.Objects.AthenaQueryResult.helpers.get_athena_client_with_role',
+        return_value=athena,
+    )
+    query = """
+        query runAthenaSqlQuery($environmentUri:String!, $worksheetUri:String!, $sqlQuery:String!, $pageSize:Int){
+            runAthenaSqlQuery(environmentUri:$environmentUri, worksheetUri:$worksheetUri, sqlQuery:$sqlQuery, pageSize:$pageSize){
+                Error
+                Status
+                AthenaQueryId
+                ElapsedTimeInMs
+                DataScannedInBytes
+                AwsAccountId
+                columns { columnName typeName }
+                vectors
+                nextToken
+                rows { cells { columnName typeName value } }
+            }
+        }
+        """
+    response = client.query(
+        query,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        sqlQuery='select * from t',
+        username='alice',
+        groups=[group.name],
+    )
+    result = response.data.runAthenaSqlQuery
+    assert athena.started['QueryString'] == 'select * from t'
+    assert result.Status == 'SUCCEEDED'
+    assert result.ElapsedTimeInMs == 12
+    assert result.AwsAccountId == env_fixture.AwsAccountId
+    assert [c.typeName for c in result.columns] == ['integer', 'boolean', 'varchar']
+    assert result.vectors == [['1', '2'], ['true', 'false'], ['a', None]]
+    assert not result.nextToken
+    assert [c.value for c in result.rows[1].cells] == ['2', 'false', None]
+
+    athena.results_calls.clear()
+    response = client.query(
+        query,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        sqlQuery='select * from t',
+        pageSize=1,
+        username='alice',
+        groups=[group.name],
+    )
+    result = response.data.runAthenaSqlQuery
+    assert result.vectors == [['1'], ['true'], ['a']]
+    assert result.nextToken == 't1'
+    assert athena.results_calls == [{'QueryExecutionId': 'q1', 'MaxResults': 2}]
+
+    response = client.query(
+        """
+        query getAthenaSqlQueryResults($environmentUri:String!, $worksheetUri:String!, $AthenaQueryId:String!, $nextToken:String){
+            getAthenaSqlQueryResults(environmentUri:$environmentUri, worksheetUri:$worksheetUri, AthenaQueryId:$AthenaQueryId, nextToken:$nextToken){
+                vectors
+                nextToken
+            }
+        }
+        """,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        AthenaQueryId='q1',
+        nextToken='t1',
+        username='alice',
+        groups=[group.name],
+    )
+    assert response.data.getAthenaSqlQueryResults.vectors == [['2'], ['false'], [None]]
+    assert not response.data.getAthenaSqlQueryResults.nextToken
+
+
+def test_run_athena_sql_query_scanning_over_2gib(client, worksheet, env_fixture, group, mocker):
+    athena = FakeAthena({None: results_page([['id', 'active', 'name']])}, scanned=3_000_000_000)
+    mocker.patch(
+        'dataall.api.Objects.AthenaQueryResult.helpers.get_athena_client_with_role',
+        return_value=athena,
+    )
+    response = client.query(
+        """
+        query runAthenaSqlQuery($environmentUri:String!, $worksheetUri:String!, $sqlQuery:String!){
+            runAthenaSqlQuery(environmentUri:$environmentUri, worksheetUri:$worksheetUri, sqlQuery:$sqlQuery){
+                Status
+                DataScannedInBytes
+            }
+        }
+        """,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        sqlQuery='select * from big',
+        username='alice',
+        groups=[group.name],
+    )
+    assert not response.errors
+    assert response.data.runAthenaSqlQuery.DataScannedInBytes == 3_000_000_000
+
+
+def test_run_athena_sql_query_timeout_cancels_query(client, worksheet, env_fixture, group, mocker):
+    athena = FakeAthena({}, state='RUNNING')
+    mocker.patch(
+        'dataall.api.Objects.AthenaQueryResult.helpers.get_athena_client_with_role',
+        return_value=athena,
+    )
+    mocker.patch('dataall.api.Objects.AthenaQueryResult.helpers.QUERY_TIMEOUT', 0)
+    response = client.query(
+        """
+        query runAthenaSqlQuery($environmentUri:String!, $worksheetUri:String!, $sqlQuery:String!){
+            runAthenaSqlQuery(environmentUri:$environmentUri, worksheetUri:$worksheetUri, sqlQuery:$sqlQuery){
+                Status
+                Error
+            }
+        }
+        """,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        sqlQuery='select * from slow',
+        username='alice',
+        groups=[group.name],
+    )
+    assert athena.stopped == ['q1']
+    assert response.data.runAthenaSqlQuery.Status == 'CANCELLED'
+    assert 'did not finish' in response.data.runAthenaSqlQuery.Error
+
+
+def test_start_athena_sql_query(client, worksheet, env_fixture, group, mocker):
+    athena = FakeAthena(
+        {
+            None: results_page([['id', 'active', 'name'], ['1', 'true', 'a']], 't1'),
+            't1': results_page([['2', 'false', None]]),
+        },
+        state='RUNNING',
+    )
+    mocker.patch(
+        'dataall.api.Objects.AthenaQueryResult.helpers.get_athena_client_with_role',
+        return_value=athena,
+    )
+    response = client.query(
+        """
+        mutation startAthenaSqlQuery($environmentUri:String!, $worksheetUri:String!, $sqlQuery:String!, $pageSize:Int){
+            startAthenaSqlQuery(environmentUri:$environmentUri, worksheetUri:$worksheetUri, sqlQuery:$sqlQuery, pageSize:$pageSize){
+                AthenaQueryId
+                Status
+            }
+        }
+        """,
+        environmentUri=env_fixture.environmentUri,
+        worksheetUri=worksheet.worksheetUri,
+        sqlQuery='select * from t',
+        pageSize=1,
+        username='alice',
+        groups=[group.name],
+    )
+    assert response.data.startAthenaSqlQuery.AthenaQueryId == 'q1'
+    assert response.data.startAthenaSqlQuery.Status == 'QUEUED'
+
+    status_query = """
+        query getAthenaSqlQueryStatus($worksheetUri:String!, $AthenaQueryId:String!){
+            getAthenaSqlQueryStatus(worksheetUri:$worksheetUri, AthenaQueryId:$AthenaQueryId){
+                Status
+                ElapsedTimeInMs
+            }
+        }
+        """
+    response = client.query(
+        status_query,
+        worksheetUri=worksheet.worksheetUri,
+        AthenaQueryId='q1',
+        username='alice',
+        groups=[group.name],
+    )
+    assert response.data.getAthenaSqlQueryStatus.Status == 'RUNNING'
+
+    athena.state = 'SUCCEEDED'
+    response = client.query(
+        status_query,
+        worksheetUri=worksheet.worksheetUri,
+        AthenaQueryId='q1',
+        username='alice',
+        groups=[group.name],
+    )
+    assert response.data.getAthenaSqlQueryStatus.Status == 'SUCCEEDED'
+    assert response.data.getAthenaSqlQueryStatus.ElapsedTimeInMs == 12
+
+    # Finished queries are not polled anymore
+    athena.state = 'FAILED'
+    page_query = """
+        query getAthenaSqlQueryResultsPage($worksheetUri:String!, $AthenaQueryId:String!, $page:Int){
+            getAthenaSqlQueryResultsPage(worksheetUri:$worksheetUri, AthenaQueryId:$AthenaQueryId, page:$page){
+                Status
+                vectors
+                page
+                hasNext
+            }
+        }
+        """
+
+    def get_page(page):
+        return client.query(
+            page_query,
+            worksheetUri=worksheet.worksheetUri,
+            AthenaQueryId='q1',
+            page=page,
+            username='alice',
+            groups=[group.name],
+        ).data.getAthenaSqlQueryResultsPage
+
+    result = get_page(2)
+    assert result.Status == 'SUCCEEDED'
+    assert result.vectors == [['2'], ['false'], [None]]
+    assert not result.hasNext
+    assert [c.get('NextToken') for c in athena.results_calls] == [None, 't1']
+
+    athena.results_calls.clear()
+    result = get_page(1)
+    assert result.vectors == [['1'], ['true'], ['a']]
+    assert result.hasNext
+    assert get_page(3).vectors == []
+    assert not athena.results_calls
+
+    response = client.query(
+        status_query,
+        worksheetUri='unknown',
+        AthenaQueryId='q1',
+        username='alice',
+        groups=[group.name],
+    )
+    assert 'ResourceNotFound' in response.errors[0].message
+
+
+def test_query_statistics_over_int4(db, worksheet, env_fixture):
+    scanned = 5 * 2**31
+    with db.scoped_session() as session:
+        query_result = dataall.db.api.Worksheet.save_query_execution(
+            session,
+            worksheet.worksheetUri,
+            env_fixture,
+            'select * from big',
+            {'AthenaQueryId': 'q-big', 'Status': 'RUNNING'},
+            10,
+        )
+        dataall.db.api.Worksheet.update_query_execution(
+            session,
+            query_result,
+            {'Status': 'SUCCEEDED', 'ElapsedTimeInMs': 2**32, 'DataScannedInBytes': scanned},
+        )
+    with db.scoped_session() as session:
+        query_result = dataall.db.api.Worksheet.get_query_execution(
+            session, worksheet.worksheetUri, 'q-big'
+        )
+        assert query_result.DataScannedInBytes == scanned
+        assert query_result.ElapsedTimeInMs == 2**32
+
+
+def test_query_result_pages_expire(db, worksheet):
+    from dataall.tasks.worksheet_results_cleanup import delete_expired_result_pages
+
+    with db.scoped_session() as session:
+        assert dataall.db.api.Worksheet.save_query_result_page(
+            session, 'q-pages', 1, {'columns': [], 'rows': []}, 't1'
+        )
+        # Saved meanwhile by another request
+        assert not dataall.db.api.Worksheet.save_query_result_page(
+            session, 'q-pages', 1, {'columns': [], 'rows': []}, 't1'
+        )
+
+    assert delete_expired_result_pages(db, ttl_hours=1) == 0
+    assert delete_expired_result_pages(db, ttl_hours=0) >= 1
+    with db.scoped_session() as session:
+        assert not dataall.db.api.Worksheet.get_query_result_page(session, 'q-pages', 1)
+
+
 def test_share_with_individual(client, worksheet, group2, group):
     response = client.query(
         """
@@ -275,3 +604,4 @@ def test_share_with_individual(client, worksheet, group2, group):
         groups=[group.name],
     )
     assert response.data.deleteWorksheet
+
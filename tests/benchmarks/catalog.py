@@ -0,0 +1,347 @@
+"""
+Synthetic catalog for benchmarks, rows are generated by Postgres with
+generate_series so that millions of rows are inserted in seconds.
+Labels combine a word of WORDS with a random suffix, a term of WORDS
+matches 1/len(WORDS) of the rows, a random suffix matches a few rows.
+Uris are the table prefix followed by the row number, e.g. table42 or col42.
+"""
+import logging
+
+from sqlalchemy import text
+
+from dataall.db import api, permissions
+
+log = logging.getLogger(__name__)
+
+WORDS = [
+    'customer', 'order', 'invoice', 'product', 'payment', 'shipment', 'account',
+    'employee', 'supplier', 'inventory', 'campaign', 'session', 'device', 'region',
+    'contract', 'ticket', 'review', 'balance', 'transaction', 'warehouse',
+]
+
+_WORD = "(ARRAY['" + "','".join(WORDS) + "'])[1 + (i % " + str(len(WORDS)) + ')]'
+
+CATALOG = [
+    (
+        'organization',
+        f"""
+        INSERT INTO organization (
+            "organizationUri", label, name, owner, created, description, "SamlGroupName"
+        )
+        SELECT
+            'org' || i, {_WORD} || ' organization ' || i, 'org' || i, 'alice', now(),
+            'Synthetic organization ' || i, 'group' || (i % :groups)
+        FROM generate_series(0, :organizations - 1) AS i
+        """,
+    ),
+    (
+        'environment',
+        f"""
+        INSERT INTO environment (
+            "environmentUri", "organizationUri", label, name, owner, created, description,
+            "AwsAccountId", region, "SamlGroupName", "resourcePrefix", "environmentType", validated,
+            "EnvironmentDefaultIAMRoleName", "EnvironmentDefaultIAMRoleArn",
+            "EnvironmentDefaultBucketName", "CDKRoleArn", "roleCreated"
+        )
+        SELECT
+            'env' || i, 'org' || (i % :organizations), {_WORD} || ' environment ' || i,
+            'env' || i, 'alice', now(), 'Synthetic environment ' || i,
+            lpad(i::text, 12, '0'), 'eu-west-1', 'group' || (i % :groups), 'dataall', 'Data', true,
+            'envrole' || i, 'arn:aws:iam::' || lpad(i::text, 12, '0') || '\\:role/envrole' || i,
+            'envbucket' || i, 'arn:aws:iam::' || lpad(i::text, 12, '0') || '\\:role/cdkrole', true
+        FROM generate_series(0, :environments - 1) AS i
+        """,
+    ),
+    (
+        'organization_group',
+        """
+        INSERT INTO organization_group ("groupUri", "organizationUri", "invitedBy", created)
+        SELECT 'group' || i, 'org' || (i % :organizations), 'alice', now()
+        FROM generate_series(0, :groups - 1) AS i
+        """,
+    ),
+    (
+        'environment_group_permission',
+        """
+        INSERT INTO environment_group_permission (
+            "groupUri", "environmentUri", "invitedBy", "environmentIAMRoleName",
+            "environmentIAMRoleArn", "groupRoleInEnvironment", created
+        )
+        SELECT
+            'group' || i, 'env' || (i % :environments), 'alice', 'grouprole' || i,
+            'arn:aws:iam::' || lpad((i % :environments)::text, 12, '0') || '\\:role/grouprole' || i,
+            '900', now()
+        FROM generate_series(0, :groups - 1) AS i
+        """,
+    ),
+    (
+        'dataset',
+        f"""
+        INSERT INTO dataset (
+            "datasetUri", "environmentUri", "organizationUri", label, name, owner, created,
+            description, "AwsAccountId", region, "S3BucketName", "GlueDatabaseName",
+            "IAMDatasetAdminRoleArn", "IAMDatasetAdminUserArn", "KmsAlias", language,
+            confidentiality, "SamlAdminGroupName", stewards,
+            "tablesCount", "locationsCount", "upvotesCount"
+        )
+        SELECT
+            'dataset' || i, 'env' || (i % :environments),
+            'org' || (i % :environments % :organizations),
+            {_WORD} || ' ' || substr(md5(i::text), 1, 8), 'dataset' || i,
+            'user' || (i % :groups), now(), 'Synthetic dataset ' || i,
+            lpad((i % :environments)::text, 12, '0'), 'eu-west-1', 'bucket' || i, 'database' || i,
+            'arn:aws:iam::' || lpad((i % :environments)::text, 12, '0') || '\\:role/dataset' || i,
+            'arn:aws:iam::' || lpad((i % :environments)::text, 12, '0') || '\\:user/dataset' || i,
+            'dataset' || i, 'English', 'Unclassified',
+            'group' || (i % :groups), 'group' || ((i + 1) % :groups),
+            greatest(least(:tables_per_dataset, :tables - i * :tables_per_dataset), 0),
+            greatest(least(:tables_per_dataset, :tables - i * :tables_per_dataset), 0),
+            (:tables - 1 - i) / :datasets + 1
+        FROM generate_series(0, :datasets - 1) AS i
+        """,
+    ),
+    (
+        'dataset_table',
+        f"""
+        INSERT INTO dataset_table (
+            "tableUri", "datasetUri", label, name, owner, created, description,
+            "AWSAccountId", "S3BucketName", "S3Prefix", "GlueDatabaseName",
+            "GlueTableName", region, "LastGlueTableStatus", confidentiality
+        )
+        SELECT
+            'table' || i, 'dataset' || (i / :tables_per_dataset),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            'alice', now(), 'Synthetic table ' || i,
+            '111111111111', 'bucket' || (i / :tables_per_dataset), 'table' || i,
+            'database' || (i / :tables_per_dataset),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            'eu-west-1', 'InSync', 'C1'
+        FROM generate_series(0, :tables - 1) AS i
+        """,
+    ),
+    (
+        'dataset_table_column',
+        f"""
+        INSERT INTO dataset_table_column (
+            "columnUri", "tableUri", "datasetUri", label, name, owner, created,
+            description, "AWSAccountId", region, "GlueDatabaseName", "GlueTableName",
+            "typeName", "columnType"
+        )
+        SELECT
+            'col' || i, 'table' || (i / :columns_per_table),
+            'dataset' || (i / :columns_per_table / :tables_per_dataset),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            'alice', now(), 'Synthetic ' || {_WORD} || ' column ' || substr(md5(i::text), 9, 12),
+            '111111111111', 'eu-west-1',
+            'database' || (i / :columns_per_table / :tables_per_dataset),
+            'table' || (i / :columns_per_table), 'string', 'column'
+        FROM generate_series(0, :columns - 1) AS i
+        """,
+    ),
+    (
+        'share_object_item',
+        f"""
+        INSERT INTO share_object_item (
+            "shareItemUri", "shareUri", "itemType", "itemUri", "itemName",
+            owner, created, status
+        )
+        SELECT
+            'shareitem' || i, 'share' || (i / 2), 'DatasetTable',
+            'table' || i, {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            'alice', now(),
+            (ARRAY['Share_Succeeded', 'PendingApproval', 'Revoke_Succeeded'])[1 + (i % 3)]
+        FROM generate_series(0, :tables - 1) AS i
+        """,
+    ),
+    (
+        'share_object',
+        """
+        INSERT INTO share_object (
+            "shareUri", "datasetUri", "environmentUri", "groupUri", "principalId",
+            "principalType", status, owner, created
+        )
+        SELECT
+            'share' || i, 'dataset' || (i % :datasets), 'env' || (i % :environments),
+            'group' || (i % :groups), 'group' || (i % :groups), 'Group', 'Approved', 'alice', now()
+        FROM generate_series(0, :tables / 2) AS i
+        """,
+    ),
+    (
+        'dataset_storage_location',
+        f"""
+        INSERT INTO dataset_storage_location (
+            "locationUri", "datasetUri", label, name, owner, created, description,
+            "AWSAccountId", "S3BucketName", "S3Prefix", region
+        )
+        SELECT
+            'location' || i, 'dataset' || (i / :tables_per_dataset),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            {_WORD} || '_' || substr(md5(i::text), 1, 8),
+            'alice', now(), 'Synthetic folder ' || i,
+            '111111111111', 'bucket' || (i / :tables_per_dataset), 'folder' || i, 'eu-west-1'
+        FROM generate_series(0, :tables - 1) AS i
+        """,
+    ),
+    (
+        'vote',
+        """
+        INSERT INTO vote ("voteUri", username, "targetUri", "targetType", upvote, created)
+        SELECT 'vote' || i, 'user' || (i / :datasets), 'dataset' || (i % :datasets), 'dataset', true, now()
+        FROM generate_series(0, :tables - 1) AS i
+        """,
+    ),
+    (
+        'notification',
+        """
+        INSERT INTO notification (
+            "notificationUri", type, message, username, is_read, target_uri, created, deleted
+        )
+        SELECT
+            'notification' || i, 'SHARE_OBJECT_APPROVED', 'Share share' || (i / 2) || ' approved',
+            'user' || (i % :groups), i % 3 = 0, 'share' || (i / 2), now(),
+            CASE WHEN i % 7 = 0 THEN now() END
+        FROM generate_series(0, :tables - 1) AS i
+        """,
+    ),
+    (
+        'glossary_node',
+        f"""
+        INSERT INTO glossary_node (
+            "nodeUri", "parentUri", "nodeType", status, path, label, readme, owner, created
+        )
+        SELECT
+            'node' || i,
+            CASE WHEN i < 100 THEN '' ELSE 'node' || (i % 100) END,
+            CASE WHEN i < 100 THEN 'G' ELSE 'T' END,
+            'approved',
+            CASE WHEN i < 100 THEN '/node' || i ELSE '/node' || (i % 100) || '/node' || i END,
+            {_WORD} || ' ' || substr(md5(i::text), 1, 8),
+            'Definition of ' || {_WORD} || ' ' || substr(md5(i::text), 9, 12),
+            'alice', now()
+        FROM generate_series(0, :terms - 1) AS i
+        """,
+    ),
+    (
+        'glossary_node_ancestor',
+        """
+        INSERT INTO glossary_node_ancestor ("nodeUri", "ancestorUri", depth)
+        SELECT 'node' || i, 'node' || i, 0 FROM generate_series(0, :terms - 1) AS i
+        UNION ALL
+        SELECT 'node' || i, 'node' || (i % 100), 1 FROM generate_series(100, :terms - 1) AS i
+        """,
+    ),
+    (
+        'term_link',
+        """
+        INSERT INTO term_link (
+            "linkUri", "nodeUri", "targetUri", "targetType", "approvedBySteward",
+            "approvedByOwner", owner, created
+        )
+        SELECT
+            'link' || i, 'node' || (100 + i % greatest(:terms - 100, 1)), 'col' || (i * 10),
+            'Column', true, true, 'alice', now()
+        FROM generate_series(0, :columns / 10 - 1) AS i
+        """,
+    ),
+    (
+        'resource_policy',
+        """
+        INSERT INTO resource_policy (sid, "resourceUri", "resourceType", "principalId", "principalType", created)
+        SELECT
+            'policy-org' || i, 'org' || i, 'Organization', 'group' || (i % :groups),
+            'GROUP'::rp_principal_type, now()
+        FROM generate_series(0, :organizations - 1) AS i
+        UNION ALL
+        SELECT 'policy-env' || i, 'env' || i, 'Environment', 'group' || (i % :groups), 'GROUP', now()
+        FROM generate_series(0, :environments - 1) AS i
+        UNION ALL
+        SELECT 'policy-dataset' || i, 'dataset' || i, 'Dataset', 'group' || (i % :groups), 'GROUP', now()
+        FROM generate_series(0, :datasets - 1) AS i
+        """,
+    ),
+    (
+        'resource_policy_permission',
+        """
+        INSERT INTO resource_policy_permission (sid, "permissionUri", created)
+        SELECT policy.sid, permission."permissionUri", now()
+        FROM resource_policy AS policy
+        JOIN permission ON permission.type = 'RESOURCE' AND permission.name = ANY(
+            CASE policy."resourceType"
+                WHEN 'Organization' THEN :organization_permissions
+                WHEN 'Environment' THEN :environment_permissions
+                ELSE :dataset_permissions
+            END
+        )
+        WHERE policy.sid LIKE 'policy-%'
+        """,
+    ),
+    (
+        'tenant_policy',
+        """
+        INSERT INTO tenant_policy (sid, "tenantUri", "principalId", "principalType", created)
+        SELECT 'policy-group' || i, tenant."tenantUri", 'group' || i, 'GROUP', now()
+        FROM generate_series(0, :groups - 1) AS i, tenant
+        WHERE tenant.name = 'dataall'
+        """,
+    ),
+    (
+        'tenant_policy_permission',
+        """
+        INSERT INTO tenant_policy_permission (sid, "permissionUri", created)
+        SELECT policy.sid, permission."permissionUri", now()
+        FROM tenant_policy AS policy
+        JOIN permission ON permission.type = 'TENANT' AND permission.name = ANY(:tenant_permissions)
+        WHERE policy.sid LIKE 'policy-%'
+        """,
+    ),
+]
+
+
+def generate_catalog(
+    engine,
+    columns=1_000_000,
+    columns_per_table=20,
+    tables_per_dataset=50,
+    organizations=10,
+    environments=100,
+    groups=1000,
+) -> dict:
+    """
+    Inserts columns dataset table columns, the tables holding them, a folder,
+    a share item, a vote and a notification per table, a share per two tables,
+    a glossary term per 100 columns and a term link per 10 columns.
+    Organization, environment and dataset N are administered by the group
+    'group' + N % groups, through resource policies with the permissions the
+    API attaches, its member is 'user' + N % groups. The tables are then analyzed
+    Returns
+    -------
+    dict with the number of rows per table
+    """
+    params = {
+        'columns': columns,
+        'columns_per_table': columns_per_table,
+        'tables_per_dataset': tables_per_dataset,
+        'tables': max(columns // columns_per_table, 1),
+        'datasets': max(columns // columns_per_table // tables_per_dataset, 1),
+        'terms': max(columns // 100, 1),
+        'organizations': organizations,
+        'environments': environments,
+        'groups': groups,
+        'organization_permissions': permissions.ORGANIZATION_ALL,
+        'environment_permissions': permissions.ENVIRONMENT_ALL,
+        'dataset_permissions': permissions.DATASET_ALL,
+        'tenant_permissions': permissions.TENANT_ALL,
+    }
+    counts = {}
+    with engine.scoped_session() as session:
+        api.Permission.init_permissions(session)
+        api.Tenant.save_tenant(session, name='dataall', description='Tenant dataall')
+        for table, statement in CATALOG:
+            counts[table] = session.execute(text(statement), params).rowcount
+            log.info(f'Generated {counts[table]} rows in {table}')
+    with engine.scoped_session() as session:
+        for table, _ in CATALOG:
+            session.execute(text(f'ANALYZE {table}'))
+    return counts
@@ -0,0 +1,300 @@
+"""
+Replays a mix of the frontend GraphQL operations in-process through the
+executable schema, on a synthetic catalog and with the AWS handlers stubbed.
+Reports the latency percentiles, SQL statements and memory per operation
+and compares them with a saved baseline.
+Runs against the local Postgres (docker-compose) in a dedicated schema
+which is dropped and recreated unless --no-generate is given:
+
+    export PYTHONPATH=./backend
+    python -m tests.benchmarks.graphql_load --baseline graphql_load.json --save
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from unittest import mock
+
+from ariadne import graphql_sync
+
+os.environ.setdefault('schema_name', 'benchmark')
+
+from dataall.api import get_executable_schema  # noqa: E402
+from dataall.api.Objects.Stack.stack_helper import batch_stack_refreshes  # noqa: E402
+from dataall.db import collect_sql_stats, create_schema_and_tables, get_engine  # noqa: E402
+
+from .catalog import WORDS, generate_catalog  # noqa: E402
+
+log = logging.getLogger(__name__)
+
+FRONTEND_API = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'frontend',
+    'src',
+    'api',
+)
+
+PAGE = {'page': 1, 'pageSize': 10}
+
+# operation: (frontend module, weight in the mix, variables for a dataset d and one of its tables t)
+OPERATIONS = {
+    'listDatasets': ('Dataset/listDatasets.js', 10, lambda d, t: {'filter': PAGE}),
+    'getDataset': ('Dataset/getDataset.js', 10, lambda d, t: {'datasetUri': f'dataset{d}'}),
+    'listDatasetTables': (
+        'Dataset/listDatasetTables.js',
+        8,
+        lambda d, t: {'datasetUri': f'dataset{d}', 'filter': PAGE},
+    ),
+    'listDatasetStorageLocations': (
+        'Dataset/listDatasetStorageLocations.js',
+        4,
+        lambda d, t: {'datasetUri': f'dataset{d}', 'filter': PAGE},
+    ),
+    'getDatasetTable': ('DatasetTable/getDatasetTable.js', 8, lambda d, t: {'tableUri': f'table{t}'}),
+    'listDatasetTableColumns': (
+        'DatasetTable/listDatasetTableColumns.js',
+        8,
+        lambda d, t: {'tableUri': f'table{t}', 'filter': PAGE},
+    ),
+    'countUpVotes': (
+        'Vote/countUpVotes.js',
+        6,
+        lambda d, t: {'targetUri': f'dataset{d}', 'targetType': 'dataset'},
+    ),
+    'searchGlossary': (
+        'Glossary/searchGlossary.js',
+        4,
+        lambda d, t: {'filter': {**PAGE, 'term': WORDS[d % len(WORDS)]}},
+    ),
+    'getShareRequestsToMe': ('ShareObject/getShareRequestsToMe.js', 4, lambda d, t: {'filter': PAGE}),
+    'listOrganizations': ('Organization/listOrganizations.js', 2, lambda d, t: {'filter': PAGE}),
+    'listEnvironments': ('Environment/listEnvironments.js', 2, lambda d, t: {'filter': PAGE}),
+    'countUnreadNotifications': ('Notification/countUnreadNotifications.js', 10, lambda d, t: {}),
+}
+
+# Everything reaching AWS, OpenSearch or the cdk proxy from the resolvers
+STUBS = [
+    'boto3.client',
+    'boto3.Session',
+    'requests.post',
+    'dataall.aws.handlers.service_handlers.Worker.process',
+    'dataall.aws.handlers.service_handlers.Worker.invoke',
+    'dataall.aws.handlers.sts.SessionHelper.remote_session',
+    'dataall.aws.handlers.sts.SessionHelper.get_session',
+    'dataall.searchproxy.connect',
+    'dataall.searchproxy.search',
+    'dataall.searchproxy.upsert',
+]
+
+
+def load_query(module: str) -> str:
+    """The GraphQL document of a frontend api module"""
+    with open(os.path.join(FRONTEND_API, module)) as f:
+        return re.search(r'gql`(.*?)`', f.read(), re.DOTALL).group(1)
+
+
+def percentile(values, p):
+    ranked = sorted(values)
+    return ranked[max(math.ceil(p / 100 * len(ranked)) - 1, 0)]
+
+
+def execute(engine, schema, name, query, variables, principal):
+    context = {
+        'engine': engine,
+        'es': None,
+        'username': f'user{principal}',
+        'groups': [f'group{principal}'],
+        'schema': None,
+        'cdkproxyurl': None,
+    }
+    with collect_sql_stats(operation=name) as sql_stats:
+        with batch_stack_refreshes(engine):
+            start = time.perf_counter()
+            _, result = graphql_sync(
+                schema, {'query': query, 'variables': variables}, context_value=context
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, sql_stats, result.get('errors')
+
+
+def replay(engine, counts, requests, seed):
+    """
+    Runs requests operations drawn from the weighted mix, each as the admin
+    of a random dataset, then traces the memory of one more call per operation
+    """
+    schema = get_executable_schema()
+    queries = {name: load_query(module) for name, (module, _, _) in OPERATIONS.items()}
+    rng = random.Random(seed)
+    datasets, tables = counts['dataset'], counts['dataset_table']
+    tables_per_dataset = max(tables // datasets, 1)
+
+    def sample():
+        d = rng.randrange(datasets)
+        t = min(d * tables_per_dataset + rng.randrange(tables_per_dataset), tables - 1)
+        return d, t, d % counts['groups']
+
+    calls = {name: {'ms': [], 'statements': [], 'sqlMs': [], 'errors': 0} for name in OPERATIONS}
+    names = rng.choices(list(OPERATIONS), weights=[w for _, w, _ in OPERATIONS.values()], k=requests)
+    for name in names:
+        d, t, principal = sample()
+        elapsed, sql_stats, errors = execute(
+            engine, schema, name, queries[name], OPERATIONS[name][2](d, t), principal
+        )
+        calls[name]['ms'].append(elapsed)
+        calls[name]['statements'].append(sql_stats.statements)
+        calls[name]['sqlMs'].append(sql_stats.duration_ms)
+        if errors:
+            if not calls[name]['errors']:
+                log.warning(f'{name} failed: {errors[0].get("message")}')
+            calls[name]['errors'] += 1
+
+    results = {}
+    for name, call in calls.items():
+        if not call['ms']:
+            continue
+        d, t, principal = sample()
+        tracemalloc.start()
+        execute(engine, schema, name, queries[name], OPERATIONS[name][2](d, t), principal)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {
+            'calls': len(call['ms']),
+            'errors': call['errors'],
+            'p50Ms': round(percentile(call['ms'], 50), 2),
+            'p95Ms': round(percentile(call['ms'], 95), 2),
+            'p99Ms': round(percentile(call['ms'], 99), 2),
+            'statements': float(statistics.median(call['statements'])),
+            'maxStatements': max(call['statements']),
+            'sqlMs': round(statistics.median(call['sqlMs']), 2),
+            'peakKiB': round(peak / 1024, 1),
+        }
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Operations whose p95 grew by more than tolerance percent or running more statements"""
+    regressed = []
+    for name, result in results.items():
+        previous = baseline.get('operations', {}).get(name)
+        if not previous:
+            continue
+        if result['p95Ms'] > previous['p95Ms'] * (1 + tolerance / 100) or (
+            result['statements'] > previous['statements']
+        ):
+            regressed.append(name)
+    return regressed
+
+
+def delta(value, previous):
+    if previous is None:
+        return '-'
+    if not previous:
+        return f'{value - previous:+}'
+    return f'{(value - previous) / previous * 100:+.0f}%'
+
+
+def report(results, baseline=None):
+    header = (
+        f"{'operation':<28} {'calls':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'sql':>5} {'sql ms':>7} {'peak KiB':>9}  {'p95 vs base':>11} {'sql vs base':>11}"
+    )
+    lines = [header, '-' * len(header)]
+    for name, row in results.items():
+        previous = (baseline or {}).get('operations', {}).get(name, {})
+        lines.append(
+            f"{name:<28} {row['calls']:>5} {row['errors']:>4} {row['p50Ms']:>8} {row['p95Ms']:>8} "
+            f"{row['p99Ms']:>8} {row['statements']:>5} {row['sqlMs']:>7} {row['peakKiB']:>9}  "
+            f"{delta(row['p95Ms'], previous.get('p95Ms')):>11} "
+            f"{delta(row['statements'], previous.get('statements')):>11}"
+        )
+    return '\n'.join(lines)
+
+
+def max_rss_mib():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--columns', type=int, default=1_000_000)
+    parser.add_argument('--columns-per-table', type=int, default=2)
+    parser.add_argument('--tables-per-dataset', type=int, default=50)
+    parser.add_argument('--organizations', type=int, default=10)
+    parser.add_argument('--environments', type=int, default=100)
+    parser.add_argument('--groups', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--no-generate', action='store_true', help='replays on the catalog generated by a previous run'
+    )
+    parser.add_argument('--baseline', help='JSON baseline the results are compared with')
+    parser.add_argument('--save', action='store_true', help='writes the results to the baseline file')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        help='fails when a p95 grows by more than this percent or an operation runs more statements',
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    logging.getLogger('dataall').setLevel(logging.ERROR)
+
+    engine = get_engine(envname=os.getenv('envname', 'local'))
+    if args.no_generate:
+        with engine.scoped_session() as session:
+            counts = {
+                table: session.execute(f'SELECT count(*) FROM {table}').scalar()
+                for table in ['dataset', 'dataset_table', 'dataset_table_column']
+            }
+    else:
+        create_schema_and_tables(engine, envname=os.environ['schema_name'])
+        counts = generate_catalog(
+            engine,
+            columns=args.columns,
+            columns_per_table=args.columns_per_table,
+            tables_per_dataset=args.tables_per_dataset,
+            organizations=args.organizations,
+            environments=args.environments,
+            groups=args.groups,
+        )
+    counts['groups'] = args.groups
+
+    with ExitStack() as stubs:
+        for target in STUBS:
+            stubs.enter_context(mock.patch(target))
+        results = replay(engine, counts, args.requests, args.seed)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('rows', {}).get('dataset_table') != counts['dataset_table']:
+            log.warning('The baseline was measured on a catalog of a different size')
+
+    print(report(results, baseline))
+    print(f"Max RSS: {max_rss_mib()} MiB")
+    if args.save and args.baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(
+                {'rows': counts, 'requests': args.requests, 'seed': args.seed, 'operations': results},
+                f,
+                indent=2,
+            )
+        log.info(f'Baseline saved to {args.baseline}')
+    if baseline and args.tolerance is not None:
+        regressed = regressions(results, baseline, args.tolerance)
+        if regressed:
+            log.error(f'Regressions over the baseline: {", ".join(regressed)}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Times the term filters of the list APIs on a synthetic catalog, without and
+then with the pg_trgm indexes of db/search.py.
+Runs against the local Postgres (docker-compose) in a dedicated schema
+which is dropped and recreated:
+
+    export PYTHONPATH=./backend
+    python -m tests.benchmarks.search_filters --columns 1000000
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+os.environ.setdefault('schema_name', 'benchmark')
+
+from dataall.db import create_schema_and_tables, get_engine, models, paginate  # noqa: E402
+from dataall.db.search import TRIGRAM_INDEXES, contains_term  # noqa: E402
+
+from .catalog import generate_catalog  # noqa: E402
+
+log = logging.getLogger(__name__)
+
+QUERIES = {
+    'columns': (
+        models.DatasetTableColumn,
+        [models.DatasetTableColumn.label, models.DatasetTableColumn.description],
+    ),
+    'tables': (
+        models.DatasetTable,
+        [models.DatasetTable.name, models.DatasetTable.GlueTableName],
+    ),
+    'share items': (models.ShareObjectItem, [models.ShareObjectItem.itemName]),
+    'glossary': (
+        models.GlossaryNode,
+        [models.GlossaryNode.label, models.GlossaryNode.readme],
+    ),
+}
+
+
+def terms():
+    """A common word, a suffix matching a handful of rows and a term matching none"""
+    return {
+        'common': 'invoice',
+        'rare': hashlib.md5(b'4242').hexdigest()[:8],
+        'none': 'zzqzz',
+    }
+
+
+def run_queries(engine, repeat):
+    results = []
+    for name, (model, columns) in QUERIES.items():
+        for selectivity, term in terms().items():
+            with engine.scoped_session() as session:
+                query = session.query(model).filter(contains_term(term, *columns))
+                plan = '\n'.join(
+                    row[0]
+                    for row in session.execute(
+                        text(f'EXPLAIN {query.statement.compile(compile_kwargs={"literal_binds": True})}')
+                    )
+                )
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    page = paginate(query, page=1, page_size=10).to_dict()
+                    timings.append((time.perf_counter() - start) * 1000)
+            results.append(
+                {
+                    'query': name,
+                    'term': selectivity,
+                    'matches': page['count'],
+                    'medianMs': round(statistics.median(timings), 2),
+                    'seqScan': 'Seq Scan' in plan,
+                }
+            )
+    return results
+
+
+def create_trigram_indexes(engine):
+    with engine.scoped_session() as session:
+        session.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        for table, columns in TRIGRAM_INDEXES.items():
+            for column in columns:
+                session.execute(
+                    text(
+                        f'CREATE INDEX IF NOT EXISTS "ix_{table}_{column}_trgm" '
+                        f'ON {table} USING gin ("{column}" gin_trgm_ops)'
+                    )
+                )
+            session.execute(text(f'ANALYZE {table}'))
+
+
+def has_trigram_extension(engine):
+    return bool(
+        engine.engine.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).first()
+    )
+
+
+def report(before, after):
+    header = f"{'query':<12} {'term':<7} {'matches':>8} {'no index ms':>12} {'trigram ms':>11}  plan"
+    lines = [header, '-' * len(header)]
+    for i, row in enumerate(before):
+        indexed = after[i] if after else None
+        lines.append(
+            f"{row['query']:<12} {row['term']:<7} {row['matches']:>8} {row['medianMs']:>12} "
+            f"{indexed['medianMs'] if indexed else '-':>11}  "
+            f"{'seq scan' if (indexed or row)['seqScan'] else 'index'}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--columns', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='writes the results as JSON to this file')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+
+    engine = get_engine(envname=os.getenv('envname', 'local'))
+    create_schema_and_tables(engine, envname=os.environ['schema_name'])
+    counts = generate_catalog(engine, columns=args.columns)
+
+    before = run_queries(engine, args.repeat)
+    after = None
+    if has_trigram_extension(engine):
+        create_trigram_indexes(engine)
+        after = run_queries(engine, args.repeat)
+    else:
+        log.warning('pg_trgm is not available on this server, only the filters without index are timed')
+
+    print(report(before, after))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'rows': counts, 'withoutIndex': before, 'withTrigramIndex': after}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
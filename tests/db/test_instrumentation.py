@@ -0,0 +1,60 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+from dataall.db import collect_sql_stats, current_sql_stats, in_current_context
+from dataall.db.instrumentation import normalize_statement
+
+
+def test_normalize_statement():
+    assert (
+        normalize_statement(
+            "SELECT * FROM dataset\n  WHERE label = 'a''b' AND \"datasetUri\" IN (%(p1)s, %(p2)s) LIMIT 10"
+        )
+        == 'SELECT * FROM dataset WHERE label = ? AND "datasetUri" IN (?, ...) LIMIT ?'
+    )
+
+
+def test_statements_are_counted(db):
+    assert current_sql_stats() is None
+    with collect_sql_stats('outer') as outer:
+        with db.scoped_session() as session:
+            session.execute(text('SELECT 1'))
+            with collect_sql_stats('inner') as inner:
+                assert current_sql_stats() is inner
+                for i in range(3):
+                    session.execute(text('SELECT :value'), {'value': i})
+    assert current_sql_stats() is None
+
+    assert inner.statements == 3
+    assert outer.statements >= 4
+    slowest = inner.to_dict()['slowest']
+    assert len(slowest) == 1
+    assert slowest[0]['statement'] == 'SELECT ?'
+    assert slowest[0]['count'] == 3
+
+
+def test_thread_pool_statements_are_counted(db):
+    def query(value):
+        with db.scoped_session() as session:
+            return session.execute(text('SELECT :value'), {'value': value}).scalar()
+
+    with collect_sql_stats('pool') as stats:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(in_current_context(query), range(4))) == list(range(4))
+            pool.submit(query, 4).result()
+    assert stats.statements == 4
+
+
+def test_thresholds_are_logged(db, caplog, mocker):
+    mocker.patch('dataall.db.instrumentation.MAX_STATEMENTS', 1)
+    with caplog.at_level(logging.WARNING, logger='dataall.db.instrumentation'):
+        with collect_sql_stats('listDatasets'):
+            with db.scoped_session() as session:
+                session.execute(text('SELECT 1'))
+                session.execute(text('SELECT 2'))
+    logged = [json.loads(r.message) for r in caplog.records]
+    assert logged[0]['operation'] == 'listDatasets'
+    assert logged[0]['statements'] >= 2
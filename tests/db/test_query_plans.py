@@ -0,0 +1,104 @@
+"""
+Query plan regressions: the main db/api queries are run against a seeded
+catalog and the plans of the statements they execute must not scan the
+large tables sequentially.
+"""
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from tests.benchmarks.catalog import generate_catalog
+from dataall.db import api
+
+LARGE_TABLES = [
+    'dataset_table',
+    'dataset_table_column',
+    'dataset_storage_location',
+    'share_object',
+    'share_object_item',
+    'term_link',
+    'vote',
+    'notification',
+]
+
+QUERIES = {
+    'shared items of a share': lambda session: api.ShareObject.check_existing_shared_items(
+        session, 'share7'
+    ),
+    'share item of a table': lambda session: api.ShareObject.find_share_item_by_table(
+        session, SimpleNamespace(shareUri='share7'), SimpleNamespace(tableUri='table14')
+    ),
+    'shares of a dataset and environment': lambda session: api.ShareObject.get_share_by_dataset_and_environment(
+        session, 'dataset3', 'env3'
+    ).all(),
+    'tables of a dataset': lambda session: api.Dataset.paginated_dataset_tables(
+        session, None, None, 'dataset3', data={}
+    ),
+    'folders of a dataset': lambda session: api.Dataset.paginated_dataset_locations(
+        session, None, None, 'dataset3', data={}
+    ),
+    'columns of a table': lambda session: api.DatasetTable.delete_all_table_columns(
+        session, SimpleNamespace(GlueDatabaseName='database1', GlueTableName='table60')
+    ),
+    'terms of a column': lambda session: api.Glossary.get_glossary_terms_links(
+        session, 'col10', 'Column'
+    ),
+    'upvotes of a dataset': lambda session: api.Vote.count_upvotes(
+        session, None, None, 'dataset3', data={'targetType': 'dataset'}
+    ),
+    'unread notifications': lambda session: api.Notification.count_unread_notifications(
+        session, 'user7'
+    ),
+}
+
+
+@pytest.fixture(scope='module')
+def catalog(db):
+    yield generate_catalog(db, columns=40_000, tables_per_dataset=10)
+
+
+@contextmanager
+def captured_statements(engine):
+    """Statements executed in the block with their parameters"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split()[0].upper() in ['SELECT', 'UPDATE', 'DELETE']:
+            statements.append((statement, parameters))
+
+    event.listen(engine.engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.engine, 'before_cursor_execute', capture)
+
+
+def sequential_scans(plan: dict) -> [str]:
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in LARGE_TABLES:
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans.extend(sequential_scans(child))
+    return scans
+
+
+@pytest.mark.parametrize('query', QUERIES.keys())
+def test_no_sequential_scan_on_large_tables(db, catalog, query):
+    with captured_statements(db) as statements:
+        with db.scoped_session() as session:
+            QUERIES[query](session)
+    assert statements
+
+    connection = db.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for statement, parameters in statements:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + statement, parameters)
+            plan = cursor.fetchone()[0]
+            plan = plan if isinstance(plan, list) else json.loads(plan)
+            assert not sequential_scans(plan[0]['Plan']), statement
+    finally:
+        connection.close()
@@ -0,0 +1,29 @@
+from dataall.db import models
+from dataall.db.search import contains_term, escape_like
+
+
+def test_escape_like():
+    assert escape_like('100%_a\\b') == '100\\%\\_a\\\\b'
+
+
+def test_contains_term(db):
+    with db.scoped_session() as session:
+        session.add_all(
+            [
+                models.GlossaryNode(path=f'/{label}', label=label, readme='', owner='alice')
+                for label in ['Customer_id', 'customerXid', '100% customers']
+            ]
+        )
+        session.commit()
+
+        def labels(term):
+            return sorted(
+                node.label
+                for node in session.query(models.GlossaryNode).filter(
+                    contains_term(term, models.GlossaryNode.label, models.GlossaryNode.readme)
+                )
+            )
+
+        assert labels('CUSTOMER') == ['100% customers', 'Customer_id', 'customerXid']
+        assert labels(' r_i ') == ['Customer_id']
+        assert labels('0%') == ['100% customers']
@@ -5,6 +5,7 @@ Remarks
 """
 import boto3
 import pytest
+from botocore.exceptions import ClientError
 
 from typing import Callable
 
@@ -322,7 +323,6 @@ def test_check_share_item_exists_on_glue_catalog(
     glue_mock.assert_called_once()
 
 
-
 def test_build_share_data(
         db,
         processor_same_account: ProcessLFSameAccountShare,
@@ -371,7 +371,7 @@ def test_build_share_data(
     assert data == data_cross_account
 
 
-def test_create_resource_link(
+def test_delete_shared_database(
         db,
         processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
@@ -383,78 +383,24 @@ def test_create_resource_link(
         table1: models.DatasetTable,
         mocker,
 ):
-    sts_mock = mocker.patch(
-        "dataall.aws.handlers.sts.SessionHelper.remote_session",
-        return_value=boto3.Session(),
-    )
     glue_mock = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.create_resource_link",
-        return_value=True,
-    )
-    lf_mock_1 = mocker.patch(
-        "dataall.aws.handlers.lakeformation.LakeFormation.grant_resource_link_permission",
-        return_value=True,
-    )
-    lf_mock_2 = mocker.patch(
-        "dataall.aws.handlers.lakeformation.LakeFormation.grant_resource_link_permission_on_target",
+        "dataall.aws.handlers.glue.Glue.delete_database",
         return_value=True,
     )
 
-    # When
-    data_same_account = {
-        'source': {
-            'accountid': source_environment.AwsAccountId,
-            'region': source_environment.region,
-            'database': table1.GlueDatabaseName,
-            'tablename': table1.GlueTableName,
-        },
-        'target': {
-            'accountid': source_environment.AwsAccountId,
-            'region': source_environment.region,
-            'principals': [f"arn:aws:iam::{source_environment.AwsAccountId}:role/{share_same_account.principalIAMRoleName}"],
-            'database': (dataset1.GlueDatabaseName + '_shared_' + share_same_account.shareUri)[:254],
-        },
-    }
-    processor_same_account.create_resource_link(**data_same_account)
-
+    processor_same_account.delete_shared_database()
     # Then
-    sts_mock.assert_called_once()
     glue_mock.assert_called_once()
-    lf_mock_1.assert_called_once()
-    lf_mock_2.assert_called_once()
 
     # Reset mocks
-    sts_mock.reset_mock()
     glue_mock.reset_mock()
-    lf_mock_1.reset_mock()
-    lf_mock_2.reset_mock()
-
-
-    data_cross_account = {
-        'source': {
-            'accountid': source_environment.AwsAccountId,
-            'region': source_environment.region,
-            'database': table1.GlueDatabaseName,
-            'tablename': table1.GlueTableName,
-        },
-        'target': {
-            'accountid': target_environment.AwsAccountId,
-            'region': target_environment.region,
-            'principals': [f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_cross_account.principalIAMRoleName}"],
-            'database': (dataset1.GlueDatabaseName + '_shared_' + share_cross_account.shareUri)[:254],
-        },
-    }
-    processor_cross_account.create_resource_link(**data_cross_account)
 
+    processor_cross_account.delete_shared_database()
     # Then
-    sts_mock.assert_called_once()
     glue_mock.assert_called_once()
-    lf_mock_1.assert_called_once()
-    lf_mock_2.assert_called_once()
 
-    pass
 
-def test_revoke_table_resource_link_access(
+def test_revoke_external_account_access_on_source_account(
         db,
         processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
@@ -463,11 +409,12 @@ def test_revoke_table_resource_link_access(
         source_environment: models.Environment,
         target_environment: models.Environment,
         dataset1: models.Dataset,
+        table1: models.DatasetTable,
         table2: models.DatasetTable,
         mocker,
 ):
-    glue_mock = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.table_exists",
+    lf_mock = mocker.patch(
+        "dataall.aws.handlers.lakeformation.LakeFormation.batch_revoke_permissions",
         return_value=True,
     )
 
@@ -476,226 +423,272 @@ def test_revoke_table_resource_link_access(
         return_value=boto3.Session(),
     )
 
-    lf_mock = mocker.patch(
-        "dataall.aws.handlers.lakeformation.LakeFormation.batch_revoke_permissions",
-        return_value=True,
-    )
-
-    processor_same_account.revoke_table_resource_link_access(
-        table=table2,
-        principals=[f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_same_account.principalIAMRoleName}"]
-    )
+    processor_cross_account.revoke_external_account_access_on_source_account()
     # Then
-    glue_mock.assert_called_once()
     lf_mock.assert_called_once()
 
-    # Reset mocks
-    glue_mock.reset_mock()
-    lf_mock.reset_mock()
+def test_handle_share_failure(
+        db,
+        processor_same_account: ProcessLFSameAccountShare,
+        processor_cross_account: ProcessLFCrossAccountShare,
+        share_item_same_account: models.ShareObjectItem,
+        share_item_cross_account: models.ShareObjectItem,
+        table1: models.DatasetTable,
+        mocker,
+):
+
+    # Given
+    alarm_service_mock = mocker.patch.object(AlarmService, "trigger_table_sharing_failure_alarm")
+    error = Exception
+
+    # When
+    processor_same_account.handle_share_failure(table1, share_item_same_account, error)
 
-    processor_cross_account.revoke_table_resource_link_access(
-        table=table2,
-        principals=[f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_cross_account.principalIAMRoleName}"],
-    )
     # Then
-    glue_mock.assert_called_once()
-    lf_mock.assert_called_once()
+    alarm_service_mock.assert_called_once()
+
+    # Reset mock
+    alarm_service_mock.reset_mock()
+
+    # When
+    processor_cross_account.handle_share_failure(table1, share_item_cross_account, error)
 
+    # Then
+    alarm_service_mock.assert_called_once()
 
-def test_revoke_source_table_access(
+def test_handle_revoke_failure(
         db,
         processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
-        share_same_account: models.ShareObject,
-        share_cross_account: models.ShareObject,
-        source_environment: models.Environment,
-        target_environment: models.Environment,
-        dataset1: models.Dataset,
-        table2: models.DatasetTable,
+        revoke_item_same_account: models.ShareObjectItem,
+        revoke_item_cross_account: models.ShareObjectItem,
+        table1: models.DatasetTable,
         mocker,
 ):
-    glue_mock = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.table_exists",
-        return_value=True,
-    )
+    # Given
+    alarm_service_mock = mocker.patch.object(AlarmService, "trigger_revoke_table_sharing_failure_alarm")
+    error = Exception
 
-    lf_mock = mocker.patch(
-        "dataall.aws.handlers.lakeformation.LakeFormation.revoke_source_table_access",
-        return_value=True,
-    )
+    # When
+    processor_same_account.handle_revoke_failure(table1, revoke_item_same_account, error)
 
-    processor_same_account.revoke_source_table_access(
-        table=table2,
-        principals=[f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_same_account.principalIAMRoleName}"]
-    )
     # Then
-    glue_mock.assert_called_once()
-    lf_mock.assert_called_once()
+    alarm_service_mock.assert_called_once()
 
-    # Reset mocks
-    glue_mock.reset_mock()
-    lf_mock.reset_mock()
+    # Reset mock
+    alarm_service_mock.reset_mock()
+
+    # When
+    processor_cross_account.handle_revoke_failure(table1, revoke_item_cross_account, error)
 
-    processor_cross_account.revoke_source_table_access(
-        table=table2,
-        principals=[f"arn:aws:iam::{target_environment.AwsAccountId}:role/{share_cross_account.principalIAMRoleName}"]
-    )
     # Then
-    glue_mock.assert_called_once()
-    lf_mock.assert_called_once()
+    alarm_service_mock.assert_called_once()
 
 
-def test_delete_resource_link_table(
+def test_share_tables_with_target_account_batches_entries(
         db,
-        processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
-        share_same_account: models.ShareObject,
-        share_cross_account: models.ShareObject,
-        source_environment: models.Environment,
-        target_environment: models.Environment,
-        dataset1: models.Dataset,
+        table1: models.DatasetTable,
         table2: models.DatasetTable,
         mocker,
 ):
-    glue_mock = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.table_exists",
-        return_value=True,
-    )
-
-    glue_mock2 = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.delete_table",
-        return_value=True,
+    # Given: grants on table2 keep failing
+    lf_client = mocker.MagicMock()
+    lf_client.batch_revoke_permissions.return_value = {'Failures': []}
+    lf_client.batch_grant_permissions.side_effect = lambda CatalogId, Entries: {
+        'Failures': [
+            {
+                'RequestEntry': entry,
+                'Error': {'ErrorCode': 'AccessDeniedException', 'ErrorMessage': 'denied'},
+            }
+            for entry in Entries
+            if entry['Resource']['Table']['Name'] == table2.GlueTableName
+        ]
+    }
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
+    mocker.patch(
+        "dataall.tasks.data_sharing.share_managers.lf_share_manager.LF_PROPAGATION_TIMEOUT",
+        0.5,
     )
+    mocker.patch("time.sleep")
 
+    # When
+    failed = processor_cross_account.share_tables_with_target_account([table1, table2])
 
-    processor_same_account.delete_resource_link_table(
-        table=table2
-    )
     # Then
-    glue_mock.assert_called_once()
-    glue_mock2.assert_called_once()
+    lf_client.batch_revoke_permissions.assert_called_once()
+    first_call, *retries = lf_client.batch_grant_permissions.call_args_list
+    assert len(first_call.kwargs['Entries']) == 2
+    # Only the failed entry is granted again
+    assert retries and all(len(c.kwargs['Entries']) == 1 for c in retries)
+    assert list(failed.keys()) == [table2.tableUri]
+    assert 'AccessDeniedException' in failed[table2.tableUri]
 
-    # Reset mocks
-    glue_mock.reset_mock()
-    glue_mock2.reset_mock()
 
-    processor_cross_account.delete_resource_link_table(
-        table=table2
-    )
-    # Then
-    glue_mock.assert_called_once()
-    glue_mock2.assert_called_once()
+def test_batch_grant_permissions_chunks_entries(mocker):
+    from dataall.aws.handlers.lakeformation import LakeFormation
 
+    client = mocker.MagicMock()
+    client.batch_grant_permissions.return_value = {'Failures': []}
+    entries = [{'Id': str(i)} for i in range(45)]
 
-def test_delete_shared_database(
+    failures = LakeFormation.batch_grant_permissions(client, SOURCE_ENV_ACCOUNT, entries)
+
+    assert failures == []
+    assert client.batch_grant_permissions.call_count == 3
+
+
+def test_create_resource_links(
         db,
-        processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
-        share_same_account: models.ShareObject,
-        share_cross_account: models.ShareObject,
-        source_environment: models.Environment,
-        target_environment: models.Environment,
-        dataset1: models.Dataset,
         table1: models.DatasetTable,
+        table2: models.DatasetTable,
         mocker,
 ):
+    lf_client = mocker.MagicMock()
+    lf_client.batch_grant_permissions.return_value = {'Failures': []}
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
     glue_mock = mocker.patch(
-        "dataall.aws.handlers.glue.Glue.delete_database",
+        "dataall.aws.handlers.glue.Glue.create_resource_link",
         return_value=True,
     )
 
-    processor_same_account.delete_shared_database()
-    # Then
-    glue_mock.assert_called_once()
-
-    # Reset mocks
-    glue_mock.reset_mock()
+    failed = processor_cross_account.create_resource_links([table1, table2])
 
-    processor_cross_account.delete_shared_database()
-    # Then
-    glue_mock.assert_called_once()
+    assert failed == {}
+    assert glue_mock.call_count == 2
+    # One resource link grant and one table grant per table and principal
+    lf_client.batch_grant_permissions.assert_called_once()
+    entries = lf_client.batch_grant_permissions.call_args.kwargs['Entries']
+    assert len(entries) == 2 * 2 * len(processor_cross_account.principals)
 
 
-def test_revoke_external_account_access_on_source_account(
+def test_revoke_tables_access(
         db,
         processor_same_account: ProcessLFSameAccountShare,
-        processor_cross_account: ProcessLFCrossAccountShare,
         share_same_account: models.ShareObject,
-        share_cross_account: models.ShareObject,
         source_environment: models.Environment,
-        target_environment: models.Environment,
-        dataset1: models.Dataset,
         table1: models.DatasetTable,
         table2: models.DatasetTable,
         mocker,
 ):
-    lf_mock = mocker.patch(
-        "dataall.aws.handlers.lakeformation.LakeFormation.batch_revoke_permissions",
+    lf_client = mocker.MagicMock()
+    lf_client.batch_revoke_permissions.side_effect = lambda CatalogId, Entries: {
+        'Failures': [
+            {
+                'RequestEntry': entry,
+                'Error': {'ErrorCode': 'InvalidInputException', 'ErrorMessage': 'Grantee has no permissions'},
+            }
+            for entry in Entries
+        ]
+    }
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
+    mocker.patch(
+        "dataall.aws.handlers.glue.Glue.table_exists",
+        return_value=True,
+    )
+    delete_mock = mocker.patch(
+        "dataall.aws.handlers.glue.Glue.delete_table",
         return_value=True,
     )
 
-    mocker.patch(
-        "dataall.aws.handlers.sts.SessionHelper.remote_session",
-        return_value=boto3.Session(),
+    failed = processor_same_account.revoke_tables_access(
+        [table1, table2],
+        [f"arn:aws:iam::{source_environment.AwsAccountId}:role/{share_same_account.principalIAMRoleName}"],
     )
 
-    processor_cross_account.revoke_external_account_access_on_source_account()
-    # Then
-    lf_mock.assert_called_once()
+    # Permissions already gone are not failures
+    assert failed == {}
+    lf_client.batch_revoke_permissions.assert_called_once()
+    assert delete_mock.call_count == 2
 
-def test_handle_share_failure(
+
+def test_process_approved_shares_cross_account(
         db,
-        processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
-        share_item_same_account: models.ShareObjectItem,
         share_item_cross_account: models.ShareObjectItem,
-        table1: models.DatasetTable,
         mocker,
 ):
+    lf_client = mocker.MagicMock()
+    lf_client.batch_revoke_permissions.return_value = {'Failures': []}
+    lf_client.batch_grant_permissions.return_value = {'Failures': []}
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
+    mocker.patch.object(processor_cross_account, "grant_pivot_role_all_database_permissions")
+    mocker.patch.object(processor_cross_account, "create_shared_database")
+    mocker.patch("dataall.aws.handlers.glue.Glue.table_exists", return_value=True)
+    mocker.patch("dataall.aws.handlers.glue.Glue.create_resource_link", return_value=True)
+    ram_mock = mocker.patch(
+        "dataall.aws.handlers.ram.Ram.accept_ram_invitation",
+        return_value=(False, []),
+    )
+    mocker.patch("time.sleep")
+
+    assert processor_cross_account.process_approved_shares()
+
+    ram_mock.assert_called_once()
+    # Source account grant and target account resource link grants
+    assert lf_client.batch_grant_permissions.call_count == 2
+    with db.scoped_session() as session:
+        item = session.query(models.ShareObjectItem).get(share_item_cross_account.shareItemUri)
+        assert item.status == constants.ShareItemStatus.Share_Succeeded.value
 
-    # Given
+
+def test_process_approved_shares_fails_items_when_batch_call_fails(
+        db,
+        processor_same_account: ProcessLFSameAccountShare,
+        share_item_same_account: models.ShareObjectItem,
+        mocker,
+):
+    lf_client = mocker.MagicMock()
+    lf_client.batch_grant_permissions.side_effect = ClientError(
+        {'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}}, 'BatchGrantPermissions'
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
+    mocker.patch.object(processor_same_account, "grant_pivot_role_all_database_permissions")
+    mocker.patch.object(processor_same_account, "create_shared_database")
+    mocker.patch("dataall.aws.handlers.glue.Glue.table_exists", return_value=True)
+    mocker.patch("dataall.aws.handlers.glue.Glue.create_resource_link", return_value=True)
     alarm_service_mock = mocker.patch.object(AlarmService, "trigger_table_sharing_failure_alarm")
-    error = Exception
 
-    # When
-    processor_same_account.handle_share_failure(table1, share_item_same_account, error)
+    assert not processor_same_account.process_approved_shares()
 
-    # Then
     alarm_service_mock.assert_called_once()
+    with db.scoped_session() as session:
+        item = session.query(models.ShareObjectItem).get(share_item_same_account.shareItemUri)
+        assert item.status == constants.ShareItemStatus.Share_Failed.value
 
-    # Reset mock
-    alarm_service_mock.reset_mock()
-
-    # When
-    processor_cross_account.handle_share_failure(table1, share_item_cross_account, error)
-
-    # Then
-    alarm_service_mock.assert_called_once()
 
-def test_handle_revoke_failure(
+def test_process_revoked_shares_fails_items_when_batch_call_fails(
         db,
-        processor_same_account: ProcessLFSameAccountShare,
         processor_cross_account: ProcessLFCrossAccountShare,
-        revoke_item_same_account: models.ShareObjectItem,
         revoke_item_cross_account: models.ShareObjectItem,
-        table1: models.DatasetTable,
         mocker,
 ):
-    # Given
+    lf_client = mocker.MagicMock()
+    lf_client.batch_revoke_permissions.side_effect = ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'slow down'}}, 'BatchRevokePermissions'
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.remote_session",
+    ).return_value.client.return_value = lf_client
+    mocker.patch("dataall.aws.handlers.glue.Glue.table_exists", return_value=True)
+    delete_mock = mocker.patch("dataall.aws.handlers.glue.Glue.delete_table")
     alarm_service_mock = mocker.patch.object(AlarmService, "trigger_revoke_table_sharing_failure_alarm")
-    error = Exception
-
-    # When
-    processor_same_account.handle_revoke_failure(table1, revoke_item_same_account, error)
-
-    # Then
-    alarm_service_mock.assert_called_once()
-
-    # Reset mock
-    alarm_service_mock.reset_mock()
 
-    # When
-    processor_cross_account.handle_revoke_failure(table1, revoke_item_cross_account, error)
+    assert not processor_cross_account.process_revoked_shares()
 
-    # Then
+    delete_mock.assert_not_called()
     alarm_service_mock.assert_called_once()
+    with db.scoped_session() as session:
+        item = session.query(models.ShareObjectItem).get(revoke_item_cross_account.shareItemUri)
+        assert item.status == constants.ShareItemStatus.Revoke_Failed.value
@@ -151,3 +151,94 @@ def test_handler(org, env, db, sync_dataset, mocker):
     updater = BucketPoliciesUpdater(db)
     assert len(updater.sync_imported_datasets_bucket_policies()) == 1
     assert updater.sync_imported_datasets_bucket_policies()[0]['status'] == 'SUCCEEDED'
+
+
+def test_normalize_policy():
+    policy = {
+        'Version': '2012-10-17',
+        'Statement': [
+            {
+                'Sid': 'DA123',
+                'Effect': 'Allow',
+                'Resource': ['arn:aws:s3:::bucket'],
+                'Principal': {'AWS': '123'},
+            }
+        ],
+    }
+    same_policy = (
+        '{"Statement": {"Principal": {"AWS": ["123"]}, "Resource": "arn:aws:s3:::bucket", '
+        '"Effect": "Allow", "Sid": "DA123"}, "Version": "2012-10-17"}'
+    )
+    assert BucketPoliciesUpdater.normalize_policy(policy) == BucketPoliciesUpdater.normalize_policy(same_policy)
+
+
+def test_handler_skips_unchanged_policy(db, sync_dataset, mocker):
+    mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.init_s3_client',
+        return_value=True,
+    )
+    mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.get_bucket_policy',
+        return_value={'Version': '2012-10-17', 'Statement': []},
+    )
+    put_bucket_policy = mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.put_bucket_policy',
+        return_value={'status': 'SUCCEEDED'},
+    )
+    reports = BucketPoliciesUpdater(db).sync_imported_datasets_bucket_policies()
+    put_bucket_policy.assert_not_called()
+    assert reports[0]['datasetUri'] == sync_dataset.datasetUri
+    assert reports[0]['updated'] is False
+    assert 'duration' in reports[0]
+
+
+def test_sync_dataset_bucket_policy_puts_changed_policy(db, sync_dataset, mocker):
+    mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.init_s3_client',
+        return_value=True,
+    )
+    mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.get_bucket_policy',
+        return_value={'Version': '2012-10-17', 'Statement': []},
+    )
+    put_bucket_policy = mocker.patch(
+        'dataall.tasks.bucket_policy_updater.BucketPoliciesUpdater.put_bucket_policy',
+        return_value={'status': 'SUCCEEDED'},
+    )
+    folder = mocker.MagicMock(S3Prefix='S3BucketName/folder', AwsAccountId='111111111111')
+    report = BucketPoliciesUpdater(db).sync_dataset_bucket_policy(sync_dataset, [], [folder])
+    put_bucket_policy.assert_called_once()
+    policy = put_bucket_policy.call_args[0][2]
+    assert policy['Statement'][0]['Sid'] == 'DA111111111111'
+    assert report['updated'] is True
+    assert report['sharedFolders'] == 1
+
+
+def test_get_shared_tables_by_dataset(db, env, sync_dataset, table):
+    with db.scoped_session() as session:
+        share = dataall.db.models.ShareObject(
+            datasetUri=sync_dataset.datasetUri,
+            environmentUri=env.environmentUri,
+            owner='bob',
+            principalId='group',
+            principalType='Group',
+            status='Approved',
+        )
+        session.add(share)
+        session.commit()
+        session.add(
+            dataall.db.models.ShareObjectItem(
+                shareUri=share.shareUri,
+                owner='bob',
+                itemUri=table.tableUri,
+                itemType='DatasetTable',
+                itemName='table1',
+                status='Approved',
+            )
+        )
+    updater = BucketPoliciesUpdater(db)
+    tables = updater.get_shared_tables_by_dataset([sync_dataset.datasetUri, 'unknown'])
+    assert list(tables.keys()) == [sync_dataset.datasetUri]
+    assert tables[sync_dataset.datasetUri][0].TargetAwsAccountId == env.AwsAccountId
+    assert len(updater.get_shared_tables(sync_dataset)) == 1
+    assert updater.get_shared_folders_by_dataset([]) == {}
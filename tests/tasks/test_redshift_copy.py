@@ -0,0 +1,128 @@
+import pytest
+
+from dataall.aws.handlers.redshift import Redshift
+from dataall.db import models
+
+
+class FakeRedshiftData:
+    def __init__(self, failing_clusters=()):
+        self.failing_clusters = failing_clusters
+        self.batches = {}
+
+    def batch_execute_statement(self, ClusterIdentifier, Database, DbUser, Sqls):
+        statement_id = f'{ClusterIdentifier}-statement'
+        self.batches[statement_id] = {
+            'cluster': ClusterIdentifier,
+            'database': Database,
+            'user': DbUser,
+            'sqls': Sqls,
+        }
+        return {'Id': statement_id}
+
+    def describe_statement(self, Id):
+        if self.batches[Id]['cluster'] in self.failing_clusters:
+            return {'Id': Id, 'Status': 'FAILED', 'Error': 'permission denied'}
+        return {'Id': Id, 'Status': 'FINISHED', 'Duration': 2000000000}
+
+
+@pytest.fixture(scope='module')
+def copy_task(db, org, environment, dataset, table):
+    org1 = org('org', 'alice', 'admins')
+    env1 = environment(org1, '111111111111', 'env', 'alice', 'admins', 'EnvRole')
+    dataset1 = dataset(org1, env1, 'sales')
+    table1 = table(dataset1, 'orders')
+    with db.scoped_session() as session:
+        for name in ['cluster1', 'cluster2']:
+            cluster = models.RedshiftCluster(
+                label=name,
+                name=name,
+                owner='alice',
+                environmentUri=env1.environmentUri,
+                organizationUri=org1.organizationUri,
+                AwsAccountId=env1.AwsAccountId,
+                region=env1.region,
+            )
+            session.add(cluster)
+            session.flush()
+            session.add(
+                models.RedshiftClusterDatasetTable(
+                    clusterUri=cluster.clusterUri,
+                    datasetUri=dataset1.datasetUri,
+                    tableUri=table1.tableUri,
+                    enabled=True,
+                    schema='sales',
+                    databaseName='datahubdb',
+                    dataLocation='s3://sales/orders/_symlink_format_manifest',
+                )
+            )
+    yield models.Task(
+        action='redshift.subscriptions.copy',
+        targetUri=env1.environmentUri,
+        payload={
+            'datasetUri': dataset1.datasetUri,
+            'tableUri': table1.tableUri,
+            'message': {'prefix': 'orders'},
+        },
+    )
+
+
+@pytest.fixture
+def glue_table(mocker):
+    mocker.patch(
+        'dataall.aws.handlers.redshift.Glue.table_exists',
+        return_value={
+            'Table': {
+                'StorageDescriptor': {
+                    'Columns': [
+                        {'Name': 'id', 'Type': 'long'},
+                        {'Name': 'item', 'Type': 'string'},
+                    ]
+                }
+            }
+        },
+    )
+
+
+def mock_redshift_data(mocker, client):
+    remote_session = mocker.patch(
+        'dataall.aws.handlers.redshift.SessionHelper.remote_session'
+    )
+    remote_session.return_value.client.return_value = client
+    return remote_session
+
+
+def test_copy_runs_one_transaction_per_cluster(db, copy_task, glue_table, mocker):
+    client = FakeRedshiftData()
+    remote_session = mock_redshift_data(mocker, client)
+
+    assert Redshift.copy_data(db, copy_task)
+
+    assert remote_session.call_count == 1
+    assert sorted(batch['cluster'] for batch in client.batches.values()) == [
+        'cluster1',
+        'cluster2',
+    ]
+    sqls = client.batches['cluster1-statement']['sqls']
+    assert client.batches['cluster1-statement']['user'] == 'datahubuser'
+    assert sqls == [
+        'CREATE SCHEMA IF NOT EXISTS sales',
+        'GRANT ALL ON SCHEMA sales TO datahubuser',
+        'GRANT ALL ON SCHEMA sales TO GROUP PUBLIC',
+        'DROP TABLE IF EXISTS "sales"."orders_stage"',
+        'CREATE TABLE "sales"."orders_stage"(id bigint,item varchar(max))',
+        'COPY "sales"."orders_stage" FROM \'s3://sales/orders\' '
+        "iam_role 'arn:aws:iam::111111111111:role/EnvRole' format as parquet",
+        'DROP TABLE IF EXISTS "sales"."orders"',
+        'ALTER TABLE "sales"."orders_stage" RENAME TO "orders"',
+        'GRANT ALL ON TABLE sales.orders TO datahubuser',
+        'GRANT ALL ON TABLE sales.orders TO GROUP PUBLIC',
+    ]
+
+
+def test_copy_failure_is_raised_after_all_clusters(db, copy_task, glue_table, mocker):
+    client = FakeRedshiftData(failing_clusters=['cluster2'])
+    mock_redshift_data(mocker, client)
+
+    with pytest.raises(Exception, match='Copy failed on clusters cluster2'):
+        Redshift.copy_data(db, copy_task)
+    assert len(client.batches) == 2
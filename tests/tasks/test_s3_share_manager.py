@@ -5,7 +5,9 @@ from typing import Callable
 
 from dataall.db import models
 
+from dataall.aws.handlers.waiter import Waiter
 from dataall.tasks.data_sharing.share_managers.s3_share_manager import S3ShareManager
+from dataall.tasks.data_sharing.share_managers.s3_policy_batch import S3PolicyBatch
 from dataall.utils.alarm_service import AlarmService
 
 
@@ -1484,3 +1486,206 @@ def test_handle_revoke_failure(
 
         # Then
         alarm_service_mock.assert_called()
+
+
+def test_manage_access_point_waits_until_created(
+    mocker,
+    source_environment_group: models.EnvironmentGroup,
+    target_environment_group: models.EnvironmentGroup,
+    dataset1: models.Dataset,
+    db,
+    share1: models.ShareObject,
+    share_item_folder1: models.ShareObjectItem,
+    location1: models.DatasetStorageLocation,
+    source_environment: models.Environment,
+    target_environment: models.Environment,
+):
+    # Given: the access point shows up on the third check
+    get_access_point_mock = mocker.patch(
+        "dataall.aws.handlers.s3.S3.get_bucket_access_point_arn",
+        side_effect=[None, None, None, "new-access-point-arn"],
+    )
+    mocker.patch(
+        "dataall.aws.handlers.s3.S3.create_bucket_access_point",
+        return_value="new-access-point-arn",
+    )
+    mocker.patch(
+        "dataall.aws.handlers.s3.S3.get_access_point_policy",
+        return_value=None,
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_role_id",
+        return_value=target_environment.SamlGroupName,
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_role_ids",
+        return_value=["dataset_admin_role_id:*"],
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_delegation_role_arn",
+        return_value=None,
+    )
+    mocker.patch(
+        "dataall.aws.handlers.s3.S3.attach_access_point_policy",
+        return_value=None,
+    )
+    sleep_mock = mocker.patch("time.sleep")
+    Waiter.reset_wait_time()
+
+    with db.scoped_session() as session:
+        manager = S3ShareManager(
+            session,
+            dataset1,
+            share1,
+            location1,
+            source_environment,
+            target_environment,
+            source_environment_group,
+            target_environment_group,
+        )
+
+        # When
+        manager.manage_access_point_and_policy()
+
+    # Then: polling stops as soon as the access point exists, with growing delays
+    assert get_access_point_mock.call_count == 4
+    assert sleep_mock.call_count == 2
+    first_delay, second_delay = [c.args[0] for c in sleep_mock.call_args_list]
+    assert second_delay > first_delay
+    assert Waiter.get_wait_time() == first_delay + second_delay
+
+
+@pytest.fixture(scope="module")
+def location2(location: Callable, dataset1: models.Dataset) -> models.DatasetStorageLocation:
+    yield location(dataset=dataset1, label="location2")
+
+
+@pytest.fixture(scope="module")
+def share_item_folder2(share_item_folder: Callable, share1: models.ShareObject, location2: models.DatasetStorageLocation):
+    yield share_item_folder(share=share1, location=location2)
+
+
+def test_policy_batch_writes_bucket_and_key_policies_once(
+    mocker,
+    source_environment_group: models.EnvironmentGroup,
+    target_environment_group: models.EnvironmentGroup,
+    dataset1: models.Dataset,
+    db,
+    share1: models.ShareObject,
+    share_item_folder1: models.ShareObjectItem,
+    share_item_folder2: models.ShareObjectItem,
+    location1: models.DatasetStorageLocation,
+    location2: models.DatasetStorageLocation,
+    source_environment: models.Environment,
+    target_environment: models.Environment,
+    base_bucket_policy,
+):
+    # Given
+    get_bucket_policy_mock = mocker.patch(
+        "dataall.aws.handlers.s3.S3.get_bucket_policy",
+        return_value=json.dumps(base_bucket_policy),
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_delegation_role_arn",
+        return_value=None,
+    )
+    mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_role_ids",
+        return_value=[1, 2, 3],
+    )
+    create_bucket_policy_mock = mocker.patch(
+        "dataall.aws.handlers.s3.S3.create_bucket_policy",
+        return_value=None,
+    )
+    mocker.patch(
+        "dataall.aws.handlers.kms.KMS.get_key_id",
+        return_value="kms-key",
+    )
+    # Requester already allowed in the key policy
+    mocker.patch(
+        "dataall.aws.handlers.kms.KMS.get_key_policy",
+        return_value=json.dumps(
+            {"Version": "2012-10-17", "Statement": [S3ShareManager.build_key_decrypt_statement("requester-id")]}
+        ),
+    )
+    get_role_id_mock = mocker.patch(
+        "dataall.aws.handlers.sts.SessionHelper.get_role_id",
+        return_value="requester-id",
+    )
+    put_key_policy_mock = mocker.patch(
+        "dataall.aws.handlers.kms.KMS.put_key_policy",
+        return_value=None,
+    )
+
+    batch = S3PolicyBatch()
+    with db.scoped_session() as session:
+        for location in [location1, location2]:
+            batch.add_folder(
+                S3ShareManager(
+                    session,
+                    dataset1,
+                    share1,
+                    location,
+                    source_environment,
+                    target_environment,
+                    source_environment_group,
+                    target_environment_group,
+                )
+            )
+
+        # When
+        failed = batch.apply()
+
+    # Then
+    assert failed == {}
+    get_bucket_policy_mock.assert_called_once()
+    create_bucket_policy_mock.assert_called_once()
+    new_policy = json.loads(create_bucket_policy_mock.call_args.args[3])
+    assert [s.get("Sid") for s in new_policy["Statement"]][-2:] == ["AllowAllToAdmin", "DelegateAccessToAccessPoint"]
+    get_role_id_mock.assert_called_once()
+    # Unchanged key policy is not written
+    put_key_policy_mock.assert_not_called()
+
+
+def test_policy_batch_maps_failures_to_share_items(
+    mocker,
+    source_environment_group: models.EnvironmentGroup,
+    target_environment_group: models.EnvironmentGroup,
+    dataset1: models.Dataset,
+    db,
+    share1: models.ShareObject,
+    share_item_folder1: models.ShareObjectItem,
+    location1: models.DatasetStorageLocation,
+    source_environment: models.Environment,
+    target_environment: models.Environment,
+):
+    mocker.patch(
+        "dataall.aws.handlers.s3.S3.get_bucket_policy",
+        side_effect=Exception("AccessDenied"),
+    )
+    mocker.patch(
+        "dataall.aws.handlers.kms.KMS.get_key_id",
+        return_value="kms-key",
+    )
+    mocker.patch(
+        "dataall.aws.handlers.kms.KMS.get_key_policy",
+        return_value=None,
+    )
+
+    batch = S3PolicyBatch()
+    with db.scoped_session() as session:
+        batch.add_folder(
+            S3ShareManager(
+                session,
+                dataset1,
+                share1,
+                location1,
+                source_environment,
+                target_environment,
+                source_environment_group,
+                target_environment_group,
+            )
+        )
+        failed = batch.apply()
+
+    assert list(failed.keys()) == [share_item_folder1.shareItemUri]
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+from dataall.tasks.data_sharing.share_refresh_executor import ShareRefreshExecutor
+
+Share = namedtuple('Share', ['shareUri', 'status', 'sourceAccountId', 'targetAccountId'])
+
+
+@pytest.fixture(scope='module')
+def shares():
+    yield [
+        Share('s1', 'Approved', '111', '222'),
+        Share('s2', 'Revoked', '111', '222'),
+        Share('s3', 'Approved', '111', '333'),
+        Share('s4', 'Approved', '444', '222'),
+    ]
+
+
+def test_group_by_accounts(shares):
+    groups = ShareRefreshExecutor.group_by_accounts(shares)
+    assert len(groups) == 3
+    assert [s.shareUri for s in groups[('111', '222')]] == ['s1', 's2']
+
+
+def test_shares_serialized_per_account_pair(shares):
+    lock = threading.Lock()
+    running = {}
+    overlaps = []
+    max_parallel = []
+
+    def process(engine, share_uri, status):
+        share = next(s for s in shares if s.shareUri == share_uri)
+        pair = (share.sourceAccountId, share.targetAccountId)
+        with lock:
+            if running.get(pair):
+                overlaps.append(pair)
+            running[pair] = True
+            max_parallel.append(sum(running.values()))
+        time.sleep(0.1)
+        with lock:
+            running[pair] = False
+        return True
+
+    summary = ShareRefreshExecutor(None, process, max_workers=3, share_timeout=5).run(shares)
+    assert not overlaps
+    assert max(max_parallel) > 1
+    assert sorted(summary.succeeded) == ['s1', 's2', 's3', 's4']
+    assert summary.to_dict()['failed'] == 0
+
+
+def test_failures_and_timeouts(shares):
+    def process(engine, share_uri, status):
+        if share_uri == 's1':
+            time.sleep(1)
+        if share_uri == 's3':
+            raise Exception('boom')
+        return share_uri != 's4'
+
+    summary = ShareRefreshExecutor(None, process, max_workers=4, share_timeout=0.2).run(shares)
+    assert summary.timed_out == ['s1']
+    # s2 shares the account pair of the timed out share
+    assert summary.skipped == ['s2']
+    assert sorted(f['shareUri'] for f in summary.failed) == ['s3', 's4']
+    assert summary.to_dict()['total'] == 4
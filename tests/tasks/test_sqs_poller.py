@@ -0,0 +1,115 @@
+import json
+
+from dataall.tasks.subscriptions import QueueConsumer, poll_queues
+
+
+class FakeSqs:
+    def __init__(self, count, fail_delete=None, receive_count=1):
+        self.messages = [
+            {
+                'MessageId': f'm{i}',
+                'ReceiptHandle': f'r{i}',
+                'Body': json.dumps({'Message': json.dumps({'prefix': f'p{i}'})}),
+                'Attributes': {'ApproximateReceiveCount': str(receive_count)},
+            }
+            for i in range(count)
+        ]
+        self.fail_delete = fail_delete or []
+        self.receive_calls = []
+        self.delete_calls = []
+
+    def receive_message(self, **kwargs):
+        self.receive_calls.append(kwargs)
+        batch = self.messages[: kwargs['MaxNumberOfMessages']]
+        self.messages = self.messages[kwargs['MaxNumberOfMessages'] :]
+        return {'Messages': batch} if batch else {}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.delete_calls.append(Entries)
+        return {
+            'Successful': [e for e in Entries if e['ReceiptHandle'] not in self.fail_delete],
+            'Failed': [
+                {'Id': e['Id'], 'Code': 'ReceiptHandleIsInvalid', 'Message': 'invalid'}
+                for e in Entries
+                if e['ReceiptHandle'] in self.fail_delete
+            ],
+        }
+
+
+def queue(name):
+    return {'url': f'https://sqs.eu-west-1.amazonaws.com/111111111111/{name}', 'region': 'eu-west-1'}
+
+
+def test_queue_drained_with_long_polling_and_batch_deletes(mocker):
+    sqs = FakeSqs(25)
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=sqs)
+    processed = []
+
+    reports = QueueConsumer([queue('q1')], wait_time=5).consume(processed.append)
+
+    assert [m['prefix'] for m in processed] == [f'p{i}' for i in range(25)]
+    assert reports[0]['received'] == 25
+    assert reports[0]['drained']
+    assert len(sqs.receive_calls) == 4
+    assert all(call['WaitTimeSeconds'] == 5 for call in sqs.receive_calls)
+    assert [len(entries) for entries in sqs.delete_calls] == [10, 10, 5]
+
+
+def test_failed_messages_are_not_deleted(mocker):
+    sqs = FakeSqs(3, fail_delete=['r2'])
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=sqs)
+
+    def process(message):
+        if message['prefix'] == 'p0':
+            raise Exception('boom')
+
+    reports = QueueConsumer([queue('q1')], wait_time=0).consume(process)
+
+    assert reports[0]['processed'] == 2
+    assert [f['MessageId'] for f in reports[0]['failed']] == ['m0', 'm2']
+    assert [e['ReceiptHandle'] for e in sqs.delete_calls[0]] == ['r1', 'r2']
+
+
+def test_messages_failing_too_many_times_are_discarded(mocker):
+    sqs = FakeSqs(2, receive_count=5)
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=sqs)
+
+    def process(message):
+        if message['prefix'] == 'p0':
+            raise Exception('boom')
+
+    reports = QueueConsumer([queue('q1')], wait_time=0, max_receive_count=5).consume(process)
+
+    assert [f['MessageId'] for f in reports[0]['failed']] == ['m0']
+    assert reports[0]['discarded'] == ['m0']
+    assert [[e['ReceiptHandle'] for e in entries] for entries in sqs.delete_calls] == [['r1'], ['r0']]
+
+
+def test_seen_messages_do_not_drain_the_queue(mocker):
+    sqs = FakeSqs(1)
+    redelivered = dict(sqs.messages[0])
+    sqs.messages = [redelivered, redelivered, *FakeSqs(2).messages[1:]]
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=sqs)
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.MAX_NUMBER_OF_MESSAGES', 1)
+    processed = []
+
+    reports = QueueConsumer([queue('q1')], wait_time=0).consume(processed.append)
+
+    assert processed == [{'prefix': 'p0'}, {'prefix': 'p1'}]
+    assert reports[0]['received'] == 2
+    assert reports[0]['drained']
+
+
+def test_time_budget(mocker):
+    sqs = FakeSqs(5)
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=sqs)
+
+    reports = QueueConsumer([queue('q1'), queue('q2')], time_budget=0).consume(lambda m: None)
+
+    assert not sqs.receive_calls
+    assert not any(r['drained'] for r in reports)
+
+
+def test_poll_queues(mocker):
+    mocker.patch('dataall.tasks.subscriptions.sqs_poller.boto3.client', return_value=FakeSqs(2))
+    assert poll_queues([queue('q1')]) == [{'prefix': 'p0'}, {'prefix': 'p1'}]
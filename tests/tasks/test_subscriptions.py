@@ -1,4 +1,5 @@
 import pytest
+from botocore.exceptions import ClientError
 
 import dataall
 from dataall.api.constants import OrganisationUserRole
@@ -150,3 +151,127 @@ def test_subscriptions(org, env, otherenv, db, dataset, share, mocker):
     queues = subscriber.get_queues(envs)
     assert queues
     assert subscriber.notify_consumers(db, messages)
+
+
+def share_table(db, dataset, environment, owners):
+    with db.scoped_session() as session:
+        table = session.query(dataall.db.models.DatasetTable).get('foo')
+        shares = []
+        for owner in owners:
+            share_object = dataall.db.models.ShareObject(
+                datasetUri=dataset.datasetUri,
+                environmentUri=environment.environmentUri,
+                owner=owner,
+                principalId=environment.environmentUri,
+                principalType=dataall.api.constants.PrincipalType.Environment.value,
+                status=dataall.api.constants.ShareObjectStatus.Approved.value,
+            )
+            session.add(share_object)
+            session.commit()
+            shares.append(share_object)
+        items = [
+            dataall.db.models.ShareObjectItem(
+                shareUri=s.shareUri,
+                owner='alice',
+                itemUri=table.tableUri,
+                itemType=dataall.api.constants.ShareableType.Table.value,
+                itemName=table.GlueTableName,
+            )
+            for s in shares
+        ]
+    return table, shares, items
+
+
+def test_publish_sns_message_fan_out(db, dataset, otherenv, share, mocker):
+    table, shares, items = share_table(db, dataset, otherenv, ['carol', 'dave'])
+    sns_publish_batch = mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.SubscriptionService.sns_publish_batch',
+        return_value=[shares[1].shareUri],
+    )
+    queue = mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.Worker.queue', return_value=True
+    )
+    dataall.tasks.subscriptions.subscription_service.SubscriptionService.publish_sns_message(
+        db, {'prefix': table.S3Prefix}, dataset, items, table.S3Prefix, table=table
+    )
+
+    sns_publish_batch.assert_called_once()
+    entries = sns_publish_batch.call_args[0][1]
+    assert [e['Id'] for e in entries] == [s.shareUri for s in shares]
+    queue.assert_called_once()
+    assert len(queue.call_args[0][1]) == 1
+    with db.scoped_session() as session:
+        notifications = session.query(dataall.db.models.Notification).all()
+        assert {n.target_uri for n in notifications} == {
+            f'{shares[0].shareUri}|{dataset.datasetUri}'
+        }
+        assert {n.username for n in notifications} == {'foo', 'alice', 'carol'}
+
+
+def test_publish_sns_message_when_redshift_copy_fails(db, dataset, otherenv, share, mocker):
+    table, shares, items = share_table(db, dataset, otherenv, ['erin'])
+    sns_publish_batch = mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.SubscriptionService.sns_publish_batch',
+        return_value=[],
+    )
+    mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.Worker.queue',
+        side_effect=ClientError({'Error': {'Code': 'AccessDenied'}}, 'SendMessage'),
+    )
+    dataall.tasks.subscriptions.subscription_service.SubscriptionService.publish_sns_message(
+        db, {'prefix': table.S3Prefix}, dataset, items, table.S3Prefix, table=table
+    )
+
+    sns_publish_batch.assert_called_once()
+    with db.scoped_session() as session:
+        notifications = session.query(dataall.db.models.Notification).filter(
+            dataall.db.models.Notification.target_uri == f'{shares[0].shareUri}|{dataset.datasetUri}'
+        )
+        assert 'erin' in {n.username for n in notifications}
+
+
+def test_notify_consumers_of_folder_update(db, dataset, otherenv, share, mocker):
+    with db.scoped_session() as session:
+        location = dataall.db.models.DatasetStorageLocation(
+            datasetUri=dataset.datasetUri,
+            label='folder',
+            name='folder',
+            owner='alice',
+            S3Prefix='s3://dataset/folder/',
+            S3BucketName=dataset.S3BucketName,
+            AWSAccountId=dataset.AwsAccountId,
+            region=dataset.region,
+        )
+        session.add(location)
+        share_object = dataall.db.models.ShareObject(
+            datasetUri=dataset.datasetUri,
+            environmentUri=otherenv.environmentUri,
+            owner='frank',
+            principalId=otherenv.environmentUri,
+            principalType=dataall.api.constants.PrincipalType.Environment.value,
+            status=dataall.api.constants.ShareObjectStatus.Approved.value,
+        )
+        session.add(share_object)
+        session.commit()
+        session.add(
+            dataall.db.models.ShareObjectItem(
+                shareUri=share_object.shareUri,
+                owner='alice',
+                itemUri=location.locationUri,
+                itemType=dataall.api.constants.ShareableType.StorageLocation.value,
+                itemName=location.name,
+            )
+        )
+    sns_publish_batch = mocker.patch(
+        'dataall.tasks.subscriptions.subscription_service.SubscriptionService.sns_publish_batch',
+        return_value=[],
+    )
+    subscriber = dataall.tasks.subscriptions.subscription_service.SubscriptionService()
+
+    assert subscriber.notify_consumers(
+        db,
+        [{'prefix': 's3://dataset/folder/', 'accountid': dataset.AwsAccountId, 'region': dataset.region}],
+    )
+
+    sns_publish_batch.assert_called_once()
+    assert [e['Id'] for e in sns_publish_batch.call_args[0][1]] == [share_object.shareUri]
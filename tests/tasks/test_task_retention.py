@@ -0,0 +1,59 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from dataall.db import models
+from dataall.tasks.task_retention import archive_tasks
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = json_lines(Body)
+
+
+def json_lines(body):
+    return [json.loads(line) for line in gzip.decompress(body).decode('utf-8').splitlines()]
+
+
+@pytest.fixture(scope='module')
+def tasks(db):
+    old = datetime.now() - timedelta(days=40)
+    with db.scoped_session() as session:
+        tasks = [
+            models.Task(action='glue.job.runs', targetUri=f'old{i}', status='completed', created=old)
+            for i in range(5)
+        ] + [
+            models.Task(action='glue.job.runs', targetUri='failed', status='failed', created=old),
+            models.Task(action='glue.job.runs', targetUri='pending', status='pending', created=old),
+            models.Task(action='glue.job.runs', targetUri='recent', status='completed'),
+        ]
+        session.add_all(tasks)
+    yield tasks
+
+
+def test_dry_run(db, tasks):
+    s3 = FakeS3()
+    summary = archive_tasks(db, 'bucket', retention_days=30, dry_run=True, s3_client=s3)
+    assert summary['tasks'] == 6
+    assert not s3.objects
+    with db.scoped_session() as session:
+        assert session.query(models.Task).count() == 8
+
+
+def test_archive_tasks(db, tasks):
+    s3 = FakeS3()
+    summary = archive_tasks(db, 'bucket', retention_days=30, batch_size=4, s3_client=s3)
+
+    assert summary['tasks'] == 6
+    assert len(summary['objects']) == 2
+    archived = [task for key in summary['objects'] for task in s3.objects[key]]
+    assert sorted(t['targetUri'] for t in archived) == ['failed'] + [f'old{i}' for i in range(5)]
+    assert all(key.startswith('task-archive/dt=') for key in summary['objects'])
+    with db.scoped_session() as session:
+        remaining = session.query(models.Task).all()
+        assert sorted(t.targetUri for t in remaining) == ['pending', 'recent']